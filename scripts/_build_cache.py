@@ -0,0 +1,186 @@
+"""Persistenter Build-Cache fuer den inkrementellen transform.py-Lauf.
+
+Haelt pro Quellzeile (Verknuepfungen) und pro Record die JSON-LD-Fragmente
+des letzten Laufs samt der Abhaengigkeiten, die beim Bauen tatsaechlich
+gelesen wurden (Index- und Enrichment-Eintraege). Ein Fragment wird nur
+wiederverwendet, wenn der Zeilen-Fingerprint (Sheet + ``_xlsx_row`` +
+Zellwerte, dieselben Daten wie ``build_xlsx_source``) und alle aufgezeichneten
+Abhaengigkeiten unveraendert sind.
+
+Der Cache ist ein reines Laufzeit-Artefakt (``$M3GIM_OUTPUT_DIR/.cache/``,
+nicht versioniert). Jede Aenderung an transform.py/_common.py verwirft ihn
+komplett, weil die Fragmente vom Code abhaengen, der sie erzeugt hat.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import pickle
+from pathlib import Path
+
+# Bei strukturellen Aenderungen am Cache-Format hochzaehlen.
+CACHE_VERSION = 1
+
+
+def stable_digest(obj) -> str:
+    """Inhalts-Hash eines JSON-artigen Objekts (Key-Reihenfolge egal).
+
+    ``None`` steht fuer "Eintrag fehlt" und bekommt einen eigenen, festen
+    Hash, damit ein spaeter hinzukommender Index-Eintrag als Aenderung zaehlt.
+    """
+    raw = json.dumps(obj, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def file_digest(path: Path) -> str | None:
+    """SHA-256 ueber den Dateiinhalt; None, wenn die Datei fehlt."""
+    path = Path(path)
+    if not path.exists():
+        return None
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def row_fingerprint(sheet: str, xlsx_row: int, values) -> str:
+    """Fingerprint einer Quellzeile: Sheet + XLSX-Zeile + Zellwerte.
+
+    Zellwerte gehen mit Typnamen ein, damit NaN (float) und der String "nan"
+    nicht kollidieren.
+    """
+    cells = [(type(v).__name__, str(v)) for v in values]
+    return stable_digest([sheet, xlsx_row, cells])
+
+
+class RecordingLookup(dict):
+    """dict, das jeden ``get``-Zugriff in ein geteiltes Log schreibt.
+
+    Damit lassen sich die Index-/Enrichment-Eintraege aufzeichnen, die eine
+    Zeile bzw. ein Record beim Bauen gelesen hat — inklusive Fehlzugriffen,
+    denn ein spaeter ergaenzter Eintrag aendert das Ergebnis ebenfalls.
+    """
+
+    def __init__(self, data: dict, name: str, log: list):
+        super().__init__(data)
+        self.name = name
+        self.log = log
+
+    def get(self, key, default=None):
+        self.log.append((self.name, key))
+        return super().get(key, default)
+
+
+def resolve_deps(log: list, sources: dict) -> list:
+    """Friert ein Zugriffs-Log zu [(quelle, key, digest)] ein (dedupliziert)."""
+    deps = []
+    seen = set()
+    for name, key in log:
+        if (name, key) in seen:
+            continue
+        seen.add((name, key))
+        deps.append((name, key, stable_digest(sources.get(name, {}).get(key))))
+    return deps
+
+
+def deps_unchanged(deps: list, sources: dict) -> bool:
+    """True, wenn alle aufgezeichneten Eintraege denselben Inhalt haben."""
+    for name, key, digest in deps:
+        if stable_digest(sources.get(name, {}).get(key)) != digest:
+            return False
+    return True
+
+
+class BuildCache:
+    """Fragment-Cache mit Trefferstatistik, als Pickle auf Platte.
+
+    ``rows``    : Zeilen-Fingerprint -> {"deps", "blob"} (Verknuepfungen)
+    ``records`` : Record-Key -> {"deps", "blob"} (add_relations_to_records)
+    ``inputs``  : Datei-/Code-Digests des letzten vollstaendigen Laufs
+    ``output``  : Digest der mit diesem Stand geschriebenen Ausgabe (ein
+                  anderer Lauf hat sie seither ueberschrieben, wenn er abweicht)
+
+    Fragmente liegen als Pickle-Blobs vor: jeder Treffer liefert frische
+    Objekte, die der Aufrufer gefahrlos mutieren darf.
+    """
+
+    def __init__(self, path: Path, code_digest: str):
+        self.path = Path(path)
+        self.code_digest = code_digest
+        self.inputs: dict = {}
+        self.output: str | None = None
+        self.rows: dict = {}
+        self.records: dict = {}
+        self._used_rows: set = set()
+        self._used_records: set = set()
+        self.stats = {"row_hits": 0, "row_misses": 0,
+                      "record_hits": 0, "record_misses": 0}
+
+    @classmethod
+    def load(cls, path: Path, code_digest: str) -> "BuildCache":
+        cache = cls(path, code_digest)
+        if not cache.path.exists():
+            return cache
+        try:
+            with open(cache.path, "rb") as f:
+                data = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+            return cache
+        if (data.get("version") != CACHE_VERSION
+                or data.get("code") != code_digest):
+            return cache
+        cache.inputs = data.get("inputs", {})
+        cache.output = data.get("output")
+        cache.rows = data.get("rows", {})
+        cache.records = data.get("records", {})
+        return cache
+
+    def save(self) -> None:
+        """Schreibt nur die im aktuellen Lauf benutzten Eintraege (kein Wachstum
+        durch geloeschte Zeilen). Atomar via Temp-Datei + replace."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        data = {
+            "version": CACHE_VERSION,
+            "code": self.code_digest,
+            "inputs": self.inputs,
+            "output": self.output,
+            "rows": {k: v for k, v in self.rows.items() if k in self._used_rows},
+            "records": {k: v for k, v in self.records.items()
+                        if k in self._used_records},
+        }
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+        with open(tmp, "wb") as f:
+            pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+        tmp.replace(self.path)
+
+    # -- Zeilen ------------------------------------------------------------
+
+    def get_row(self, fp: str, sources: dict):
+        entry = self.rows.get(fp)
+        if entry is not None and deps_unchanged(entry["deps"], sources):
+            self._used_rows.add(fp)
+            self.stats["row_hits"] += 1
+            return pickle.loads(entry["blob"])
+        self.stats["row_misses"] += 1
+        return None
+
+    def put_row(self, fp: str, deps: list, fragment) -> None:
+        self.rows[fp] = {"deps": deps, "blob": pickle.dumps(fragment)}
+        self._used_rows.add(fp)
+
+    # -- Records -----------------------------------------------------------
+
+    def get_record(self, key: str, sources: dict):
+        entry = self.records.get(key)
+        if entry is not None and deps_unchanged(entry["deps"], sources):
+            self._used_records.add(key)
+            self.stats["record_hits"] += 1
+            return pickle.loads(entry["blob"])
+        self.stats["record_misses"] += 1
+        return None
+
+    def put_record(self, key: str, deps: list, fragment) -> None:
+        self.records[key] = {"deps": deps, "blob": pickle.dumps(fragment)}
+        self._used_records.add(key)
@@ -0,0 +1,308 @@
+"""Offline-Kandidatenindex fuer reconcile.py (Wikidata-Dump-Auszug in SQLite).
+
+Statt der Search API beantwortet ein lokal gebauter Index die Suchanfragen
+und P31/P86-Claims der Reconciliation. Aufbau in zwei Schritten
+(``build-candidate-index.py``):
+
+1. **Auszug** (JSONL): aus einem Wikidata-JSON-Dump (``latest-all.json.gz``,
+   eine Entitaet pro Zeile) nur Entitaeten, deren P31 einen der Typen aus
+   ``reconcile.Q_HUMAN``/``Q_GEOGRAPHIC``/``Q_ORGANIZATION``/``Q_MUSICAL_WORK``
+   enthaelt; pro Entitaet Labels/Aliase (``LANGUAGES``), Beschreibung und die
+   P31/P86-Werte (``extract_entity``).
+2. **Index** (SQLite): Label/Alias-Tabelle mit exaktem Schluessel (B-Baum,
+   Lookup im Mikrosekundenbereich) plus Token- und Bigramm-Postings fuer das
+   verlustfreie Blocking aus ``_fuzzy_match`` (``build_index``).
+
+``OfflineIndex`` ist ein ``CandidateIndex``, dessen Postings aus SQLite
+kommen; ``search()`` liefert Treffer im Format von ``wbsearchentities``,
+``claims()`` im Format von ``wbgetentities`` — reconcile.py bewertet sie
+unveraendert.
+
+Ablage: ``$M3GIM_CACHE_DIR/wikidata/candidates.sqlite`` (nicht versioniert).
+"""
+
+from __future__ import annotations
+
+import bz2
+import gzip
+import json
+import os
+import sqlite3
+import threading
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from _fuzzy_match import (FUZZY_LOW_THRESHOLD, CandidateIndex, bigrams,
+                          exact_key, normalize, prefix_grams, threshold_ratio,
+                          token_string)
+
+BASE_DIR = Path(__file__).parent.parent
+CACHE_DIR = Path(os.environ.get("M3GIM_CACHE_DIR", BASE_DIR / "data" / "output" / ".cache"))
+INDEX_PATH = CACHE_DIR / "wikidata" / "candidates.sqlite"
+EXTRACT_PATH = CACHE_DIR / "wikidata" / "candidates.jsonl"
+
+LANGUAGES = ("de", "en")  # Labels/Aliase im Index; Anzeige-Label in dieser Reihenfolge
+CLAIM_PROPERTIES = ("P31", "P86")  # was reconcile.py bewertet
+SCHEMA_VERSION = 1
+
+
+def open_dump(path: Path | str):
+    """Dump/Auszug lesen, auch ``.gz``/``.bz2`` komprimiert."""
+    path = str(path)
+    if path.endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf-8")
+    if path.endswith(".bz2"):
+        return bz2.open(path, "rt", encoding="utf-8")
+    return open(path, encoding="utf-8")
+
+
+def iter_dump(path: Path | str) -> Iterator[dict]:
+    """Entitaeten aus einem Wikidata-JSON-Dump (``[``, eine Entitaet pro Zeile
+    mit Komma, ``]``) oder einer JSONL-Datei."""
+    with open_dump(path) as f:
+        for line in f:
+            line = line.strip().rstrip(",")
+            if not line or line in ("[", "]"):
+                continue
+            yield json.loads(line)
+
+
+def _claim_ids(entity: dict, prop: str) -> list:
+    ids = []
+    for claim in entity.get("claims", {}).get(prop, []):
+        value = claim.get("mainsnak", {}).get("datavalue", {}).get("value")
+        if isinstance(value, dict) and "id" in value:
+            ids.append(value["id"])
+    return ids
+
+
+def extract_entity(entity: dict, types: dict) -> dict | None:
+    """Kompakter Auszug einer Dump-Entitaet oder None, wenn kein P31-Typ passt.
+
+    ``types``: Art (``person``, ``location``, ...) -> Menge erlaubter P31-Werte.
+    """
+    p31 = _claim_ids(entity, "P31")
+    kinds = sorted(kind for kind, allowed in types.items() if allowed & set(p31))
+    if not kinds:
+        return None
+    labels = {lang: entity["labels"][lang]["value"]
+              for lang in LANGUAGES if lang in entity.get("labels", {})}
+    if not labels:
+        labels = {v["language"]: v["value"] for v in entity.get("labels", {}).values()}
+    aliases = sorted({a["value"] for lang in LANGUAGES
+                      for a in entity.get("aliases", {}).get(lang, [])} - set(labels.values()))
+    descriptions = entity.get("descriptions", {})
+    description = next((descriptions[lang]["value"] for lang in LANGUAGES
+                        if lang in descriptions), "")
+    return {
+        "id": entity["id"], "kinds": kinds, "labels": labels, "aliases": aliases,
+        "description": description,
+        "claims": {prop: ids for prop in CLAIM_PROPERTIES
+                   if (ids := _claim_ids(entity, prop))},
+    }
+
+
+def display_label(record: dict) -> str:
+    labels = record["labels"]
+    for lang in LANGUAGES:
+        if lang in labels:
+            return labels[lang]
+    return next(iter(labels.values()), record["id"])
+
+
+def _statements(ids: list) -> list:
+    """QIDs -> Claims im wbgetentities-Format (soweit get_instance_of es liest)."""
+    return [{"mainsnak": {"snaktype": "value", "datavalue": {
+        "type": "wikibase-entityid", "value": {"entity-type": "item", "id": qid}}},
+        "rank": "normal"} for qid in ids]
+
+
+SCHEMA = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE entity (qid TEXT PRIMARY KEY, label TEXT, description TEXT,
+                     kinds TEXT, claims TEXT);
+CREATE TABLE name (id INTEGER PRIMARY KEY, qid TEXT NOT NULL, text TEXT NOT NULL,
+                   is_alias INTEGER NOT NULL, exact TEXT NOT NULL, norm TEXT NOT NULL,
+                   tlen INTEGER NOT NULL);
+CREATE TABLE token (token TEXT, name_id INTEGER, PRIMARY KEY (token, name_id)) WITHOUT ROWID;
+CREATE TABLE gram (gram TEXT, occ INTEGER, tlen INTEGER, name_id INTEGER,
+                   PRIMARY KEY (gram, occ, tlen, name_id)) WITHOUT ROWID;
+CREATE TABLE gram_freq (gram TEXT, occ INTEGER, freq INTEGER,
+                        PRIMARY KEY (gram, occ)) WITHOUT ROWID;
+"""
+
+
+def build_index(records: Iterable[dict], path: Path | str = INDEX_PATH,
+                min_confidence: int = FUZZY_LOW_THRESHOLD, source: str = "") -> dict:
+    """Schreibt den SQLite-Index aus Auszugs-Datensaetzen (extract_entity).
+
+    Zwei Durchlaeufe: erst Entitaeten, Namen, Token und Bigramm-Haeufigkeiten,
+    dann die Bigramm-Praefixe (die Ordnung braucht die globalen Haeufigkeiten).
+    Returns Statistik (Entitaeten, Namen).
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.unlink(missing_ok=True)
+    db = sqlite3.connect(str(tmp))
+    db.executescript("PRAGMA journal_mode=OFF; PRAGMA synchronous=OFF;" + SCHEMA)
+    ratio = threshold_ratio(min_confidence)
+
+    freq: Counter = Counter()
+    stats = {"entities": 0, "names": 0}
+    name_id = 0
+    for record in records:
+        qid = record["id"]
+        claims = {prop: _statements(ids) for prop, ids in record.get("claims", {}).items()}
+        db.execute("INSERT OR REPLACE INTO entity VALUES (?, ?, ?, ?, ?)",
+                   (qid, display_label(record), record.get("description", ""),
+                    ",".join(record.get("kinds", [])), json.dumps(claims)))
+        stats["entities"] += 1
+        texts = [(t, 0) for t in dict.fromkeys(record["labels"].values())]
+        texts += [(t, 1) for t in record.get("aliases", [])]
+        for text, is_alias in texts:
+            name_id += 1
+            norm = normalize(text)
+            tokens = token_string(norm)
+            db.execute("INSERT INTO name VALUES (?, ?, ?, ?, ?, ?, ?)",
+                       (name_id, qid, text, is_alias, exact_key(text), norm, len(tokens)))
+            db.executemany("INSERT OR IGNORE INTO token VALUES (?, ?)",
+                           [(tok, name_id) for tok in set(norm.split())])
+            freq.update(bigrams(tokens))
+        stats["names"] = name_id
+
+    db.executemany("INSERT INTO gram_freq VALUES (?, ?, ?)",
+                   [(g, occ, n) for (g, occ), n in freq.items()])
+    writer = db.cursor()
+    for nid, norm, tlen in db.execute("SELECT id, norm, tlen FROM name"):
+        grams = prefix_grams(token_string(norm), freq, ratio)
+        writer.executemany("INSERT OR IGNORE INTO gram VALUES (?, ?, ?, ?)",
+                           [(g, occ, tlen, nid) for g, occ in grams])
+
+    db.execute("CREATE INDEX name_exact ON name (exact)")
+    meta = {"schema": SCHEMA_VERSION, "min_confidence": min_confidence,
+            "languages": ",".join(LANGUAGES), "source": source,
+            "built": datetime.now().isoformat(timespec="seconds"), **stats}
+    db.executemany("INSERT INTO meta VALUES (?, ?)", [(k, str(v)) for k, v in meta.items()])
+    db.commit()
+    db.close()
+    os.replace(tmp, path)
+    return stats
+
+
+class OfflineIndex(CandidateIndex):
+    """Kandidatenindex aus SQLite; Postings werden pro Anfrage gelesen.
+
+    Thread-sicher (eine Verbindung, ein Lock), wie ``_http_cache.ResponseCache``.
+    """
+
+    def __init__(self, path: Path | str = INDEX_PATH):
+        self.path = Path(path)
+        if not self.path.exists():
+            raise FileNotFoundError(f"Kandidatenindex fehlt: {self.path} "
+                                    "(build-candidate-index.py ausfuehren)")
+        self._db = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True,
+                                   check_same_thread=False)
+        self._lock = threading.Lock()
+        self.meta = dict(self._query("SELECT key, value FROM meta"))
+        if int(self.meta.get("schema", 0)) != SCHEMA_VERSION:
+            raise ValueError(f"{self.path}: Schema {self.meta.get('schema')}, "
+                             f"erwartet {SCHEMA_VERSION} — Index neu bauen")
+        self.min_confidence = int(self.meta["min_confidence"])
+        self._ratio = threshold_ratio(self.min_confidence)
+        self.stats = {"searches": 0, "claims": 0}
+
+    def _query(self, sql: str, params=()) -> list:
+        with self._lock:
+            return self._db.execute(sql, params).fetchall()
+
+    def __len__(self) -> int:
+        return int(self.meta.get("names", 0))
+
+    @property
+    def entity_count(self) -> int:
+        return int(self.meta.get("entities", 0))
+
+    # -- Postings aus SQLite -------------------------------------------------
+
+    def _all_ids(self) -> Iterable[int]:
+        return [r[0] for r in self._query("SELECT id FROM name")]
+
+    def _exact_ids(self, key: str) -> Iterable[int]:
+        return [r[0] for r in self._query("SELECT id FROM name WHERE exact = ?", (key,))]
+
+    def _token_ids(self, token: str) -> Iterable[int]:
+        return [r[0] for r in self._query("SELECT name_id FROM token WHERE token = ?", (token,))]
+
+    def _gram_ids(self, gram, low, high) -> Iterable[int]:
+        return [r[0] for r in self._query(
+            "SELECT name_id FROM gram WHERE gram = ? AND occ = ? AND tlen BETWEEN ? AND ?",
+            (gram[0], gram[1], low, high))]
+
+    def _gram_freq(self, gram) -> int:
+        row = self._query("SELECT freq FROM gram_freq WHERE gram = ? AND occ = ?", gram)
+        return row[0][0] if row else 0
+
+    def _names(self, ids: list) -> dict:
+        out = {}
+        for start in range(0, len(ids), 500):
+            chunk = ids[start:start + 500]
+            marks = ",".join("?" * len(chunk))
+            for row in self._query(f"SELECT id, qid, text, is_alias, exact, norm FROM name "
+                                   f"WHERE id IN ({marks})", chunk):
+                out[row[0]] = row[1:]
+        return out
+
+    def _entries(self, ids: list) -> list:
+        names = self._names(ids)
+        return [(names[i][4], names[i][3]) for i in ids]
+
+    # -- API fuer reconcile.py -----------------------------------------------
+
+    def lookup(self, text: str) -> list:
+        """QIDs mit exakt diesem Label/Alias (case-insensitive)."""
+        rows = self._query("SELECT DISTINCT qid FROM name WHERE exact = ?", (exact_key(text),))
+        return [r[0] for r in rows]
+
+    def search(self, query: str, limit: int = 5) -> list:
+        """Treffer wie ``wbsearchentities``: id, label, description, match.
+
+        Eine Entitaet erscheint einmal (bester Label/Alias-Treffer), exakte
+        Treffer zuerst, dann nach Score.
+        """
+        self.stats["searches"] += 1
+        hits = self.match([query])[0]
+        names = self._names([i for i, _, _ in hits])
+        best = {}
+        for i, level, score in hits:
+            qid, text, is_alias = names[i][0], names[i][1], names[i][2]
+            best.setdefault(qid, (text, is_alias))
+        qids = list(best)[:limit]
+        entities = self._entities(qids)
+        return [{"id": qid, "label": entities[qid][0], "description": entities[qid][1],
+                 "match": {"type": "alias" if best[qid][1] else "label",
+                           "text": best[qid][0]}}
+                for qid in qids if qid in entities]
+
+    def _entities(self, qids: list) -> dict:
+        out = {}
+        for start in range(0, len(qids), 500):
+            chunk = qids[start:start + 500]
+            marks = ",".join("?" * len(chunk))
+            for qid, label, description, claims in self._query(
+                    f"SELECT qid, label, description, claims FROM entity "
+                    f"WHERE qid IN ({marks})", chunk):
+                out[qid] = (label, description, claims)
+        return out
+
+    def claims(self, qids: list) -> dict:
+        """QID -> Claims (P31/P86) wie ``wbgetentities``; unbekannte QIDs fehlen."""
+        self.stats["claims"] += 1
+        qids = list(dict.fromkeys(q for q in qids if q))
+        return {qid: json.loads(row[2]) for qid, row in self._entities(qids).items()}
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
@@ -0,0 +1,243 @@
+"""Gebuendeltes Fuzzy-Matching fuer reconcile.py (Blocking + Vektor-Scoring).
+
+``reconcile.compute_match_level`` bewertet ein Paar (Suchname, WD-Label) mit
+``thefuzz.fuzz.token_set_ratio``. Fuer viele Paare — eine ganze Gruppe von
+Suchergebnissen oder eine Offline-Kandidatenliste mit zehntausenden Labels —
+erledigt das dieses Modul in einem Zug:
+
+1. **Normalisieren** einmal pro String, exakt wie thefuzz (``full_process``
+   mit ``force_ascii``: Kleinschreibung, nur ASCII-Buchstaben/Ziffern).
+2. **Blocking**: Verglichen wird nur, was einen Block teilt — gleiches
+   Token, gleicher exakter Name oder genug gemeinsame Zeichen-Bigramme.
+3. **Scoring** aller verbleibenden Paare mit einem Aufruf von
+   ``rapidfuzz.process.cpdist`` (C, dieselbe Scorer-Funktion wie thefuzz).
+
+Die Klassifikation (``exact``/``fuzzy_high``/``fuzzy_low``) ist identisch zum
+Einzelvergleich, denn das Blocking ist fuer Schwellen ueber 2/3 verlustfrei:
+
+- Teilen zwei Namen ein Token, landen sie ueber den Token-Schluessel im
+  selben Block (nur dann kann die Schnittmenge den Score tragen).
+- Ohne gemeinsames Token ist ``token_set_ratio`` die Indel-Ratio
+  ``2L/(n+m)`` der sortierten Token-Strings (L = laengste gemeinsame
+  Teilfolge). In den mit ``^``/``$`` gepolsterten Strings sind je zwei
+  aufeinanderfolgende LCS-Zeichen ohne Luecke ein gemeinsames Bigramm; es
+  gibt davon mindestens ``3L + 1 - (n+m)``, bei Ratio >= r also mindestens
+  ``(1.5r - 1)(n+m) + 1`` > 0. Zusammen mit dem Laengenfilter
+  (``2 min(n,m)/(n+m) >= r``) ergibt das pro String eine Mindestanzahl
+  gemeinsamer Bigramme, und nach Praefix-Filterung (Bigramme global nach
+  Seltenheit geordnet) muss nur das seltenste Praefix indiziert werden.
+
+Unter ``BLOCKING_FLOOR`` (``--min-confidence`` < 68, d.h. Ratio vor der
+Rundung <= 2/3) gilt das nicht mehr; dann wird jedes Paar verglichen.
+"""
+
+from __future__ import annotations
+
+import math
+from collections import Counter, defaultdict
+from typing import Iterable, Sequence
+
+from rapidfuzz import fuzz, process
+from thefuzz.utils import full_process
+
+# Fuzzy-Matching Schwellenwerte
+FUZZY_HIGH_THRESHOLD = 90
+FUZZY_LOW_THRESHOLD = 80
+
+# Unterhalb dieser Schwelle ist das Bigramm-Blocking nicht verlustfrei
+BLOCKING_FLOOR = 68
+
+
+def exact_key(name: str) -> str:
+    """Vergleichsform fuer exakte Matches (case-insensitive, wie bisher)."""
+    return name.strip().lower()
+
+
+def normalize(name: str) -> str:
+    """Vergleichsform fuer token_set_ratio (wie thefuzz mit full_process)."""
+    return full_process(name.lower(), force_ascii=True)
+
+
+def classify(exact: bool, score: int,
+             min_confidence: int = FUZZY_LOW_THRESHOLD) -> tuple[str | None, int]:
+    """(level, score) aus Exakt-Flag und token_set_ratio."""
+    if exact:
+        return ('exact', 100)
+    if score >= FUZZY_HIGH_THRESHOLD:
+        return ('fuzzy_high', score)
+    if score >= min_confidence:
+        return ('fuzzy_low', score)
+    return (None, score)
+
+
+def score_pairs(left: Sequence[str], right: Sequence[str]) -> list[int]:
+    """token_set_ratio fuer normalisierte Paare (left[i], right[i]) in einem Aufruf.
+
+    Gerundet wie thefuzz (``int(round(score))``).
+    """
+    if not left:
+        return []
+    scores = process.cpdist(left, right, scorer=fuzz.token_set_ratio)
+    return [int(round(float(s))) for s in scores]
+
+
+def match_pairs(pairs: Iterable[tuple[str, str]],
+                min_confidence: int = FUZZY_LOW_THRESHOLD) -> list[tuple[str | None, int]]:
+    """compute_match_level fuer viele Paare (Suchname, Label) auf einmal."""
+    pairs = list(pairs)
+    scores = score_pairs([normalize(a) for a, _ in pairs],
+                         [normalize(b) for _, b in pairs])
+    return [classify(exact_key(a) == exact_key(b), score, min_confidence)
+            for (a, b), score in zip(pairs, scores)]
+
+
+def token_string(norm: str) -> str:
+    """Sortierte, eindeutige Tokens — der Vergleichsstring ohne gemeinsames Token."""
+    return " ".join(sorted(set(norm.split())))
+
+
+def bigrams(text: str) -> list[tuple[str, int]]:
+    """Bigramm-Vorkommen des gepolsterten Strings, durchnummeriert (Multimenge als Menge)."""
+    padded = f"^{text}$"
+    seen: Counter = Counter()
+    out = []
+    for i in range(len(padded) - 1):
+        gram = padded[i:i + 2]
+        seen[gram] += 1
+        out.append((gram, seen[gram]))
+    return out
+
+
+def _min_shared(length: int, ratio: float) -> int:
+    """Mindestzahl gemeinsamer Bigramme fuer einen String der Laenge ``length``."""
+    partner_total = 2 * length / (2 - ratio)  # n + m nach Laengenfilter
+    return max(1, math.ceil((1.5 * ratio - 1) * partner_total + 1 - 1e-9))
+
+
+def threshold_ratio(min_confidence: int) -> float:
+    """Kleinste Indel-Ratio (0-1), die nach Rundung ``min_confidence`` erreicht."""
+    return (min_confidence - 0.5) / 100
+
+
+def length_bounds(length: int, ratio: float) -> tuple[float, float]:
+    """Laengen (Token-String), mit denen Ratio >= ``ratio`` ueberhaupt moeglich ist."""
+    return (length * ratio / (2 - ratio) - 1e-9, length * (2 - ratio) / ratio + 1e-9)
+
+
+def prefix_grams(text: str, freq, ratio: float) -> list[tuple[str, int]]:
+    """Seltenste Bigramme von ``text``; jedes passende Paar teilt mindestens eines.
+
+    ``freq``: Haeufigkeit pro Bigramm-Vorkommen im Kandidatenbestand (Mapping
+    oder Funktion); sie legt die globale Ordnung fuer die Praefix-Filterung fest.
+    """
+    grams = bigrams(text)
+    lookup = freq if callable(freq) else (lambda g: freq.get(g, 0))
+    ordered = sorted(grams, key=lambda g: (lookup(g), g))
+    keep = len(ordered) - _min_shared(len(text), ratio) + 1
+    return ordered[:max(1, keep)]
+
+
+class CandidateIndex:
+    """Blocking-Index ueber Kandidaten-Labels (Offline-Liste oder Suchtreffer).
+
+    ``match(names)`` liefert pro Name die Kandidaten mit Level, bestes Ergebnis
+    zuerst; verglichen werden nur Paare aus gemeinsamen Bloecken, bewertet in
+    einem ``cpdist``-Aufruf fuer alle Namen. Die Postings liegen hier im
+    Speicher; ``_candidate_index.OfflineIndex`` liest sie aus SQLite (die
+    ``_``-Zugriffsmethoden unten).
+    """
+
+    def __init__(self, labels: Iterable[str],
+                 min_confidence: int = FUZZY_LOW_THRESHOLD):
+        self.labels = list(labels)
+        self.min_confidence = min_confidence
+        self._ratio = threshold_ratio(min_confidence)
+        self._exact = [exact_key(l) for l in self.labels]
+        self._norm = [normalize(l) for l in self.labels]
+        self._tokens_str = [token_string(n) for n in self._norm]
+
+        self._by_exact: dict[str, list[int]] = defaultdict(list)
+        self._by_token: dict[str, list[int]] = defaultdict(list)
+        self._by_gram: dict[tuple[str, int], list[int]] = defaultdict(list)
+        self._freq = Counter(g for t in self._tokens_str for g in bigrams(t))
+        for i, label in enumerate(self.labels):
+            self._by_exact[self._exact[i]].append(i)
+            for token in set(self._norm[i].split()):
+                self._by_token[token].append(i)
+            if self.blocking:
+                for gram in prefix_grams(self._tokens_str[i], self._freq, self._ratio):
+                    self._by_gram[gram].append(i)
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    @property
+    def blocking(self) -> bool:
+        return self.min_confidence >= BLOCKING_FLOOR
+
+    # -- Zugriff auf die Postings ------------------------------------------
+
+    def _all_ids(self) -> Iterable[int]:
+        return range(len(self.labels))
+
+    def _exact_ids(self, key: str) -> Iterable[int]:
+        return self._by_exact.get(key, ())
+
+    def _token_ids(self, token: str) -> Iterable[int]:
+        return self._by_token.get(token, ())
+
+    def _gram_ids(self, gram: tuple[str, int], low: float, high: float) -> Iterable[int]:
+        return (i for i in self._by_gram.get(gram, ())
+                if low <= len(self._tokens_str[i]) <= high)
+
+    def _gram_freq(self, gram: tuple[str, int]) -> int:
+        return self._freq.get(gram, 0)
+
+    def _entries(self, ids: list[int]) -> list[tuple[str, str]]:
+        """(normalisiert, exact_key) pro Kandidat."""
+        return [(self._norm[i], self._exact[i]) for i in ids]
+
+    # -- Blocking und Scoring ----------------------------------------------
+
+    def block(self, name: str) -> list[int]:
+        """Kandidaten, die mit ``name`` einen Block teilen (Label-Indizes)."""
+        if not self.blocking:
+            return list(self._all_ids())
+        norm = normalize(name)
+        found = set(self._exact_ids(exact_key(name)))
+        for token in set(norm.split()):
+            found.update(self._token_ids(token))
+        text = token_string(norm)
+        low, high = length_bounds(len(text), self._ratio)
+        for gram in prefix_grams(text, self._gram_freq, self._ratio):
+            found.update(self._gram_ids(gram, low, high))
+        return sorted(found)
+
+    def match(self, names: Sequence[str], min_confidence: int | None = None,
+              limit: int | None = None) -> list[list[tuple[int, str, int]]]:
+        """Pro Name: ``[(label_index, level, score), ...]`` ab ``min_confidence``.
+
+        Sortiert nach Score (exakt zuerst), bei Gleichstand in Label-Reihenfolge.
+        """
+        min_confidence = self.min_confidence if min_confidence is None else min_confidence
+        if min_confidence < self.min_confidence:
+            raise ValueError(f"Index fuer min_confidence >= {self.min_confidence} "
+                             f"gebaut, angefragt: {min_confidence}")
+        blocks = [self.block(name) for name in names]
+        entries = [self._entries(block) for block in blocks]
+        norms = [normalize(name) for name in names]
+        left = [norms[q] for q, block in enumerate(blocks) for _ in block]
+        right = [norm for rows in entries for norm, _ in rows]
+        scores = iter(score_pairs(left, right))
+
+        out = []
+        for name, block, rows in zip(names, blocks, entries):
+            key = exact_key(name)
+            hits = []
+            for i, (_, exact) in zip(block, rows):
+                level, score = classify(exact == key, next(scores), min_confidence)
+                if level:
+                    hits.append((i, level, score))
+            hits.sort(key=lambda h: (h[1] != 'exact', -h[2], h[0]))
+            out.append(hits[:limit] if limit else hits)
+        return out
@@ -0,0 +1,463 @@
+"""Indiziertes In-Memory-Modell von m3gim.jsonld (audit, report, scout, Tests).
+
+audit-data.py, report-quality.py, scout-coverage.py, tests/tools/snapshot_diff.py
+und die Fixtures in tests/conftest.py haben m3gim.jsonld jeweils selbst
+geladen und ``@graph`` pro Frage erneut mit ``node.get("@type") == ...``
+durchlaufen. ``Graph`` parst einmal und baut in einem Durchgang:
+
+- ``@type``       -> Knoten (``of_type``; Knoten mit mehreren Typen unter jedem)
+- ``@id``         -> Knoten (``get``)
+- ``rico:identifier`` -> Knoten (``by_identifier``, Records und RecordSets)
+- Praedikat      -> Knoten, die es nicht-leer tragen (``with_predicate``)
+- referenzierte ``@id`` -> (Knoten, Praedikat), auch aus verschachtelten
+  Werten (``referrers``); vorwaerts ``targets``.
+
+Damit sind Rueckwaertskanten direkt abfragbar: Record -> seine
+SpatiotemporalEvents (``referrers(record_id, "agrelon:metadataProvenance")``),
+Performance -> Record (``referrers(perf_id, "m3gim:hasPerformance")``).
+Die Listen gehoeren dem Index und duerfen nicht veraendert werden.
+
+``merkle`` liefert Inhalts-Hashes pro Knoten, gebuendelt zu einem Merkle-
+Baum pro Typ; darauf setzt der @id-basierte Diff in _graph_diff.py auf.
+
+``load_graph`` merkt sich pro Pfad das geparste Modell (solange Datei-
+groesse und mtime gleich bleiben), so dass mehrere Werkzeuge bzw. Fixtures
+im selben Prozess nur einmal parsen.
+
+``write_snapshot`` (von transform.py nach jedem Export aufgerufen) legt
+daneben ``m3gim.graph.bin`` ab: alle Knoten einzeln kompakt serialisiert
+mit Offset-Tabelle, dazu die fertigen Indizes. ``load_graph`` bildet die
+Datei per ``mmap`` ab, statt das JSON-LD zu parsen; Knoten werden erst beim
+Zugriff dekodiert, Indizes erst bei der ersten Abfrage. Der Schnappschuss
+traegt den SHA-256 des JSON-LD, aus dem er entstand; passt der nicht zur
+aktuellen Datei (JSON-LD neu geschrieben, Schnappschuss veraltet), wird
+normal geparst. Mehrere Prozesse (pytest-xdist-Worker, Skripte) teilen sich
+die Seiten des abgebildeten Schnappschusses ueber den Page-Cache.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+from collections.abc import Sequence
+from pathlib import Path
+
+RECORD = "rico:Record"
+RECORD_SET = "rico:RecordSet"
+PERFORMANCE = "m3gim:Performance"
+STAGE_ROLE = "m3gim:StageRole"
+STE = "m3gim:SpatiotemporalEvent"
+FONDS = "ric-rst:Fonds"
+
+SNAPSHOT_MAGIC = b"M3GIMGS\x02"
+_HEADER = struct.Struct("<8sI")     # Magic, Laenge des JSON-Kopfs
+
+MERKLE_BUCKETS = 16     # Buckets pro Typ (erste Hex-Stelle des @id-Hash)
+
+_EMPTY: tuple = ()
+_loaded: dict = {}
+
+
+def ensure_list(value) -> list:
+    """Wert immer als Liste (JSON-LD erlaubt Einzelwert oder Liste)."""
+    if value is None:
+        return []
+    return value if isinstance(value, list) else [value]
+
+
+def _types(node: dict) -> list:
+    return ensure_list(node.get("@type"))
+
+
+def _refs(value):
+    """Alle ``@id``-Werte in einem Property-Wert, rekursiv."""
+    if isinstance(value, dict):
+        ref = value.get("@id")
+        if isinstance(ref, str):
+            yield ref
+        for key, inner in value.items():
+            if key != "@id":
+                yield from _refs(inner)
+    elif isinstance(value, list):
+        for item in value:
+            yield from _refs(item)
+
+
+def _build_indexes(nodes) -> dict:
+    """Indizes ueber Knotenpositionen (JSON-serialisierbar fuer den Schnappschuss)."""
+    by_type: dict[str, list] = {}
+    by_id: dict[str, int] = {}
+    by_identifier: dict[str, int] = {}
+    by_predicate: dict[str, list] = {}
+    referrers: dict[str, list] = {}
+    targets: dict[str, list] = {}
+    for pos, node in enumerate(nodes):
+        for t in _types(node):
+            by_type.setdefault(t, []).append(pos)
+        node_id = node.get("@id")
+        if node_id is not None:
+            by_id.setdefault(node_id, pos)
+        identifier = node.get("rico:identifier")
+        if isinstance(identifier, str):
+            by_identifier.setdefault(identifier, pos)
+        out = []
+        for pred, value in node.items():
+            if pred.startswith("@") or value in (None, "", [], {}):
+                continue
+            by_predicate.setdefault(pred, []).append(pos)
+            for ref in _refs(value):
+                if ref != node_id:
+                    out.append((pred, ref))
+                    referrers.setdefault(ref, []).append((pos, pred))
+        if node_id is not None and out:
+            targets[node_id] = out
+    return {"types": by_type, "ids": by_id, "identifiers": by_identifier,
+            "predicates": by_predicate, "referrers": referrers, "targets": targets}
+
+
+class Graph:
+    """Top-Level-Knoten eines JSON-LD-Dokuments mit Indizes."""
+
+    def __init__(self, data: dict):
+        self._data = data
+        self.nodes = data.get("@graph", [])
+        self._indexes = _build_indexes(self.nodes)
+        self._load_index = None
+        self._meta = None
+        self._by_type_nodes: dict[str, list] = {}
+        self._merkle = None
+
+    @classmethod
+    def load(cls, path: Path | str) -> "Graph":
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    @classmethod
+    def _from_snapshot(cls, snapshot: "_Snapshot") -> "Graph":
+        graph = cls.__new__(cls)
+        graph._data = None
+        graph.nodes = snapshot.nodes
+        graph._indexes = {}
+        graph._load_index = snapshot.section
+        graph._meta = snapshot.section("meta")
+        graph._by_type_nodes = {}
+        graph._merkle = None
+        return graph
+
+    def _index(self, name: str) -> dict:
+        index = self._indexes.get(name)
+        if index is None:
+            index = self._indexes[name] = self._load_index(name)
+        return index
+
+    @property
+    def data(self) -> dict:
+        """Das ganze Dokument (beim Schnappschuss: alle Knoten dekodiert)."""
+        if self._data is None:
+            self._data = {key: list(self.nodes) if key == "@graph" else value
+                          for key, value in self._meta}
+        return self._data
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    # -- Lookups -------------------------------------------------------------
+
+    def of_type(self, node_type: str) -> list:
+        """Alle Knoten mit ``node_type`` in Dokumentreihenfolge (eigene Liste
+        pro Aufruf; der Cache bleibt unberuehrt, wenn der Aufrufer sie aendert)."""
+        found = self._by_type_nodes.get(node_type)
+        if found is None:
+            positions = self._index("types").get(node_type)
+            if positions is None:
+                return []
+            found = self._by_type_nodes[node_type] = [self.nodes[i] for i in positions]
+        return list(found)
+
+    def get(self, node_id: str, default=None):
+        pos = self._index("ids").get(node_id)
+        return default if pos is None else self.nodes[pos]
+
+    def node_ids(self) -> list:
+        """@ids in Dokumentreihenfolge, ohne Knoten zu dekodieren (Knoten ohne
+        @id fehlen, doppelte @ids stehen nur einmal)."""
+        ids = self._index("ids")
+        return sorted(ids, key=ids.__getitem__)
+
+    def __contains__(self, node_id: str) -> bool:
+        return node_id in self._index("ids")
+
+    def by_identifier(self, identifier: str):
+        """Knoten mit ``rico:identifier`` (Signatur), sonst None."""
+        pos = self._index("identifiers").get(identifier)
+        return None if pos is None else self.nodes[pos]
+
+    @property
+    def identifiers(self):
+        return self._index("identifiers").keys()
+
+    def with_predicate(self, predicate: str) -> list:
+        """Knoten, die ``predicate`` mit nicht-leerem Wert tragen."""
+        positions = self._index("predicates").get(predicate, _EMPTY)
+        return [self.nodes[i] for i in positions]
+
+    def referrers(self, node_id: str, predicate: str | None = None) -> list:
+        """Knoten, die ``node_id`` referenzieren (optional nur ueber ``predicate``)."""
+        pairs = self._index("referrers").get(node_id, _EMPTY)
+        if predicate is None:
+            # Ein Knoten kann dasselbe Ziel ueber mehrere Praedikate referenzieren
+            positions = dict.fromkeys(pos for pos, _ in pairs)
+        else:
+            positions = [pos for pos, p in pairs if p == predicate]
+        return [self.nodes[i] for i in positions]
+
+    def targets(self, node_id: str, predicate: str | None = None) -> list:
+        """Von ``node_id`` referenzierte ``@id``-Werte (optional nur ``predicate``)."""
+        pairs = self._index("targets").get(node_id, _EMPTY)
+        return [ref for p, ref in pairs if predicate is None or p == predicate]
+
+    def merkle(self) -> dict:
+        """Merkle-Baum der Knoten-Hashes (``merkle_tree``; beim Schnappschuss vorberechnet)."""
+        if self._merkle is None:
+            if self._load_index is not None:
+                self._merkle = self._load_index("merkle")
+            else:
+                self._merkle = merkle_tree(self.nodes)
+        return self._merkle
+
+    # -- Haeufige Teilmengen -------------------------------------------------
+
+    @property
+    def records(self) -> list:
+        return self.of_type(RECORD)
+
+    @property
+    def konvolute(self) -> list:
+        """Record-Sets ausser dem Fonds."""
+        return [n for n in self.of_type(RECORD_SET) if not _is_fonds(n)]
+
+    @property
+    def fonds(self):
+        for node in self.of_type(RECORD_SET):
+            if _is_fonds(node):
+                return node
+        return None
+
+
+# -- Inhalts-Hashes ------------------------------------------------------------
+#
+# Jeder Knoten bekommt einen Hash ueber seine kanonische Serialisierung
+# (sortierte Schluessel, kompakt). Darueber ein zweistufiger Merkle-Baum:
+# Typ (erster @type) -> Bucket (erste Hex-Stelle des Hash der @id) ->
+# {@id: Knoten-Hash}. Zwei Graphen mit gleicher Wurzel eines Typs/Buckets
+# sind dort identisch; _graph_diff.py steigt nur in abweichende Zweige ab.
+
+def node_hash(node: dict) -> str:
+    """Inhalts-Hash eines Knotens (unabhaengig von Schluesselreihenfolge)."""
+    canonical = json.dumps(node, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:32]
+
+
+def _combine(items) -> str:
+    """Hash ueber sortierte (Schluessel, Hash)-Paare."""
+    h = hashlib.sha256()
+    for key, value in sorted(items):
+        h.update(f"{key}\t{value}\n".encode("utf-8"))
+    return h.hexdigest()[:32]
+
+
+def node_key(node: dict, digest: str) -> str:
+    """Schluessel im Merkle-Baum: @id, bei Knoten ohne @id der Inhalts-Hash."""
+    node_id = node.get("@id")
+    return node_id if isinstance(node_id, str) else f"_:{digest}"
+
+
+def node_bucket(key: str) -> str:
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()[0]
+
+
+def merkle_tree(nodes) -> dict:
+    """``{typ: {"root", "buckets": {b: {"root", "nodes": {@id: hash}}}}}``."""
+    tree: dict = {}
+    for node in nodes:
+        digest = node_hash(node)
+        key = node_key(node, digest)
+        types = _types(node)
+        node_type = types[0] if types else ""
+        buckets = tree.setdefault(node_type, {"buckets": {}})["buckets"]
+        bucket = buckets.setdefault(node_bucket(key), {"nodes": {}})
+        bucket["nodes"].setdefault(key, digest)     # doppelte @id: erster gewinnt (wie get)
+    for entry in tree.values():
+        for bucket in entry["buckets"].values():
+            bucket["root"] = _combine(bucket["nodes"].items())
+        entry["root"] = _combine((b, v["root"]) for b, v in entry["buckets"].items())
+    return tree
+
+
+def tree_root(tree: dict) -> str:
+    """Wurzel ueber alle Typen."""
+    return _combine((t, v["root"]) for t, v in tree.items())
+
+
+def _is_fonds(node: dict) -> bool:
+    set_type = node.get("rico:hasRecordSetType")
+    return isinstance(set_type, dict) and set_type.get("@id") == FONDS
+
+
+# -- Binaerer Schnappschuss ---------------------------------------------------
+#
+# Aufbau: Magic + Kopflaenge, JSON-Kopf {"sha256", "count", "sections":
+# {name: [offset, laenge]}} (Offsets ab Kopfende), danach die Abschnitte. "offsets" ist ein
+# uint64-Array (count + 1 Eintraege, relativ zu "nodes"), "nodes" die
+# aneinandergehaengten Knoten als kompaktes JSON, "meta" die Top-Level-
+# Schluessel des Dokuments in Originalreihenfolge ("@graph" ohne Wert),
+# "merkle" der Baum aus ``merkle_tree``, die uebrigen Abschnitte sind die
+# Indizes aus ``_build_indexes``.
+
+def snapshot_path(jsonld_path: Path | str) -> Path:
+    """``m3gim.jsonld`` -> ``m3gim.graph.bin`` im selben Verzeichnis."""
+    path = Path(jsonld_path)
+    return path.with_name(path.stem + ".graph.bin")
+
+
+def _dumps(obj) -> bytes:
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def write_snapshot(jsonld_path: Path | str, out: Path | str | None = None) -> Path:
+    """Schnappschuss fuer ``jsonld_path`` schreiben (tmp + rename); liefert den Pfad."""
+    raw = Path(jsonld_path).read_bytes()
+    data = json.loads(raw)
+    nodes = data.get("@graph", [])
+
+    blobs = [_dumps(node) for node in nodes]
+    offsets = [0]
+    for blob in blobs:
+        offsets.append(offsets[-1] + len(blob))
+    sections = {
+        "offsets": struct.pack(f"<{len(offsets)}Q", *offsets),
+        "nodes": b"".join(blobs),
+        "meta": _dumps([[k, None if k == "@graph" else v] for k, v in data.items()]),
+    }
+    for name, index in _build_indexes(nodes).items():
+        sections[name] = _dumps(index)
+    sections["merkle"] = _dumps(merkle_tree(nodes))
+
+    table, pos = {}, 0
+    for name, blob in sections.items():
+        table[name] = [pos, len(blob)]
+        pos += len(blob)
+    header = _dumps({"sha256": hashlib.sha256(raw).hexdigest(),
+                     "count": len(nodes), "sections": table})
+
+    out = Path(out) if out is not None else snapshot_path(jsonld_path)
+    tmp = out.with_name(f"{out.name}.{os.getpid()}.tmp")
+    with open(tmp, "wb") as f:
+        f.write(_HEADER.pack(SNAPSHOT_MAGIC, len(header)))
+        f.write(header)
+        for blob in sections.values():
+            f.write(blob)
+    tmp.replace(out)
+    return out
+
+
+class _LazyNodes(Sequence):
+    """Knotenliste ueber dem abgebildeten Schnappschuss; dekodiert bei Zugriff.
+
+    Jeder Knoten wird hoechstens einmal dekodiert, wiederholte Zugriffe
+    liefern dasselbe Dict (wie bei einer normalen Liste).
+    """
+
+    _OFFSETS = struct.Struct("<QQ")
+
+    def __init__(self, buf, count: int, offsets: int, start: int):
+        self._buf = buf
+        self._offsets = offsets
+        self._start = start
+        self._decoded: list = [None] * count
+
+    def __len__(self) -> int:
+        return len(self._decoded)
+
+    def _decode(self, i: int) -> dict:
+        node = self._decoded[i]
+        if node is None:
+            a, b = self._OFFSETS.unpack_from(self._buf, self._offsets + 8 * i)
+            node = self._decoded[i] = json.loads(self._buf[self._start + a:self._start + b])
+        return node
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self._decode(j) for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        return self._decode(i)
+
+    def __iter__(self):
+        return (self._decode(i) for i in range(len(self)))
+
+
+class _Snapshot:
+    """Per ``mmap`` abgebildeter Schnappschuss (nur lesend)."""
+
+    def __init__(self, path: Path):
+        with open(path, "rb") as f:
+            self._buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, size = _HEADER.unpack_from(self._buf, 0)
+        if magic != SNAPSHOT_MAGIC:
+            raise ValueError(f"kein Graph-Schnappschuss: {path}")
+        header = json.loads(self._buf[_HEADER.size:_HEADER.size + size])
+        self._base = _HEADER.size + size
+        self.sha256 = header["sha256"]
+        self._sections = header["sections"]
+        self.nodes = _LazyNodes(self._buf, header["count"],
+                                self._base + self._sections["offsets"][0],
+                                self._base + self._sections["nodes"][0])
+
+    def section(self, name: str):
+        off, length = self._sections[name]
+        return json.loads(self._buf[self._base + off:self._base + off + length])
+
+
+def _from_snapshot(path: Path, raw: bytes) -> Graph | None:
+    """Graph aus dem Schnappschuss, falls vorhanden und zum Inhalt passend."""
+    snap = snapshot_path(path)
+    if not snap.exists():
+        return None
+    try:
+        snapshot = _Snapshot(snap)
+    except (ValueError, KeyError, struct.error):
+        return None
+    if snapshot.sha256 != hashlib.sha256(raw).hexdigest():
+        return None
+    return Graph._from_snapshot(snapshot)
+
+
+def snapshot_is_current(jsonld_path: Path | str) -> bool:
+    """Schnappschuss vorhanden, im aktuellen Format (SNAPSHOT_MAGIC) und zum
+    Inhalt von ``jsonld_path`` passend?"""
+    path = Path(jsonld_path)
+    return _from_snapshot(path, path.read_bytes()) is not None
+
+
+def load_graph(path: Path | str) -> Graph:
+    """``Graph`` fuer ``path``, pro Prozess nur einmal geparst (solange unveraendert).
+
+    Liegt ein passender Schnappschuss (``write_snapshot``) daneben, wird er
+    abgebildet statt das JSON-LD zu parsen.
+    """
+    path = Path(path).resolve()
+    stat = path.stat()
+    key = (stat.st_size, stat.st_mtime_ns)
+    cached = _loaded.get(path)
+    if cached is None or cached[0] != key:
+        raw = path.read_bytes()
+        graph = _from_snapshot(path, raw) or Graph(json.loads(raw))
+        cached = (key, graph)
+        _loaded[path] = cached
+    return cached[1]
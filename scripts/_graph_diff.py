@@ -0,0 +1,150 @@
+"""@id-basierter Struktur-Diff zweier Graph-Staende mit maschinenlesbarem Changeset.
+
+Grundlage ist der Merkle-Baum aus ``_graph.merkle_tree`` (Typ -> Bucket ->
+{@id: Inhalts-Hash}). ``diff_trees`` vergleicht zuerst die Wurzeln pro Typ
+und steigt nur in Typen und Buckets ab, deren Hash sich unterscheidet;
+unveraenderte Teilbaeume kosten einen Vergleich. Liegt fuer beide Staende
+ein Schnappschuss (``m3gim.graph.bin``) vor, ist der Baum dort vorberechnet
+und es werden nur die tatsaechlich geaenderten Knoten dekodiert.
+
+``diff_graphs`` liefert das Changeset als JSON-faehiges Dict::
+
+    {"format": "m3gim-changeset/1", "old_root", "new_root",
+     "added":    [{"@id", "@type", "hash"}],
+     "removed":  [{"@id", "@type", "hash"}],
+     "modified": [{"@id", "@type", "old_hash", "hash",
+                   "paths": [{"path": "/rico:title", "old", "new"}]}],
+     "types":    {typ: {"added", "removed", "modified"}},
+     "stats":    {...}}
+
+Pfade sind JSON-Pointer (RFC 6901) in den Knoten; ein fehlendes ``old``
+bzw. ``new`` heisst, die Property kam hinzu bzw. fiel weg. Listen gleicher
+Laenge werden elementweise verglichen, sonst als Ganzes gemeldet. Ein
+Knoten, dessen erster ``@type`` wechselt, gilt als geaendert
+(``old_type``), nicht als entfernt + neu.
+"""
+
+from __future__ import annotations
+
+from _graph import Graph, tree_root
+
+CHANGESET_FORMAT = "m3gim-changeset/1"
+
+_MISSING = object()
+
+
+def diff_trees(old: dict, new: dict) -> tuple[dict, dict, dict, dict]:
+    """(added, removed, changed, stats) zwischen zwei Merkle-Baeumen.
+
+    added/removed: @id -> (Typ, Hash); changed: @id -> (alter Typ, neuer Typ,
+    alter Hash, neuer Hash).
+    """
+    added: dict = {}
+    removed: dict = {}
+    changed: dict = {}
+    stats = {"types": 0, "types_skipped": 0, "buckets": 0, "buckets_skipped": 0}
+    for node_type in sorted(old.keys() | new.keys()):
+        stats["types"] += 1
+        old_entry, new_entry = old.get(node_type), new.get(node_type)
+        if old_entry and new_entry and old_entry["root"] == new_entry["root"]:
+            stats["types_skipped"] += 1
+            continue
+        old_buckets = old_entry["buckets"] if old_entry else {}
+        new_buckets = new_entry["buckets"] if new_entry else {}
+        for bucket in sorted(old_buckets.keys() | new_buckets.keys()):
+            old_bucket, new_bucket = old_buckets.get(bucket), new_buckets.get(bucket)
+            if old_bucket and new_bucket and old_bucket["root"] == new_bucket["root"]:
+                stats["buckets_skipped"] += 1
+                continue
+            stats["buckets"] += 1
+            old_nodes = old_bucket["nodes"] if old_bucket else {}
+            new_nodes = new_bucket["nodes"] if new_bucket else {}
+            for key, digest in new_nodes.items():
+                before = old_nodes.get(key)
+                if before is None:
+                    added[key] = (node_type, digest)
+                elif before != digest:
+                    changed[key] = (node_type, node_type, before, digest)
+            for key, digest in old_nodes.items():
+                if key not in new_nodes:
+                    removed[key] = (node_type, digest)
+    # Typwechsel: dieselbe @id verschwindet unter dem alten Typ und taucht
+    # unter dem neuen auf
+    for key in added.keys() & removed.keys():
+        new_type, new_hash = added.pop(key)
+        old_type, old_hash = removed.pop(key)
+        changed[key] = (old_type, new_type, old_hash, new_hash)
+    return added, removed, changed, stats
+
+
+def _pointer(path: str, key) -> str:
+    return f"{path}/{str(key).replace('~', '~0').replace('/', '~1')}"
+
+
+def property_changes(old, new, path: str = "") -> list[dict]:
+    """Geaenderte Pfade zwischen zwei Werten (JSON-Pointer, alter/neuer Wert)."""
+    if old is not _MISSING and new is not _MISSING and old == new:
+        return []
+    if isinstance(old, dict) and isinstance(new, dict):
+        changes = []
+        for key in list(old) + [k for k in new if k not in old]:
+            changes += property_changes(old.get(key, _MISSING), new.get(key, _MISSING),
+                                        _pointer(path, key))
+        return changes
+    if isinstance(old, list) and isinstance(new, list) and len(old) == len(new):
+        changes = []
+        for i, (a, b) in enumerate(zip(old, new)):
+            changes += property_changes(a, b, _pointer(path, i))
+        return changes
+    change = {"path": path or "/"}
+    if old is not _MISSING:
+        change["old"] = old
+    if new is not _MISSING:
+        change["new"] = new
+    return [change]
+
+
+def diff_graphs(old: Graph, new: Graph, paths: bool = True) -> dict:
+    """Changeset von ``old`` nach ``new`` (Format siehe Modul-Docstring).
+
+    ``paths=False`` laesst die Property-Pfade weg; dann wird kein Knoten
+    dekodiert, der Diff laeuft nur auf den Hashes.
+    """
+    old_tree, new_tree = old.merkle(), new.merkle()
+    added, removed, changed, stats = diff_trees(old_tree, new_tree)
+
+    types: dict = {}
+
+    def count(node_type: str, kind: str) -> None:
+        entry = types.setdefault(node_type, {"added": 0, "removed": 0, "modified": 0})
+        entry[kind] += 1
+
+    modified = []
+    for key in sorted(changed):
+        old_type, new_type, old_hash, new_hash = changed[key]
+        item = {"@id": key, "@type": new_type, "old_hash": old_hash, "hash": new_hash}
+        if old_type != new_type:
+            item["old_type"] = old_type
+        if paths:
+            item["paths"] = property_changes(old.get(key), new.get(key))
+        modified.append(item)
+        count(new_type, "modified")
+    for key, (node_type, _) in added.items():
+        count(node_type, "added")
+    for key, (node_type, _) in removed.items():
+        count(node_type, "removed")
+
+    return {
+        "format": CHANGESET_FORMAT,
+        "old_root": tree_root(old_tree),
+        "new_root": tree_root(new_tree),
+        "added": [{"@id": k, "@type": t, "hash": h} for k, (t, h) in sorted(added.items())],
+        "removed": [{"@id": k, "@type": t, "hash": h} for k, (t, h) in sorted(removed.items())],
+        "modified": modified,
+        "types": dict(sorted(types.items())),
+        "stats": stats,
+    }
+
+
+def is_empty(changeset: dict) -> bool:
+    return not (changeset["added"] or changeset["removed"] or changeset["modified"])
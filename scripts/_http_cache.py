@@ -0,0 +1,205 @@
+"""Persistenter Antwort-Cache fuer die Wikidata-Skripte (SQLite).
+
+reconcile.py, enrich-wikidata.py und verify-manual-approvals.py fragen
+ueberwiegend dieselben Suchen und Entitaeten ab wie im vorigen Lauf. Der
+Cache legt jede erfolgreiche API-Antwort unter ihrer normalisierten URL ab
+(Query-Parameter sortiert, ``maxlag`` ignoriert) und wird von
+``_wikidata_client.WikidataClient`` vor jeder Anfrage befragt:
+
+- **frisch** (juenger als die TTL des Endpunkts, s. ``TTLS``): Antwort direkt
+  aus dem Cache, kein Netz.
+- **abgelaufen**: bedingte Anfrage (``If-None-Match``/``If-Modified-Since``,
+  falls der Server ETag/Last-Modified geliefert hat); ``304`` erneuert nur
+  den Zeitstempel, ``200`` ersetzt den Eintrag.
+- **offline** (``M3GIM_HTTP_CACHE=offline`` bzw. ``--offline``): nur Cache,
+  auch abgelaufene Eintraege; ein Fehltreffer bricht mit ``CacheMiss`` ab,
+  statt still als "kein Treffer" weiterzulaufen. Damit laufen CI und Tests
+  den kompletten Pfad ohne Netz (Replay).
+- **refresh** (``--force``): alles, was vor diesem Lauf geholt wurde, gilt
+  als abgelaufen.
+
+Ablage: ``$M3GIM_CACHE_DIR/http/wikidata.sqlite`` (Default
+``data/output/.cache/http/``, nicht versioniert). ``M3GIM_HTTP_CACHE=0``
+schaltet den Cache ab.
+"""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import NamedTuple
+from urllib.parse import urlencode, urlsplit
+
+BASE_DIR = Path(__file__).parent.parent
+CACHE_PATH = Path(os.environ.get(
+    "M3GIM_CACHE_DIR", BASE_DIR / "data" / "output" / ".cache")) / "http" / "wikidata.sqlite"
+
+DAY = 86400
+# TTL pro Endpunkt (API-``action``) in Sekunden
+TTLS = {
+    "wbsearchentities": 7 * DAY,   # Suchindex aendert sich langsam
+    "wbgetentities": 1 * DAY,      # Claims/Labels werden laufend editiert
+}
+DEFAULT_TTL = 1 * DAY
+
+# Parameter, die die Antwort nicht veraendern und nicht in den Schluessel gehen
+VOLATILE_PARAMS = {"maxlag"}
+
+MODES = ("on", "off", "offline", "refresh")
+
+
+class CacheMiss(RuntimeError):
+    """Offline-Modus: Anfrage ist nicht im Cache."""
+
+
+class Entry(NamedTuple):
+    body: bytes
+    etag: str | None
+    last_modified: str | None
+    fetched: float
+    endpoint: str | None
+
+
+def cache_key(api_url: str, params: dict) -> str:
+    """Normalisierte URL: Host + Pfad + sortierte Parameter ohne VOLATILE_PARAMS."""
+    parts = urlsplit(api_url)
+    query = sorted((k, str(v)) for k, v in params.items() if k not in VOLATILE_PARAMS)
+    return f"{parts.netloc}{parts.path}?{urlencode(query)}"
+
+
+def cache_mode() -> str:
+    """Modus aus ``M3GIM_HTTP_CACHE`` (``1``/``on``, ``0``/``off``, ``offline``, ``refresh``)."""
+    value = os.environ.get("M3GIM_HTTP_CACHE", "on").strip().lower()
+    value = {"1": "on", "0": "off", "": "on"}.get(value, value)
+    if value not in MODES:
+        raise ValueError(f"M3GIM_HTTP_CACHE={value!r}: erlaubt sind {', '.join(MODES)}")
+    return value
+
+
+class SqliteCache:
+    """Gemeinsamer Kern der SQLite-Caches (``ResponseCache``,
+    ``_label_store.LabelStore``): Modus, Verbindung und Frische-Regeln.
+
+    Thread-sicher (eine Verbindung, ein Lock); die Worker des Clients teilen
+    sich eine Instanz. Unterklassen setzen ``TABLE``/``SCHEMA`` (CREATE TABLE)
+    und ``STATS`` und liefern ihren Default-Pfad ueber ``default_path()``.
+    """
+
+    TABLE = ""
+    SCHEMA = ""
+    STATS: tuple = ()
+
+    def __init__(self, path: Path | str, mode: str = "on", clock=time.time):
+        if mode not in MODES or mode == "off":
+            raise ValueError(f"ungueltiger Cache-Modus: {mode!r}")
+        self.path = Path(path)
+        self.mode = mode
+        self._clock = clock
+        self._started = clock()
+        self._lock = threading.Lock()
+        self.stats = dict.fromkeys(self.STATS, 0)
+        if str(self.path) != ":memory:":
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(self.path), check_same_thread=False,
+                                   isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(self.SCHEMA)
+
+    @classmethod
+    def default_path(cls) -> Path:
+        raise NotImplementedError
+
+    @classmethod
+    def from_env(cls, offline: bool = False, refresh: bool = False):
+        """Cache gemaess ``M3GIM_HTTP_CACHE``; None = aus.
+
+        ``offline`` (CLI ``--offline``) erzwingt den Replay-Modus, ``refresh``
+        (CLI ``--force``) revalidiert alles, sofern der Cache nicht aus ist.
+        """
+        mode = cache_mode()
+        if offline:
+            mode = "offline"
+        elif mode == "off":
+            return None
+        elif refresh:
+            mode = "refresh"
+        return cls(cls.default_path(), mode=mode)
+
+    @property
+    def offline(self) -> bool:
+        return self.mode == "offline"
+
+    def fresh(self, fetched: float, max_age: float) -> bool:
+        """``refresh``: nur in diesem Lauf Geholtes; ``offline``: alles;
+        sonst juenger als ``max_age`` Sekunden."""
+        if self.mode == "refresh":
+            return fetched >= self._started
+        if self.mode == "offline":
+            return True
+        return self._clock() - fetched < max_age
+
+    def count(self, key: str) -> None:
+        with self._lock:
+            self.stats[key] += 1
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute(f"SELECT COUNT(*) FROM {self.TABLE}").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+class ResponseCache(SqliteCache):
+    """SQLite-Tabelle normalisierte URL -> Antwort-Body + Validatoren."""
+
+    TABLE = "responses"
+    SCHEMA = ("CREATE TABLE IF NOT EXISTS responses ("
+              " key TEXT PRIMARY KEY, endpoint TEXT, body BLOB NOT NULL,"
+              " etag TEXT, last_modified TEXT, fetched REAL NOT NULL)")
+    STATS = ("hits", "misses", "revalidated", "stored")
+
+    def __init__(self, path: Path | str = CACHE_PATH, mode: str = "on",
+                 ttls: dict | None = None, default_ttl: float = DEFAULT_TTL,
+                 clock=time.time):
+        self.ttls = dict(TTLS if ttls is None else ttls)
+        self.default_ttl = default_ttl
+        super().__init__(path, mode=mode, clock=clock)
+
+    @classmethod
+    def default_path(cls) -> Path:
+        return CACHE_PATH
+
+    def ttl(self, endpoint: str | None) -> float:
+        return self.ttls.get(endpoint, self.default_ttl)
+
+    def lookup(self, key: str) -> Entry | None:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT body, etag, last_modified, fetched, endpoint"
+                " FROM responses WHERE key = ?", (key,)).fetchone()
+        return Entry(*row) if row else None
+
+    def is_fresh(self, entry: Entry) -> bool:
+        return self.fresh(entry.fetched, self.ttl(entry.endpoint))
+
+    def store(self, key: str, endpoint: str | None, body: bytes,
+              etag: str | None = None, last_modified: str | None = None) -> None:
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses"
+                " (key, endpoint, body, etag, last_modified, fetched)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (key, endpoint, body, etag, last_modified, self._clock()))
+            self.stats["stored"] += 1
+
+    def touch(self, key: str) -> None:
+        """Nach ``304 Not Modified``: Eintrag gilt wieder als frisch."""
+        with self._lock:
+            self._db.execute("UPDATE responses SET fetched = ? WHERE key = ?",
+                             (self._clock(), key))
+            self.stats["revalidated"] += 1
@@ -0,0 +1,89 @@
+"""Append-only Fortschrittsjournal (JSONL) fuer lange Laeufe.
+
+reconcile.py schreibt seine Ergebnisse sonst erst am Ende; ein Netzfehler
+oder Strg+C nach der Haelfte des Personenindex verwirft alles, was seit dem
+letzten vollstaendigen Lauf abgefragt wurde. Das Journal haelt jedes
+aufgeloeste Ergebnis als eine JSON-Zeile fest (``append`` schreibt eine
+Gruppe und ``fsync``-t sie), ein abgebrochener Lauf setzt beim naechsten
+Aufruf dort fort.
+
+Die erste Zeile ist ein Kopf mit den Laufparametern, von denen die
+Ergebnisse abhaengen (z.B. ``min_confidence``). Passt er nicht zum neuen
+Lauf, wird das Journal verworfen statt fremde Ergebnisse zu uebernehmen.
+Eine beim Absturz halb geschriebene letzte Zeile wird beim Oeffnen
+abgeschnitten.
+
+``write_json_atomic`` schreibt den (Zwischen-)Stand der eigentlichen
+Ausgabe ueber eine temporaere Datei, damit dort nie ein halbes JSON steht.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+
+
+def write_json_atomic(path: Path, data) -> None:
+    """``data`` als JSON nach ``path`` (tmp + fsync + rename)."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    tmp.replace(path)
+
+
+class Journal:
+    """JSONL-Datei: Kopfzeile ``{"journal": header}``, danach ein Datensatz pro Zeile.
+
+    ``records`` enthaelt nach dem Oeffnen die Datensaetze eines frueheren
+    (abgebrochenen) Laufs mit gleichem Kopf, sonst ``[]``.
+    """
+
+    def __init__(self, path: Path, header: dict):
+        self.path = Path(path)
+        self.header = header
+        self.records, self.discarded = self._read()
+        # Sauber neu schreiben: Kopf + gueltige Zeilen, ohne angerissene Reste
+        lines = [{"journal": header}] + self.records
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.writelines(json.dumps(r, ensure_ascii=False) + "\n" for r in lines)
+        tmp.replace(self.path)
+        self._file = open(self.path, "a", encoding="utf-8")
+
+    def _read(self) -> tuple[list, bool]:
+        """(Datensaetze, verworfen?) aus einer vorhandenen Datei."""
+        try:
+            text = self.path.read_text(encoding="utf-8")
+        except FileNotFoundError:
+            return [], False
+        records = []
+        for line in text.splitlines():
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                break  # angerissene Zeile (Absturz beim Schreiben)
+        if not records or records[0] != {"journal": self.header}:
+            return [], bool(records)
+        return records[1:], False
+
+    def append(self, records: list) -> None:
+        """Datensaetze anhaengen und auf die Platte zwingen."""
+        if not records:
+            return
+        self._file.writelines(json.dumps(r, ensure_ascii=False) + "\n" for r in records)
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self) -> None:
+        if not self._file.closed:
+            self._file.close()
+
+    def discard(self) -> None:
+        """Lauf abgeschlossen: Journal loeschen."""
+        self.close()
+        self.path.unlink(missing_ok=True)
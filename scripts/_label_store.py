@@ -0,0 +1,100 @@
+"""Persistenter Label-Cache fuer Wikidata-QIDs (SQLite).
+
+enrich-wikidata.py loest bei jedem Lauf die Labels aller referenzierten
+QIDs auf (Beruf, Staat, Genre, Geburtsort, ...) — einige hundert, die sich
+fast nie aendern ("Opernsänger", "Österreich"). Der Label-Cache haelt pro
+QID das de- und en-Label mit Abrufzeitpunkt; solange ein Eintrag juenger
+als ``LABEL_TTL`` ist, kostet er keine Anfrage. verify-manual-approvals.py
+traegt die Labels der geprueften Entitaeten ebenfalls ein.
+
+Anders als ``_http_cache.ResponseCache`` (ganze Antworten pro URL, also pro
+Batch-Zusammensetzung) ist der Schluessel hier die einzelne QID: ein Label
+aus einer 50er-Batch trifft auch, wenn es im naechsten Lauf in einer ganz
+anderen Batch steht.
+
+Modi wie beim HTTP-Cache (``M3GIM_HTTP_CACHE``): ``offline`` liefert auch
+abgelaufene Eintraege, ``refresh`` (``--force``) behandelt alles vor dem
+Lauf Geholte als abgelaufen, ``off`` schaltet den Cache ab.
+
+Ablage: ``$M3GIM_CACHE_DIR/wikidata/labels.sqlite`` (nicht versioniert).
+"""
+
+from __future__ import annotations
+
+import os
+import time
+from pathlib import Path
+
+from _http_cache import DAY, SqliteCache
+
+BASE_DIR = Path(__file__).parent.parent
+LABEL_PATH = Path(os.environ.get(
+    "M3GIM_CACHE_DIR", BASE_DIR / "data" / "output" / ".cache")) / "wikidata" / "labels.sqlite"
+
+LABEL_TTL = 30 * DAY    # Labels von Berufen/Orten/Staaten aendern sich selten
+LANGUAGES = ("de", "en")
+
+
+def entity_labels(entity: dict) -> tuple[str | None, str | None]:
+    """(de, en)-Label einer ``wbgetentities``-Entitaet (fehlende als None)."""
+    labels = entity.get("labels", {})
+    return tuple((labels.get(lang) or {}).get("value") for lang in LANGUAGES)
+
+
+class LabelStore(SqliteCache):
+    """SQLite-Tabelle QID -> de/en-Label + Abrufzeitpunkt.
+
+    Modus, Verbindung und Frische-Regeln aus ``_http_cache.SqliteCache``;
+    die Worker des Clients tragen Ergebnisse direkt ein.
+    """
+
+    TABLE = "labels"
+    SCHEMA = ("CREATE TABLE IF NOT EXISTS labels ("
+              " qid TEXT PRIMARY KEY, de TEXT, en TEXT, fetched REAL NOT NULL)")
+    STATS = ("hits", "misses", "stored")
+
+    def __init__(self, path: Path | str = LABEL_PATH, mode: str = "on",
+                 max_age: float = LABEL_TTL, clock=time.time):
+        self.max_age = max_age
+        super().__init__(path, mode=mode, clock=clock)
+
+    @classmethod
+    def default_path(cls) -> Path:
+        return LABEL_PATH
+
+    def lookup(self, qids) -> dict:
+        """Frische Eintraege fuer ``qids``: QID -> (de, en). Fehlende/abgelaufene fehlen."""
+        qids = list(dict.fromkeys(qids))
+        rows = []
+        with self._lock:
+            # SQLite begrenzt die Zahl der Parameter pro Statement
+            for i in range(0, len(qids), 500):
+                chunk = qids[i:i + 500]
+                rows += self._db.execute(
+                    f"SELECT qid, de, en, fetched FROM labels WHERE qid IN "
+                    f"({','.join('?' * len(chunk))})", chunk).fetchall()
+            found = {qid: (de, en) for qid, de, en, fetched in rows if self.fresh(fetched, self.max_age)}
+            self.stats["hits"] += len(found)
+            self.stats["misses"] += len(qids) - len(found)
+        return found
+
+    def labels(self, qids) -> dict:
+        """Frische Eintraege als Anzeige-Label: QID -> de, sonst en, sonst QID."""
+        return {qid: de or en or qid for qid, (de, en) in self.lookup(qids).items()}
+
+    def store(self, labels: dict) -> None:
+        """QID -> (de, en) eintragen (Zeitstempel: jetzt)."""
+        now = self._clock()
+        with self._lock:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO labels (qid, de, en, fetched) VALUES (?, ?, ?, ?)",
+                [(qid, de, en, now) for qid, (de, en) in labels.items()])
+            self.stats["stored"] += len(labels)
+
+    def store_entities(self, entities: dict) -> None:
+        """Labels aus einer ``wbgetentities``-Antwort (``entities``) eintragen.
+
+        Auch QIDs ohne de/en-Label (oder geloeschte) werden vermerkt, damit
+        sie nicht bei jedem Lauf erneut angefragt werden.
+        """
+        self.store({qid: entity_labels(entity) for qid, entity in entities.items()})
@@ -0,0 +1,101 @@
+"""Mehrfach-Mustersuche fuer Titel (Komponist, Werk, Person, Ort, ...).
+
+Die Klassifikationen in build-views.py pruefen Titel gegen mehrere
+Schluesselwort-Tabellen (``KOMPONISTEN_MAPPING``, ``PERSONEN_KATEGORIEN``,
+Werk-/Rollen-/Ortsmuster). Statt pro Tabelle jeden Schluessel einzeln per
+``in`` zu testen (Aufwand Titel x Muster), findet ``MultiPatternMatcher`` alle
+Schluessel aller Tabellen in einem Durchlauf pro Titel; die Tabellen werten
+danach nur noch die (wenigen) Treffer aus.
+
+Technik: Die Schluessel werden zu einem Trie gefaltet und als eine Regex
+kompiliert (``wa(?:gner|lküre)`` statt ``wagner|walküre``), die in einem
+Lookahead an jeder Titelposition den laengsten Schluessel findet. Kuerzere
+Schluessel, die an derselben Position beginnen, sind genau dessen Praefixe
+und werden aus einer vorberechneten Tabelle ergaenzt. Ergebnis: exakt die
+Menge der Schluessel ``k`` mit ``k in text`` — dieselbe Semantik wie die
+bisherigen Einzeltests, ueberlappende Treffer eingeschlossen.
+
+``PatternTable`` bildet die Auswertung der alten Schleifen nach: ``first()``
+= erster Schluessel in Tabellenreihenfolge (``for k, v in d.items(): if k in
+t: return v``), ``all()`` = alle Treffer in Tabellenreihenfolge.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Iterable
+
+
+def _trie_regex(keys: Iterable[str]) -> str:
+    """Regex-Quelltext eines Tries ueber ``keys`` (laengster Treffer zuerst)."""
+    trie: dict = {}
+    for key in keys:
+        node = trie
+        for ch in key:
+            node = node.setdefault(ch, {})
+        node[""] = {}  # Endmarke
+
+    def emit(node: dict) -> str:
+        terminal = "" in node
+        branches = [re.escape(ch) + emit(child)
+                    for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if terminal:
+            # Greedy optional: erst weiter im Trie (laengerer Schluessel),
+            # sonst hier enden.
+            body = ("(?:" + body + ")?") if len(branches) == 1 else body + "?"
+        return body
+
+    return emit(trie)
+
+
+class MultiPatternMatcher:
+    """Findet alle Schluessel, die als Teilstring in einem Text vorkommen."""
+
+    def __init__(self, patterns: Iterable[str]):
+        keys = sorted({p for p in patterns if p})
+        self.patterns = frozenset(keys)
+        self._regex = re.compile("(?=(" + _trie_regex(keys) + "))") if keys else None
+        # Schluessel -> alle Schluessel, die Praefix davon sind (inkl. selbst)
+        self._prefixes = {k: tuple(p for p in keys if k.startswith(p)) for k in keys}
+
+    def findall(self, text: str) -> frozenset[str]:
+        """Menge aller Schluessel ``k`` mit ``k in text``."""
+        if not text or self._regex is None:
+            return frozenset()
+        found = self._regex.findall(text)
+        if not found:
+            return frozenset()
+        prefixes = self._prefixes
+        return frozenset(k for key in found for k in prefixes[key])
+
+
+class PatternTable:
+    """Geordnete Tabelle Schluessel -> Wert, ausgewertet gegen Matcher-Treffer."""
+
+    def __init__(self, mapping: dict):
+        self.mapping = dict(mapping)
+        self._rank = {key: pos for pos, key in enumerate(self.mapping)}
+
+    def keys(self):
+        return self.mapping.keys()
+
+    def _ordered(self, hits: Iterable[str]) -> list[str]:
+        rank = self._rank
+        return sorted((k for k in hits if k in rank), key=rank.__getitem__)
+
+    def first(self, hits: Iterable[str]):
+        """Wert des ersten getroffenen Schluessels in Tabellenreihenfolge."""
+        best = None
+        rank = self._rank
+        for key in hits:
+            pos = rank.get(key)
+            if pos is not None and (best is None or pos < rank[best]):
+                best = key
+        return None if best is None else self.mapping[best]
+
+    def all(self, hits: Iterable[str]) -> list[tuple[str, object]]:
+        """Alle getroffenen (Schluessel, Wert) in Tabellenreihenfolge."""
+        return [(key, self.mapping[key]) for key in self._ordered(hits)]
@@ -0,0 +1,162 @@
+"""Opt-in Stage-Tracing fuer die Pipeline-Scripts.
+
+Misst pro Stage Wall-Zeit, CPU-Zeit (Prozess) und Peak-Allokation
+(tracemalloc) und schreibt das Ergebnis als Chrome-Trace-JSON
+(``chrome://tracing``, https://ui.perfetto.dev) plus eine kurze Tabelle auf
+stdout. Gedacht, um Regressionen nach Layout-Aenderungen der Sheets einer
+Stage zuordnen zu koennen.
+
+Verwendung::
+
+    tracer = Tracer(enabled=args.trace is not None)
+    with tracer.stage("load_index"):
+        ...
+    tracer.write(path)
+    tracer.print_summary()
+
+Ohne ``enabled`` ist ``stage()`` ein No-op (kein tracemalloc, kein Overhead).
+Stages duerfen geschachtelt werden; der Peak einer aeusseren Stage umfasst
+die inneren. tracemalloc verlangsamt allokationslastigen Code spuerbar (das
+XLSX-Parsen um ein Mehrfaches) — fuer belastbare Zeiten ``memory=False``,
+dann fehlen die Peak-Werte.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+
+
+class Tracer:
+    """Sammelt Stage-Messungen eines Laufs."""
+
+    def __init__(self, enabled: bool = False, process_name: str = "m3gim",
+                 memory: bool = True):
+        self.enabled = enabled
+        self.memory = enabled and memory
+        self.process_name = process_name
+        self.stages: list[dict] = []
+        # Pro offener Stage der hoechste Peak, den Resets innerer Stages
+        # aus tracemalloc geloescht haben.
+        self._carry: list[int] = []
+        self._t0 = time.perf_counter()
+        self._started_tracemalloc = False
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+
+    def stage(self, name: str, **args):
+        """Context-Manager fuer eine Stage; ``args`` landen im Trace-Event."""
+        if not self.enabled:
+            return nullcontext()
+        return self._measure(name, args)
+
+    @contextmanager
+    def _measure(self, name: str, args: dict):
+        # tracemalloc kennt nur einen globalen Peak. Vor dem Reset fuer diese
+        # Stage den bisherigen Peak der umgebenden Stage in deren carry sichern.
+        if self.memory:
+            if self._carry:
+                self._carry[-1] = max(self._carry[-1],
+                                      tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+            mem_start, _ = tracemalloc.get_traced_memory()
+        depth = len(self._carry)
+        self._carry.append(0)
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - wall_start
+            cpu = time.process_time() - cpu_start
+            carry = self._carry.pop()
+            peak_bytes = net_bytes = None
+            if self.memory:
+                mem_end, peak = tracemalloc.get_traced_memory()
+                peak = max(peak, carry)
+                if self._carry:
+                    self._carry[-1] = max(self._carry[-1], peak)
+                # Peak relativ zum Stand bei Eintritt = zusaetzlicher Speicher
+                peak_bytes = max(0, peak - mem_start)
+                net_bytes = mem_end - mem_start
+            self.stages.append({
+                "name": name,
+                "depth": depth,
+                "start": wall_start - self._t0,
+                "wall": wall,
+                "cpu": cpu,
+                "peak_bytes": peak_bytes,
+                "net_bytes": net_bytes,
+                "args": args,
+            })
+
+    def stop(self) -> None:
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    # ------------------------------------------------------------------
+    # Ausgabe
+    # ------------------------------------------------------------------
+
+    def chrome_trace(self) -> dict:
+        """Trace-Event-Format (Complete Events, ``ph: "X"``, Mikrosekunden)."""
+        pid = os.getpid()
+        tid = threading.get_ident() % 2**31
+        events = [{"name": "process_name", "ph": "M", "pid": pid, "tid": tid,
+                   "args": {"name": self.process_name}}]
+        for st in sorted(self.stages, key=lambda s: (s["start"], s["depth"])):
+            args = {"cpu_ms": round(st["cpu"] * 1e3, 3)}
+            if st["peak_bytes"] is not None:
+                args["peak_kb"] = round(st["peak_bytes"] / 1024, 1)
+                args["net_kb"] = round(st["net_bytes"] / 1024, 1)
+            events.append({
+                "name": st["name"],
+                "cat": "stage",
+                "ph": "X",
+                "ts": round(st["start"] * 1e6, 1),
+                "dur": round(st["wall"] * 1e6, 1),
+                "pid": pid,
+                "tid": tid,
+                "args": {**args, **st["args"]},
+            })
+            if st["peak_bytes"] is None:
+                continue
+            # Counter-Track: Perfetto zeigt den Peak als Verlauf ueber die Stages
+            events.append({"name": "peak_alloc_kb", "ph": "C", "pid": pid,
+                           "ts": round(st["start"] * 1e6, 1),
+                           "args": {"peak_kb": round(st["peak_bytes"] / 1024, 1)}})
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write(self, path: Path) -> Path:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.chrome_trace(), f, ensure_ascii=False, indent=1)
+        return path
+
+    def summary_lines(self) -> list[str]:
+        """Eine Zeile pro Stage (Ausfuehrungsreihenfolge, eingerueckt nach Tiefe)."""
+        rows = sorted(self.stages, key=lambda s: (s["start"], s["depth"]))
+        width = max([len(s["name"]) + 2 * s["depth"] for s in rows] + [5])
+        lines = [f"  {'Stage':<{width}}  {'Wall':>8}  {'CPU':>8}  {'Peak':>10}"]
+        for st in rows:
+            label = "  " * st["depth"] + st["name"]
+            peak = ("-" if st["peak_bytes"] is None
+                    else f"{st['peak_bytes'] / 2**20:.1f} MB")
+            lines.append(f"  {label:<{width}}  {st['wall']:>7.3f}s  {st['cpu']:>7.3f}s"
+                         f"  {peak:>10}")
+        return lines
+
+    def print_summary(self) -> None:
+        if not self.stages:
+            return
+        print("\nTrace:")
+        for line in self.summary_lines():
+            print(line)
@@ -0,0 +1,320 @@
+"""Gemeinsamer Wikidata-API-Client (reconcile.py, spaeter enrich/verify).
+
+Die Wikidata-Skripte sind latenzgebunden: pro Index-Zeile eine Suche plus
+ein paar ``wbgetentities``-Abfragen, jede bisher mit frischer
+``urlopen``-Verbindung und festem ``time.sleep`` dazwischen. Der Client
+buendelt drei Dinge:
+
+- **Rate-Limit**: ein Token-Bucket (``TokenBucket``), den alle Worker teilen.
+  Die Rate gilt fuer den ganzen Lauf, nicht pro Thread.
+- **Keep-Alive**: eine persistente ``http.client``-Verbindung pro Worker-
+  Thread statt TCP/TLS-Handshake pro Anfrage.
+- **Retry**: 429/5xx, Verbindungsfehler und ``maxlag``-Antworten werden mit
+  Backoff wiederholt; ``Retry-After`` (bzw. der gemeldete Lag) hat Vorrang
+  und pausiert den gemeinsamen Bucket, damit nicht alle Worker gleichzeitig
+  weiterfeuern.
+
+``WikidataClient.map`` verteilt Arbeit auf einen begrenzten Thread-Pool und
+liefert die Ergebnisse in Eingabereihenfolge (deterministische Ausgabe).
+``WikidataClient.submit`` startet einzelne Aufgaben im gemeinsamen Pool des
+Clients, z.B. Folgeanfragen, die erst waehrend eines Laufs entstehen.
+
+Der API-Endpunkt laesst sich per ``M3GIM_WIKIDATA_API`` umlenken, z.B. auf
+einen lokalen Stand-in-Server fuer Tests und Benchmarks. Mit ``cache=``
+(``_http_cache.ResponseCache``) werden Antworten persistent gecacht und
+bedingt revalidiert; im Offline-Modus kommt alles aus dem Cache.
+"""
+
+from __future__ import annotations
+
+import http.client
+import json
+import os
+import random
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from email.utils import parsedate_to_datetime
+from typing import Callable, Iterable, Iterator
+from urllib.parse import urlencode, urlsplit
+
+from _http_cache import CacheMiss, ResponseCache, cache_key
+
+WIKIDATA_API = os.environ.get("M3GIM_WIKIDATA_API",
+                              "https://www.wikidata.org/w/api.php")
+DEFAULT_USER_AGENT = "M3GIM-Pipeline/1.0 (DH research project; mailto:pollin@dhcraft.org)"
+
+DEFAULT_RATE = 4.0      # Anfragen pro Sekunde (alle Worker zusammen)
+DEFAULT_WORKERS = 4     # parallele Worker-Threads
+DEFAULT_MAXLAG = 5      # Sekunden Replikations-Lag, ab dem Wikidata ablehnt
+MAX_RETRIES = 4
+MAX_WAIT = 120.0        # Obergrenze fuer Retry-After/Backoff (Sekunden)
+
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+
+class WikidataError(Exception):
+    """API-Anfrage endgueltig fehlgeschlagen (nach allen Retries)."""
+
+
+class TokenBucket:
+    """Thread-sicherer Token-Bucket: ``rate`` Tokens/s, bis zu ``burst`` auf Vorrat."""
+
+    def __init__(self, rate: float, burst: float = 1.0,
+                 clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep):
+        if rate <= 0:
+            raise ValueError("rate muss > 0 sein")
+        self.rate = float(rate)
+        self.burst = max(1.0, float(burst))
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = self.burst
+        self._stamp = clock()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Blockiert, bis ein Token frei ist (und keine Pause laeuft)."""
+        while True:
+            with self._lock:
+                now = self._clock()
+                self._tokens = min(self.burst,
+                                   self._tokens + (now - self._stamp) * self.rate)
+                self._stamp = now
+                if now < self._blocked_until:
+                    wait = self._blocked_until - now
+                elif self._tokens >= 1.0 - 1e-9:  # Float-Rundung beim Nachfuellen
+                    self._tokens = max(0.0, self._tokens - 1.0)
+                    return
+                else:
+                    wait = (1.0 - self._tokens) / self.rate
+            self._sleep(wait)
+
+    def pause(self, seconds: float) -> None:
+        """Alle Worker fuer ``seconds`` anhalten (Retry-After, maxlag)."""
+        with self._lock:
+            until = self._clock() + seconds
+            if until > self._blocked_until:
+                self._blocked_until = until
+                self._tokens = 0.0
+
+
+def _retry_after(value: str | None) -> float | None:
+    """``Retry-After`` als Sekunden (Zahl oder HTTP-Datum), sonst None."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class WikidataClient:
+    """Rate-limitierter, wiederholender Client fuer die Wikidata Action API."""
+
+    def __init__(self, api_url: str | None = None,
+                 user_agent: str = DEFAULT_USER_AGENT,
+                 rate: float = DEFAULT_RATE, burst: float | None = None,
+                 workers: int = DEFAULT_WORKERS, timeout: float = 30,
+                 max_retries: int = MAX_RETRIES,
+                 maxlag: int | None = DEFAULT_MAXLAG,
+                 backoff: float = 1.0,
+                 cache: ResponseCache | None = None):
+        self.api_url = api_url or WIKIDATA_API
+        parts = urlsplit(self.api_url)
+        self._scheme = parts.scheme
+        self._host = parts.netloc
+        self._path = parts.path or "/"
+        self.user_agent = user_agent
+        self.workers = max(1, workers)
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.maxlag = maxlag
+        self.backoff = backoff
+        self.cache = cache
+        self.bucket = TokenBucket(rate, burst if burst is not None else self.workers)
+        self._local = threading.local()
+        self._connections: list = []
+        self._lock = threading.Lock()
+        self._pool: ThreadPoolExecutor | None = None
+        self.stats = {"requests": 0, "retries": 0, "connections": 0, "errors": 0}
+
+    # -- Verbindungen --------------------------------------------------------
+
+    def _connection(self) -> http.client.HTTPConnection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            cls = (http.client.HTTPSConnection if self._scheme == "https"
+                   else http.client.HTTPConnection)
+            conn = cls(self._host, timeout=self.timeout)
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
+                self.stats["connections"] += 1
+        return conn
+
+    def _drop_connection(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def close(self) -> None:
+        """Pool, alle offenen Verbindungen (aller Worker) und den Cache schliessen."""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=True)
+        with self._lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+        self._local = threading.local()
+        if self.cache is not None:
+            self.cache.close()
+            self.cache = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self.stats[key] += 1
+
+    # -- Anfragen ------------------------------------------------------------
+
+    def _delay(self, attempt: int, hint: float | None) -> float:
+        if hint is not None:
+            return min(hint, MAX_WAIT)
+        # Exponentiell mit Jitter, damit Worker nicht im Gleichschritt retryen
+        base = self.backoff * (2 ** attempt)
+        return min(base + random.uniform(0, base / 2), MAX_WAIT)
+
+    def get(self, params: dict, revalidate: bool = False) -> dict:
+        """GET auf die Action API, Antwort als dict.
+
+        ``revalidate``: auch einen frischen Cache-Eintrag nicht ungeprueft
+        verwenden (z.B. Revisionsabfragen); offline gilt der Cache trotzdem.
+
+        Wirft ``WikidataError``, wenn auch der letzte Versuch scheitert oder
+        die API einen anderen Fehler als ``maxlag`` meldet, und ``CacheMiss``,
+        wenn der Cache offline ist und die Anfrage nicht kennt.
+        """
+        query = dict(params, format="json")
+        if self.maxlag is not None:
+            query.setdefault("maxlag", str(self.maxlag))
+        target = f"{self._path}?{urlencode(query)}"
+        headers = {"User-Agent": self.user_agent, "Accept": "application/json"}
+
+        cache = self.cache
+        cached = None
+        if cache is not None:
+            key = cache_key(self.api_url, query)
+            cached = cache.lookup(key)
+            if (cached is not None and cache.is_fresh(cached)
+                    and (not revalidate or cache.offline)):
+                cache.count("hits")
+                return json.loads(cached.body.decode("utf-8"))
+            cache.count("misses")
+            if cache.offline:
+                raise CacheMiss(f"offline, nicht im Cache: {key}")
+            if cached is not None:
+                if cached.etag:
+                    headers["If-None-Match"] = cached.etag
+                if cached.last_modified:
+                    headers["If-Modified-Since"] = cached.last_modified
+
+        error = None
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                self._count("retries")
+            self.bucket.acquire()
+            self._count("requests")
+            hint = None
+            try:
+                conn = self._connection()
+                conn.request("GET", target, headers=headers)
+                resp = conn.getresponse()
+                body = resp.read()
+                if resp.will_close:
+                    self._drop_connection()
+            except (OSError, http.client.HTTPException) as e:
+                # Server hat die Keep-Alive-Verbindung geschlossen o.ae.
+                self._drop_connection()
+                error = e
+            else:
+                hint = _retry_after(resp.getheader("Retry-After"))
+                if resp.status == 304 and cached is not None:
+                    cache.touch(key)
+                    return json.loads(cached.body.decode("utf-8"))
+                if resp.status in RETRY_STATUS:
+                    error = WikidataError(f"HTTP {resp.status}")
+                elif resp.status >= 400:
+                    self._count("errors")
+                    raise WikidataError(f"HTTP {resp.status}")
+                else:
+                    try:
+                        data = json.loads(body.decode("utf-8"))
+                    except ValueError as e:
+                        error = e
+                    else:
+                        api_error = data.get("error") if isinstance(data, dict) else None
+                        if not api_error:
+                            if cache is not None:
+                                cache.store(key, query.get("action"), body,
+                                            resp.getheader("ETag"),
+                                            resp.getheader("Last-Modified"))
+                            return data
+                        if api_error.get("code") != "maxlag":
+                            self._count("errors")
+                            raise WikidataError(
+                                f"{api_error.get('code')}: {api_error.get('info', '')}")
+                        error = WikidataError(f"maxlag: {api_error.get('info', '')}")
+                        if hint is None and api_error.get("lag") is not None:
+                            hint = float(api_error["lag"])
+
+            if attempt < self.max_retries:
+                self.bucket.pause(self._delay(attempt, hint))
+
+        self._count("errors")
+        raise WikidataError(f"{self.max_retries + 1} Versuche fehlgeschlagen: {error}")
+
+    def _executor(self) -> ThreadPoolExecutor:
+        """Der gemeinsame Pool (lebt bis ``close()``): seine Threads und damit
+        ihre Keep-Alive-Verbindungen werden ueber alle Aufrufe wiederverwendet."""
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.workers,
+                                                thread_name_prefix="wikidata")
+            return self._pool
+
+    def map(self, fn: Callable, items: Iterable) -> Iterator:
+        """``fn`` parallel auf ``items`` (gemeinsamer Pool), Ergebnisse in Eingabereihenfolge."""
+        items = list(items)
+        if self.workers == 1 or len(items) <= 1:
+            yield from map(fn, items)
+            return
+        yield from self._executor().map(fn, items)
+
+    def submit(self, fn: Callable, *args, **kwargs) -> Future:
+        """``fn(*args, **kwargs)`` im gemeinsamen Pool des Clients starten.
+
+        Der Pool lebt bis ``close()``; mit ``workers == 1`` laeuft ``fn``
+        sofort im aufrufenden Thread (das Future ist dann schon erledigt).
+        """
+        if self.workers == 1:
+            future = Future()
+            try:
+                future.set_result(fn(*args, **kwargs))
+            except BaseException as e:
+                future.set_exception(e)
+            return future
+        return self._executor().submit(fn, *args, **kwargs)
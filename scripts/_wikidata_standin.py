@@ -0,0 +1,340 @@
+"""Lokaler Stand-in fuer die Wikidata Action API (Tests, Benchmarks).
+
+Implementiert den Ausschnitt, den die Pipeline nutzt — ``wbsearchentities``
+und ``wbgetentities`` (``ids``, ``props``, max. 50 IDs) — aus einem
+Fixture-Korpus, mit Keep-Alive (HTTP/1.1) und ETag/``If-None-Match``.
+Fuer Last- und Fehlertests laesst sich einstellen:
+
+- ``latency``/``jitter``: Antwortzeit pro Anfrage (Sekunden),
+- ``error_rate``: Anteil zufaelliger ``503``-Antworten,
+- ``maxlag_rate``: Anteil ``maxlag``-Fehler (mit ``Retry-After``),
+- ``rate_limit``: serverseitiges Limit in Anfragen/s; darueber ``429`` mit
+  ``Retry-After``,
+- ``failures``: explizite Antworten ``(status, payload, headers)`` fuer die
+  naechsten Anfragen.
+
+Korpus: ``Corpus.demo()`` (kleiner fester Satz fuer Tests) oder
+``Corpus.from_outputs()`` — aus ``wikidata-reconciliation.json`` und
+``wikidata-enrichment.json`` rekonstruiert, damit reconcile/enrich/verify
+realistische Namen, Kandidaten und Claims sehen. Nutzung: ``serve()``
+(Kontextmanager) bzw. ``scripts/benchmark-wikidata.py --serve``.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import random
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+BASE_DIR = Path(__file__).parent.parent
+OUTPUT_DIR = BASE_DIR / "data" / "output"
+
+MAX_IDS = 50  # wie die echte API: mehr IDs -> Fehler "toomanyvalues"
+
+# P31-Werte pro Entitaetstyp (passend zu den Typfiltern in reconcile.py)
+TYPE_P31 = {
+    "person": "Q5",
+    "location": "Q515",
+    "org": "Q43229",
+    "work": "Q1344",
+}
+TYPE_DESCRIPTION = {
+    "person": "Person",
+    "location": "Stadt",
+    "org": "Organisation",
+    "work": "Oper",
+}
+Q_DISAMBIGUATION = "Q4167410"
+
+# Enrichment-Feld -> Property (Umkehrung von enrich-wikidata.PROPERTY_MAP)
+FIELD_PROPERTY = {
+    "person": {"occupation": "P106", "voiceType": "P412", "birthPlace": "P19",
+               "deathPlace": "P20", "birthDate": "P569", "deathDate": "P570"},
+    "location": {"coordinates": "P625", "country": "P17"},
+    "work": {"composer": "P86", "genre": "P136", "premiereDate": "P1191",
+             "publicationDate": "P577"},
+    "org": {"location": "P276", "inception": "P571"},
+}
+
+
+def _claim(value) -> dict:
+    """Enrichment-Wert -> Wikidata-Claim (wie extract_claim_value ihn liest)."""
+    if isinstance(value, dict) and "qid" in value:
+        datavalue = {"type": "wikibase-entityid",
+                     "value": {"entity-type": "item", "id": value["qid"]}}
+    elif isinstance(value, dict) and "lat" in value:
+        datavalue = {"type": "globecoordinate",
+                     "value": {"latitude": value["lat"], "longitude": value["lon"]}}
+    else:
+        datavalue = {"type": "time", "value": {"time": f"+{value}T00:00:00Z"}}
+    return {"mainsnak": {"snaktype": "value", "datavalue": datavalue},
+            "rank": "normal"}
+
+
+def _p31(qid: str) -> list:
+    return [_claim({"qid": qid})]
+
+
+def _labelled(qid: str, label: str, description: str = "", claims=None) -> dict:
+    entity = {"id": qid, "labels": {"de": {"language": "de", "value": label}},
+              "aliases": {}, "claims": claims or {}}
+    if description:
+        entity["descriptions"] = {"de": {"language": "de", "value": description}}
+    return entity
+
+
+class Corpus:
+    """Suchindex (Query -> Treffer) und Entitaeten (QID -> JSON)."""
+
+    def __init__(self, search: dict | None = None, entities: dict | None = None):
+        self.search = dict(search or {})
+        self.entities = dict(entities or {})
+
+    @classmethod
+    def demo(cls) -> "Corpus":
+        return cls(
+            search={
+                "Malaniuk, Ira": [],
+                "Ira Malaniuk": [{"id": "Q94208", "label": "Ira Malaniuk"}],
+                "Wien": [{"id": "Q1741", "label": "Wien"}],
+            },
+            entities={
+                "Q94208": _labelled("Q94208", "Ira Malaniuk", "ukrainische Sängerin (Alt)",
+                                    {"P31": _p31("Q5")}),
+                "Q1741": _labelled("Q1741", "Wien", "Hauptstadt von Österreich",
+                                   {"P31": _p31("Q515")}),
+            },
+        )
+
+    @classmethod
+    def from_outputs(cls, reconciliation: Path = OUTPUT_DIR / "wikidata-reconciliation.json",
+                     enrichment: Path = OUTPUT_DIR / "wikidata-enrichment.json",
+                     decoys: int = 2) -> "Corpus":
+        """Korpus aus den Pipeline-Ausgaben.
+
+        Jeder Match wird unter allen Suchformen gefunden, die reconcile.py
+        verwendet (Name, "Vorname Nachname", "Titel Komponist"), gefolgt von
+        ``decoys`` Begriffsklaerungs-Kandidaten mit aehnlichem Label — die
+        fallen erst bei der P31-Pruefung raus, wie in echt. Ungematchte Namen
+        liefern nur Decoys. Claims kommen aus dem Enrichment; referenzierte
+        Entitaeten (Berufe, Orte, ...) bekommen ihr Label.
+        """
+        with open(reconciliation, encoding="utf-8") as f:
+            recon = json.load(f)
+        enriched = {}
+        if Path(enrichment).exists():
+            with open(enrichment, encoding="utf-8") as f:
+                enriched = json.load(f).get("entities", {})
+
+        corpus = cls()
+        counter = [0]
+
+        def decoy_hits(label):
+            hits = []
+            for _ in range(decoys):
+                counter[0] += 1
+                qid = f"Q9{counter[0]:07d}"
+                text = f"{label} (Begriffsklärung)"
+                corpus.entities[qid] = _labelled(qid, text, "Begriffsklärungsseite",
+                                                 {"P31": _p31(Q_DISAMBIGUATION)})
+                hits.append({"id": qid, "label": text})
+            return hits
+
+        def queries(entry):
+            name = entry["name"]
+            forms = [name]
+            parts = name.split(",", 1)
+            if len(parts) == 2:
+                forms.append(f"{parts[1].strip()} {parts[0].strip()}")
+            if entry.get("komponist"):
+                forms.append(f"{name} {entry['komponist']}")
+            return forms
+
+        for entry in recon.get("matched", []):
+            qid, label, etype = entry["qid"], entry.get("label") or entry["name"], entry["type"]
+            claims = {"P31": _p31(TYPE_P31.get(etype, "Q35120"))}
+            props = enriched.get(qid, {}).get("properties", {})
+            for field, value in props.items():
+                pid = FIELD_PROPERTY.get(etype, {}).get(field)
+                if pid is None:
+                    continue
+                values = value if isinstance(value, list) else [value]
+                claims[pid] = [_claim(v) for v in values]
+                for v in values:
+                    if isinstance(v, dict) and "qid" in v and v["qid"] not in corpus.entities:
+                        corpus.entities[v["qid"]] = _labelled(v["qid"], v.get("label") or v["qid"])
+            corpus.entities[qid] = _labelled(qid, label, TYPE_DESCRIPTION.get(etype, ""), claims)
+            hits = [{"id": qid, "label": label}] + decoy_hits(label)
+            for query in queries(entry):
+                corpus.search[query] = hits
+
+        for entry in recon.get("unmatched", []):
+            hits = decoy_hits(entry["name"])
+            for query in queries(entry):
+                corpus.search.setdefault(query, hits)
+        return corpus
+
+    def names(self) -> list:
+        return list(self.search)
+
+
+class StandIn:
+    """Zustand und Konfiguration eines laufenden Stand-ins."""
+
+    def __init__(self, corpus: Corpus | None = None, latency: float = 0.0,
+                 jitter: float = 0.0, error_rate: float = 0.0,
+                 maxlag_rate: float = 0.0, rate_limit: float | None = None,
+                 retry_after: float = 1.0, seed: int = 0):
+        corpus = corpus or Corpus.demo()
+        self.search = corpus.search
+        self.entities = corpus.entities
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.maxlag_rate = maxlag_rate
+        self.rate_limit = rate_limit
+        self.retry_after = retry_after
+        self.failures = []      # (status, payload, headers) fuer die naechsten Anfragen
+        self.requests = []
+        self.ports = set()
+        self.not_modified = 0
+        self.status_counts = {}
+        self.lock = threading.Lock()
+        self.url = None
+        self._random = random.Random(seed)
+        self._window = []       # Zeitstempel fuer rate_limit (gleitende Sekunde)
+
+    def calls(self, action: str) -> list:
+        return [r for r in self.requests if r.get("action") == action]
+
+    def _injected(self):
+        """Naechste explizite oder zufaellige Stoerung, sonst None (unter Lock)."""
+        if self.failures:
+            return self.failures.pop(0)
+        if self.rate_limit:
+            now = time.monotonic()
+            self._window = [t for t in self._window if now - t < 1.0]
+            if len(self._window) >= self.rate_limit:
+                return (429, {"error": {"code": "ratelimited", "info": "too many requests"}},
+                        [("Retry-After", f"{self.retry_after:g}")])
+            self._window.append(now)
+        if self.error_rate and self._random.random() < self.error_rate:
+            return (503, {"error": {"code": "unavailable"}}, ())
+        if self.maxlag_rate and self._random.random() < self.maxlag_rate:
+            return (200, {"error": {"code": "maxlag", "info": "Waiting for replica", "lag": 1}},
+                    [("Retry-After", f"{self.retry_after:g}")])
+        return None
+
+    def _delay(self) -> float:
+        if not self.jitter:
+            return self.latency
+        with self.lock:
+            return max(0.0, self.latency + self._random.uniform(-self.jitter, self.jitter))
+
+    def _entity(self, qid: str, props: list) -> dict:
+        entity = self.entities.get(qid)
+        if entity is None:
+            return {"id": qid, "missing": ""}
+        out = {"id": qid}
+        if "info" in props:
+            out["lastrevid"] = entity.get("lastrevid", 1)
+            out["modified"] = entity.get("modified", "2026-01-01T00:00:00Z")
+        for prop in props:
+            if prop in entity:
+                out[prop] = entity[prop]
+        return out
+
+    def edit(self, qid: str, claims: dict | None = None, label: str | None = None) -> None:
+        """Entitaet aendern wie ein Wikidata-Edit (neue Revision)."""
+        with self.lock:
+            entity = self.entities[qid]
+            if claims is not None:
+                entity["claims"] = claims
+            if label is not None:
+                entity["labels"]["de"] = {"language": "de", "value": label}
+            entity["lastrevid"] = entity.get("lastrevid", 1) + 1
+            entity["modified"] = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+
+    def respond(self, params: dict) -> tuple[int, dict]:
+        action = params.get("action")
+        if action == "wbsearchentities":
+            limit = int(params.get("limit", 7))
+            return 200, {"search": self.search.get(params.get("search"), [])[:limit]}
+        if action == "wbgetentities":
+            ids = params.get("ids", "").split("|")
+            if len(ids) > MAX_IDS:
+                return 200, {"error": {"code": "toomanyvalues",
+                                       "info": f"Too many values supplied for parameter \"ids\". The limit is {MAX_IDS}."}}
+            props = params.get("props", "info|sitelinks|aliases|labels|descriptions|claims").split("|")
+            return 200, {"entities": {q: self._entity(q, props) for q in ids}}
+        return 200, {"error": {"code": "badvalue", "info": "unknown action"}}
+
+
+def _handler(state: StandIn):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def _send(self, status, payload, headers=()):
+            body = json.dumps(payload).encode("utf-8") if payload is not None else b""
+            with state.lock:
+                state.status_counts[status] = state.status_counts.get(status, 0) + 1
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            for key, value in headers:
+                self.send_header(key, value)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            params = {k: v[0] for k, v in parse_qs(urlsplit(self.path).query).items()}
+            with state.lock:
+                state.requests.append(params)
+                state.ports.add(self.client_address[1])
+                failure = state._injected()
+            delay = state._delay()
+            if delay:
+                time.sleep(delay)
+            if failure:
+                self._send(*failure)
+                return
+
+            status, payload = state.respond(params)
+            if "error" in payload:
+                self._send(status, payload)
+                return
+            etag = '"' + hashlib.sha1(json.dumps(payload, sort_keys=True)
+                                      .encode("utf-8")).hexdigest() + '"'
+            if self.headers.get("If-None-Match") == etag:
+                with state.lock:
+                    state.not_modified += 1
+                self._send(304, None, [("ETag", etag)])
+                return
+            self._send(status, payload, [("ETag", etag)])
+
+    return Handler
+
+
+@contextmanager
+def serve(state: StandIn | None = None, host: str = "127.0.0.1", port: int = 0):
+    """Startet einen Stand-in (Default: freier Port), liefert den ``StandIn``-Zustand."""
+    state = state or StandIn()
+    server = ThreadingHTTPServer((host, port), _handler(state))
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    state.url = f"http://{host}:{server.server_address[1]}/w/api.php"
+    try:
+        yield state
+    finally:
+        server.shutdown()
+        server.server_close()
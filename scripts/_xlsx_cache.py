@@ -0,0 +1,254 @@
+"""Geteilter XLSX-Loader mit Parse-Cache fuer alle Pipeline-Scripts.
+
+transform.py, validate.py, reconcile.py, audit-data.py, explore.py und die
+pytest-Fixtures lesen dieselben ``M3GIM-*.xlsx``. Das Parsen (Zip + XML via
+openpyxl) ist der teure Teil; dieses Modul legt jedes geparste Sheet einmal
+als Pickle ab, Schluessel ist der SHA-256 der Workbook-Bytes. Solange sich
+die Datei nicht aendert, bekommt jeder Aufruf — auch aus anderen Prozessen —
+den Frame direkt aus dem Cache.
+
+Gecacht wird der Rohframe, exakt wie ``pd.read_excel`` ihn liefert (Pickle
+erhaelt Dtypes und gemischte object-Spalten verlustfrei). Header-Shift-
+Korrekturen und Spalten-Normalisierung bleiben bei den Aufrufern, deren
+Regeln sich unterscheiden (transform vs. validate vs. reconcile); sie kosten
+gegenueber dem Parsen nichts.
+
+Ablage: ``$M3GIM_CACHE_DIR/xlsx/`` (Default ``data/output/.cache/xlsx/``,
+nicht versioniert). ``M3GIM_XLSX_CACHE=0`` schaltet den Cache ab. Jeder
+Eintrag vermerkt in ``sources``, zu welchen Workbooks er gehoert; legt ein
+Workbook einen neuen Eintrag an (Datei geaendert, pandas aktualisiert),
+werden seine alten Eintraege entfernt, ebenso Eintraege, deren Workbooks
+nicht mehr existieren (z.B. temporaere Kopien) oder die keinen Vermerk haben
+(aeltere Cache-Staende).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import pickle
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import pandas as pd
+
+BASE_DIR = Path(__file__).parent.parent
+CACHE_DIR = Path(os.environ.get(
+    "M3GIM_CACHE_DIR", BASE_DIR / "data" / "output" / ".cache")) / "xlsx"
+
+# Bei Format-Aenderungen hochzaehlen; die pandas-Version geht mit ein, weil
+# Pickles nicht ueber pandas-Versionen hinweg stabil sind.
+CACHE_VERSION = 1
+_FLAVOR = f"v{CACHE_VERSION}-pd{pd.__version__}"
+
+# Prozesslokale Memos: Datei-Stat -> Digest, Cache-Datei -> Pickle-Bytes
+# (zuletzt benutzte zuerst verdraengt, hoechstens _BLOB_BUDGET Bytes),
+# Eintraege, die dieser Prozess schon beansprucht hat (_claim_entry).
+_digests: dict = {}
+_blobs: dict = {}
+_BLOB_BUDGET = 32 << 20
+_claimed: set = set()
+
+
+def cache_enabled() -> bool:
+    return os.environ.get("M3GIM_XLSX_CACHE", "1") != "0"
+
+
+def workbook_digest(path: Path) -> str:
+    """SHA-256 der Workbook-Bytes (pro Prozess per mtime/Groesse gememot)."""
+    path = Path(path)
+    st = path.stat()
+    memo_key = (str(path.resolve()), st.st_mtime_ns, st.st_size)
+    digest = _digests.get(memo_key)
+    if digest is None:
+        digest = hashlib.sha256(path.read_bytes()).hexdigest()
+        _digests[memo_key] = digest
+    return digest
+
+
+def _entry_dir(path: Path) -> Path:
+    return CACHE_DIR / f"{workbook_digest(path)}-{_FLAVOR}"
+
+
+def _sheet_file(path: Path, sheet) -> Path:
+    # Sheet-Namen enthalten Leerzeichen/Umlaute; int = Position (read_excel-Default).
+    key = hashlib.sha1(repr(sheet).encode("utf-8")).hexdigest()[:16]
+    return _entry_dir(path) / f"sheet-{key}.pickle"
+
+
+def _claim_entry(path: Path) -> None:
+    """``path`` im ``sources``-Vermerk seines Eintrags eintragen und aus allen
+    anderen Eintraegen austragen, geloeschte Workbooks ebenso; Eintraege ohne
+    Workbook werden geloescht."""
+    entry = _entry_dir(path)
+    if entry in _claimed:
+        return
+    _claimed.add(entry)
+    source = str(path.resolve())
+    entry.mkdir(parents=True, exist_ok=True)
+    if source not in _sources(entry):
+        with open(entry / "sources", "a", encoding="utf-8") as f:
+            f.write(source + "\n")
+    for other in CACHE_DIR.iterdir():
+        if other == entry or not other.is_dir():
+            continue
+        listed = _sources(other)
+        sources = [s for s in listed if s != source and Path(s).exists()]
+        if listed and sources == listed:
+            continue
+        _claimed.discard(other)
+        if sources:
+            _write_atomic(other / "sources", "".join(f"{s}\n" for s in sources).encode("utf-8"))
+        else:
+            shutil.rmtree(other, ignore_errors=True)
+            for target in [t for t in _blobs if t.parent == other]:
+                del _blobs[target]
+
+
+def _sources(entry: Path) -> list[str]:
+    try:
+        return (entry / "sources").read_text(encoding="utf-8").splitlines()
+    except OSError:
+        return []
+
+
+def _write_atomic(target: Path, data: bytes) -> None:
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp = target.with_name(f"{target.name}.{os.getpid()}.tmp")
+    tmp.write_bytes(data)
+    tmp.replace(target)
+
+
+def _remember(target: Path, blob: bytes) -> None:
+    """Blob ans Ende des Memos; aelteste Eintraege ueber dem Budget verdraengen."""
+    _blobs.pop(target, None)
+    _blobs[target] = blob
+    total = sum(len(b) for b in _blobs.values())
+    while total > _BLOB_BUDGET and len(_blobs) > 1:
+        oldest = next(iter(_blobs))
+        total -= len(_blobs.pop(oldest))
+
+
+def _load(target: Path, memo: bool = True) -> pd.DataFrame | None:
+    blob = _blobs.get(target)
+    if blob is None:
+        try:
+            blob = target.read_bytes()
+        except OSError:
+            return None
+    if memo:
+        _remember(target, blob)
+    try:
+        return pickle.loads(blob)
+    except (pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+        _blobs.pop(target, None)
+        return None
+
+
+def _store(path: Path, target: Path, df: pd.DataFrame, memo: bool = True) -> None:
+    blob = pickle.dumps(df, protocol=pickle.HIGHEST_PROTOCOL)
+    if memo:
+        _remember(target, blob)
+    try:
+        _claim_entry(path)
+        _write_atomic(target, blob)
+    except OSError:
+        pass  # Cache ist optional — read-only Checkout etc.
+
+
+def sheet_names(path: Path) -> list[str]:
+    """Sheet-Namen des Workbooks in Workbook-Reihenfolge (gecacht)."""
+    path = Path(path)
+    if not cache_enabled():
+        with pd.ExcelFile(path) as xl:
+            return list(xl.sheet_names)
+    target = _entry_dir(path) / "sheets.json"
+    try:
+        return json.loads(target.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        pass
+    with pd.ExcelFile(path) as xl:
+        names = list(xl.sheet_names)
+    try:
+        _claim_entry(path)
+        _write_atomic(target, json.dumps(names, ensure_ascii=False).encode("utf-8"))
+    except OSError:
+        pass
+    return names
+
+
+def read_sheet(path: Path, sheet_name: str | int = 0) -> pd.DataFrame:
+    """Wie ``pd.read_excel(path, sheet_name=sheet_name)``, aus dem Cache.
+
+    Jeder Aufruf liefert einen frischen Frame, den der Aufrufer mutieren darf.
+    """
+    path = Path(path)
+    if not cache_enabled():
+        return pd.read_excel(path, sheet_name=sheet_name)
+    target = _sheet_file(path, sheet_name)
+    df = _load(target)
+    if df is None:
+        df = pd.read_excel(path, sheet_name=sheet_name)
+        _store(path, target, df)
+    return df
+
+
+# ---------------------------------------------------------------------------
+# Mehrere Sheets: Workbook einmal oeffnen, Cache-Fehlschlaege parallel parsen
+# ---------------------------------------------------------------------------
+
+# Pro Worker-Prozess einmal geoeffnetes Workbook (_init_sheet_worker).
+_WORKER_BOOK: pd.ExcelFile | None = None
+
+
+def _init_sheet_worker(path: str) -> None:
+    global _WORKER_BOOK
+    _WORKER_BOOK = pd.ExcelFile(path)
+
+
+def _parse_sheet_in_worker(sheet: str) -> pd.DataFrame:
+    return _WORKER_BOOK.parse(sheet)
+
+
+def worker_count(workers: int | None, tasks: int) -> int:
+    """Pool-Groesse: explizit, sonst $M3GIM_WORKERS, sonst CPU-Anzahl;
+    nie mehr Worker als Aufgaben."""
+    if workers is None:
+        workers = int(os.environ.get("M3GIM_WORKERS") or os.cpu_count() or 1)
+    return max(1, min(workers, tasks))
+
+
+def read_workbook(path: Path, workers: int | None = None) -> dict[str, pd.DataFrame]:
+    """Alle Sheets als {name: frame} in Workbook-Reihenfolge.
+
+    Treffer kommen aus dem Cache. Die uebrigen Sheets werden aus EINEM
+    geoeffneten Workbook geparst — bei mehreren Fehlschlaegen und
+    ``workers > 1`` parallel in einem Prozess-Pool (jeder Worker oeffnet das
+    Workbook einmal im Initializer). Die Sheets landen nicht im Prozess-Memo:
+    der Aufrufer haelt die Frames ohnehin, ein zweites Lesen kommt von Platte.
+    """
+    path = Path(path)
+    names = sheet_names(path)
+    use_cache = cache_enabled()
+    frames: dict = {}
+    for name in names:
+        frames[name] = _load(_sheet_file(path, name), memo=False) if use_cache else None
+    missing = [name for name in names if frames[name] is None]
+
+    if missing:
+        n_workers = worker_count(workers, len(missing))
+        if n_workers > 1:
+            with ProcessPoolExecutor(max_workers=n_workers,
+                                     initializer=_init_sheet_worker,
+                                     initargs=(str(path),)) as pool:
+                parsed = list(pool.map(_parse_sheet_in_worker, missing))
+        else:
+            with pd.ExcelFile(path) as xl:
+                parsed = [xl.parse(name) for name in missing]
+        for name, df in zip(missing, parsed):
+            if use_cache:
+                _store(path, _sheet_file(path, name), df, memo=False)
+            frames[name] = df
+    return frames
@@ -26,6 +26,9 @@ import pandas as pd
 from pathlib import Path
 from collections import Counter
 
+sys.path.insert(0, str(Path(__file__).parent))
+from _graph import RECORD, RECORD_SET, Graph, ensure_list, load_graph  # noqa: E402
+
 # Windows-Konsole: UTF-8 erzwingen
 if sys.stdout.encoding != "utf-8":
     sys.stdout.reconfigure(encoding="utf-8")
@@ -39,12 +42,9 @@ DOCS_DIR = BASE_DIR / "docs" / "data"
 # Hilfsfunktionen
 # ---------------------------------------------------------------------------
 
-def load_jsonld():
-    """Laedt JSON-LD und gibt Graph zurueck"""
-    path = OUTPUT_DIR / "m3gim.jsonld"
-    with open(path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-    return data
+def load_jsonld() -> Graph:
+    """Laedt JSON-LD als indizierten Graph (_graph.py)"""
+    return load_graph(OUTPUT_DIR / "m3gim.jsonld")
 
 def load_view(name):
     """Laedt ein View-JSON aus docs/data/"""
@@ -85,11 +85,10 @@ def audit_records(df_objekte, graph):
 
     # Alle Identifiers aus JSON-LD
     jsonld_ids = set()
-    for node in graph:
-        if node.get("@type") in ("rico:Record", "rico:RecordSet"):
-            identifier = node.get("rico:identifier")
-            if identifier:
-                jsonld_ids.add(identifier)
+    for node in graph.of_type(RECORD) + graph.of_type(RECORD_SET):
+        identifier = node.get("rico:identifier")
+        if identifier:
+            jsonld_ids.add(identifier)
 
     # Vergleich
     missing_in_jsonld = xlsx_sigs - jsonld_ids
@@ -166,22 +165,11 @@ def audit_verknuepfungen(df_verk, graph):
     jsonld_details = 0
     jsonld_events = 0
 
-    for node in graph:
-        if node.get("@type") not in ("rico:Record",):
-            continue
-        agents = node.get("m3gim:hasAssociatedAgent", [])
-        if isinstance(agents, dict):
-            agents = [agents]
-        jsonld_agents += len(agents)
-
-        locs = node.get("rico:hasOrHadLocation", [])
-        if isinstance(locs, dict):
-            locs = [locs]
-        jsonld_locations += len(locs)
-
-        subjs = node.get("rico:hasOrHadSubject", [])
-        if isinstance(subjs, dict):
-            subjs = [subjs]
+    for node in graph.records:
+        jsonld_agents += len(ensure_list(node.get("m3gim:hasAssociatedAgent")))
+        jsonld_locations += len(ensure_list(node.get("rico:hasOrHadLocation")))
+
+        subjs = ensure_list(node.get("rico:hasOrHadSubject"))
         jsonld_subjects += len(subjs)
         for s in subjs:
             if s.get("@type") == "m3gim:PerformanceEvent":
@@ -191,22 +179,9 @@ def audit_verknuepfungen(df_verk, graph):
 
         # E-102: das generische m3gim:eventDate ist in m3gim:hasDatedEvent
         # (DatedEvent-Fallback) aufgegangen.
-        dts = node.get("m3gim:hasDatedEvent", [])
-        if isinstance(dts, (str,)):
-            dts = [dts]
-        elif isinstance(dts, dict):
-            dts = [dts]
-        jsonld_dates += len(dts)
-
-        rls = node.get("m3gim:hasPerformanceRole", [])
-        if isinstance(rls, dict):
-            rls = [rls]
-        jsonld_roles += len(rls)
-
-        dtls = node.get("m3gim:hasDetail", [])
-        if isinstance(dtls, dict):
-            dtls = [dtls]
-        jsonld_details += len(dtls)
+        jsonld_dates += len(ensure_list(node.get("m3gim:hasDatedEvent")))
+        jsonld_roles += len(ensure_list(node.get("m3gim:hasPerformanceRole")))
+        jsonld_details += len(ensure_list(node.get("m3gim:hasDetail")))
 
     print(f"  XLSX Verknuepfungstypen:")
     for t, c in sorted(xlsx_types.items(), key=lambda x: -x[1]):
@@ -342,9 +317,7 @@ def audit_quality(df_objekte, graph):
     # JSON-LD: Records mit Verknuepfungen
     linked = 0
     unlinked = 0
-    for node in graph:
-        if node.get("@type") != "rico:Record":
-            continue
+    for node in graph.records:
         has_links = any(
             node.get(prop) for prop in [
                 "m3gim:hasAssociatedAgent", "rico:hasOrHadLocation",
@@ -368,13 +341,8 @@ def audit_quality(df_objekte, graph):
     total_orgs = 0
     total_works = 0
 
-    for node in graph:
-        if node.get("@type") != "rico:Record":
-            continue
-        agents = node.get("m3gim:hasAssociatedAgent", [])
-        if isinstance(agents, dict):
-            agents = [agents]
-        for a in agents:
+    for node in graph.records:
+        for a in ensure_list(node.get("m3gim:hasAssociatedAgent")):
             if a.get("@type") == "rico:Person":
                 total_persons += 1
                 if a.get("@id", "").startswith("wd:"):
@@ -384,10 +352,7 @@ def audit_quality(df_objekte, graph):
                 if a.get("@id", "").startswith("wd:"):
                     wd_orgs += 1
 
-        subjs = node.get("rico:hasOrHadSubject", [])
-        if isinstance(subjs, dict):
-            subjs = [subjs]
-        for s in subjs:
+        for s in ensure_list(node.get("rico:hasOrHadSubject")):
             if s.get("@type") == "m3gim:MusicalWork":
                 total_works += 1
                 if s.get("@id", "").startswith("wd:"):
@@ -400,9 +365,7 @@ def audit_quality(df_objekte, graph):
 
     # Erfassungsstatus-Verteilung
     status_counts = Counter()
-    for node in graph:
-        if node.get("@type") != "rico:Record":
-            continue
+    for node in graph.records:
         bs = node.get("m3gim:bearbeitungsstand", "nicht_gesetzt")
         status_counts[bs] += 1
 
@@ -484,13 +447,17 @@ def main():
 
     # Daten laden
     print("\nLade Daten...")
-    data = load_jsonld()
-    graph = data.get("@graph", [])
+    graph = load_jsonld()
     print(f"  JSON-LD: {len(graph)} Graph-Knoten")
 
-    # XLSX laden
+    # XLSX laden — ueber den geteilten Parse-Cache (_xlsx_cache.py) und den
+    # Multi-Sheet-Loader der Pipeline (Box-Export verteilt auf mehrere Sheets),
+    # statt single-sheet pd.read_excel — sonst driften die Aggregat-Zahlen.
+    from _xlsx_cache import read_sheet
+    from transform import load_verknuepfungen
+
     objekte_path = SHEETS_DIR / "M3GIM-Objekte.xlsx"
-    df_objekte = pd.read_excel(objekte_path)
+    df_objekte = read_sheet(objekte_path)
     df_objekte.columns = [c.lower().strip() if isinstance(c, str) else c
                           for c in df_objekte.columns]
     print(f"  Objekte-XLSX: {len(df_objekte)} Zeilen")
@@ -498,10 +465,6 @@ def main():
     verk_path = SHEETS_DIR / "M3GIM-Verknüpfungen.xlsx"
     if not verk_path.exists():
         verk_path = SHEETS_DIR / "M3GIM-Verknuepfungen.xlsx"
-    # Multi-Sheet-Loader der Pipeline (Box-Export verteilt auf mehrere Sheets),
-    # statt single-sheet pd.read_excel — sonst driften die Aggregat-Zahlen.
-    sys.path.insert(0, str(BASE_DIR / "scripts"))
-    from transform import load_verknuepfungen
     df_verk = load_verknuepfungen(verk_path)
     print(f"  Verknuepfungen-XLSX: {len(df_verk)} Zeilen")
 
@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+M³GIM Benchmark — Wikidata-Skripte gegen einen lokalen Stand-in-Server.
+
+Startet _wikidata_standin.py mit einem Korpus aus den aktuellen
+Pipeline-Ausgaben (wikidata-reconciliation.json, wikidata-enrichment.json)
+und realistischer Latenz und laesst die Netzwerkpfade der Skripte dagegen
+laufen:
+
+- ``reconcile``: run_reconciliation ueber die echten Index-Tabellen
+  (``--force``, ohne HTTP-Cache), einmal pro ``--workers``-Wert
+- ``enrich``: run_enrichment fuer alle Matches (Batch-Fetch + Labels),
+  ebenfalls pro ``--workers``-Wert
+- ``verify``: verify-manual-approvals.fetch_entities fuer alle Match-QIDs
+
+Gemessen werden Wall-Zeit, HTTP-Anfragen (inkl. Retries), Anfragen/s und
+Namen bzw. Entitaeten/s. Fehler und Rate-Limits lassen sich injizieren
+(``--error-rate``, ``--maxlag-rate``, ``--server-rate-limit``). Alle
+Ausgaben landen in ``--workdir``; die versionierten Dateien bleiben
+unberuehrt.
+
+``--serve`` startet nur den Server, z.B. fuer manuelle Laeufe (reconcile.py
+und enrich-wikidata.py ueberschreiben dabei ihre Ausgaben in data/output/)::
+
+    python scripts/benchmark-wikidata.py --serve 8765 --latency 0.2
+    M3GIM_WIKIDATA_API=http://127.0.0.1:8765/w/api.php M3GIM_HTTP_CACHE=0 \\
+        python scripts/verify-manual-approvals.py
+
+Verwendung:
+    python scripts/benchmark-wikidata.py                       # Latenz 0.1 s
+    python scripts/benchmark-wikidata.py --limit 50 --workers 1 --workers 8 --rate 50
+    python scripts/benchmark-wikidata.py --error-rate 0.05 --server-rate-limit 10
+"""
+
+import argparse
+import importlib.util
+import io
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager, redirect_stdout
+from datetime import datetime
+from pathlib import Path
+
+# Windows-Konsole: UTF-8 erzwingen
+if sys.stdout.encoding != "utf-8":
+    sys.stdout.reconfigure(encoding="utf-8")
+
+sys.path.insert(0, str(Path(__file__).parent))
+import reconcile  # noqa: E402
+from _wikidata_client import DEFAULT_RATE, WikidataClient  # noqa: E402
+from _wikidata_standin import Corpus, StandIn, serve  # noqa: E402
+
+BASE_DIR = Path(__file__).parent.parent
+SCRIPTS_DIR = BASE_DIR / "scripts"
+OUTPUT_DIR = Path(os.environ.get("M3GIM_OUTPUT_DIR", BASE_DIR / "data" / "output"))
+WORK_DIR = OUTPUT_DIR / ".cache" / "benchmark-wikidata"
+
+SCENARIOS = ["reconcile", "enrich", "verify"]
+DEFAULT_WORKERS = [1, 4]
+
+
+def _load(name: str, filename: str):
+    spec = importlib.util.spec_from_file_location(name, SCRIPTS_DIR / filename)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@contextmanager
+def _patched(module, **values):
+    """Modul-Globals (Pfade, Loader) fuer einen Lauf umbiegen."""
+    old = {k: getattr(module, k) for k in values}
+    for k, v in values.items():
+        setattr(module, k, v)
+    try:
+        yield
+    finally:
+        for k, v in old.items():
+            setattr(module, k, v)
+
+
+def _client(state: StandIn, args, workers: int, rate: float | None) -> WikidataClient:
+    return WikidataClient(state.url, rate=rate or DEFAULT_RATE, workers=workers,
+                          backoff=args.backoff, timeout=30)
+
+
+def _measure(state: StandIn, client: WikidataClient, fn, quiet: bool = True) -> dict:
+    before = len(state.requests)
+    start = time.perf_counter()
+    out = io.StringIO()
+    with client:
+        if quiet:
+            with redirect_stdout(out):
+                units = fn(client)
+        else:
+            units = fn(client)
+    wall = time.perf_counter() - start
+    stats = client.stats
+    return {
+        "wall": round(wall, 3),
+        "units": units,
+        "requests": len(state.requests) - before,
+        "retries": stats["retries"],
+        "errors": stats["errors"],
+        "connections": stats["connections"],
+        "req_per_s": round((len(state.requests) - before) / wall, 2) if wall else None,
+        "units_per_s": round(units / wall, 2) if wall else None,
+    }
+
+
+def bench_reconcile(state, args, workers, workdir) -> dict:
+    limit = args.limit
+    original_load = reconcile.load_index
+
+    def load_index(filename, shift_key=None):
+        df = original_load(filename, shift_key=shift_key)
+        return df.head(limit) if limit else df
+
+    def run(client):
+        reconcile.run_reconciliation(args.types, force=True, client=client)
+        reconcile.set_client(None)
+        data = json.loads((workdir / "wikidata-reconciliation.json").read_text(encoding="utf-8"))
+        return len(data["matched"]) + len(data["unmatched"])
+
+    with _patched(reconcile, OUTPUT_FILE=workdir / "wikidata-reconciliation.json",
+                  load_index=load_index):
+        return _measure(state, _client(state, args, workers, args.rate), run, not args.verbose)
+
+
+def bench_enrich(state, args, workers, workdir, recon_file) -> dict:
+    enrich = _load("enrich_wikidata", "enrich-wikidata.py")
+
+    def run(client):
+        enrich.set_client(client)
+        enrich.run_enrichment(args.types, force=True)
+        enrich.set_client(None)
+        data = json.loads((workdir / "wikidata-enrichment.json").read_text(encoding="utf-8"))
+        return len(data["entities"])
+
+    with _patched(enrich, RECONCILIATION_FILE=recon_file,
+                  ENRICHMENT_FILE=workdir / "wikidata-enrichment.json"):
+        return _measure(state, _client(state, args, workers, args.rate or enrich.REQUEST_RATE),
+                        run, not args.verbose)
+
+
+def bench_verify(state, args, recon_file) -> dict:
+    verify = _load("verify_manual_approvals", "verify-manual-approvals.py")
+    with open(recon_file, encoding="utf-8") as f:
+        qids = [m["qid"] for m in json.load(f).get("matched", [])
+                if m.get("qid") and m.get("type") in args.types]
+
+    def run(client):
+        verify._client = client
+        found = {}
+        for i in range(0, len(qids), verify.BATCH):
+            found.update(verify.fetch_entities(qids[i:i + verify.BATCH]))
+        verify._client = None
+        return len(found)
+
+    return _measure(state, _client(state, args, 1, args.rate or verify.REQUEST_RATE),
+                    run, not args.verbose)
+
+
+def _row(name: str, result: dict) -> str:
+    return (f"  {name:<22} {result['wall']:>8.2f}s {result['units']:>6} "
+            f"{result['units_per_s'] or 0:>8.1f}/s {result['requests']:>6} "
+            f"{result['req_per_s'] or 0:>8.1f}/s {result['retries']:>5} {result['errors']:>4}")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="M³GIM Benchmark der Wikidata-Skripte (Stand-in)")
+    parser.add_argument("--scenario", action="append", choices=SCENARIOS,
+                        help="Nur dieses Szenario (mehrfach moeglich; Default: alle)")
+    parser.add_argument("--type", action="append", dest="types",
+                        choices=["person", "org", "location", "work"],
+                        help="Entitaetstypen (mehrfach moeglich; Default: alle)")
+    parser.add_argument("--workers", action="append", type=int,
+                        help=f"Worker fuer reconcile/enrich (mehrfach; Default: {DEFAULT_WORKERS})")
+    parser.add_argument("--rate", type=float, default=None,
+                        help="Client-Rate-Limit in Anfragen/s (Default: das des jeweiligen Skripts)")
+    parser.add_argument("--limit", type=int, default=None,
+                        help="Nur die ersten N Zeilen pro Index-Tabelle reconcilen")
+    parser.add_argument("--latency", type=float, default=0.1,
+                        help="Server-Antwortzeit in Sekunden (Default: 0.1)")
+    parser.add_argument("--jitter", type=float, default=0.0,
+                        help="Zufaellige Abweichung der Latenz (+/- Sekunden)")
+    parser.add_argument("--error-rate", type=float, default=0.0,
+                        help="Anteil zufaelliger 503-Antworten")
+    parser.add_argument("--maxlag-rate", type=float, default=0.0,
+                        help="Anteil maxlag-Fehler")
+    parser.add_argument("--server-rate-limit", type=float, default=None,
+                        help="Serverseitiges Limit (Anfragen/s), darueber 429 + Retry-After")
+    parser.add_argument("--retry-after", type=float, default=1.0,
+                        help="Retry-After der injizierten 429/maxlag-Antworten (Sekunden)")
+    parser.add_argument("--backoff", type=float, default=0.2,
+                        help="Basis-Backoff des Clients fuer Retries ohne Retry-After")
+    parser.add_argument("--decoys", type=int, default=2,
+                        help="Begriffsklaerungs-Kandidaten pro Suche (erzwingen P31-Pruefungen)")
+    parser.add_argument("--workdir", type=Path, default=WORK_DIR,
+                        help=f"Arbeitsverzeichnis (Default: {WORK_DIR.relative_to(BASE_DIR)})")
+    parser.add_argument("--json", type=Path, default=None,
+                        help="Ergebnisse zusaetzlich als JSON schreiben")
+    parser.add_argument("--serve", type=int, metavar="PORT", default=None,
+                        help="Nur den Stand-in auf PORT starten (Strg+C beendet)")
+    parser.add_argument("--verbose", action="store_true",
+                        help="Ausgabe der Skripte nicht unterdruecken")
+    args = parser.parse_args(argv)
+    args.types = args.types or ["person", "org", "location", "work"]
+    scenarios = args.scenario or SCENARIOS
+    workers = args.workers or DEFAULT_WORKERS
+
+    corpus = Corpus.from_outputs(decoys=args.decoys)
+    state = StandIn(corpus, latency=args.latency, jitter=args.jitter,
+                    error_rate=args.error_rate, maxlag_rate=args.maxlag_rate,
+                    rate_limit=args.server_rate_limit, retry_after=args.retry_after)
+
+    if args.serve is not None:
+        with serve(state, port=args.serve):
+            print(f"Wikidata-Stand-in: {state.url} "
+                  f"({len(corpus.search)} Suchbegriffe, {len(corpus.entities)} Entitaeten)")
+            print(f"  M3GIM_WIKIDATA_API={state.url} M3GIM_HTTP_CACHE=0 python scripts/verify-manual-approvals.py")
+            try:
+                while True:
+                    time.sleep(3600)
+            except KeyboardInterrupt:
+                print(f"\n{len(state.requests)} Anfragen bedient.")
+        return 0
+
+    args.workdir.mkdir(parents=True, exist_ok=True)
+    print("M³GIM Benchmark — Wikidata-Skripte gegen Stand-in")
+    print(f"Latenz {args.latency:g}s (+/-{args.jitter:g}), Fehler {args.error_rate:g}, "
+          f"maxlag {args.maxlag_rate:g}, Server-Limit {args.server_rate_limit or '-'}/s, "
+          f"Client-Rate {args.rate or 'Skript-Default'}")
+    print(f"Korpus: {len(corpus.search)} Suchbegriffe, {len(corpus.entities)} Entitaeten\n")
+    print(f"  {'Szenario':<22} {'Wall':>9} {'Einh.':>6} {'Einh./s':>10} {'HTTP':>6} "
+          f"{'HTTP/s':>10} {'Retry':>5} {'Fehl':>4}")
+
+    results = {}
+    with serve(state):
+        if "reconcile" in scenarios:
+            for n in workers:
+                name = f"reconcile (workers={n})"
+                results[name] = bench_reconcile(state, args, n, args.workdir)
+                print(_row(name, results[name]), flush=True)
+        recon_file = args.workdir / "wikidata-reconciliation.json"
+        if not recon_file.exists():
+            recon_file = OUTPUT_DIR / "wikidata-reconciliation.json"
+        if "enrich" in scenarios:
+            for n in workers:
+                name = f"enrich (workers={n})"
+                results[name] = bench_enrich(state, args, n, args.workdir, recon_file)
+                print(_row(name, results[name]), flush=True)
+        if "verify" in scenarios:
+            results["verify"] = bench_verify(state, args, recon_file)
+            print(_row("verify", results["verify"]), flush=True)
+
+    print(f"\nServer: {len(state.requests)} Anfragen, Status {dict(sorted(state.status_counts.items()))}")
+    if args.json:
+        args.json.parent.mkdir(parents=True, exist_ok=True)
+        payload = {"date": datetime.now().isoformat(timespec="seconds"),
+                   "options": {k: (str(v) if isinstance(v, Path) else v)
+                               for k, v in vars(args).items()},
+                   "results": results}
+        args.json.write_text(json.dumps(payload, ensure_ascii=False, indent=2) + "\n",
+                             encoding="utf-8")
+        print(f"Ergebnisse: {args.json}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
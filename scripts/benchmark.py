@@ -0,0 +1,408 @@
+#!/usr/bin/env python3
+"""
+M³GIM Benchmark — transform.py und build-views.py unter Last.
+
+Erzeugt pro Skalierung einen synthetischen Sheet-Satz
+(generate-scaled-data.py, wiederverwendet solange Quellen und Optionen gleich
+bleiben), fuehrt transform.py und build-views.py darauf als eigene Prozesse
+aus und misst:
+
+- End-to-End-Wall-Zeit und maximale RSS pro Script
+- Wall-/CPU-Zeit pro Stage bzw. View-Builder (``--trace``, _trace.py)
+- mit ``--memory`` zusaetzlich Peak-Allokation pro Stage (eigener Lauf,
+  tracemalloc verfaelscht die Zeiten)
+
+Jeder Aufruf haengt einen Eintrag an die History-Datei an (Default
+data/reports/benchmark-history.json) und vergleicht mit dem letzten Eintrag
+derselben Skalierung: Verschlechterungen ueber ``--threshold`` werden als
+REGRESSION gemeldet (``--fail-on-regression``: Exitcode 1). Laeufe, die
+abbrechen oder ``--timeout`` ueberschreiten, werden mit Status festgehalten —
+so wird sichtbar, ab welcher Groesse die Pipeline nicht mehr durchkommt.
+
+Standardmaessig wird kalt gemessen (XLSX-Parse-Cache aus); ``--warm`` misst
+mit gefuelltem Cache.
+
+Verwendung:
+    python scripts/benchmark.py                         # x1 und x10
+    python scripts/benchmark.py --scale 100 --repeat 3
+    python scripts/benchmark.py --scale 1000 --timeout 7200 --label vor-umbau
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+# Windows-Konsole: UTF-8 erzwingen
+if sys.stdout.encoding != "utf-8":
+    sys.stdout.reconfigure(encoding="utf-8")
+
+BASE_DIR = Path(__file__).parent.parent
+SCRIPTS_DIR = BASE_DIR / "scripts"
+SHEETS_DIR = Path(os.environ.get("M3GIM_SHEETS_DIR", BASE_DIR / "data" / "google-spreadsheet"))
+OUTPUT_DIR = Path(os.environ.get("M3GIM_OUTPUT_DIR", BASE_DIR / "data" / "output"))
+REPORTS_DIR = Path(os.environ.get("M3GIM_REPORTS_DIR", BASE_DIR / "data" / "reports"))
+HISTORY_FILE = REPORTS_DIR / "benchmark-history.json"
+WORK_DIR = OUTPUT_DIR / ".cache" / "benchmark"
+
+DEFAULT_SCALES = [1, 10]
+DEFAULT_THRESHOLD = 0.20
+# Unter dieser Dauer ist das Rauschen groesser als jede Regression
+MIN_COMPARABLE_SECONDS = 0.05
+
+
+# ---------------------------------------------------------------------------
+# Prozesse
+# ---------------------------------------------------------------------------
+
+def _run_child(cmd: list[str], env: dict, log_path: Path,
+               timeout: float | None) -> dict:
+    """Fuehrt ``cmd`` aus; liefert Status, Wall-Zeit und max. RSS (KB)."""
+    log_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(log_path, "w", encoding="utf-8") as log:
+        start = time.perf_counter()
+        proc = subprocess.Popen(cmd, cwd=BASE_DIR, env=env, stdout=log,
+                                stderr=subprocess.STDOUT)
+        timer = None
+        timed_out = threading.Event()
+        if timeout:
+            def _kill():
+                timed_out.set()
+                proc.kill()
+            timer = threading.Timer(timeout, _kill)
+            timer.start()
+        try:
+            if hasattr(os, "wait4"):
+                # wait4 liefert die rusage genau dieses Kindes (POSIX)
+                _, status, usage = os.wait4(proc.pid, 0)
+                proc.returncode = os.waitstatus_to_exitcode(status)
+                max_rss_kb = usage.ru_maxrss
+                if sys.platform == "darwin":
+                    max_rss_kb //= 1024  # macOS: Bytes
+            else:
+                proc.wait()
+                max_rss_kb = None
+        finally:
+            if timer:
+                timer.cancel()
+        wall = time.perf_counter() - start
+
+    if timed_out.is_set():
+        status = "timeout"
+    elif proc.returncode != 0:
+        status = "failed"
+    else:
+        status = "ok"
+    return {"status": status, "returncode": proc.returncode,
+            "wall": round(wall, 4), "max_rss_kb": max_rss_kb}
+
+
+def _read_trace(path: Path) -> dict:
+    """Chrome-Trace (_trace.py) -> {stage: {wall, cpu[, peak_kb]}}."""
+    try:
+        events = json.loads(path.read_text(encoding="utf-8"))["traceEvents"]
+    except (OSError, ValueError, KeyError):
+        return {}
+    stages = {}
+    for e in events:
+        if e.get("ph") != "X":
+            continue
+        entry = {"wall": round(e["dur"] / 1e6, 4),
+                 "cpu": round(e["args"]["cpu_ms"] / 1e3, 4)}
+        if "peak_kb" in e["args"]:
+            entry["peak_kb"] = e["args"]["peak_kb"]
+        stages[e["name"]] = entry
+    return stages
+
+
+def _median_stages(runs: list[dict]) -> dict:
+    names = []
+    for run in runs:
+        names += [n for n in run if n not in names]
+    result = {}
+    for name in names:
+        samples = [run[name] for run in runs if name in run]
+        result[name] = {key: round(statistics.median(s[key] for s in samples), 4)
+                        for key in ("wall", "cpu")}
+    return result
+
+
+def bench_script(script: str, args: list[str], env: dict, work: Path,
+                 repeat: int, timeout: float | None, memory: bool) -> dict:
+    """``repeat`` Zeit-Laeufe (+ optional ein Speicher-Lauf) eines Scripts."""
+    name = Path(script).stem
+    trace = work / f"trace-{name}.json"
+    walls, rss, stage_runs = [], [], []
+    result = {"status": "ok", "runs": []}
+    for i in range(repeat):
+        run = _run_child([sys.executable, str(SCRIPTS_DIR / script), *args,
+                          "--trace", str(trace), "--no-trace-memory"],
+                         env, work / "logs" / f"{name}-{i + 1}.log", timeout)
+        result["runs"].append(run["wall"])
+        if run["status"] != "ok":
+            result.update(status=run["status"], returncode=run["returncode"],
+                          log=str(work / "logs" / f"{name}-{i + 1}.log"))
+            return result
+        walls.append(run["wall"])
+        if run["max_rss_kb"] is not None:
+            rss.append(run["max_rss_kb"])
+        stage_runs.append(_read_trace(trace))
+
+    result["wall"] = round(statistics.median(walls), 4)
+    result["wall_min"] = min(walls)
+    if rss:
+        result["max_rss_kb"] = max(rss)
+    result["stages"] = _median_stages(stage_runs)
+
+    if memory:
+        run = _run_child([sys.executable, str(SCRIPTS_DIR / script), *args,
+                          "--trace", str(trace)],
+                         env, work / "logs" / f"{name}-memory.log", timeout)
+        if run["status"] == "ok":
+            for stage, entry in _read_trace(trace).items():
+                if "peak_kb" in entry and stage in result["stages"]:
+                    result["stages"][stage]["peak_kb"] = entry["peak_kb"]
+        else:
+            result["memory_status"] = run["status"]
+    return result
+
+
+def bench_scale(scale: int, work_root: Path, repeat: int, timeout: float | None,
+                memory: bool, warm: bool, shared_index: bool) -> dict:
+    """Alle Messungen fuer eine Skalierung."""
+    work = work_root / f"x{scale}"
+    entry: dict = {"scale": scale}
+
+    if scale == 1 and not shared_index:
+        sheets = SHEETS_DIR
+    else:
+        sheets = work / "sheets"
+        cmd = [sys.executable, str(SCRIPTS_DIR / "generate-scaled-data.py"),
+               "--scale", str(scale), "--out", str(sheets), "--source",
+               str(SHEETS_DIR), "--reuse"]
+        if shared_index:
+            cmd.append("--shared-index")
+        gen = _run_child(cmd, dict(os.environ), work / "logs" / "generate.log", None)
+        if gen["status"] != "ok":
+            entry["status"] = "generate-" + gen["status"]
+            return entry
+        manifest = json.loads((sheets / "generator.json").read_text(encoding="utf-8"))
+        entry["rows"] = manifest["rows"]
+
+    out = work / "output"
+    if out.exists():
+        shutil.rmtree(out)
+    out.mkdir(parents=True)
+    # Reconciliation/Enrichment wie im echten Lauf (Joins ueber Q-IDs)
+    for src in OUTPUT_DIR.glob("wikidata-*.json"):
+        shutil.copy2(src, out / src.name)
+
+    env = dict(os.environ, M3GIM_SHEETS_DIR=str(sheets), M3GIM_OUTPUT_DIR=str(out),
+               M3GIM_REPORTS_DIR=str(work / "reports"),
+               M3GIM_CACHE_DIR=str(work / "cache"))
+    if not warm:
+        env["M3GIM_XLSX_CACHE"] = "0"
+
+    entry["transform"] = bench_script("transform.py", [], env, work, repeat,
+                                      timeout, memory)
+    entry["status"] = entry["transform"]["status"]
+    if entry["status"] != "ok":
+        return entry
+    jsonld = out / "m3gim.jsonld"
+    entry["jsonld_kb"] = round(jsonld.stat().st_size / 1024, 1)
+
+    entry["build_views"] = bench_script("build-views.py", [], env, work, repeat,
+                                        timeout, memory)
+    entry["status"] = entry["build_views"]["status"]
+    return entry
+
+
+# ---------------------------------------------------------------------------
+# History
+# ---------------------------------------------------------------------------
+
+def _git_commit() -> str | None:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BASE_DIR,
+                             capture_output=True, text=True, timeout=10)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return out.stdout.strip() or None
+
+
+def load_history(path: Path) -> dict:
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {"runs": []}
+
+
+def save_history(path: Path, history: dict) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps(history, ensure_ascii=False, indent=2) + "\n",
+                   encoding="utf-8")
+    tmp.replace(path)
+
+
+def previous_result(history: dict, scale: int, options: dict) -> dict | None:
+    """Juengstes erfolgreiches Ergebnis derselben Skalierung, gemessen mit
+    denselben Optionen (kalt/warm usw. sind nicht vergleichbar)."""
+    for run in reversed(history.get("runs", [])):
+        if run.get("options") != options:
+            continue
+        for result in run.get("results", []):
+            if result.get("scale") == scale and result.get("status") == "ok":
+                return result
+    return None
+
+
+def _metrics(result: dict) -> dict:
+    """Flache Sicht {"transform", "transform/load_index", ...: Sekunden}."""
+    flat = {}
+    for script in ("transform", "build_views"):
+        data = result.get(script) or {}
+        if "wall" in data:
+            flat[script] = data["wall"]
+        for stage, values in (data.get("stages") or {}).items():
+            flat[f"{script}/{stage}"] = values["wall"]
+    return flat
+
+
+def compare(previous: dict | None, current: dict,
+            threshold: float = DEFAULT_THRESHOLD) -> list[str]:
+    """Regressionen von ``current`` gegenueber ``previous`` als Meldungen."""
+    if previous is None:
+        return []
+    if current.get("status") != "ok":
+        return [f"x{current['scale']}: Status {current.get('status')} "
+                f"(zuvor ok)"]
+    before, after = _metrics(previous), _metrics(current)
+    findings = []
+    for key, old in before.items():
+        new = after.get(key)
+        if new is None or max(old, new) < MIN_COMPARABLE_SECONDS:
+            continue
+        if new > old * (1 + threshold):
+            findings.append(f"x{current['scale']} {key}: {old:.3f}s -> {new:.3f}s "
+                            f"(+{(new / old - 1) * 100:.0f}%)")
+    return findings
+
+
+def _print_result(result: dict) -> None:
+    print(f"\nx{result['scale']}: {result.get('status')}")
+    if "rows" in result:
+        rows = result["rows"]
+        print(f"  Objekte {rows.get('M3GIM-Objekte.xlsx')}, "
+              f"Verknuepfungen {rows.get('M3GIM-Verknüpfungen.xlsx')}")
+    for script in ("transform", "build_views"):
+        data = result.get(script)
+        if not data:
+            continue
+        if data.get("status") != "ok":
+            print(f"  {script}: {data['status']} (Log: {data.get('log')})")
+            continue
+        rss = data.get("max_rss_kb")
+        rss_txt = f", max RSS {rss / 1024:.0f} MB" if rss else ""
+        print(f"  {script}: {data['wall']:.3f}s (Median){rss_txt}")
+        for stage, values in data["stages"].items():
+            peak = values.get("peak_kb")
+            peak_txt = f"  {peak / 1024:8.1f} MB" if peak is not None else ""
+            print(f"    {stage:<26} {values['wall']:>8.3f}s{peak_txt}")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="transform.py/build-views.py auf skalierten Daten messen")
+    parser.add_argument("--scale", type=int, action="append", dest="scales",
+                        metavar="N", help="Skalierung (mehrfach; Default: 1 und 10)")
+    parser.add_argument("--repeat", type=int, default=1,
+                        help="Zeit-Laeufe pro Script (Median wird gespeichert)")
+    parser.add_argument("--memory", action="store_true",
+                        help="zusaetzlicher Lauf mit tracemalloc fuer Peak pro Stage")
+    parser.add_argument("--warm", action="store_true",
+                        help="mit XLSX-Parse-Cache messen (Default: kalt)")
+    parser.add_argument("--shared-index", action="store_true",
+                        help="Indizes nicht mitskalieren (siehe generate-scaled-data.py)")
+    parser.add_argument("--timeout", type=float, default=None,
+                        help="Sekunden pro Script-Lauf, danach Abbruch (Status timeout)")
+    parser.add_argument("--history", type=Path, default=HISTORY_FILE,
+                        help="History-Datei (Default: data/reports/benchmark-history.json)")
+    parser.add_argument("--no-history", action="store_true",
+                        help="Ergebnis nicht speichern (nur ausgeben und vergleichen)")
+    parser.add_argument("--workdir", type=Path, default=WORK_DIR,
+                        help="Arbeitsverzeichnis fuer Sheets/Ausgaben")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="relative Verschlechterung, ab der gemeldet wird (0.2 = +20%%)")
+    parser.add_argument("--fail-on-regression", action="store_true",
+                        help="Exitcode 1 bei Regression")
+    parser.add_argument("--label", default=None, help="Freitext fuer den History-Eintrag")
+    args = parser.parse_args(argv)
+
+    scales = args.scales or DEFAULT_SCALES
+    if any(s < 1 for s in scales) or args.repeat < 1:
+        parser.error("--scale und --repeat muessen >= 1 sein")
+
+    print("=" * 60)
+    print("M³GIM Benchmark")
+    print("=" * 60)
+    print(f"Skalierungen: {', '.join(f'x{s}' for s in scales)}  "
+          f"(repeat {args.repeat}, {'warm' if args.warm else 'kalt'})")
+
+    history = load_history(args.history)
+    options = {"repeat": args.repeat, "warm": args.warm,
+               "shared_index": args.shared_index, "memory": args.memory}
+    results, findings = [], []
+    for scale in scales:
+        result = bench_scale(scale, args.workdir, args.repeat, args.timeout,
+                             args.memory, args.warm, args.shared_index)
+        _print_result(result)
+        findings += compare(previous_result(history, scale, options), result,
+                            args.threshold)
+        results.append(result)
+
+    pandas_version = None
+    try:
+        import pandas
+        pandas_version = pandas.__version__
+    except ImportError:
+        pass
+    entry = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "commit": _git_commit(),
+        "label": args.label,
+        "python": platform.python_version(),
+        "pandas": pandas_version,
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "options": options,
+        "results": results,
+    }
+
+    if findings:
+        print("\nREGRESSION:")
+        for line in findings:
+            print(f"  {line}")
+    else:
+        print("\nKeine Regression gegenueber dem letzten Lauf.")
+
+    if not args.no_history:
+        history.setdefault("runs", []).append(entry)
+        save_history(args.history, history)
+        print(f"History: {args.history} ({len(history['runs'])} Eintraege)")
+
+    if findings and args.fail_on_regression:
+        return 1
+    return 0 if all(r.get("status") == "ok" for r in results) else 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+M³GIM Kandidatenindex — Offline-Index fuer reconcile.py aus einem Wikidata-Dump.
+
+Filtert einen Wikidata-JSON-Dump (https://dumps.wikimedia.org/wikidatawiki/entities/,
+``latest-all.json.gz``/``.bz2``) auf Personen, Orte, Organisationen und
+musikalische Werke — genau die P31-Typen, die reconcile.py akzeptiert
+(Q_HUMAN, Q_GEOGRAPHIC, Q_ORGANIZATION, Q_MUSICAL_WORK) — schreibt den
+Auszug als JSONL und baut daraus den SQLite-Index (_candidate_index.py).
+Danach laeuft ``reconcile.py --index`` komplett ohne Netz.
+
+Der Auszug ist klein genug zum Aufheben; ``--from-extract`` baut den Index
+neu, ohne den Dump noch einmal zu lesen (z.B. mit anderer
+``--min-confidence``, die die Trefferschwelle des Blockings festlegt).
+
+Verwendung:
+    python scripts/build-candidate-index.py latest-all.json.gz
+    python scripts/build-candidate-index.py --from-extract data/output/.cache/wikidata/candidates.jsonl
+    python scripts/build-candidate-index.py DUMP --type person --type work --limit 100000
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+# Windows-Konsole: UTF-8 erzwingen
+if sys.stdout.encoding != "utf-8":
+    sys.stdout.reconfigure(encoding="utf-8")
+
+sys.path.insert(0, str(Path(__file__).parent))
+from _candidate_index import (EXTRACT_PATH, INDEX_PATH, build_index,  # noqa: E402
+                              extract_entity, iter_dump, open_dump)
+from _fuzzy_match import FUZZY_LOW_THRESHOLD  # noqa: E402
+from reconcile import Q_GEOGRAPHIC, Q_HUMAN, Q_MUSICAL_WORK, Q_ORGANIZATION  # noqa: E402
+
+# Art -> erlaubte P31-Werte (wie die Typpruefung in reconcile.py)
+CANDIDATE_TYPES = {
+    "person": {Q_HUMAN},
+    "location": set(Q_GEOGRAPHIC),
+    "org": set(Q_ORGANIZATION),
+    "work": set(Q_MUSICAL_WORK),
+}
+
+
+def _may_match(line: str, quoted: tuple) -> bool:
+    """Billiger Vorfilter vor json.loads: P31 und einer der Ziel-Typen im Text."""
+    return '"P31"' in line and any(q in line for q in quoted)
+
+
+def extract(dump: Path, out: Path, types: dict, limit: int | None = None) -> int:
+    """Dump -> JSONL-Auszug. Returns Anzahl Entitaeten."""
+    quoted = tuple(f'"{q}"' for allowed in types.values() for q in allowed)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    tmp = out.with_suffix(".tmp")
+    count = scanned = 0
+    start = time.monotonic()
+    with open_dump(dump) as src, open(tmp, "w", encoding="utf-8") as dst:
+        for line in src:
+            scanned += 1
+            if scanned % 1_000_000 == 0:
+                print(f"  {scanned:,} Zeilen, {count:,} Kandidaten "
+                      f"({time.monotonic() - start:.0f}s)", flush=True)
+            line = line.strip().rstrip(",")
+            if not line or line in ("[", "]") or not _may_match(line, quoted):
+                continue
+            record = extract_entity(json.loads(line), types)
+            if record is None:
+                continue
+            dst.write(json.dumps(record, ensure_ascii=False) + "\n")
+            count += 1
+            if limit and count >= limit:
+                break
+    tmp.replace(out)
+    return count
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="M³GIM Offline-Kandidatenindex fuer reconcile.py")
+    parser.add_argument("dump", nargs="?", type=Path,
+                        help="Wikidata-JSON-Dump (.json, .json.gz, .json.bz2)")
+    parser.add_argument("--from-extract", type=Path, default=None,
+                        help="Vorhandenen JSONL-Auszug indizieren (kein Dump noetig)")
+    parser.add_argument("--extract", type=Path, default=EXTRACT_PATH,
+                        help="Ziel des JSONL-Auszugs")
+    parser.add_argument("--index", type=Path, default=INDEX_PATH,
+                        help="Ziel des SQLite-Index")
+    parser.add_argument("--type", action="append", dest="types",
+                        choices=sorted(CANDIDATE_TYPES),
+                        help="Nur diese Arten (mehrfach moeglich; Default: alle)")
+    parser.add_argument("--min-confidence", type=int, default=FUZZY_LOW_THRESHOLD,
+                        help=f"Trefferschwelle des Blockings (default: {FUZZY_LOW_THRESHOLD})")
+    parser.add_argument("--limit", type=int, default=None,
+                        help="Nach N Kandidaten abbrechen (Tests, Stichproben)")
+    args = parser.parse_args(argv)
+
+    if (args.dump is None) == (args.from_extract is None):
+        parser.error("entweder DUMP oder --from-extract angeben")
+    types = {k: v for k, v in CANDIDATE_TYPES.items() if not args.types or k in args.types}
+
+    start = time.monotonic()
+    source = args.from_extract
+    if source is None:
+        print(f"Auszug: {args.dump} → {args.extract} ({', '.join(types)})")
+        count = extract(args.dump, args.extract, types, args.limit)
+        print(f"  {count:,} Kandidaten ({time.monotonic() - start:.1f}s)")
+        source = args.extract
+
+    print(f"Index: {source} → {args.index}")
+    stats = build_index(iter_dump(source), args.index,
+                        min_confidence=args.min_confidence, source=str(source))
+    print(f"  {stats['entities']:,} Entitaeten, {stats['names']:,} Labels/Aliase "
+          f"({time.monotonic() - start:.1f}s gesamt)")
+    print(f"\nreconcile: python scripts/reconcile.py --index {args.index}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -8,6 +8,8 @@ visualization code.
 
 Usage:
     python scripts/build-views.py
+    python scripts/build-views.py --trace [PATH]   # Stage-Zeiten/Peaks (_trace.py)
+    python scripts/build-views.py --incremental    # nur geaenderte Knoten neu
 
 Output:
     data/views/partitur.json   (Legacy — nicht im Frontend konsumiert)
@@ -19,21 +21,46 @@ Hinweis:
     partitur.json und sankey.json werden weiterhin erzeugt, sind aber
     im aktuellen Frontend nicht eingebunden. Matrix und Kosmos sind
     als Tabs ausgeblendet (hidden), der Code bleibt erhalten.
+
+Aufbau:
+    Alle Views entstehen in einem Durchlauf ueber den Graph (build_views):
+    jede View ist ein ViewAccumulator (visit pro Knoten, finish am Ende),
+    gemeinsame Felder (Jahr, Dokumenttyp, Titel-Komponist, ...) berechnet
+    NodeContext einmal pro Knoten. Neue View = Unterklasse + Eintrag in VIEWS.
+
+Inkrementell (--incremental):
+    visit() ist contribute() (Beitrag eines Knotens) + fold() (Aggregation).
+    Die Beitraege liegen pro @id in .cache/views-state.pickle, zusammen mit
+    dem Merkle-Baum des Graphs (_graph.py). Der naechste Lauf diffed die
+    Baeume (_graph_diff.diff_trees), berechnet nur geaenderte, neue und auf
+    sie verweisende Knoten neu, verwirft die entfernter und faltet den
+    Bestand in Graph-Reihenfolge — die Ausgabe ist identisch zum Vollbau.
 """
 
+import argparse
+import filecmp
 import os
 import json
+import pickle
 import re
 from pathlib import Path
 from collections import defaultdict
 from datetime import datetime
 
+import _graph_diff
+from _build_cache import file_digest, stable_digest
+from _graph import load_graph
+from _title_matcher import MultiPatternMatcher, PatternTable
+from _trace import Tracer
+
 # Paths
 SCRIPT_DIR = Path(__file__).parent
 PROJECT_ROOT = SCRIPT_DIR.parent
 _OUTPUT_BASE = Path(os.environ.get("M3GIM_OUTPUT_DIR", PROJECT_ROOT / 'data' / 'output'))
 INPUT_FILE = Path(os.environ.get("M3GIM_JSONLD_PATH", _OUTPUT_BASE / 'm3gim.jsonld'))
 OUTPUT_DIR = _OUTPUT_BASE / 'views'
+TRACE_PATH = _OUTPUT_BASE / '.cache' / 'trace-build-views.json'
+STATE_PATH = _OUTPUT_BASE / '.cache' / 'views-state.pickle'
 
 # =============================================================================
 # STATIC DATA: Lebensphasen (based on biographical research)
@@ -334,12 +361,11 @@ def get_komponist_from_title(title):
     """Try to determine composer from title."""
     if not title:
         return None
+    return _komponist_from_title_lower(title.lower())
 
-    title_lower = title.lower()
-    for keyword, komponist in KOMPONISTEN_MAPPING.items():
-        if keyword in title_lower:
-            return komponist
-    return None
+
+def _komponist_from_title_lower(title_lower):
+    return KOMPONISTEN_TABLE.first(TITLE_MATCHER.findall(title_lower))
 
 
 def get_person_kategorie(name):
@@ -347,11 +373,8 @@ def get_person_kategorie(name):
     if not name:
         return 'Andere'
 
-    name_lower = name.lower()
-    for keyword, kategorie in PERSONEN_KATEGORIEN.items():
-        if keyword in name_lower:
-            return kategorie
-    return 'Andere'
+    kategorie = PERSONEN_TABLE.first(TITLE_MATCHER.findall(name.lower()))
+    return kategorie or 'Andere'
 
 
 def ensure_list(value):
@@ -404,6 +427,164 @@ def normalize_komponist(name):
     return KOMPONISTEN_NORMALISIERUNG.get(name.strip().lower(), name.strip())
 
 
+# =============================================================================
+# TITEL-MUSTER: alle Schluesselwort-Tabellen, ein Matcher
+# =============================================================================
+
+# Kosmos: extended work patterns (from analysis)
+KOSMOS_WERK_PATTERNS = {
+    'ring': 'Der Ring des Nibelungen',
+    'walküre': 'Die Walküre',
+    'rheingold': 'Das Rheingold',
+    'götterdämmerung': 'Götterdämmerung',
+    'siegfried': 'Siegfried',
+    'meistersinger': 'Die Meistersinger',
+    'tristan': 'Tristan und Isolde',
+    'tannhäuser': 'Tannhäuser',
+    'lohengrin': 'Lohengrin',
+    'parsifal': 'Parsifal',
+    'aida': 'Aida',
+    'trovatore': 'Il Trovatore',
+    'maskenball': 'Ein Maskenball',
+    'don carlos': 'Don Carlos',
+    'macbeth': 'Macbeth',
+    'falstaff': 'Falstaff',
+    'traviata': 'La Traviata',
+    'rosenkavalier': 'Der Rosenkavalier',
+    'elektra': 'Elektra',
+    'salome': 'Salome',
+    'arabella': 'Arabella',
+    'capriccio': 'Capriccio',
+    'frau ohne schatten': 'Die Frau ohne Schatten',
+    'orpheus': 'Orfeo ed Euridice',
+    'orfeo': 'Orfeo ed Euridice',
+    'julius cäsar': 'Giulio Cesare',
+    'carmen': 'Carmen'
+}
+
+# Kosmos: known roles (from analysis)
+KOSMOS_ROLLEN_PATTERNS = {
+    'fricka': 'Fricka',
+    'waltraute': 'Waltraute',
+    'erda': 'Erda',
+    'brangäne': 'Brangäne',
+    'amneris': 'Amneris',
+    'azucena': 'Azucena',
+    'ulrica': 'Ulrica',
+    'eboli': 'Eboli',
+    'octavian': 'Octavian',
+    'klytämnestra': 'Klytämnestra',
+    'herodias': 'Herodias',
+    'kabanicha': 'Kabanicha',
+    'orlofsky': 'Orlofsky'
+}
+
+# Kosmos: location patterns
+KOSMOS_ORTE_PATTERNS = {
+    'bayreuth': 'Bayreuth',
+    'münchen': 'München',
+    'wien': 'Wien',
+    'salzburg': 'Salzburg',
+    'zürich': 'Zürich',
+    'graz': 'Graz',
+    'buenos aires': 'Buenos Aires'
+}
+
+# Sankey: known locations in titles and location names
+SANKEY_ORTE_PATTERNS = {
+    'wien': 'Wien',
+    'vienna': 'Wien',
+    'bayreuth': 'Bayreuth',
+    'münchen': 'München',
+    'munich': 'München',
+    'salzburg': 'Salzburg',
+    'graz': 'Graz'
+}
+
+KOMPONISTEN_TABLE = PatternTable(KOMPONISTEN_MAPPING)
+PERSONEN_TABLE = PatternTable(PERSONEN_KATEGORIEN)
+KOSMOS_WERK_TABLE = PatternTable(KOSMOS_WERK_PATTERNS)
+KOSMOS_ROLLEN_TABLE = PatternTable(KOSMOS_ROLLEN_PATTERNS)
+KOSMOS_ORTE_TABLE = PatternTable(KOSMOS_ORTE_PATTERNS)
+SANKEY_ORTE_TABLE = PatternTable(SANKEY_ORTE_PATTERNS)
+
+# Ein Durchlauf pro Titel liefert die Treffer fuer alle Tabellen
+# (NodeContext.title_hits); die Tabellen werten nur noch Treffer aus.
+TITLE_MATCHER = MultiPatternMatcher(
+    key
+    for table in (KOMPONISTEN_TABLE, PERSONEN_TABLE, KOSMOS_WERK_TABLE,
+                  KOSMOS_ROLLEN_TABLE, KOSMOS_ORTE_TABLE, SANKEY_ORTE_TABLE)
+    for key in table.keys()
+)
+
+
+# =============================================================================
+# GRAPH-DURCHLAUF: ein Pass, gemeinsame abgeleitete Felder
+# =============================================================================
+
+class NodeContext:
+    """A graph node plus the derived fields the views share.
+
+    The fields are computed once when the node is visited, so helpers such as
+    extract_year, get_dokumenttyp or title matching run once per node instead
+    of once per view. Eager on purpose: nearly every view reads nearly every
+    field, and plain slots are much cheaper than lazy properties here.
+    """
+
+    __slots__ = ('node', 'is_recordset', 'title', 'title_lower', 'signatur',
+                 'year', 'doc_type', 'title_hits', 'komponist', 'subjects',
+                 'locations', 'agents', 'performance_roles', 'stes')
+
+    def __init__(self, node, stes=None):
+        self.node = node
+        # SpatiotemporalEvents of the whole graph by @id (for auftritte)
+        self.stes = stes if stes is not None else {}
+        self.is_recordset = node.get('@type') == 'rico:RecordSet'
+        self.title = node.get('rico:title', '')
+        self.title_lower = (node.get('rico:title') or '').lower()
+        self.signatur = node.get('rico:identifier')
+        self.year = extract_year(node.get('rico:date'))
+        self.doc_type = get_dokumenttyp(node)
+        # All TITLE_MATCHER keywords in the title, one scan for every table
+        self.title_hits = TITLE_MATCHER.findall(self.title_lower)
+        # Composer matched from the title (KOMPONISTEN_MAPPING)
+        self.komponist = KOMPONISTEN_TABLE.first(self.title_hits)
+        self.subjects = ensure_list(node.get('rico:hasOrHadSubject'))
+        self.locations = ensure_list(node.get('rico:hasOrHadLocation'))
+        self.agents = ensure_list(node.get('m3gim:hasAssociatedAgent'))
+        self.performance_roles = ensure_list(node.get('m3gim:hasPerformanceRole'))
+
+
+class ViewAccumulator:
+    """One view: sees every graph node exactly once, then builds its document.
+
+    A new view subclasses this, implements contribute()/fold()/finish() and
+    is added to VIEWS; build_views() drives all of them in the same traversal.
+    A node's contribution depends on the node alone (plus the STEs it
+    references), so --incremental can persist it and only recompute the
+    contributions of changed nodes (build_views_incremental).
+    """
+
+    name = None
+
+    def visit(self, ctx):
+        contribution = self.contribute(ctx)
+        if contribution is not None:
+            self.fold(contribution)
+
+    def contribute(self, ctx):
+        """What this node adds to the view (picklable, None = nothing)."""
+        raise NotImplementedError
+
+    def fold(self, contribution):
+        """Add one node's contribution to the aggregates (graph order)."""
+        raise NotImplementedError
+
+    def finish(self, source_records):
+        """Return the view document; ``source_records`` = graph size."""
+        raise NotImplementedError
+
+
 # =============================================================================
 # AUFTRITTS-EXTRAKTION
 # =============================================================================
@@ -418,13 +599,13 @@ def _get_lebensphase(year):
     return None
 
 
-def _extract_ort_from_record(record):
+def _extract_ort_from_record(ctx):
     """Extract performance location from record (structured data)."""
     ort = None
     ort_detail = None
 
     # 1. Check rico:hasOrHadLocation with role auffuehrungsort
-    locations = ensure_list(record.get('rico:hasOrHadLocation'))
+    locations = ctx.locations
     for loc in locations:
         if isinstance(loc, dict):
             role = (loc.get('role') or '').lower()
@@ -434,8 +615,7 @@ def _extract_ort_from_record(record):
 
     # 2. Check agents with role auffuehrungsort (institutions as venues)
     if not ort:
-        agents = ensure_list(record.get('m3gim:hasAssociatedAgent'))
-        for agent in agents:
+        for agent in ctx.agents:
             if isinstance(agent, dict):
                 role = (agent.get('role') or '').lower()
                 if role == 'auffuehrungsort':
@@ -467,15 +647,14 @@ def _extract_ort_from_record(record):
     return ort, ort_detail
 
 
-def _extract_werk_from_record(record):
+def _extract_werk_from_record(ctx):
     """Extract musical work + composer from record."""
     werk = None
     komponist = None
     gattung = None
 
     # 1. Structured: rico:hasOrHadSubject with @type m3gim:MusicalWork
-    subjects = ensure_list(record.get('rico:hasOrHadSubject'))
-    for subj in subjects:
+    for subj in ctx.subjects:
         if isinstance(subj, dict) and subj.get('@type') == 'm3gim:MusicalWork':
             werk = subj.get('name', '')
             komponist = normalize_komponist(subj.get('komponist', ''))
@@ -483,14 +662,13 @@ def _extract_werk_from_record(record):
 
     # 2. Fallback: title-matching
     if not komponist:
-        komponist = get_komponist_from_title(record.get('rico:title'))
+        komponist = ctx.komponist
 
     # Determine gattung
-    title_lower = (record.get('rico:title') or '').lower()
-    roles = ensure_list(record.get('m3gim:hasPerformanceRole'))
+    title_lower = ctx.title_lower
     has_character_role = any(
         isinstance(r, dict) and r.get('name', '') and r.get('name', '') not in ('Alt Solo',)
-        for r in roles
+        for r in ctx.performance_roles
     )
 
     if any(kw in title_lower for kw in OPER_KEYWORDS) or has_character_role:
@@ -505,9 +683,9 @@ def _extract_werk_from_record(record):
     return werk, komponist, gattung
 
 
-def _extract_rolle_from_record(record):
+def _extract_rolle_from_record(ctx):
     """Extract Malaniuk's performance role from record."""
-    roles = ensure_list(record.get('m3gim:hasPerformanceRole'))
+    roles = ctx.performance_roles
     for role in roles:
         if isinstance(role, dict):
             role_type = (role.get('role') or '').lower()
@@ -519,10 +697,8 @@ def _extract_rolle_from_record(record):
     return None
 
 
-def _categorize_auftritt(ort, jahr, title, roles_raw):
+def _categorize_auftritt(ort, jahr, title_lower, roles):
     """Determine auftritt category: engagement, festspiel, gastspiel, konzert."""
-    title_lower = (title or '').lower()
-
     # 1. Festspiel-Orte
     if ort in FESTSPIEL_ORTE:
         return 'festspiel'
@@ -532,7 +708,6 @@ def _categorize_auftritt(ort, jahr, title, roles_raw):
         return 'festspiel'
 
     # 3. Gastspiel role in performance roles
-    roles = ensure_list(roles_raw)
     for r in roles:
         if isinstance(r, dict) and (r.get('role') or '').lower() == 'gastspiel':
             return 'gastspiel'
@@ -555,176 +730,213 @@ def _categorize_auftritt(ort, jahr, title, roles_raw):
     return 'gastspiel'
 
 
-def extract_auftritte(records):
-    """
-    Extract performance events from archive records.
+VENUE_MAP = {
+    'wiener staatsoper': 'Wien',
+    'staatsoper wien': 'Wien',
+    'volksoper': 'Wien',
+    'bayerische staatsoper': 'München',
+    'prinzregententheater': 'München',
+    'festspielhaus': 'Bayreuth',
+    'mozarteum': 'Salzburg',
+    'tonhalle': 'Zürich',
+    'grazer oper': 'Graz',
+    'opernhaus graz': 'Graz',
+}
 
-    Three-pass extraction:
+
+def _auftritt_from_record(ctx, ste_by_id):
+    """Performance event for one record, or None.
+
+    Three criteria (any suffices):
     - Pass 1: Structured data (DatedEvent/STE date + location + work)
     - Pass 2: Programmhefte + Plakate (title parsing)
     - Pass 3: Rezensionen with performance context
-
-    Returns deduplicated list of performance events.
     """
-    raw_auftritte = []
-    seen_records = set()
-
-    # E-102: ort,datum-Daten leben (dedupliziert) im SpatiotemporalEvent, nicht
-    # mehr in einem record-seitigen Datumsfeld. Lookup, um deren atDate als
-    # Datumsquelle der Auftritte aufzuloesen.
-    ste_by_id = {
-        n['@id']: n for n in records
-        if isinstance(n, dict) and n.get('@type') == 'm3gim:SpatiotemporalEvent'
-    }
+    record = ctx.node
+    signatur = record.get('rico:identifier', '')
+    title = ctx.title
+    doc_type = ctx.doc_type
+
+    # Extract year from DatedEvent dateValue (preferred) or rico:date.
+    # E-102: das fruehere generische m3gim:eventDate ist in der Fallback-
+    # Klasse m3gim:hasDatedEvent (dateValue) aufgegangen.
+    jahr = None
+    datum = None
+    event_dates = [
+        de.get('m3gim:dateValue')
+        for de in ensure_list(record.get('m3gim:hasDatedEvent'))
+        if isinstance(de, dict) and isinstance(de.get('m3gim:dateValue'), str)
+    ]
+    # ort,datum-Daten aus den referenzierten SpatiotemporalEvents nachziehen.
+    for ref in ensure_list(record.get('m3gim:hasSpatiotemporalEvent')):
+        ste = ste_by_id.get(ref.get('@id')) if isinstance(ref, dict) else None
+        if ste and isinstance(ste.get('m3gim:atDate'), str):
+            event_dates.append(ste['m3gim:atDate'])
+    for ed in event_dates:
+        if isinstance(ed, str):
+            j = extract_year(ed)
+            if j:
+                jahr = j
+                datum = ed.split('/')[0] if '/' in ed else ed  # first date
+                break
 
-    for record in records:
-        if record.get('@type') == 'rico:RecordSet':
-            continue
-
-        rec_id = record.get('@id', '')
-        signatur = record.get('rico:identifier', '')
-        title = record.get('rico:title', '')
-        doc_type = get_dokumenttyp(record)
-
-        # Extract year from DatedEvent dateValue (preferred) or rico:date.
-        # E-102: das fruehere generische m3gim:eventDate ist in der Fallback-
-        # Klasse m3gim:hasDatedEvent (dateValue) aufgegangen.
-        jahr = None
-        datum = None
-        event_dates = [
-            de.get('m3gim:dateValue')
-            for de in ensure_list(record.get('m3gim:hasDatedEvent'))
-            if isinstance(de, dict) and isinstance(de.get('m3gim:dateValue'), str)
-        ]
-        # ort,datum-Daten aus den referenzierten SpatiotemporalEvents nachziehen.
-        for ref in ensure_list(record.get('m3gim:hasSpatiotemporalEvent')):
-            ste = ste_by_id.get(ref.get('@id')) if isinstance(ref, dict) else None
-            if ste and isinstance(ste.get('m3gim:atDate'), str):
-                event_dates.append(ste['m3gim:atDate'])
-        for ed in event_dates:
-            if isinstance(ed, str):
-                j = extract_year(ed)
-                if j:
-                    jahr = j
-                    datum = ed.split('/')[0] if '/' in ed else ed  # first date
-                    break
+    if not jahr:
+        rico_date = record.get('rico:date')
+        if rico_date:
+            jahr = ctx.year
+            datum = rico_date
+
+    if not jahr or jahr < 1935 or jahr > 2009:
+        return None
 
-        if not jahr:
-            rico_date = record.get('rico:date')
-            if rico_date:
-                jahr = extract_year(rico_date)
-                datum = rico_date
-
-        if not jahr or jahr < 1935 or jahr > 2009:
-            continue
-
-        # Extract components
-        ort, ort_detail = _extract_ort_from_record(record)
-        werk, komponist, gattung = _extract_werk_from_record(record)
-        rolle = _extract_rolle_from_record(record)
-
-        # Pass 1: Structured data (DatedEvent/STE date + location/agent auffuehrungsort)
-        has_event_date = len(event_dates) > 0
-        has_perf_context = ort is not None or werk is not None
-
-        # Pass 2: Programmhefte + Plakate
-        is_performance_doc = doc_type in ('programmheft', 'plakat')
-
-        # Pass 3: Rezensionen with work reference
-        is_perf_rezension = (doc_type == 'rezension' and
-                             (werk is not None or komponist is not None))
-
-        if not (has_event_date and has_perf_context) and \
-           not is_performance_doc and \
-           not is_perf_rezension:
-            continue
-
-        if rec_id in seen_records:
-            continue
-        seen_records.add(rec_id)
-
-        # Try to infer ort from title for programmhefte/plakate if missing
-        if not ort and title:
-            title_lower = title.lower()
-            for city in LOCATION_ORDER:
-                if city.lower() in title_lower:
+    # Extract components
+    ort, ort_detail = _extract_ort_from_record(ctx)
+    werk, komponist, gattung = _extract_werk_from_record(ctx)
+    rolle = _extract_rolle_from_record(ctx)
+
+    # Pass 1: Structured data (DatedEvent/STE date + location/agent auffuehrungsort)
+    has_event_date = len(event_dates) > 0
+    has_perf_context = ort is not None or werk is not None
+
+    # Pass 2: Programmhefte + Plakate
+    is_performance_doc = doc_type in ('programmheft', 'plakat')
+
+    # Pass 3: Rezensionen with work reference
+    is_perf_rezension = (doc_type == 'rezension' and
+                         (werk is not None or komponist is not None))
+
+    if not (has_event_date and has_perf_context) and \
+       not is_performance_doc and \
+       not is_perf_rezension:
+        return None
+
+    # Try to infer ort from title for programmhefte/plakate if missing
+    if not ort and title:
+        title_lower = ctx.title_lower
+        for city in LOCATION_ORDER:
+            if city.lower() in title_lower:
+                ort = city
+                break
+        # Check common venue names
+        if not ort:
+            for venue, city in VENUE_MAP.items():
+                if venue in title_lower:
                     ort = city
+                    ort_detail = venue.title()
                     break
-            # Check common venue names
-            if not ort:
-                venue_map = {
-                    'wiener staatsoper': 'Wien',
-                    'staatsoper wien': 'Wien',
-                    'volksoper': 'Wien',
-                    'bayerische staatsoper': 'München',
-                    'prinzregententheater': 'München',
-                    'festspielhaus': 'Bayreuth',
-                    'mozarteum': 'Salzburg',
-                    'tonhalle': 'Zürich',
-                    'grazer oper': 'Graz',
-                    'opernhaus graz': 'Graz',
-                }
-                for venue, city in venue_map.items():
-                    if venue in title_lower:
-                        ort = city
-                        ort_detail = venue.title()
-                        break
-
-        kategorie = _categorize_auftritt(ort, jahr, title, record.get('m3gim:hasPerformanceRole'))
-
-        raw_auftritte.append({
-            'ort': ort,
-            'ort_detail': ort_detail,
-            'kategorie': kategorie,
-            'werk': werk,
-            'komponist': komponist,
-            'rolle': rolle,
-            'jahr': jahr,
-            'datum': datum,
-            'phase': _get_lebensphase(jahr),
-            'dokumente': [signatur],
-            'gattung': gattung,
-            'titel': title[:80] if title else None,
-        })
 
-    # Deduplicate: merge records with same (ort, jahr, werk)
-    dedup = {}
-    for a in raw_auftritte:
-        key = (a['ort'] or '', a['jahr'], a['werk'] or '')
-        if key in dedup:
-            existing = dedup[key]
-            for sig in a['dokumente']:
-                if sig not in existing['dokumente']:
-                    existing['dokumente'].append(sig)
-            # Upgrade fields if missing
-            if not existing['rolle'] and a['rolle']:
-                existing['rolle'] = a['rolle']
-            if not existing['ort_detail'] and a['ort_detail']:
-                existing['ort_detail'] = a['ort_detail']
-            if not existing['gattung'] and a['gattung']:
-                existing['gattung'] = a['gattung']
-        else:
-            dedup[key] = a
+    kategorie = _categorize_auftritt(ort, jahr, ctx.title_lower, ctx.performance_roles)
 
-    result = sorted(dedup.values(), key=lambda x: (x['jahr'], x['ort'] or ''))
+    return {
+        'ort': ort,
+        'ort_detail': ort_detail,
+        'kategorie': kategorie,
+        'werk': werk,
+        'komponist': komponist,
+        'rolle': rolle,
+        'jahr': jahr,
+        'datum': datum,
+        'phase': _get_lebensphase(jahr),
+        'dokumente': [signatur],
+        'gattung': gattung,
+        'titel': title[:80] if title else None,
+    }
 
-    # Log statistics
-    cats = defaultdict(int)
-    for a in result:
-        cats[a['kategorie']] += 1
-    print(f'  Auftritte: {len(result)} total — ' +
-          ', '.join(f'{k}: {v}' for k, v in sorted(cats.items())))
 
-    return result
+STE_TYPE = 'm3gim:SpatiotemporalEvent'
+
+
+def index_stes(nodes):
+    """SpatiotemporalEvents by @id (NodeContext.stes)."""
+    return {n['@id']: n for n in nodes if n.get('@type') == STE_TYPE}
+
+
+class AuftrittCollector:
+    """Collects performance events during the graph traversal.
+
+    E-102: ort,datum-Daten leben (dedupliziert) im SpatiotemporalEvent, nicht
+    in einem record-seitigen Datumsfeld. Die STE-Knoten stehen im Graph hinter
+    den Records; aufgeloest wird deshalb ueber ``ctx.stes`` (alle STEs des
+    Graphs, vorab indiziert). Die Reihenfolge bleibt die des Graphs.
+    """
+
+    def __init__(self):
+        # Pro Record in Graph-Reihenfolge: (rec_id, auftritt)
+        self.slots = []
+
+    def contribute(self, ctx):
+        if ctx.is_recordset:
+            return None
+        auftritt = _auftritt_from_record(ctx, ctx.stes)
+        if auftritt is None:
+            return None
+        return (ctx.node.get('@id', ''), auftritt)
+
+    def visit(self, ctx):
+        slot = self.contribute(ctx)
+        if slot is not None:
+            self.slots.append(slot)
+
+    def finish(self):
+        """Deduplicated list of performance events, sorted by (jahr, ort)."""
+        raw_auftritte = []
+        seen_records = set()
+        for rec_id, item in self.slots:
+            if rec_id in seen_records:
+                continue
+            seen_records.add(rec_id)
+            raw_auftritte.append(item)
+
+        # Deduplicate: merge records with same (ort, jahr, werk). Die Slots
+        # koennen aus dem persistierten Zustand stammen (--incremental):
+        # gemergt wird in Kopien.
+        dedup = {}
+        for a in raw_auftritte:
+            a = dict(a, dokumente=list(a['dokumente']))
+            key = (a['ort'] or '', a['jahr'], a['werk'] or '')
+            if key in dedup:
+                existing = dedup[key]
+                for sig in a['dokumente']:
+                    if sig not in existing['dokumente']:
+                        existing['dokumente'].append(sig)
+                # Upgrade fields if missing
+                if not existing['rolle'] and a['rolle']:
+                    existing['rolle'] = a['rolle']
+                if not existing['ort_detail'] and a['ort_detail']:
+                    existing['ort_detail'] = a['ort_detail']
+                if not existing['gattung'] and a['gattung']:
+                    existing['gattung'] = a['gattung']
+            else:
+                dedup[key] = a
+
+        result = sorted(dedup.values(), key=lambda x: (x['jahr'], x['ort'] or ''))
+
+        # Log statistics
+        cats = defaultdict(int)
+        for a in result:
+            cats[a['kategorie']] += 1
+        print(f'  Auftritte: {len(result)} total — ' +
+              ', '.join(f'{k}: {v}' for k, v in sorted(cats.items())))
+
+        return result
+
+
+def extract_auftritte(records):
+    """Extract deduplicated performance events from archive records."""
+    collector = AuftrittCollector()
+    stes = index_stes(records)
+    for record in records:
+        collector.visit(NodeContext(record, stes))
+    return collector.finish()
 
 
 # =============================================================================
-# VIEW BUILDERS
+# VIEWS
 # =============================================================================
 
-def build_partitur(records):
+class PartiturView(ViewAccumulator):
     """
-    Build data for Mobilitäts-Partitur visualization.
+    Mobilitäts-Partitur visualization.
 
     Structure:
     - lebensphasen: Static biographical phases
@@ -734,160 +946,167 @@ def build_partitur(records):
     - repertoire: Roles/works over time
     - dokumente: Document count per year
     """
-    print('Building partitur.json...')
-
-    # Aggregate documents per year
-    docs_per_year = defaultdict(int)
-    for record in records:
-        year = extract_year(record.get('rico:date'))
-        if year:
-            docs_per_year[year] += 1
 
-    # Extract repertoire from titles
-    repertoire = []
-    for record in records:
-        komponist = get_komponist_from_title(record.get('rico:title'))
-        if komponist:
-            year = extract_year(record.get('rico:date'))
-            if year:
-                repertoire.append({
-                    'komponist': komponist,
-                    'jahr': year,
-                    'signatur': record.get('rico:identifier'),
-                    'titel': record.get('rico:title', '')[:100],
-                    'typ': get_dokumenttyp(record)
-                })
+    name = 'partitur'
 
-    # Aggregate repertoire by composer and year range
-    komponist_jahre = defaultdict(lambda: {'min': 9999, 'max': 0, 'count': 0, 'dokumente': []})
-    for item in repertoire:
-        k = item['komponist']
-        komponist_jahre[k]['min'] = min(komponist_jahre[k]['min'], item['jahr'])
-        komponist_jahre[k]['max'] = max(komponist_jahre[k]['max'], item['jahr'])
-        komponist_jahre[k]['count'] += 1
-        komponist_jahre[k]['dokumente'].append({
-            'signatur': item['signatur'],
-            'titel': item['titel'],
-            'typ': item.get('typ', 'Unknown')
-        })
+    def __init__(self):
+        self.docs_per_year = defaultdict(int)
+        # Repertoire aggregated by composer and year range
+        self.komponist_jahre = defaultdict(
+            lambda: {'min': 9999, 'max': 0, 'count': 0, 'dokumente': []})
+        self.auftritte = AuftrittCollector()
 
-    repertoire_aggregated = [
-        {
-            'komponist': k,
-            'farbe': KOMPONISTEN_FARBEN.get(k, '#757575'),
-            'von': v['min'],
-            'bis': v['max'],
-            'dokumente': v['count'],
-            'dokumente_liste': v['dokumente'][:20]  # Full doc refs for click-through
-        }
-        for k, v in komponist_jahre.items()
-        if v['min'] < 9999
-    ]
+    def contribute(self, ctx):
+        contribution = {}
+        year = ctx.year
+        if year:
+            contribution['year'] = year
+            # Repertoire from titles
+            if ctx.komponist:
+                contribution['komponist'] = (ctx.komponist, {
+                    'signatur': ctx.signatur,
+                    'titel': ctx.title[:100],
+                    'typ': ctx.doc_type
+                })
+        slot = self.auftritte.contribute(ctx)
+        if slot is not None:
+            contribution['auftritt'] = slot
+        return contribution or None
 
-    # Mobility events with narrative context
-    mobilitaet = [
-        {
-            'von': 'Lemberg',
-            'nach': 'Wien',
-            'jahr': 1944,
-            'form': 'erzwungen',
-            'beschreibung': 'Flucht vor der Roten Armee',
-            'kontext': 'Abbruch des Studiums am Konservatorium Lemberg, Verlust aller lokalen Netzwerke. 11 Dokumente aus 1944 belegen die dichteste Überlieferung vor 1950.'
-        },
-        {
-            'von': 'Wien',
-            'nach': 'Graz',
-            'jahr': 1945,
-            'form': 'geografisch',
-            'beschreibung': 'Erstes Engagement',
-            'kontext': 'Engagement als Altistin an der Grazer Oper — Graz als Sprungbrett für die internationale Karriere.'
-        },
-        {
-            'von': 'Graz',
-            'nach': 'Wien',
-            'jahr': 1950,
-            'form': 'geografisch',
-            'beschreibung': 'Wiener Staatsoper',
-            'kontext': 'Wechsel an die Wiener Staatsoper markiert den Beginn der Aufstiegsphase. Netzwerk-Intensität verdoppelt sich (7 → 46).'
-        },
-        {
-            'von': 'Wien',
-            'nach': 'Bayreuth',
-            'jahr': 1952,
-            'form': 'geografisch',
-            'beschreibung': 'Bayreuther Festspiele Debüt',
-            'kontext': 'Internationaler Durchbruch. Zusammenarbeit mit Wieland Wagner und Knappertsbusch beginnt.'
-        },
-        {
-            'von': 'Wien',
-            'nach': 'Zürich',
-            'jahr': 1970,
-            'form': 'lebensstil',
-            'beschreibung': 'Übersiedlung (Ehemann)',
-            'kontext': 'Rückzug aus dem aktiven Bühnenleben. Gleichzeitig Beginn der Lehrtätigkeit an der KUG Graz.'
-        },
-        {
-            'von': 'Lemberg',
-            'nach': 'Wien',
-            'jahr': 1950,
-            'form': 'national',
-            'beschreibung': 'Staatsbürgerschaft durch Heirat'
-        },
-        {
-            'von': 'Zürich',
-            'nach': 'Graz',
-            'jahr': 1970,
-            'form': 'bildung',
-            'beschreibung': 'Professur für Liedinterpretation, KUG Graz',
-            'kontext': 'Wissenstransfer: Erfahrung aus internationaler Karriere fließt in die Lehre. Graz als Ort der Rückkehr.'
-        }
-    ]
+    def fold(self, contribution):
+        year = contribution.get('year')
+        if year:
+            # Aggregate documents per year
+            self.docs_per_year[year] += 1
+            if 'komponist' in contribution:
+                komponist, doc = contribution['komponist']
+                entry = self.komponist_jahre[komponist]
+                entry['min'] = min(entry['min'], year)
+                entry['max'] = max(entry['max'], year)
+                entry['count'] += 1
+                entry['dokumente'].append(doc)
+        if 'auftritt' in contribution:
+            self.auftritte.slots.append(contribution['auftritt'])
+
+    def finish(self, source_records):
+        docs_per_year = self.docs_per_year
+
+        repertoire_aggregated = [
+            {
+                'komponist': k,
+                'farbe': KOMPONISTEN_FARBEN.get(k, '#757575'),
+                'von': v['min'],
+                'bis': v['max'],
+                'dokumente': v['count'],
+                'dokumente_liste': v['dokumente'][:20]  # Full doc refs for click-through
+            }
+            for k, v in self.komponist_jahre.items()
+            if v['min'] < 9999
+        ]
 
-    # Network density per period (simplified - count documents as proxy)
-    perioden = ['1940-1944', '1945-1949', '1950-1954', '1955-1959',
-                '1960-1964', '1965-1969', '1970-1974']
-    netzwerk = []
-    for periode in perioden:
-        start, end = map(int, periode.split('-'))
-        count = sum(docs_per_year[y] for y in range(start, end + 1))
-        netzwerk.append({
-            'periode': periode,
-            'intensitaet': count
-        })
+        # Mobility events with narrative context
+        mobilitaet = [
+            {
+                'von': 'Lemberg',
+                'nach': 'Wien',
+                'jahr': 1944,
+                'form': 'erzwungen',
+                'beschreibung': 'Flucht vor der Roten Armee',
+                'kontext': 'Abbruch des Studiums am Konservatorium Lemberg, Verlust aller lokalen Netzwerke. 11 Dokumente aus 1944 belegen die dichteste Überlieferung vor 1950.'
+            },
+            {
+                'von': 'Wien',
+                'nach': 'Graz',
+                'jahr': 1945,
+                'form': 'geografisch',
+                'beschreibung': 'Erstes Engagement',
+                'kontext': 'Engagement als Altistin an der Grazer Oper — Graz als Sprungbrett für die internationale Karriere.'
+            },
+            {
+                'von': 'Graz',
+                'nach': 'Wien',
+                'jahr': 1950,
+                'form': 'geografisch',
+                'beschreibung': 'Wiener Staatsoper',
+                'kontext': 'Wechsel an die Wiener Staatsoper markiert den Beginn der Aufstiegsphase. Netzwerk-Intensität verdoppelt sich (7 → 46).'
+            },
+            {
+                'von': 'Wien',
+                'nach': 'Bayreuth',
+                'jahr': 1952,
+                'form': 'geografisch',
+                'beschreibung': 'Bayreuther Festspiele Debüt',
+                'kontext': 'Internationaler Durchbruch. Zusammenarbeit mit Wieland Wagner und Knappertsbusch beginnt.'
+            },
+            {
+                'von': 'Wien',
+                'nach': 'Zürich',
+                'jahr': 1970,
+                'form': 'lebensstil',
+                'beschreibung': 'Übersiedlung (Ehemann)',
+                'kontext': 'Rückzug aus dem aktiven Bühnenleben. Gleichzeitig Beginn der Lehrtätigkeit an der KUG Graz.'
+            },
+            {
+                'von': 'Lemberg',
+                'nach': 'Wien',
+                'jahr': 1950,
+                'form': 'national',
+                'beschreibung': 'Staatsbürgerschaft durch Heirat'
+            },
+            {
+                'von': 'Zürich',
+                'nach': 'Graz',
+                'jahr': 1970,
+                'form': 'bildung',
+                'beschreibung': 'Professur für Liedinterpretation, KUG Graz',
+                'kontext': 'Wissenstransfer: Erfahrung aus internationaler Karriere fließt in die Lehre. Graz als Ort der Rückkehr.'
+            }
+        ]
 
-    # Extract performance events
-    auftritte = extract_auftritte(records)
+        # Network density per period (simplified - count documents as proxy)
+        perioden = ['1940-1944', '1945-1949', '1950-1954', '1955-1959',
+                    '1960-1964', '1965-1969', '1970-1974']
+        netzwerk = []
+        for periode in perioden:
+            start, end = map(int, periode.split('-'))
+            count = sum(docs_per_year[y] for y in range(start, end + 1))
+            netzwerk.append({
+                'periode': periode,
+                'intensitaet': count
+            })
 
-    return {
-        'lebensphasen': LEBENSPHASEN,
-        'orte': [
-            {'ort': 'Lemberg', 'typ': 'wohnort', 'von': 1919, 'bis': 1944},
-            {'ort': 'Wien', 'typ': 'wohnort', 'von': 1944, 'bis': 1950},
-            {'ort': 'Graz', 'typ': 'wohnort', 'von': 1945, 'bis': 1950},
-            {'ort': 'Wien', 'typ': 'wohnort', 'von': 1950, 'bis': 1970},
-            {'ort': 'Zürich', 'typ': 'wohnort', 'von': 1970, 'bis': 2009},
-            {'ort': 'Bayreuth', 'typ': 'auffuehrungsort', 'von': 1952, 'bis': 1968},
-            {'ort': 'München', 'typ': 'auffuehrungsort', 'von': 1953, 'bis': 1968},
-            {'ort': 'Salzburg', 'typ': 'auffuehrungsort', 'von': 1955, 'bis': 1965}
-        ],
-        'mobilitaet': mobilitaet,
-        'auftritte': auftritte,
-        'netzwerk': netzwerk,
-        'repertoire': sorted(repertoire_aggregated, key=lambda x: -x['dokumente']),
-        'dokumente': [
-            {'jahr': year, 'anzahl': count}
-            for year, count in sorted(docs_per_year.items())
-        ],
-        '_meta': {
-            'generated': datetime.now().isoformat(),
-            'source_records': len(records)
+        auftritte = self.auftritte.finish()
+
+        return {
+            'lebensphasen': LEBENSPHASEN,
+            'orte': [
+                {'ort': 'Lemberg', 'typ': 'wohnort', 'von': 1919, 'bis': 1944},
+                {'ort': 'Wien', 'typ': 'wohnort', 'von': 1944, 'bis': 1950},
+                {'ort': 'Graz', 'typ': 'wohnort', 'von': 1945, 'bis': 1950},
+                {'ort': 'Wien', 'typ': 'wohnort', 'von': 1950, 'bis': 1970},
+                {'ort': 'Zürich', 'typ': 'wohnort', 'von': 1970, 'bis': 2009},
+                {'ort': 'Bayreuth', 'typ': 'auffuehrungsort', 'von': 1952, 'bis': 1968},
+                {'ort': 'München', 'typ': 'auffuehrungsort', 'von': 1953, 'bis': 1968},
+                {'ort': 'Salzburg', 'typ': 'auffuehrungsort', 'von': 1955, 'bis': 1965}
+            ],
+            'mobilitaet': mobilitaet,
+            'auftritte': auftritte,
+            'netzwerk': netzwerk,
+            'repertoire': sorted(repertoire_aggregated, key=lambda x: -x['dokumente']),
+            'dokumente': [
+                {'jahr': year, 'anzahl': count}
+                for year, count in sorted(docs_per_year.items())
+            ],
+            '_meta': {
+                'generated': datetime.now().isoformat(),
+                'source_records': source_records
+            }
         }
-    }
 
 
-def build_matrix(records):
+class MatrixView(ViewAccumulator):
     """
-    Build data for Begegnungs-Matrix visualization.
+    Begegnungs-Matrix visualization.
 
     Structure:
     - zeitraeume: List of 5-year periods
@@ -896,25 +1115,24 @@ def build_matrix(records):
 
     IMPROVED: Weighted intensity based on document type, full names
     """
-    print('Building matrix.json...')
 
-    # Extract persons from structured data AND titles
-    personen_begegnungen = defaultdict(lambda: defaultdict(list))
+    name = 'matrix'
 
-    known_persons = list(PERSONEN_KATEGORIEN.keys())
+    def __init__(self):
+        # Persons from structured data AND titles
+        self.personen_begegnungen = defaultdict(lambda: defaultdict(list))
 
-    for record in records:
+    def contribute(self, ctx):
+        """(period, doc entry, person names in encounter order) or None."""
         # Skip RecordSets (Fonds, Konvolute)
-        if record.get('@type') == 'rico:RecordSet':
-            continue
-
-        title = (record.get('rico:title') or '').lower()
-        year = extract_year(record.get('rico:date'))
-        period = get_5year_period(year)
-        doc_type = get_dokumenttyp(record)
+        if ctx.is_recordset:
+            return None
 
+        period = get_5year_period(ctx.year)
         if not period:
-            continue
+            return None
+
+        doc_type = ctx.doc_type
 
         # Calculate intensity based on document type
         intensity_weight = 1
@@ -923,90 +1141,97 @@ def build_matrix(records):
         elif doc_type in ['programmheft', 'plakat', 'vertrag']:
             intensity_weight = 2
 
-        signatur = record.get('rico:identifier')
         doc_entry = {
-            'signatur': signatur,
-            'titel': record.get('rico:title', ''),
+            'signatur': ctx.signatur,
+            'titel': ctx.title,
             'typ': doc_type,
             'weight': intensity_weight
         }
 
+        names = []
         # Method 1: Extract from structured data (m3gim:hasAssociatedAgent + mentioned persons in subjects)
         seen_names = set()
-        for agent in ensure_list(record.get('m3gim:hasAssociatedAgent')):
+        for agent in ctx.agents:
             if isinstance(agent, dict):
                 name = agent.get('name', '')
                 if name and name not in seen_names:
                     seen_names.add(name)
-                    personen_begegnungen[name][period].append(doc_entry)
+                    names.append(name)
         # Mentioned persons are now in rico:hasOrHadSubject with @type rico:Person
-        for subj in ensure_list(record.get('rico:hasOrHadSubject')):
+        for subj in ctx.subjects:
             if isinstance(subj, dict) and subj.get('@type') == 'rico:Person':
                 name = subj.get('name', '')
                 if name and name not in seen_names:
                     seen_names.add(name)
-                    personen_begegnungen[name][period].append(doc_entry)
+                    names.append(name)
 
         # Method 2: Fallback title matching for known persons (Iteration 1 approach)
-        for person_key in known_persons:
-            if person_key in title:
-                person_name = PERSONEN_VOLLNAMEN.get(person_key, person_key.title())
-                if person_name not in seen_names:
-                    personen_begegnungen[person_name][period].append(doc_entry)
-
-    # Convert to output format
-    zeitraeume = ['1940-1944', '1945-1949', '1950-1954', '1955-1959',
-                  '1960-1964', '1965-1969', '1970-1974']
-
-    personen = []
-    for name, perioden in personen_begegnungen.items():
-        kategorie = get_person_kategorie(name)
-        begegnungen = []
-        for z in zeitraeume:
-            docs = perioden.get(z, [])
-            if docs:
-                # Calculate weighted intensity (sum of weights, not just count)
-                total_weight = sum(d['weight'] for d in docs)
-                begegnungen.append({
-                    'zeitraum': z,
-                    'intensitaet': total_weight,  # Weighted intensity
-                    'anzahl_dokumente': len(docs),  # Actual document count
-                    'dokumente': [
-                        {'signatur': d['signatur'], 'titel': d['titel'], 'typ': d['typ']}
-                        for d in docs  # Include all documents
-                    ]
+        for person_key, _ in PERSONEN_TABLE.all(ctx.title_hits):
+            person_name = PERSONEN_VOLLNAMEN.get(person_key, person_key.title())
+            if person_name not in seen_names:
+                names.append(person_name)
+
+        return (period, doc_entry, names) if names else None
+
+    def fold(self, contribution):
+        period, doc_entry, names = contribution
+        for name in names:
+            self.personen_begegnungen[name][period].append(doc_entry)
+
+    def finish(self, source_records):
+        # Convert to output format
+        zeitraeume = ['1940-1944', '1945-1949', '1950-1954', '1955-1959',
+                      '1960-1964', '1965-1969', '1970-1974']
+
+        personen = []
+        for name, perioden in self.personen_begegnungen.items():
+            kategorie = get_person_kategorie(name)
+            begegnungen = []
+            for z in zeitraeume:
+                docs = perioden.get(z, [])
+                if docs:
+                    # Calculate weighted intensity (sum of weights, not just count)
+                    total_weight = sum(d['weight'] for d in docs)
+                    begegnungen.append({
+                        'zeitraum': z,
+                        'intensitaet': total_weight,  # Weighted intensity
+                        'anzahl_dokumente': len(docs),  # Actual document count
+                        'dokumente': [
+                            {'signatur': d['signatur'], 'titel': d['titel'], 'typ': d['typ']}
+                            for d in docs  # Include all documents
+                        ]
+                    })
+
+            if begegnungen:  # Only include if there are encounters
+                personen.append({
+                    'name': name,
+                    'kategorie': kategorie,
+                    'begegnungen': begegnungen,
+                    'gesamt_intensitaet': sum(b['intensitaet'] for b in begegnungen)
                 })
 
-        if begegnungen:  # Only include if there are encounters
-            personen.append({
-                'name': name,
-                'kategorie': kategorie,
-                'begegnungen': begegnungen,
-                'gesamt_intensitaet': sum(b['intensitaet'] for b in begegnungen)
-            })
-
-    # Sort by category, then by total intensity
-    def sort_key(p):
-        cat_order = {'Dirigent': 0, 'Regisseur': 1, 'Korrepetitor': 2, 'Vermittler': 3, 'Kollege': 4, 'Institution': 5, 'Korrespondenz': 6, 'Andere': 7}
-        return (cat_order.get(p['kategorie'], 8), -p['gesamt_intensitaet'])
-
-    personen.sort(key=sort_key)
-
-    return {
-        'zeitraeume': zeitraeume,
-        'kategorien': ['Dirigent', 'Regisseur', 'Korrepetitor', 'Kollege', 'Vermittler'],
-        'personen': personen,
-        '_meta': {
-            'generated': datetime.now().isoformat(),
-            'source_records': len(records),
-            'note': 'Intensity weighted by document type: Letter=3, Program/Poster/Contract=2, Photo=1'
+        # Sort by category, then by total intensity
+        def sort_key(p):
+            cat_order = {'Dirigent': 0, 'Regisseur': 1, 'Korrepetitor': 2, 'Vermittler': 3, 'Kollege': 4, 'Institution': 5, 'Korrespondenz': 6, 'Andere': 7}
+            return (cat_order.get(p['kategorie'], 8), -p['gesamt_intensitaet'])
+
+        personen.sort(key=sort_key)
+
+        return {
+            'zeitraeume': zeitraeume,
+            'kategorien': ['Dirigent', 'Regisseur', 'Korrepetitor', 'Kollege', 'Vermittler'],
+            'personen': personen,
+            '_meta': {
+                'generated': datetime.now().isoformat(),
+                'source_records': source_records,
+                'note': 'Intensity weighted by document type: Letter=3, Program/Poster/Contract=2, Photo=1'
+            }
         }
-    }
 
 
-def build_kosmos(records):
+class KosmosView(ViewAccumulator):
     """
-    Build data for Rollen-Kosmos visualization.
+    Rollen-Kosmos visualization.
 
     Structure:
     - zentrum: Ira Malaniuk
@@ -1014,188 +1239,145 @@ def build_kosmos(records):
 
     IMPROVED: Better role extraction and geographic context
     """
-    print('Building kosmos.json...')
 
-    # Aggregate by composer with location tracking
-    komponisten_data = defaultdict(lambda: {
-        'dokumente': 0,
-        'werke': defaultdict(lambda: {
+    name = 'kosmos'
+
+    def __init__(self):
+        # Aggregate by composer with location tracking
+        self.komponisten_data = defaultdict(lambda: {
             'dokumente': 0,
-            'signaturen': [],
-            'orte': defaultdict(int),
-            'rollen': defaultdict(int)
+            'werke': defaultdict(lambda: {
+                'dokumente': 0,
+                'signaturen': [],
+                'orte': defaultdict(int),
+                'rollen': defaultdict(int)
+            })
         })
-    })
-
-    # Extended work patterns (from analysis)
-    werk_patterns = {
-        'ring': 'Der Ring des Nibelungen',
-        'walküre': 'Die Walküre',
-        'rheingold': 'Das Rheingold',
-        'götterdämmerung': 'Götterdämmerung',
-        'siegfried': 'Siegfried',
-        'meistersinger': 'Die Meistersinger',
-        'tristan': 'Tristan und Isolde',
-        'tannhäuser': 'Tannhäuser',
-        'lohengrin': 'Lohengrin',
-        'parsifal': 'Parsifal',
-        'aida': 'Aida',
-        'trovatore': 'Il Trovatore',
-        'maskenball': 'Ein Maskenball',
-        'don carlos': 'Don Carlos',
-        'macbeth': 'Macbeth',
-        'falstaff': 'Falstaff',
-        'traviata': 'La Traviata',
-        'rosenkavalier': 'Der Rosenkavalier',
-        'elektra': 'Elektra',
-        'salome': 'Salome',
-        'arabella': 'Arabella',
-        'capriccio': 'Capriccio',
-        'frau ohne schatten': 'Die Frau ohne Schatten',
-        'orpheus': 'Orfeo ed Euridice',
-        'orfeo': 'Orfeo ed Euridice',
-        'julius cäsar': 'Giulio Cesare',
-        'carmen': 'Carmen'
-    }
 
-    # Known roles (from analysis)
-    rollen_patterns = {
-        'fricka': 'Fricka',
-        'waltraute': 'Waltraute',
-        'erda': 'Erda',
-        'brangäne': 'Brangäne',
-        'amneris': 'Amneris',
-        'azucena': 'Azucena',
-        'ulrica': 'Ulrica',
-        'eboli': 'Eboli',
-        'octavian': 'Octavian',
-        'klytämnestra': 'Klytämnestra',
-        'herodias': 'Herodias',
-        'kabanicha': 'Kabanicha',
-        'orlofsky': 'Orlofsky'
-    }
-
-    # Location patterns
-    orte_patterns = {
-        'bayreuth': 'Bayreuth',
-        'münchen': 'München',
-        'wien': 'Wien',
-        'salzburg': 'Salzburg',
-        'zürich': 'Zürich',
-        'graz': 'Graz',
-        'buenos aires': 'Buenos Aires'
-    }
+    def contribute(self, ctx):
+        """Update operations in visit order (fold() replays them):
 
-    for record in records:
+        ('k', komponist)                   composer document +1
+        ('w', komponist, werk, sig, count) touch work; if count: document +1
+        ('o', komponist, werk, ort)        location +1
+        ('r', komponist, werk, rolle)      role +1
+        """
         # Skip RecordSets
-        if record.get('@type') == 'rico:RecordSet':
-            continue
+        if ctx.is_recordset:
+            return None
 
-        title = record.get('rico:title', '')
-        title_lower = title.lower()
-        signatur = record.get('rico:identifier')
+        ops = []
+        title_hits = ctx.title_hits
+        signatur = ctx.signatur
 
         # Method 1: Structured data — Werke aus rico:hasOrHadSubject
-        subjects = ensure_list(record.get('rico:hasOrHadSubject'))
+        subjects = ctx.subjects
         for subj in subjects:
             if isinstance(subj, dict) and subj.get('@type') == 'm3gim:MusicalWork':
                 werk_name = subj.get('name', '')
                 komp = normalize_komponist(subj.get('komponist', ''))
                 if komp:
-                    komponisten_data[komp]['dokumente'] += 1
-                    werk_data = komponisten_data[komp]['werke'][werk_name]
-                    werk_data['dokumente'] += 1
-                    werk_data['signaturen'].append(signatur)
+                    ops.append(('k', komp))
+                    ops.append(('w', komp, werk_name, signatur, True))
                     # Location from structured data
-                    locs = ensure_list(record.get('rico:hasOrHadLocation'))
-                    for loc in locs:
+                    for loc in ctx.locations:
                         if isinstance(loc, dict):
                             loc_name = loc.get('name', '')
                             if loc_name:
-                                werk_data['orte'][loc_name] += 1
+                                ops.append(('o', komp, werk_name, loc_name))
                     # Roles from structured data
-                    perf_roles = ensure_list(record.get('m3gim:hasPerformanceRole'))
-                    for pr in perf_roles:
+                    for pr in ctx.performance_roles:
                         if isinstance(pr, dict):
                             rolle_name = pr.get('name', '')
                             if rolle_name:
-                                werk_data['rollen'][rolle_name] += 1
+                                ops.append(('r', komp, werk_name, rolle_name))
 
         # Method 2: Fallback title matching (Iteration 1 approach)
-        komponist = get_komponist_from_title(title)
+        komponist = ctx.komponist
         if komponist:
             # Nur zaehlen wenn nicht schon via structured data erfasst
             if not subjects:
-                komponisten_data[komponist]['dokumente'] += 1
+                ops.append(('k', komponist))
 
-            werk = None
-            for pattern, werk_name in werk_patterns.items():
-                if pattern in title_lower:
-                    werk = werk_name
-                    break
+            werk = KOSMOS_WERK_TABLE.first(title_hits)
 
             if werk:
-                werk_data = komponisten_data[komponist]['werke'][werk]
                 # Nur zaehlen wenn nicht schon via structured data
-                if not any(isinstance(s, dict) and s.get('name') == werk for s in subjects):
+                count = not any(isinstance(s, dict) and s.get('name') == werk for s in subjects)
+                ops.append(('w', komponist, werk, signatur, count))
+
+                loc_name = KOSMOS_ORTE_TABLE.first(title_hits)
+                if loc_name:
+                    ops.append(('o', komponist, werk, loc_name))
+
+                for _, rolle_name in KOSMOS_ROLLEN_TABLE.all(title_hits):
+                    ops.append(('r', komponist, werk, rolle_name))
+
+        return ops or None
+
+    def fold(self, contribution):
+        komponisten_data = self.komponisten_data
+        for op in contribution:
+            if op[0] == 'k':
+                komponisten_data[op[1]]['dokumente'] += 1
+                continue
+            werk_data = komponisten_data[op[1]]['werke'][op[2]]
+            if op[0] == 'w':
+                if op[4]:
                     werk_data['dokumente'] += 1
-                    werk_data['signaturen'].append(signatur)
-
-                for loc_pattern, loc_name in orte_patterns.items():
-                    if loc_pattern in title_lower:
-                        werk_data['orte'][loc_name] += 1
-                        break
-
-                for rolle_pattern, rolle_name in rollen_patterns.items():
-                    if rolle_pattern in title_lower:
-                        werk_data['rollen'][rolle_name] += 1
-
-    # Convert to output format
-    komponisten = []
-    for name, data in komponisten_data.items():
-        werke = []
-        for werk_name, werk_data in data['werke'].items():
-            # Get top locations
-            top_orte = sorted(werk_data['orte'].items(), key=lambda x: -x[1])[:3]
-            top_rollen = sorted(werk_data['rollen'].items(), key=lambda x: -x[1])[:3]
-
-            werke.append({
-                'name': werk_name,
-                'dokumente': werk_data['dokumente'],
-                'signaturen': werk_data['signaturen'][:10],
-                'orte': [{'name': o[0], 'count': o[1]} for o in top_orte],
-                'rollen': [{'name': r[0], 'count': r[1]} for r in top_rollen]
-            })
-
-        komponisten.append({
-            'name': name,
-            'farbe': KOMPONISTEN_FARBEN.get(name, '#757575'),
-            'dokumente_gesamt': data['dokumente'],
-            'werke': sorted(werke, key=lambda x: -x['dokumente'])
-        })
+                    werk_data['signaturen'].append(op[3])
+            elif op[0] == 'o':
+                werk_data['orte'][op[3]] += 1
+            else:
+                werk_data['rollen'][op[3]] += 1
+
+    def finish(self, source_records):
+        # Convert to output format
+        komponisten = []
+        for name, data in self.komponisten_data.items():
+            werke = []
+            for werk_name, werk_data in data['werke'].items():
+                # Get top locations
+                top_orte = sorted(werk_data['orte'].items(), key=lambda x: -x[1])[:3]
+                top_rollen = sorted(werk_data['rollen'].items(), key=lambda x: -x[1])[:3]
+
+                werke.append({
+                    'name': werk_name,
+                    'dokumente': werk_data['dokumente'],
+                    'signaturen': werk_data['signaturen'][:10],
+                    'orte': [{'name': o[0], 'count': o[1]} for o in top_orte],
+                    'rollen': [{'name': r[0], 'count': r[1]} for r in top_rollen]
+                })
 
-    # Sort by document count
-    komponisten.sort(key=lambda x: -x['dokumente_gesamt'])
+            komponisten.append({
+                'name': name,
+                'farbe': KOMPONISTEN_FARBEN.get(name, '#757575'),
+                'dokumente_gesamt': data['dokumente'],
+                'werke': sorted(werke, key=lambda x: -x['dokumente'])
+            })
 
-    return {
-        'zentrum': {
-            'name': 'Ira Malaniuk',
-            'wikidata': 'Q94208',
-            'lebensdaten': '1919-2009',
-            'fach': 'Alt'
-        },
-        'komponisten': komponisten,
-        '_meta': {
-            'generated': datetime.now().isoformat(),
-            'source_records': len(records),
-            'note': 'Includes geographic and role context extracted from titles'
+        # Sort by document count
+        komponisten.sort(key=lambda x: -x['dokumente_gesamt'])
+
+        return {
+            'zentrum': {
+                'name': 'Ira Malaniuk',
+                'wikidata': 'Q94208',
+                'lebensdaten': '1919-2009',
+                'fach': 'Alt'
+            },
+            'komponisten': komponisten,
+            '_meta': {
+                'generated': datetime.now().isoformat(),
+                'source_records': source_records,
+                'note': 'Includes geographic and role context extracted from titles'
+            }
         }
-    }
 
 
-def build_sankey(records):
+class SankeyView(ViewAccumulator):
     """
-    Build data for Karriere-Fluss (Sankey) visualization.
+    Karriere-Fluss (Sankey) visualization.
 
     Structure:
     - phasen: Career phases
@@ -1205,121 +1387,341 @@ def build_sankey(records):
 
     IMPROVED: Now includes document signaturen for click-through
     """
-    print('Building sankey.json...')
-
-    # Track flows with document references
-    phase_komponist = defaultdict(lambda: defaultdict(list))
-    komponist_ort = defaultdict(lambda: defaultdict(list))
-
-    # Known locations in titles
-    orte_patterns = {
-        'wien': 'Wien',
-        'vienna': 'Wien',
-        'bayreuth': 'Bayreuth',
-        'münchen': 'München',
-        'munich': 'München',
-        'salzburg': 'Salzburg',
-        'graz': 'Graz'
-    }
 
-    for record in records:
+    name = 'sankey'
+
+    def __init__(self):
+        # Track flows with document references
+        self.phase_komponist = defaultdict(lambda: defaultdict(list))
+        self.komponist_ort = defaultdict(lambda: defaultdict(list))
+
+    def contribute(self, ctx):
+        """(phase, komponist, doc info, ort or None) or None."""
         # Skip RecordSets
-        if record.get('@type') == 'rico:RecordSet':
-            continue
-
-        title = record.get('rico:title', '')
-        title_lower = title.lower()
-        year = extract_year(record.get('rico:date'))
-        phase = get_karrierephase(year)
-        komponist = get_komponist_from_title(title)
-        signatur = record.get('rico:identifier')
-        doc_type = get_dokumenttyp(record)
-
-        if phase and komponist and signatur:
-            doc_info = {
-                'signatur': signatur,
-                'titel': title[:100],
-                'typ': doc_type
-            }
-            phase_komponist[phase][komponist].append(doc_info)
-
-            # Method 1: Structured location data
-            found_loc = False
-            locs = ensure_list(record.get('rico:hasOrHadLocation'))
-            for loc in locs:
-                if isinstance(loc, dict):
-                    loc_name = loc.get('name', '')
-                    # Normalize to known cities
-                    for pattern, ort in orte_patterns.items():
-                        if pattern in loc_name.lower():
-                            komponist_ort[komponist][ort].append(doc_info)
-                            found_loc = True
-                            break
-                if found_loc:
+        if ctx.is_recordset:
+            return None
+
+        phase = get_karrierephase(ctx.year)
+        komponist = ctx.komponist
+        signatur = ctx.signatur
+
+        if not (phase and komponist and signatur):
+            return None
+        doc_info = {
+            'signatur': signatur,
+            'titel': ctx.title[:100],
+            'typ': ctx.doc_type
+        }
+
+        # Method 1: Structured location data (first known city)
+        ort = None
+        for loc in ctx.locations:
+            if isinstance(loc, dict):
+                loc_name = loc.get('name', '')
+                # Normalize to known cities
+                ort = SANKEY_ORTE_TABLE.first(TITLE_MATCHER.findall(loc_name.lower()))
+                if ort:
                     break
 
-            # Method 2: Fallback title matching
-            if not found_loc:
-                for pattern, ort in orte_patterns.items():
-                    if pattern in title_lower:
-                        komponist_ort[komponist][ort].append(doc_info)
-                        break
-
-    # Build flows with document references
-    flows = []
-
-    # Phase -> Komponist
-    for phase, komponisten in phase_komponist.items():
-        for komponist, docs in komponisten.items():
-            if len(docs) > 0:
-                flows.append({
-                    'source': phase,
-                    'target': komponist,
-                    'value': len(docs),
-                    'dokumente': docs[:20]  # Limit for JSON size
-                })
+        # Method 2: Fallback title matching
+        if not ort:
+            ort = SANKEY_ORTE_TABLE.first(ctx.title_hits)
+        return (phase, komponist, doc_info, ort)
+
+    def fold(self, contribution):
+        phase, komponist, doc_info, ort = contribution
+        self.phase_komponist[phase][komponist].append(doc_info)
+        if ort:
+            self.komponist_ort[komponist][ort].append(doc_info)
+
+    def finish(self, source_records):
+        # Build flows with document references
+        flows = []
+
+        # Phase -> Komponist
+        for phase, komponisten in self.phase_komponist.items():
+            for komponist, docs in komponisten.items():
+                if len(docs) > 0:
+                    flows.append({
+                        'source': phase,
+                        'target': komponist,
+                        'value': len(docs),
+                        'dokumente': docs[:20]  # Limit for JSON size
+                    })
+
+        # Komponist -> Ort
+        for komponist, orte in self.komponist_ort.items():
+            for ort, docs in orte.items():
+                if len(docs) > 0:
+                    flows.append({
+                        'source': komponist,
+                        'target': ort,
+                        'value': len(docs),
+                        'dokumente': docs[:20]
+                    })
+
+        return {
+            'phasen': KARRIEREPHASEN,
+            'repertoire': [
+                {'id': 'Wagner', 'label': 'Wagner', 'farbe': KOMPONISTEN_FARBEN['Wagner']},
+                {'id': 'Verdi', 'label': 'Verdi', 'farbe': KOMPONISTEN_FARBEN['Verdi']},
+                {'id': 'Strauss', 'label': 'Strauss', 'farbe': KOMPONISTEN_FARBEN['Strauss']},
+                {'id': 'Gluck/Händel', 'label': 'Gluck/Händel', 'farbe': KOMPONISTEN_FARBEN['Gluck/Händel']},
+                {'id': 'Beethoven', 'label': 'Beethoven', 'farbe': KOMPONISTEN_FARBEN['Beethoven']}
+            ],
+            'orte': [
+                {'id': 'Wien', 'label': 'Wien'},
+                {'id': 'Bayreuth', 'label': 'Bayreuth'},
+                {'id': 'München', 'label': 'München'},
+                {'id': 'Salzburg', 'label': 'Salzburg'},
+                {'id': 'Graz', 'label': 'Graz'}
+            ],
+            'flows': flows,
+            '_meta': {
+                'generated': datetime.now().isoformat(),
+                'source_records': source_records
+            }
+        }
 
-    # Komponist -> Ort
-    for komponist, orte in komponist_ort.items():
-        for ort, docs in orte.items():
-            if len(docs) > 0:
-                flows.append({
-                    'source': komponist,
-                    'target': ort,
-                    'value': len(docs),
-                    'dokumente': docs[:20]
-                })
 
-    return {
-        'phasen': KARRIEREPHASEN,
-        'repertoire': [
-            {'id': 'Wagner', 'label': 'Wagner', 'farbe': KOMPONISTEN_FARBEN['Wagner']},
-            {'id': 'Verdi', 'label': 'Verdi', 'farbe': KOMPONISTEN_FARBEN['Verdi']},
-            {'id': 'Strauss', 'label': 'Strauss', 'farbe': KOMPONISTEN_FARBEN['Strauss']},
-            {'id': 'Gluck/Händel', 'label': 'Gluck/Händel', 'farbe': KOMPONISTEN_FARBEN['Gluck/Händel']},
-            {'id': 'Beethoven', 'label': 'Beethoven', 'farbe': KOMPONISTEN_FARBEN['Beethoven']}
-        ],
-        'orte': [
-            {'id': 'Wien', 'label': 'Wien'},
-            {'id': 'Bayreuth', 'label': 'Bayreuth'},
-            {'id': 'München', 'label': 'München'},
-            {'id': 'Salzburg', 'label': 'Salzburg'},
-            {'id': 'Graz', 'label': 'Graz'}
-        ],
-        'flows': flows,
-        '_meta': {
-            'generated': datetime.now().isoformat(),
-            'source_records': len(records)
+# Registrierte Views in Ausgabe-Reihenfolge. Eine neue View = eine
+# ViewAccumulator-Unterklasse hier eintragen; kein weiterer Graph-Durchlauf.
+VIEWS = [PartiturView, MatrixView, KosmosView, SankeyView]
+
+
+def build_views(records, views=None, tracer=None):
+    """Build views with a single traversal of the graph.
+
+    Each node is wrapped once in a NodeContext and handed to every view's
+    visit(); shared derived fields are computed at most once per node.
+    Returns {view name: document} in registration order.
+    """
+    if views is None:
+        views = [cls() for cls in VIEWS]
+    if tracer is None:
+        tracer = Tracer()
+
+    print('Building ' + ', '.join(f'{v.name}.json' for v in views) + ' (one pass)...')
+    with tracer.stage('traverse_graph', views=len(views)):
+        stes = index_stes(records)
+        for node in records:
+            ctx = NodeContext(node, stes)
+            for view in views:
+                view.visit(ctx)
+
+    result = {}
+    for view in views:
+        with tracer.stage(f'finish_{view.name}'):
+            result[view.name] = view.finish(len(records))
+    return result
+
+
+def build_partitur(records):
+    """Build data for Mobilitäts-Partitur visualization (PartiturView)."""
+    return build_views(records, [PartiturView()])['partitur']
+
+
+def build_matrix(records):
+    """Build data for Begegnungs-Matrix visualization (MatrixView)."""
+    return build_views(records, [MatrixView()])['matrix']
+
+
+def build_kosmos(records):
+    """Build data for Rollen-Kosmos visualization (KosmosView)."""
+    return build_views(records, [KosmosView()])['kosmos']
+
+
+def build_sankey(records):
+    """Build data for Karriere-Fluss (Sankey) visualization (SankeyView)."""
+    return build_views(records, [SankeyView()])['sankey']
+
+
+# =============================================================================
+# INCREMENTAL BUILD
+# =============================================================================
+
+STATE_VERSION = 1
+
+
+def _code_digest():
+    """Beitraege haengen am View-Code, an den Titel-Mustern und am Graph-
+    Modell (Merkle-Baum, Diff)."""
+    return stable_digest([file_digest(SCRIPT_DIR / name)
+                          for name in ('build-views.py', '_title_matcher.py',
+                                       '_graph.py', '_graph_diff.py')])
+
+
+class _GraphStes:
+    """NodeContext.stes over an indexed Graph (no up-front STE scan)."""
+
+    def __init__(self, graph):
+        self.graph = graph
+
+    def get(self, node_id, default=None):
+        node = self.graph.get(node_id)
+        if node is None or node.get('@type') != STE_TYPE:
+            return default
+        return node
+
+
+class ViewState:
+    """Persisted input of the last --incremental build, as pickle on disk.
+
+    ``tree``     : Merkle-Baum des Graphs (_graph.Graph.merkle)
+    ``contribs`` : @id -> {view name: contribution} (nur Knoten mit Beitrag)
+    ``outputs``  : view name -> letztes Dokument ohne _meta.generated
+    """
+
+    def __init__(self, path, code_digest):
+        self.path = Path(path)
+        self.code_digest = code_digest
+        self.tree = None
+        self.contribs = {}
+        self.outputs = {}
+
+    @classmethod
+    def load(cls, path, code_digest):
+        state = cls(path, code_digest)
+        if not state.path.exists():
+            return state
+        try:
+            with open(state.path, 'rb') as f:
+                data = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+            return state
+        if (data.get('version') != STATE_VERSION
+                or data.get('code') != code_digest
+                or data.get('views') != [cls_.name for cls_ in VIEWS]):
+            return state
+        state.tree = data.get('tree')
+        state.contribs = data.get('contribs', {})
+        state.outputs = data.get('outputs', {})
+        return state
+
+    def save(self):
+        """Atomar via Temp-Datei + replace."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        data = {
+            'version': STATE_VERSION,
+            'code': self.code_digest,
+            'views': [cls.name for cls in VIEWS],
+            'tree': self.tree,
+            'contribs': self.contribs,
+            'outputs': self.outputs,
         }
-    }
+        tmp = self.path.with_suffix(self.path.suffix + '.tmp')
+        with open(tmp, 'wb') as f:
+            pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+        tmp.replace(self.path)
+
+
+def build_views_incremental(graph, state, tracer=None):
+    """Build all VIEWS from ``graph`` (_graph.Graph), reusing ``state``.
+
+    Only nodes that were added or changed since ``state.tree`` — and the
+    nodes referring to any added, changed or removed node (STE lookups) —
+    get a NodeContext; every other contribution comes from ``state``.
+    Updates ``state`` in place. Returns ({view name: document}, stats).
+    """
+    if tracer is None:
+        tracer = Tracer()
+    views = [cls() for cls in VIEWS]
+    order = graph.node_ids()
+    if len(order) != len(graph):
+        # Knoten ohne oder mit doppelter @id haben keinen stabilen Schluessel
+        state.tree, state.contribs = None, {}
+        return build_views(list(graph.nodes), views, tracer), {
+            'nodes': len(graph), 'dirty': len(graph), 'full': True}
+
+    with tracer.stage('diff_graph'):
+        tree = graph.merkle()
+        if state.tree is None:
+            state.contribs = {}
+            dirty = order
+        else:
+            added, removed, changed, _ = _graph_diff.diff_trees(state.tree, tree)
+            dirty = set(added) | set(changed)
+            for key in added.keys() | removed.keys() | changed.keys():
+                dirty.update(n['@id'] for n in graph.referrers(key) if '@id' in n)
+            for key in removed:
+                state.contribs.pop(key, None)
+
+    print(f'Building {len(VIEWS)} views incrementally '
+          f'({len(dirty)} of {len(order)} nodes changed)...')
+    with tracer.stage('contribute', nodes=len(dirty)):
+        stes = _GraphStes(graph)
+        for key in dirty:
+            ctx = NodeContext(graph.get(key), stes)
+            contrib = {}
+            for view in views:
+                c = view.contribute(ctx)
+                if c is not None:
+                    contrib[view.name] = c
+            if contrib:
+                state.contribs[key] = contrib
+            else:
+                state.contribs.pop(key, None)
+
+    # Listen und Gleichstaende in den Views folgen der Graph-Reihenfolge:
+    # der Bestand wird in dieser Reihenfolge neu gefaltet, nicht verrechnet.
+    with tracer.stage('fold', views=len(views)):
+        contribs = state.contribs
+        for key in order:
+            contrib = contribs.get(key)
+            if contrib:
+                for view in views:
+                    c = contrib.get(view.name)
+                    if c is not None:
+                        view.fold(c)
+
+    result = {}
+    for view in views:
+        with tracer.stage(f'finish_{view.name}'):
+            result[view.name] = view.finish(len(graph))
+    state.tree = tree
+    return result, {'nodes': len(order), 'dirty': len(dirty), 'full': dirty is order}
+
+
+def _without_timestamp(doc):
+    meta = doc.get('_meta')
+    if not isinstance(meta, dict) or 'generated' not in meta:
+        return doc
+    return dict(doc, _meta={k: v for k, v in meta.items() if k != 'generated'})
 
 
 # =============================================================================
 # MAIN
 # =============================================================================
 
-def main():
+def main(argv=None):
     """Main entry point."""
+    parser = argparse.ArgumentParser(description='M³GIM View Data Builder')
+    parser.add_argument(
+        '--trace', nargs='?', const=TRACE_PATH, type=Path, metavar='PATH',
+        help='Wall-/CPU-Zeit und Peak-Allokation je View messen und als '
+             'Chrome-Trace-JSON schreiben (Default: .cache/trace-build-views.json)')
+    parser.add_argument(
+        '--no-trace-memory', action='store_true',
+        help='mit --trace nur Zeiten messen (ohne tracemalloc)')
+    parser.add_argument(
+        '--incremental', action='store_true',
+        help='nur seit dem letzten Lauf geaenderte Knoten neu auswerten '
+             '(Zustand: .cache/views-state.pickle); unveraenderte Views '
+             'werden nicht neu geschrieben')
+    args = parser.parse_args(argv)
+    tracer = Tracer(enabled=args.trace is not None, process_name='build-views',
+                    memory=not args.no_trace_memory)
+    try:
+        _run(tracer, incremental=args.incremental)
+    finally:
+        if tracer.enabled:
+            tracer.stop()
+            if tracer.stages:
+                tracer.print_summary()
+                print(f'  Trace: {tracer.write(args.trace)}')
+
+
+def _run(tracer, incremental=False):
     print(f'M³GIM View Data Builder')
     print(f'=' * 50)
     print(f'Input: {INPUT_FILE}')
@@ -1331,24 +1733,41 @@ def main():
 
     # Load source data
     print(f'Loading JSON-LD...')
-    records = load_jsonld()
-    print(f'Loaded {len(records)} records')
+    state = None
+    with tracer.stage('load_jsonld'):
+        if incremental:
+            graph = load_graph(INPUT_FILE)
+            state = ViewState.load(STATE_PATH, _code_digest())
+            count = len(graph)
+        else:
+            records = load_jsonld()
+            count = len(records)
+    print(f'Loaded {count} records')
     print()
 
-    # Build all views
-    views = {
-        'partitur': build_partitur(records),
-        'matrix': build_matrix(records),
-        'kosmos': build_kosmos(records),
-        'sankey': build_sankey(records)
-    }
+    # Build all views (one graph traversal, see build_views)
+    if incremental:
+        views, _ = build_views_incremental(graph, state, tracer=tracer)
+    else:
+        views = build_views(records, tracer=tracer)
 
     # Write output files
-    for name, data in views.items():
-        output_file = OUTPUT_DIR / f'{name}.json'
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
-        print(f'  [OK] {output_file.name} ({len(json.dumps(data)):,} bytes)')
+    changed = set()
+    with tracer.stage('write_views'):
+        for name, data in views.items():
+            output_file = OUTPUT_DIR / f'{name}.json'
+            if state is not None:
+                content = _without_timestamp(data)
+                if state.outputs.get(name) == content and output_file.exists():
+                    print(f'  [--] {output_file.name} unveraendert')
+                    continue
+                state.outputs[name] = content
+            changed.add(name)
+            with open(output_file, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
+            print(f'  [OK] {output_file.name} ({len(json.dumps(data)):,} bytes)')
+    if state is not None:
+        state.save()
 
     # Copy frontend-consumed artefacts to docs/data/ beim Default-Output.
     # docs/data/ ist die Frontend-Datenquelle; hier fließt alles zusammen.
@@ -1360,14 +1779,19 @@ def main():
         print('Copying to docs/data/:')
         # Hauptquelle: m3gim.jsonld — einzige Wahrheit, auf der loader.js aufsetzt
         jsonld_src = _OUTPUT_BASE / 'm3gim.jsonld'
-        if jsonld_src.exists() and docs_data.exists():
-            shutil.copy2(jsonld_src, docs_data / 'm3gim.jsonld')
+        jsonld_dst = docs_data / 'm3gim.jsonld'
+        if jsonld_src.exists() and docs_data.exists() and not (
+                incremental and jsonld_dst.exists()
+                and filecmp.cmp(jsonld_src, jsonld_dst, shallow=False)):
+            shutil.copy2(jsonld_src, jsonld_dst)
             print('  [CP] m3gim.jsonld -> docs/data/')
         # Derivate: vorverdichtete View-JSONs für einzelne Visualisierungen
         frontend_views = ['partitur', 'matrix', 'kosmos']
         for name in frontend_views:
             src = OUTPUT_DIR / f'{name}.json'
             dst = docs_data / f'{name}.json'
+            if incremental and name not in changed and dst.exists():
+                continue
             if src.exists() and dst.parent.exists():
                 shutil.copy2(src, dst)
                 print(f'  [CP] {name}.json -> docs/data/')
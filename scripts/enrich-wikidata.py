@@ -8,23 +8,41 @@ aus der Wikidata API und schreibt wikidata-enrichment.json.
 Die Enrichment-Daten werden von transform.py in die JSON-LD-Ausgabe
 injiziert (owl:sameAs, m3gim:occupation, m3gim:birthDate etc.).
 
+Abfragen laufen ueber _wikidata_client.WikidataClient (Rate-Limit, Retry,
+HTTP-Cache aus _http_cache.py); --offline spielt nur aus dem Cache ab.
+
+Pro Entitaet werden ``lastrevid``/``modified`` mitgespeichert. --refresh
+prueft die Revisionen aller gecachten Entitaeten (ein wbgetentities mit
+props=info pro 50 QIDs) und holt Claims und Labels nur fuer geaenderte neu;
+--force holt dagegen alles neu.
+
+Die Entity-Batches laufen parallel (--workers) unter dem gemeinsamen
+Rate-Limit des Clients (--rate). Referenzierte QIDs (Beruf, Geburtsort, ...)
+landen schon waehrend des Fetchs in einer deduplizierten Label-Warteschlange;
+jede volle 50er-Batch startet sofort, statt auf das Ende aller
+Entity-Batches zu warten. Bekannte Labels kommen aus dem persistenten
+Label-Cache (_label_store.py) und kosten keine Anfrage.
+
 Verwendung:
-    python scripts/enrich-wikidata.py [--force] [--type person|org|location|work]
+    python scripts/enrich-wikidata.py [--force | --refresh]
+                                      [--type person|org|location|work]
+                                      [--workers 4] [--rate 2] [--offline]
 """
 
 import sys
 import json
-import time
 import argparse
-import urllib.request
-import urllib.parse
-import urllib.error
+from collections import deque
 from datetime import datetime
 from pathlib import Path
 
 # Pipeline-Shared-Utilities (scripts/_common.py)
 sys.path.insert(0, str(Path(__file__).parent))
 from _common import is_approved_match  # noqa: E402
+from _http_cache import CacheMiss, ResponseCache  # noqa: E402
+from _label_store import LabelStore  # noqa: E402
+from _wikidata_client import (DEFAULT_WORKERS, WIKIDATA_API, WikidataClient,  # noqa: E402
+                              WikidataError)
 
 # Windows-Konsole: UTF-8 erzwingen
 if sys.stdout.encoding != "utf-8":
@@ -42,8 +60,7 @@ ENRICHMENT_FILE = BASE_DIR / "data" / "output" / "wikidata-enrichment.json"
 # Wikidata API
 # ---------------------------------------------------------------------------
 
-WIKIDATA_API = "https://www.wikidata.org/w/api.php"
-REQUEST_DELAY = 0.5
+REQUEST_RATE = 2.0  # Anfragen pro Sekunde (alle Worker zusammen)
 BATCH_SIZE = 50  # Max 50 IDs pro wbgetentities-Aufruf
 USER_AGENT = "M3GIM-Enrich/1.0 (DH research project; mailto:pollin@dhcraft.org)"
 
@@ -85,57 +102,161 @@ for props in PROPERTY_MAP.values():
 # API-Funktionen
 # ---------------------------------------------------------------------------
 
-def fetch_entities_batch(qids: list) -> dict:
-    """Holt Claims und Labels fuer eine Batch von QIDs (max 50)."""
+_client = None
+_label_store = None
+
+
+def get_client() -> WikidataClient:
+    """Der im Lauf verwendete Client (Default-Konfiguration, falls keiner gesetzt)."""
+    global _client
+    if _client is None:
+        _client = WikidataClient(WIKIDATA_API, user_agent=USER_AGENT,
+                                 rate=REQUEST_RATE, workers=DEFAULT_WORKERS,
+                                 cache=ResponseCache.from_env())
+    return _client
+
+
+def set_client(client: WikidataClient | None) -> None:
+    """Client fuer die API-Funktionen setzen (Tests, CLI-Optionen)."""
+    global _client
+    _client = client
+
+
+def set_label_store(store: LabelStore | None) -> None:
+    """Persistenten Label-Cache setzen (None = jedes Label per API)."""
+    global _label_store
+    _label_store = store
+
+
+def fetch_entities_batch(qids: list, revalidate: bool = False) -> dict:
+    """Holt Claims, Labels und Revision (info) fuer eine Batch von QIDs (max 50).
+
+    ``revalidate``: am HTTP-Cache vorbei (--refresh fuer geaenderte
+    Entitaeten), sonst kaeme dieselbe Batch-URL bis zum Ablauf der TTL mit
+    der alten Revision zurueck.
+    """
     params = {
         "action": "wbgetentities",
         "ids": "|".join(qids),
-        "props": "claims|labels",
+        "props": "info|claims|labels",
         "languages": "de|en",
-        "format": "json",
     }
-    url = f"{WIKIDATA_API}?{urllib.parse.urlencode(params)}"
-
     try:
-        req = urllib.request.Request(url, headers={"User-Agent": USER_AGENT})
-        with urllib.request.urlopen(req, timeout=30) as resp:
-            data = json.loads(resp.read().decode("utf-8"))
-            return data.get("entities", {})
-    except (urllib.error.URLError, urllib.error.HTTPError, TimeoutError) as e:
+        return get_client().get(params, revalidate=revalidate).get("entities", {})
+    except WikidataError as e:
         print(f"  [WARN] API-Fehler fuer Batch: {e}")
         return {}
 
 
-def resolve_labels(qids: list) -> dict:
-    """Batch-Aufloesung von QIDs zu Labels (de bevorzugt, en Fallback)."""
-    if not qids:
-        return {}
+def fetch_revisions(qids: list) -> dict:
+    """Aktuelle ``lastrevid`` pro QID, ein props=info-Aufruf pro 50 IDs.
 
-    labels = {}
+    Geht am HTTP-Cache vorbei (revalidate), sonst saehe der Refresh bis zum
+    Ablauf der TTL die alte Revision. Geloeschte/unbekannte QIDs fehlen,
+    fehlgeschlagene Batches ebenfalls (die Entitaeten bleiben dann wie sie sind).
+    """
+    revisions = {}
     for i in range(0, len(qids), BATCH_SIZE):
         batch = qids[i:i + BATCH_SIZE]
         params = {
             "action": "wbgetentities",
             "ids": "|".join(batch),
-            "props": "labels",
-            "languages": "de|en",
-            "format": "json",
+            "props": "info",
         }
-        url = f"{WIKIDATA_API}?{urllib.parse.urlencode(params)}"
         try:
-            req = urllib.request.Request(url, headers={"User-Agent": USER_AGENT})
-            with urllib.request.urlopen(req, timeout=30) as resp:
-                data = json.loads(resp.read().decode("utf-8"))
-                for qid, entity in data.get("entities", {}).items():
-                    lbl = entity.get("labels", {})
-                    labels[qid] = (lbl.get("de") or lbl.get("en") or {}).get("value", qid)
-        except (urllib.error.URLError, urllib.error.HTTPError, TimeoutError):
-            pass
-        time.sleep(REQUEST_DELAY)
+            data = get_client().get(params, revalidate=True)
+        except WikidataError as e:
+            print(f"  [WARN] API-Fehler fuer Revisions-Batch: {e}")
+            continue
+        for qid, entity in data.get("entities", {}).items():
+            if "missing" not in entity and "lastrevid" in entity:
+                revisions[qid] = entity["lastrevid"]
+    return revisions
+
 
+def fetch_labels_batch(qids: list) -> dict:
+    """Labels fuer eine Batch von QIDs (max 50), de bevorzugt, en Fallback."""
+    params = {
+        "action": "wbgetentities",
+        "ids": "|".join(qids),
+        "props": "labels",
+        "languages": "de|en",
+    }
+    try:
+        data = get_client().get(params)
+    except WikidataError:
+        return {}
+    entities = data.get("entities", {})
+    if _label_store is not None:
+        _label_store.store_entities(entities)
+    labels = {}
+    for qid, entity in entities.items():
+        lbl = entity.get("labels", {})
+        labels[qid] = (lbl.get("de") or lbl.get("en") or {}).get("value", qid)
+    return labels
+
+
+def resolve_labels(qids: list) -> dict:
+    """Batch-Aufloesung von QIDs zu Labels (de bevorzugt, en Fallback)."""
+    labels = _label_store.labels(qids) if _label_store is not None else {}
+    qids = [q for q in dict.fromkeys(qids) if q not in labels]
+    batches = [qids[i:i + BATCH_SIZE] for i in range(0, len(qids), BATCH_SIZE)]
+    for batch_labels in get_client().map(fetch_labels_batch, batches):
+        labels.update(batch_labels)
     return labels
 
 
+class LabelQueue:
+    """Deduplizierte Warteschlange fuer Label-QIDs.
+
+    QIDs mit frischem Eintrag im Label-Cache werden sofort beantwortet; von
+    den uebrigen startet jede volle ``BATCH_SIZE`` ihre Abfrage im Pool des
+    Clients — parallel zu noch laufenden Entity-Batches. ``result()``
+    schickt den Rest ab und sammelt alle Labels ein.
+    """
+
+    def __init__(self, client: WikidataClient, store: LabelStore | None = None):
+        self.client = client
+        self.store = store
+        self.seen = set()
+        self.cached = {}
+        self.pending = []
+        self.futures = []
+
+    def __len__(self) -> int:
+        return len(self.seen)
+
+    def add(self, qid: str) -> None:
+        self.extend([qid])
+
+    def extend(self, qids) -> None:
+        """Mehrere QIDs einreihen (ein Cache-Lookup fuer alle)."""
+        new = [q for q in dict.fromkeys(qids) if q not in self.seen]
+        if not new:
+            return
+        self.seen.update(new)
+        if self.store is not None:
+            self.cached.update(self.store.labels(new))
+        for qid in new:
+            if qid in self.cached:
+                continue
+            self.pending.append(qid)
+            if len(self.pending) >= BATCH_SIZE:
+                self._submit()
+
+    def _submit(self) -> None:
+        batch, self.pending = self.pending, []
+        self.futures.append(self.client.submit(fetch_labels_batch, batch))
+
+    def result(self) -> dict:
+        if self.pending:
+            self._submit()
+        labels = dict(self.cached)
+        for future in self.futures:
+            labels.update(future.result())
+        return labels
+
+
 def extract_claim_value(claim: dict) -> dict | str | None:
     """Extrahiert einen lesbaren Wert aus einem Wikidata-Claim."""
     mainsnak = claim.get("mainsnak", {})
@@ -236,6 +357,17 @@ def extract_properties(entity: dict, prop_config: dict) -> dict:
     return result
 
 
+def entity_refs(props: dict):
+    """Alle Entity-Referenzen (``{"qid": ..., "label": ...}``) in ``props``."""
+    for val in props.values():
+        if isinstance(val, dict) and "qid" in val:
+            yield val
+        elif isinstance(val, list):
+            for item in val:
+                if isinstance(item, dict) and "qid" in item:
+                    yield item
+
+
 # ---------------------------------------------------------------------------
 # Hauptprogramm
 # ---------------------------------------------------------------------------
@@ -249,8 +381,12 @@ def load_previous_enrichment() -> dict:
     return data.get("entities", {})
 
 
-def run_enrichment(entity_types: list, force: bool = False):
-    """Holt WD-Properties fuer alle reconcilierten Entitaeten."""
+def run_enrichment(entity_types: list, force: bool = False, refresh: bool = False):
+    """Holt WD-Properties fuer alle reconcilierten Entitaeten.
+
+    ``refresh``: gecachte Entitaeten nur neu holen, wenn sich ihre Revision
+    geaendert hat (Eintraege ohne gespeicherte Revision gelten als veraltet).
+    """
 
     # Reconciliation-Ergebnisse laden
     if not RECONCILIATION_FILE.exists():
@@ -297,79 +433,105 @@ def run_enrichment(entity_types: list, force: bool = False):
 
         to_fetch[qid] = {"type": etype, "name": m.get("name", "")}
 
+    refreshed = set()
+    if refresh and not force:
+        cached = [m for m in matched
+                  if m.get("type") in entity_types and m.get("type") in PROPERTY_MAP
+                  and m.get("qid") in cache and m["qid"] not in to_fetch
+                  and is_approved_match(m)]
+        qids = list(dict.fromkeys(m["qid"] for m in cached))
+        print(f"Revisionen pruefen: {len(qids)} gecachte Entitaeten...")
+        revisions = fetch_revisions(qids)
+        changed = 0
+        for m in cached:
+            qid = m["qid"]
+            if qid in to_fetch or qid not in revisions:
+                continue
+            if cache[qid].get("lastrevid") != revisions[qid]:
+                to_fetch[qid] = {"type": m["type"], "name": m.get("name", "")}
+                refreshed.add(qid)
+                changed += 1
+        cached_count -= changed
+        print(f"  {changed} geaendert, {len(qids) - changed} unveraendert")
+
     print(f"Zu fetchen: {len(to_fetch)} Entitaeten "
           f"(Cache: {cached_count} uebersprungen, "
           f"{low_conf_skipped} low-conf ungepruft)")
 
     # Batch-Fetch (auch wenn leer — dann nur Cache-Resolve-Pass)
     qid_list = list(to_fetch.keys())
+    batches = [qid_list[i:i + BATCH_SIZE] for i in range(0, len(qid_list), BATCH_SIZE)]
     enriched = dict(cache)  # Start mit Cache
-    pending_label_qids = set()
+    client = get_client()
+    labels = LabelQueue(client, _label_store)
 
     if not to_fetch:
         print("Keine neuen Entitaeten — pruefe nur Label-Luecken im Cache.")
 
-    for i in range(0, len(qid_list), BATCH_SIZE):
-        batch = qid_list[i:i + BATCH_SIZE]
-        print(f"  Batch {i // BATCH_SIZE + 1}: {len(batch)} QIDs...", end=" ",
-              flush=True)
-
-        entities = fetch_entities_batch(batch)
-        time.sleep(REQUEST_DELAY)
+    # Cache-Hits einbeziehen: auch fuer bereits gecachte Entitaeten die
+    # Entity-Ref-Label nachholen, falls sie in frueheren Laeufen unaufgeloest
+    # blieben (Muster `label == qid`). Dadurch schliesst z. B. ein spaeterer
+    # Approval-Batch Label-Luecken in zuvor gefetchten Orten.
+    labels.extend(ref["qid"] for qid_key, entry in cache.items() if qid_key not in to_fetch
+                  for ref in entity_refs(entry.get("properties", {}))
+                  if ref.get("label") == ref["qid"])
+
+    # Hoechstens `workers` Entity-Batches gleichzeitig; Ergebnisse in
+    # Eingabereihenfolge (deterministische Ausgabe). Jede fertige Batch
+    # fuellt die Label-Warteschlange, volle Label-Batches laufen sofort mit.
+    in_flight = deque()
+    todo = iter(enumerate(batches, 1))
+
+    def submit_next():
+        item = next(todo, None)
+        if item is not None:
+            batch = item[1]
+            in_flight.append((*item, client.submit(
+                fetch_entities_batch, batch, revalidate=not refreshed.isdisjoint(batch))))
+
+    for _ in range(client.workers):
+        submit_next()
+
+    while in_flight:
+        n, batch, future = in_flight.popleft()
+        entities = future.result()
+        submit_next()
+        print(f"  Batch {n}: {len(batch)} QIDs... OK ({len(entities)} Entitaeten)")
 
         for qid in batch:
             info = to_fetch[qid]
+            if qid not in entities and qid in cache:
+                # Refetch fehlgeschlagen (API-Fehler -> leere Antwort): den
+                # gecachten Stand behalten statt mit leeren Properties zu
+                # ueberschreiben; offene Label-Luecken trotzdem nachholen
+                labels.extend(ref["qid"] for ref in entity_refs(cache[qid].get("properties", {}))
+                              if ref.get("label") == ref["qid"])
+                continue
             entity = entities.get(qid, {})
             prop_config = PROPERTY_MAP.get(info["type"], {})
             props = extract_properties(entity, prop_config)
 
-            # Entity-Ref QIDs sammeln fuer Label-Aufloesung
-            for field_name, val in props.items():
-                if isinstance(val, dict) and "qid" in val:
-                    pending_label_qids.add(val["qid"])
-                elif isinstance(val, list):
-                    for item in val:
-                        if isinstance(item, dict) and "qid" in item:
-                            pending_label_qids.add(item["qid"])
+            # Entity-Ref QIDs sofort fuer die Label-Aufloesung einreihen
+            labels.extend(ref["qid"] for ref in entity_refs(props))
 
             enriched[qid] = {
                 "type": info["type"],
                 "name": info["name"],
                 "properties": props,
             }
-
-        print(f"OK ({len(entities)} Entitaeten)")
-
-    # Cache-Hits einbeziehen: auch fuer bereits gecachte Entitaeten die
-    # Entity-Ref-Label nachholen, falls sie in frueheren Laeufen unaufgeloest
-    # blieben (Muster `label == qid`). Dadurch schliesst z. B. ein spaeterer
-    # Approval-Batch Label-Luecken in zuvor gefetchten Orten.
-    for qid_key, entry in enriched.items():
-        for field_name, val in entry.get("properties", {}).items():
-            if isinstance(val, dict) and "qid" in val:
-                if val.get("label") == val.get("qid"):
-                    pending_label_qids.add(val["qid"])
-            elif isinstance(val, list):
-                for item in val:
-                    if isinstance(item, dict) and "qid" in item:
-                        if item.get("label") == item.get("qid"):
-                            pending_label_qids.add(item["qid"])
-
-    # Labels fuer Entity-Referenzen aufloesen
-    if pending_label_qids:
-        print(f"\nLabels aufloesen: {len(pending_label_qids)} QIDs...")
-        labels = resolve_labels(list(pending_label_qids))
-
-        # Labels in Properties eintragen
-        for qid_key, entry in enriched.items():
-            props = entry.get("properties", {})
-            for field_name, val in props.items():
-                if isinstance(val, dict) and "qid" in val:
-                    val["label"] = labels.get(val["qid"], val.get("label") or val["qid"])
-                elif isinstance(val, list):
-                    for item in val:
-                        if isinstance(item, dict) and "qid" in item:
-                            item["label"] = labels.get(item["qid"], item.get("label") or item["qid"])
+            # Revision fuer --refresh
+            if "lastrevid" in entity:
+                enriched[qid]["lastrevid"] = entity["lastrevid"]
+                enriched[qid]["modified"] = entity.get("modified")
+
+    # Labels fuer Entity-Referenzen eintragen
+    if labels:
+        print(f"\nLabels aufloesen: {len(labels)} QIDs "
+              f"({len(labels.cached)} aus dem Label-Cache)...")
+        resolved = labels.result()
+        for entry in enriched.values():
+            for ref in entity_refs(entry.get("properties", {})):
+                ref["label"] = resolved.get(ref["qid"], ref.get("label") or ref["qid"])
 
     _write_output(enriched, entity_types, matched)
 
@@ -422,7 +584,23 @@ def main():
     )
     parser.add_argument(
         "--force", action="store_true",
-        help="Cache ignorieren, alle Entitaeten neu fetchen"
+        help="Cache ignorieren, alle Entitaeten neu fetchen (HTTP-Cache wird revalidiert)"
+    )
+    parser.add_argument(
+        "--refresh", action="store_true",
+        help="Revisionen pruefen, nur geaenderte Entitaeten neu fetchen"
+    )
+    parser.add_argument(
+        "--workers", type=int, default=DEFAULT_WORKERS,
+        help=f"Parallele Batch-Abfragen (default: {DEFAULT_WORKERS}; 1 = sequentiell)"
+    )
+    parser.add_argument(
+        "--rate", type=float, default=REQUEST_RATE,
+        help=f"Max. API-Anfragen pro Sekunde, alle Worker zusammen (default: {REQUEST_RATE:g})"
+    )
+    parser.add_argument(
+        "--offline", action="store_true",
+        help="Nur aus dem HTTP-Cache antworten, Abbruch bei Fehltreffer"
     )
     args = parser.parse_args()
 
@@ -434,8 +612,26 @@ def main():
     print(f"Typen: {', '.join(entity_types)}")
     if args.force:
         print("[FORCE — Cache wird ignoriert]")
-
-    run_enrichment(entity_types, force=args.force)
+    elif args.refresh:
+        print("[REFRESH — nur geaenderte Revisionen neu fetchen]")
+    if args.offline:
+        print("[OFFLINE — nur HTTP-Cache]")
+
+    cache = ResponseCache.from_env(offline=args.offline, refresh=args.force)
+    client = WikidataClient(WIKIDATA_API, user_agent=USER_AGENT,
+                            rate=args.rate, workers=args.workers, cache=cache)
+    set_client(client)
+    store = LabelStore.from_env(offline=args.offline, refresh=args.force)
+    set_label_store(store)
+    with client:
+        try:
+            run_enrichment(entity_types, force=args.force, refresh=args.refresh)
+        except CacheMiss as e:
+            print(f"\nFehler: {e}")
+            sys.exit(1)
+        finally:
+            if store is not None:
+                store.close()
 
 
 if __name__ == "__main__":
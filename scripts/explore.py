@@ -24,6 +24,8 @@ if sys.stdout.encoding != "utf-8":
 
 import pandas as pd
 
+from _xlsx_cache import read_sheet, sheet_names
+
 # ---------------------------------------------------------------------------
 # Konfiguration
 # ---------------------------------------------------------------------------
@@ -149,11 +151,10 @@ def analyze_table(path: Path, name: str) -> dict:
     }
 
     try:
-        xls = pd.ExcelFile(path, engine="openpyxl")
-        result["sheets"] = xls.sheet_names
+        result["sheets"] = sheet_names(path)
 
         # Erste Sheet lesen (Google Sheets Export hat typisch nur eine)
-        df = pd.read_excel(path, engine="openpyxl")
+        df = read_sheet(path)
 
         # Leere Zeilen entfernen
         df = df.dropna(how="all")
@@ -403,8 +404,8 @@ def cross_table_analysis(tables: dict[str, dict]) -> list[dict]:
     verk_path = verknuepfungen["path"]
 
     try:
-        df_obj = pd.read_excel(obj_path, engine="openpyxl").dropna(how="all")
-        df_verk = pd.read_excel(verk_path, engine="openpyxl").dropna(how="all")
+        df_obj = read_sheet(obj_path).dropna(how="all")
+        df_verk = read_sheet(verk_path).dropna(how="all")
 
         # Template-Zeilen filtern
         if "archivsignatur" in df_obj.columns:
@@ -442,7 +443,7 @@ def cross_table_analysis(tables: dict[str, dict]) -> list[dict]:
                 relevant_types = typ_mapping.get(index_name, [])
 
                 try:
-                    df_idx = pd.read_excel(index_table["path"], engine="openpyxl").dropna(how="all")
+                    df_idx = read_sheet(index_table["path"]).dropna(how="all")
 
                     # Index-Werte sammeln (name oder titel)
                     idx_values = set()
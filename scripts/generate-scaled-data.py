@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+M³GIM Testdaten-Generator — Sheets in n-facher Groesse.
+
+Erzeugt aus den echten Tabellen in data/google-spreadsheet/ einen
+synthetischen Satz (Objekte, vier Indizes, Verknuepfungen) in ``--scale``-
+facher Groesse, um transform.py/build-views.py vor der Vollerfassung des
+Nachlasses unter Last zu messen (scripts/benchmark.py).
+
+Jede Kopie c = 1..n-1 wiederholt die Datenzeilen des Originals mit:
+
+- verschobenen Signaturen: NIM_135 -> NIM_{135 + c*1000}, NIM/PL_03 ->
+  NIM/PL_{3 + c*1000} (Objekte und Verknuepfungen gleich, Joins bleiben
+  erhalten; zwei- und dreistellige Erfassung normalisiert identisch)
+- eigenen Index-Eintraegen: Index-Namen bekommen das Suffix `` [c]``, und
+  Verknuepfungszeilen, deren Name exakt einen Indexeintrag trifft, zeigen auf
+  die Kopie — die Indizes wachsen mit (``--shared-index`` laesst sie gleich)
+- eigenen Verknuepfungs-Sheets (``Box 5~c``), wie neu erfasste Boxen
+
+Kopfzeilen bleiben unveraendert, inklusive der bekannten Header-Shifts
+(E-95); nur der leere Auslauf am Sheet-Ende wird nicht mitkopiert. ``--scale
+1`` reproduziert damit den heutigen Export. Die Ausgabe ist deterministisch.
+
+Verwendung:
+    python scripts/generate-scaled-data.py --scale 10 --out /tmp/m3gim-x10
+    M3GIM_SHEETS_DIR=/tmp/m3gim-x10 M3GIM_OUTPUT_DIR=/tmp/m3gim-x10-out \\
+        python scripts/transform.py
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+from pathlib import Path
+
+import openpyxl
+
+BASE_DIR = Path(__file__).parent.parent
+SHEETS_DIR = Path(os.environ.get("M3GIM_SHEETS_DIR", BASE_DIR / "data" / "google-spreadsheet"))
+
+INDEX_NAMES = ["Personenindex", "Organisationsindex", "Ortsindex", "Werkindex"]
+OBJEKTE = "M3GIM-Objekte.xlsx"
+VERKNUEPFUNGEN = "M3GIM-Verknüpfungen.xlsx"
+
+# Abstand der Signaturnummern zwischen Kopien (echte Nummern liegen < 1000)
+SIGNATUR_OFFSET = 1000
+_SIGNATUR_RE = re.compile(r"(NIM(?:/[A-Z]+)?_)(\d+)")
+# Excel-Limit fuer Sheet-Namen
+_MAX_SHEET_NAME = 31
+
+# Manifest im Ausgabeverzeichnis; --reuse erzeugt nur bei Abweichung neu
+MANIFEST = "generator.json"
+GENERATOR_VERSION = 1
+
+
+def source_digest(source_dir: Path = SHEETS_DIR) -> str:
+    """SHA-256 ueber alle Quell-Workbooks (Name + Inhalt)."""
+    h = hashlib.sha256()
+    for path in sorted(Path(source_dir).glob("*.xlsx")):
+        h.update(path.name.encode("utf-8") + b"\0")
+        h.update(hashlib.sha256(path.read_bytes()).digest())
+    return h.hexdigest()
+
+
+def shift_signatur(value, copy: int):
+    """Signaturnummern der Kopie ``copy`` verschieben (Kopie 0 = Original)."""
+    if copy == 0 or not isinstance(value, str):
+        return value
+    return _SIGNATUR_RE.sub(
+        lambda m: f"{m.group(1)}{int(m.group(2)) + copy * SIGNATUR_OFFSET:03d}", value)
+
+
+def copy_name(name, copy: int):
+    if copy == 0 or not isinstance(name, str):
+        return name
+    return f"{name.strip()} [{copy}]"
+
+
+def _read_rows(path: Path) -> dict[str, list[tuple]]:
+    """Alle Sheets als {titel: [zeile, ...]} (Rohwerte, Zeile 0 = Kopf)."""
+    wb = openpyxl.load_workbook(path, read_only=True)
+    try:
+        return {ws.title: [tuple(r) for r in ws.iter_rows(values_only=True)]
+                for ws in wb.worksheets}
+    finally:
+        wb.close()
+
+
+def _is_empty(row: tuple) -> bool:
+    return all(v is None or (isinstance(v, str) and not v.strip()) for v in row)
+
+
+def _data_rows(rows: list[tuple]) -> list[tuple]:
+    """Datenzeilen ohne Kopf und ohne leeren Auslauf am Sheet-Ende.
+
+    Leerzeilen mitten im Sheet bleiben (XLSX-Provenance = Zeilennummer).
+    """
+    data = list(rows[1:])
+    while data and _is_empty(data[-1]):
+        data.pop()
+    return data
+
+
+def _write(path: Path, sheets: dict) -> None:
+    """{titel: iterable(zeilen)} als Workbook schreiben (write-only, streamend)."""
+    wb = openpyxl.Workbook(write_only=True)
+    for title, rows in sheets.items():
+        ws = wb.create_sheet(title=title)
+        for row in rows:
+            ws.append(list(row))
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    wb.save(tmp)
+    tmp.replace(path)
+
+
+def _sheet_title(title: str, copy: int) -> str:
+    if copy == 0:
+        return title
+    suffix = f"~{copy}"
+    return title[:_MAX_SHEET_NAME - len(suffix)] + suffix
+
+
+def _header_col(header: tuple, name: str) -> int | None:
+    for pos, col in enumerate(header):
+        if isinstance(col, str) and col.strip().lower() == name:
+            return pos
+    return None
+
+
+def _scaled_index(rows: list[tuple], scale: int, shared: bool):
+    header, data = rows[0], _data_rows(rows)
+    yield header
+    for copy in range(1 if shared else scale):
+        for row in data:
+            # Position 1 ist in allen vier Indizes der Name (load_index)
+            yield row[:1] + (copy_name(row[1], copy),) + row[2:] if len(row) > 1 else row
+
+
+def _scaled_objekte(rows: list[tuple], scale: int):
+    header, data = rows[0], _data_rows(rows)
+    sig = _header_col(header, "archivsignatur")
+    yield header
+    for copy in range(scale):
+        for row in data:
+            if sig is not None and sig < len(row):
+                row = row[:sig] + (shift_signatur(row[sig], copy),) + row[sig + 1:]
+            yield row
+
+
+def _scaled_verknuepfungen_sheet(rows: list[tuple], copy: int, index_names: set):
+    header, data = rows[0], _data_rows(rows)
+    name_col = _header_col(header, "name")
+    yield header
+    for row in data:
+        row = list(row)
+        # Spalte 0 ist positionell die Archivsignatur (transform.py)
+        if row:
+            row[0] = shift_signatur(row[0], copy)
+        if (name_col is not None and name_col < len(row)
+                and isinstance(row[name_col], str)
+                and row[name_col].strip().lower() in index_names):
+            row[name_col] = copy_name(row[name_col], copy)
+        yield tuple(row)
+
+
+def generate(out_dir: Path, scale: int, source_dir: Path = SHEETS_DIR,
+             shared_index: bool = False) -> dict:
+    """Schreibt den skalierten Satz nach ``out_dir`` und liefert das Manifest
+    (Zeilen pro Datei/Sheet)."""
+    if scale < 1:
+        raise ValueError(f"scale muss >= 1 sein, nicht {scale}")
+    out_dir = Path(out_dir)
+    manifest = {"version": GENERATOR_VERSION, "scale": scale,
+                "shared_index": shared_index, "source": str(source_dir),
+                "source_digest": source_digest(source_dir), "rows": {}}
+
+    index_names: set = set()
+    for name in INDEX_NAMES:
+        src = source_dir / f"M3GIM-{name}.xlsx"
+        if not src.exists():
+            continue
+        sheets = _read_rows(src)
+        title, rows = next(iter(sheets.items()))
+        if not rows:
+            continue
+        index_names.update(r[1].strip().lower() for r in rows[1:]
+                           if len(r) > 1 and isinstance(r[1], str) and r[1].strip())
+        scaled = list(_scaled_index(rows, scale, shared_index))
+        _write(out_dir / src.name, {title: scaled})
+        manifest["rows"][src.name] = len(scaled) - 1
+
+    src = source_dir / OBJEKTE
+    title, rows = next(iter(_read_rows(src).items()))
+    scaled = list(_scaled_objekte(rows, scale))
+    _write(out_dir / OBJEKTE, {title: scaled})
+    manifest["rows"][OBJEKTE] = len(scaled) - 1
+
+    # Verknuepfungen: Sheets einer Kopie zusammen, Kopien hintereinander
+    # (wie fortlaufend erfasste Boxen). Generatoren, damit auch 1000x
+    # nicht komplett im Speicher liegt.
+    src = source_dir / VERKNUEPFUNGEN
+    originals = {t: r for t, r in _read_rows(src).items() if r}
+    link_names = set() if shared_index else index_names
+    sheets = {}
+    for copy in range(scale):
+        for title, rows in originals.items():
+            sheets[_sheet_title(title, copy)] = _scaled_verknuepfungen_sheet(
+                rows, copy, link_names)
+    _write(out_dir / VERKNUEPFUNGEN, sheets)
+    manifest["rows"][VERKNUEPFUNGEN] = scale * sum(
+        len(_data_rows(rows)) for rows in originals.values())
+    manifest["sheets"] = len(sheets)
+
+    (out_dir / MANIFEST).write_text(
+        json.dumps(manifest, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+    return manifest
+
+
+def is_current(out_dir: Path, scale: int, source_dir: Path = SHEETS_DIR,
+               shared_index: bool = False) -> bool:
+    """True, wenn ``out_dir`` bereits genau diesen Satz enthaelt."""
+    try:
+        manifest = json.loads((Path(out_dir) / MANIFEST).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return False
+    return (manifest.get("version") == GENERATOR_VERSION
+            and manifest.get("scale") == scale
+            and manifest.get("shared_index") == shared_index
+            and manifest.get("source_digest") == source_digest(source_dir)
+            and all((Path(out_dir) / name).exists() for name in manifest["rows"]))
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Skalierte synthetische M3GIM-Sheets erzeugen")
+    parser.add_argument("--scale", type=int, required=True,
+                        help="Vielfaches der heutigen Datenmenge (z.B. 10, 100, 1000)")
+    parser.add_argument("--out", type=Path, required=True,
+                        help="Zielverzeichnis (wird als M3GIM_SHEETS_DIR genutzt)")
+    parser.add_argument("--source", type=Path, default=SHEETS_DIR,
+                        help="Quell-Sheets (Default: data/google-spreadsheet)")
+    parser.add_argument("--shared-index", action="store_true",
+                        help="Indizes nicht vervielfachen, alle Kopien verweisen "
+                             "auf dieselben Eintraege")
+    parser.add_argument("--reuse", action="store_true",
+                        help="nichts tun, wenn --out schon diesen Satz enthaelt "
+                             "(gleiche Quellen, Skalierung, Optionen)")
+    args = parser.parse_args(argv)
+
+    if args.out.resolve() == args.source.resolve():
+        print("FEHLER: --out darf nicht das Quellverzeichnis sein")
+        return 1
+    if args.reuse and is_current(args.out, args.scale, args.source, args.shared_index):
+        print(f"Skalierung x{args.scale}: {args.out} ist aktuell (uebersprungen)")
+        return 0
+    manifest = generate(args.out, args.scale, args.source, args.shared_index)
+    print(f"Skalierung x{args.scale} -> {args.out}")
+    for name, count in manifest["rows"].items():
+        print(f"  {name}: {count} Zeilen")
+    print(f"  Verknuepfungs-Sheets: {manifest['sheets']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
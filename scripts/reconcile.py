@@ -9,31 +9,56 @@ bei der naechsten Pipeline-Ausfuehrung uebernommen wird.
 
 Strategie:
   - Exakte Matches (Label == Name, case-insensitive) bevorzugt
-  - Fuzzy-Matching als Fallback (thefuzz token_set_ratio)
+  - Fuzzy-Matching als Fallback (thefuzz token_set_ratio; pro Gruppe
+    gebuendelt ueber _fuzzy_match, das auch Offline-Kandidatenlisten mit
+    Blocking abgleicht)
   - Personen: zusaetzlich Filterung auf instance-of human (Q5)
   - Organisationen: Filterung auf organisation/institution
   - Orte: Filterung auf geographic entity
   - Werke: Suche mit "Komponist + Titel", P86-Validierung
   - Confidence-Level: exact (100), fuzzy_high (>=90), fuzzy_low (>=80)
 
+Netzwerk: Die Abfragen laufen ueber _wikidata_client.WikidataClient —
+mehrere Index-Zeilen parallel (--workers), gemeinsames Rate-Limit (--rate),
+Keep-Alive-Verbindungen, Retry mit Retry-After/maxlag. Die Ausgabe-
+Reihenfolge bleibt die der Index-Tabellen. Die P31/P86-Claims der Kandidaten
+werden gruppenweise (CHUNK_ROWS Zeilen) mit einem wbgetentities-Aufruf pro
+50 QIDs geladen und lokal bewertet, statt pro Kandidat einzeln. Antworten
+landen im HTTP-Cache (_http_cache.py); --offline spielt nur aus dem Cache ab.
+--index beantwortet Suche und Claims stattdessen aus einem lokal gebauten
+Kandidatenindex (build-candidate-index.py, _candidate_index.py), ganz ohne Netz.
+
+Absturzsicherheit: Jede fertige Gruppe landet sofort im Journal
+(wikidata-reconciliation.journal.jsonl neben der Ausgabe, _journal.py), alle
+JOURNAL_COMPACT_EVERY Gruppen und beim Abbruch wird der Zwischenstand atomar
+in die Ausgabe geschrieben (``meta.partial``). Ein abgebrochener Lauf setzt
+beim naechsten Aufruf fort, ohne bereits aufgeloeste Namen erneut abzufragen;
+nach einem vollstaendigen Lauf wird das Journal geloescht.
+
 Verwendung:
     python scripts/reconcile.py [--dry-run] [--type person|org|location|work]
                                 [--force] [--min-confidence 80]
+                                [--workers 4] [--rate 4] [--offline]
+                                [--index [PATH]]
 """
 
 import sys
 import json
-import time
 import argparse
-import urllib.request
-import urllib.parse
-import urllib.error
 import pandas as pd
 from datetime import datetime
 from pathlib import Path
 from thefuzz import fuzz
 
+from _candidate_index import INDEX_PATH, OfflineIndex
 from _common import INDEX_HEADER_SHIFTS
+from _fuzzy_match import (FUZZY_HIGH_THRESHOLD, FUZZY_LOW_THRESHOLD, classify,
+                          exact_key, normalize, score_pairs)
+from _http_cache import CacheMiss, ResponseCache
+from _journal import Journal, write_json_atomic
+from _wikidata_client import (DEFAULT_RATE, DEFAULT_WORKERS, WIKIDATA_API,
+                              WikidataClient, WikidataError)
+from _xlsx_cache import read_sheet
 
 # Windows-Konsole: UTF-8 erzwingen
 if sys.stdout.encoding != "utf-8":
@@ -51,13 +76,14 @@ OUTPUT_FILE = BASE_DIR / "data" / "output" / "wikidata-reconciliation.json"
 # Wikidata API
 # ---------------------------------------------------------------------------
 
-WIKIDATA_API = "https://www.wikidata.org/w/api.php"
-REQUEST_DELAY = 0.5  # Sekunden zwischen Anfragen (Rate Limiting)
+USER_AGENT = "M3GIM-Reconcile/1.0 (DH research project; mailto:pollin@dhcraft.org)"
 MIN_NAME_LENGTH = 3  # Kurze Namen (Kuerzel, Initialien) ueberspringen
+BATCH_SIZE = 50  # Max 50 IDs pro wbgetentities-Aufruf
+CHUNK_ROWS = 50  # Index-Zeilen pro Gruppe (Suche → gebuendelte Claims → Bewertung)
+JOURNAL_COMPACT_EVERY = 10  # Gruppen zwischen zwei Zwischenstaenden der Ausgabe
 
-# Fuzzy-Matching Schwellenwerte
-FUZZY_HIGH_THRESHOLD = 90
-FUZZY_LOW_THRESHOLD = 80
+# Fuzzy-Matching Schwellenwerte: FUZZY_HIGH_THRESHOLD / FUZZY_LOW_THRESHOLD
+# (aus _fuzzy_match)
 
 # Instance-of (P31) Werte fuer Filterung
 Q_HUMAN = "Q5"
@@ -78,49 +104,92 @@ Q_MUSICAL_WORK = {"Q105543609", "Q7725634", "Q1344", "Q7366", "Q9730",
 # Q482994=musical composition, Q188451=musical work
 
 
+_client = None
+_index: OfflineIndex | None = None  # gesetzt: Suche/Claims aus dem Offline-Index
+
+
+def set_index(index: OfflineIndex | None) -> None:
+    """Offline-Kandidatenindex statt der API verwenden (None = API)."""
+    global _index
+    _index = index
+
+
+def get_client() -> WikidataClient:
+    """Der im Lauf verwendete Client (Default-Konfiguration, falls keiner gesetzt)."""
+    global _client
+    if _client is None:
+        _client = WikidataClient(WIKIDATA_API, user_agent=USER_AGENT, timeout=10,
+                                 cache=ResponseCache.from_env())
+    return _client
+
+
+def set_client(client: WikidataClient | None) -> None:
+    """Client fuer search_wikidata/get_entity_claims setzen (Tests, CLI-Optionen)."""
+    global _client
+    _client = client
+
+
 def search_wikidata(query: str, language: str = "de", limit: int = 5) -> list:
-    """Sucht Entitaeten ueber die Wikidata Search API."""
+    """Sucht Entitaeten ueber die Wikidata Search API (oder den Offline-Index)."""
+    if _index is not None:
+        return _index.search(query, limit=limit)
     params = {
         "action": "wbsearchentities",
         "search": query,
         "language": language,
         "limit": str(limit),
-        "format": "json",
     }
-    url = f"{WIKIDATA_API}?{urllib.parse.urlencode(params)}"
-
     try:
-        req = urllib.request.Request(url, headers={
-            "User-Agent": "M3GIM-Reconcile/1.0 (DH research project; mailto:pollin@dhcraft.org)"
-        })
-        with urllib.request.urlopen(req, timeout=10) as resp:
-            data = json.loads(resp.read().decode("utf-8"))
-            return data.get("search", [])
-    except (urllib.error.URLError, urllib.error.HTTPError, TimeoutError) as e:
+        return get_client().get(params).get("search", [])
+    except WikidataError as e:
         print(f"  [WARN] API-Fehler fuer '{query}': {e}")
         return []
 
 
 def get_entity_claims(qid: str) -> dict:
     """Holt die Claims (P31 etc.) fuer eine Entitaet."""
+    if _index is not None:
+        return _index.claims([qid]).get(qid, {})
     params = {
         "action": "wbgetentities",
         "ids": qid,
         "props": "claims",
-        "format": "json",
     }
-    url = f"{WIKIDATA_API}?{urllib.parse.urlencode(params)}"
-
     try:
-        req = urllib.request.Request(url, headers={
-            "User-Agent": "M3GIM-Reconcile/1.0 (DH research project; mailto:pollin@dhcraft.org)"
-        })
-        with urllib.request.urlopen(req, timeout=10) as resp:
-            data = json.loads(resp.read().decode("utf-8"))
-            entity = data.get("entities", {}).get(qid, {})
-            return entity.get("claims", {})
-    except (urllib.error.URLError, urllib.error.HTTPError, TimeoutError):
+        data = get_client().get(params)
+    except WikidataError:
         return {}
+    entity = data.get("entities", {}).get(qid, {})
+    return entity.get("claims", {})
+
+
+def fetch_claims(qids: list) -> dict:
+    """Claims fuer viele QIDs: ein wbgetentities-Aufruf pro 50 IDs.
+
+    Returns dict QID → Claims. Fehlende oder fehlgeschlagene QIDs fehlen im
+    Ergebnis (check_type wertet sie wie bisher als "Typ passt nicht").
+    """
+    qids = list(dict.fromkeys(q for q in qids if q))
+    if not qids:
+        return {}
+    if _index is not None:
+        return _index.claims(qids)
+    batches = [qids[i:i + BATCH_SIZE] for i in range(0, len(qids), BATCH_SIZE)]
+
+    def fetch(batch):
+        params = {"action": "wbgetentities", "ids": "|".join(batch), "props": "claims"}
+        try:
+            return get_client().get(params).get("entities", {})
+        except WikidataError as e:
+            print(f"  [WARN] API-Fehler fuer Claims-Batch ({len(batch)} QIDs): {e}")
+            return {}
+
+    claims = {}
+    for entities in get_client().map(fetch, batches):
+        for qid, entity in entities.items():
+            if "missing" not in entity:
+                claims[qid] = entity.get("claims", {})
+    return claims
 
 
 def get_instance_of(claims: dict) -> set:
@@ -146,6 +215,8 @@ def compute_match_level(search_name: str, result_label: str,
                         ) -> tuple[str | None, int]:
     """Bewertet Match-Qualitaet zwischen Suchname und WD-Label.
 
+    Scores aus prime_match_levels() werden wiederverwendet, sonst Einzelvergleich.
+
     Returns: (level, score)
       level: 'exact', 'fuzzy_high', 'fuzzy_low', oder None
       score: 0-100 Aehnlichkeitswert
@@ -153,19 +224,39 @@ def compute_match_level(search_name: str, result_label: str,
     if is_exact_match(search_name, result_label):
         return ('exact', 100)
 
-    score = fuzz.token_set_ratio(search_name.lower(), result_label.lower())
+    score = _pair_scores.get((search_name, result_label))
+    if score is None:
+        score = fuzz.token_set_ratio(search_name.lower(), result_label.lower())
+    return classify(False, score, min_confidence)
+
+
+# Vorab gebuendelt berechnete Scores (Suchname, Label) -> token_set_ratio
+_pair_scores: dict = {}
+
+
+def prime_match_levels(pairs) -> None:
+    """Scores vieler Paare (Suchname, Label) in einem Aufruf vorab berechnen.
+
+    run_reconciliation ruft das pro Gruppe fuer alle Namensvarianten x
+    Suchtreffer auf; compute_match_level liest danach nur noch nach.
+    """
+    todo = list(dict.fromkeys(p for p in pairs if p not in _pair_scores
+                              and exact_key(p[0]) != exact_key(p[1])))
+    scores = score_pairs([normalize(a) for a, _ in todo], [normalize(b) for _, b in todo])
+    _pair_scores.update(zip(todo, scores))
 
-    if score >= FUZZY_HIGH_THRESHOLD:
-        return ('fuzzy_high', score)
-    if score >= min_confidence:
-        return ('fuzzy_low', score)
-    return (None, score)
 
+def clear_match_levels() -> None:
+    _pair_scores.clear()
 
-def check_type(qid: str, expected_types: set) -> bool:
-    """Prueft ob eine Entitaet den erwarteten P31-Typ hat."""
-    time.sleep(REQUEST_DELAY)
-    claims = get_entity_claims(qid)
+
+def check_type(qid: str, expected_types: set, claims: dict | None = None) -> bool:
+    """Prueft ob eine Entitaet den erwarteten P31-Typ hat.
+
+    ``claims``: bereits geladene Claims (fetch_claims); sonst Einzelabfrage.
+    """
+    if claims is None:
+        claims = get_entity_claims(qid)
     instances = get_instance_of(claims)
     if isinstance(expected_types, str):
         return expected_types in instances
@@ -176,27 +267,51 @@ def check_type(qid: str, expected_types: set) -> bool:
 # Reconciliation-Funktionen pro Typ
 # ---------------------------------------------------------------------------
 
-def reconcile_person(name: str, min_confidence: int = FUZZY_LOW_THRESHOLD,
-                     **_) -> dict | None:
-    """Reconciliation fuer Personen: Name → Q-ID mit Fuzzy-Matching + Q5."""
-    # Namenskandidaten: Original + umgekehrte Form ("Nachname, Vorname")
+# Jede Reconciliation besteht aus zwei Schritten:
+#   search_*  — Wikidata-Suche, liefert eine Trefferliste pro Suchanfrage
+#   score_*   — lokale Bewertung mit vorab (gebuendelt) geladenen Claims
+# Dazwischen laedt fetch_claims die P31/P86-Claims aller Kandidaten einer
+# ganzen Gruppe von Index-Zeilen mit einem Aufruf pro 50 QIDs, statt
+# check_type pro Kandidat einzeln abzufragen.
+
+def name_variants(name: str) -> list:
+    """Namenskandidaten fuer Personen: Original + umgekehrte Form ("Nachname, Vorname")."""
     candidates = [name]
     parts = name.split(",", 1)
     if len(parts) == 2:
         candidates.append(f"{parts[1].strip()} {parts[0].strip()}")
+    return candidates
+
+
+def candidate_qids(names: list, result_lists: list,
+                   min_confidence: int = FUZZY_LOW_THRESHOLD) -> list:
+    """QIDs, deren Label zu einem der Namen passt (nur diese brauchen Claims)."""
+    qids = []
+    for results in result_lists:
+        for r in results:
+            label = r.get("label", "")
+            if any(compute_match_level(n, label, min_confidence)[0] for n in names):
+                qids.append(r.get("id", ""))
+    return qids
 
-    # Alle Suchvarianten ausprobieren
-    all_results = []
-    for query in candidates:
+
+def search_person(name: str, **_) -> list:
+    """Suche fuer Personen: erste Namensvariante mit Treffern."""
+    for query in name_variants(name):
         results = search_wikidata(query, language="de")
         if results:
-            all_results.extend(results)
-            break  # Erster erfolgreicher Query reicht
+            return [results]  # Erster erfolgreicher Query reicht
+    return [[]]
+
 
+def score_person(name: str, result_lists: list, claims: dict,
+                 min_confidence: int = FUZZY_LOW_THRESHOLD, **_) -> dict | None:
+    """Bewertung fuer Personen: Fuzzy-Matching ueber alle Namensvarianten + Q5."""
+    candidates = name_variants(name)
     best_match = None
     best_score = 0
 
-    for r in all_results:
+    for r in result_lists[0]:
         label = r.get("label", "")
         qid = r.get("id", "")
 
@@ -204,7 +319,7 @@ def reconcile_person(name: str, min_confidence: int = FUZZY_LOW_THRESHOLD,
         for candidate in candidates:
             level, score = compute_match_level(candidate, label, min_confidence)
             if level and score > best_score:
-                if check_type(qid, Q_HUMAN):
+                if check_type(qid, Q_HUMAN, claims.get(qid, {})):
                     best_match = {
                         "qid": qid, "label": label,
                         "match": level, "confidence": score,
@@ -216,21 +331,23 @@ def reconcile_person(name: str, min_confidence: int = FUZZY_LOW_THRESHOLD,
     return best_match
 
 
-def reconcile_simple(name: str, expected_types: set,
-                     min_confidence: int = FUZZY_LOW_THRESHOLD,
-                     **_) -> dict | None:
-    """Generische Reconciliation mit Fuzzy-Matching + P31-Typfilter."""
-    results = search_wikidata(name, language="de")
+def search_simple(name: str, **_) -> list:
+    return [search_wikidata(name, language="de")]
 
+
+def score_simple(name: str, result_lists: list, claims: dict,
+                 expected_types: set,
+                 min_confidence: int = FUZZY_LOW_THRESHOLD, **_) -> dict | None:
+    """Generische Bewertung mit Fuzzy-Matching + P31-Typfilter."""
     best_match = None
     best_score = 0
 
-    for r in results:
+    for r in result_lists[0]:
         label = r.get("label", "")
         qid = r.get("id", "")
         level, score = compute_match_level(name, label, min_confidence)
         if level and score > best_score:
-            if check_type(qid, expected_types):
+            if check_type(qid, expected_types, claims.get(qid, {})):
                 best_match = {
                     "qid": qid, "label": label,
                     "match": level, "confidence": score,
@@ -242,20 +359,27 @@ def reconcile_simple(name: str, expected_types: set,
     return best_match
 
 
-def reconcile_work(name: str, komponist: str = None,
-                   min_confidence: int = FUZZY_LOW_THRESHOLD,
-                   **_) -> dict | None:
-    """Reconciliation fuer Werke. Composer-aware mit P86-Validierung."""
+def _work_queries(name: str, komponist: str = None) -> list:
     queries = []
     if komponist:
         queries.append(f"{name} {komponist}")
     queries.append(name)
+    return queries
 
+
+def search_work(name: str, komponist: str = None, **_) -> list:
+    """Suche fuer Werke: "Titel Komponist" und "Titel" (beide vorab)."""
+    return [search_wikidata(q, language="de") for q in _work_queries(name, komponist)]
+
+
+def score_work(name: str, result_lists: list, claims: dict,
+               komponist: str = None,
+               min_confidence: int = FUZZY_LOW_THRESHOLD, **_) -> dict | None:
+    """Bewertung fuer Werke. Composer-aware mit P86-Validierung."""
     best_match = None
     best_score = 0
 
-    for query in queries:
-        results = search_wikidata(query, language="de")
+    for results in result_lists:
         for r in results:
             label = r.get("label", "")
             qid = r.get("id", "")
@@ -264,14 +388,13 @@ def reconcile_work(name: str, komponist: str = None,
             if not level:
                 continue
 
-            if not check_type(qid, Q_MUSICAL_WORK):
+            entity_claims = claims.get(qid, {})
+            if not check_type(qid, Q_MUSICAL_WORK, entity_claims):
                 continue
 
             # Bonus fuer Composer-bestaetigung via P86
             if komponist and score < 100:
-                time.sleep(REQUEST_DELAY)
-                claims = get_entity_claims(qid)
-                p86 = claims.get("P86", [])
+                p86 = entity_claims.get("P86", [])
                 if p86:  # Hat Composer-Claim → vertrauenswuerdiger
                     score = min(score + 5, 100)
 
@@ -287,11 +410,43 @@ def reconcile_work(name: str, komponist: str = None,
     return best_match
 
 
+def _reconcile(search_fn, score_fn, names: list, name: str,
+               min_confidence: int, **kw) -> dict | None:
+    result_lists = search_fn(name, **kw)
+    claims = fetch_claims(candidate_qids(names, result_lists, min_confidence))
+    return score_fn(name, result_lists, claims, min_confidence=min_confidence, **kw)
+
+
+def reconcile_person(name: str, min_confidence: int = FUZZY_LOW_THRESHOLD,
+                     **_) -> dict | None:
+    """Reconciliation fuer Personen: Name → Q-ID mit Fuzzy-Matching + Q5."""
+    return _reconcile(search_person, score_person, name_variants(name), name,
+                      min_confidence)
+
+
+def reconcile_simple(name: str, expected_types: set,
+                     min_confidence: int = FUZZY_LOW_THRESHOLD,
+                     **_) -> dict | None:
+    """Generische Reconciliation mit Fuzzy-Matching + P31-Typfilter."""
+    return _reconcile(search_simple, score_simple, [name], name, min_confidence,
+                      expected_types=expected_types)
+
+
+def reconcile_work(name: str, komponist: str = None,
+                   min_confidence: int = FUZZY_LOW_THRESHOLD,
+                   **_) -> dict | None:
+    """Reconciliation fuer Werke. Composer-aware mit P86-Validierung."""
+    return _reconcile(search_work, score_work, [name], name, min_confidence,
+                      komponist=komponist)
+
+
 # ---------------------------------------------------------------------------
 # Index-Konfiguration (ersetzt den Duplikat-Code)
 # ---------------------------------------------------------------------------
 
 # Header-Shift-Korrekturen kommen aus _common.py (INDEX_HEADER_SHIFTS).
+# search_fn/score_fn: zweistufige Reconciliation (s.o.); names_fn liefert die
+# Namen, gegen die Labels geprueft werden (Default: nur der Name selbst).
 
 INDEX_CONFIG = [
     {
@@ -299,7 +454,9 @@ INDEX_CONFIG = [
         "label": "Personenindex",
         "filename": "M3GIM-Personenindex.xlsx",
         "shift_key": None,
-        "reconcile_fn": reconcile_person,
+        "search_fn": search_person,
+        "score_fn": score_person,
+        "names_fn": name_variants,
         "extra_fields": [],
     },
     {
@@ -307,7 +464,8 @@ INDEX_CONFIG = [
         "label": "Organisationsindex",
         "filename": "M3GIM-Organisationsindex.xlsx",
         "shift_key": "organisationsindex",
-        "reconcile_fn": lambda name, min_confidence=FUZZY_LOW_THRESHOLD, **kw: reconcile_simple(name, Q_ORGANIZATION, min_confidence=min_confidence),
+        "search_fn": search_simple,
+        "score_fn": lambda *a, **kw: score_simple(*a, expected_types=Q_ORGANIZATION, **kw),
         "extra_fields": [],
     },
     {
@@ -315,7 +473,8 @@ INDEX_CONFIG = [
         "label": "Ortsindex",
         "filename": "M3GIM-Ortsindex.xlsx",
         "shift_key": "ortsindex",
-        "reconcile_fn": lambda name, min_confidence=FUZZY_LOW_THRESHOLD, **kw: reconcile_simple(name, Q_GEOGRAPHIC, min_confidence=min_confidence),
+        "search_fn": search_simple,
+        "score_fn": lambda *a, **kw: score_simple(*a, expected_types=Q_GEOGRAPHIC, **kw),
         "extra_fields": [],
     },
     {
@@ -323,7 +482,8 @@ INDEX_CONFIG = [
         "label": "Werkindex",
         "filename": "M3GIM-Werkindex.xlsx",
         "shift_key": "werkindex",
-        "reconcile_fn": reconcile_work,
+        "search_fn": search_work,
+        "score_fn": score_work,
         "extra_fields": ["komponist"],
     },
 ]
@@ -336,7 +496,7 @@ def load_index(filename: str, shift_key: str = None) -> pd.DataFrame:
         print(f"  [SKIP] {filename} nicht gefunden")
         return pd.DataFrame()
 
-    df = pd.read_excel(path)
+    df = read_sheet(path)
 
     if shift_key and shift_key in INDEX_HEADER_SHIFTS:
         expected = INDEX_HEADER_SHIFTS[shift_key]
@@ -383,14 +543,46 @@ def load_previous_results() -> dict:
     return result
 
 
+def journal_file() -> Path:
+    """Fortschrittsjournal neben der Ausgabe (folgt OUTPUT_FILE)."""
+    return OUTPUT_FILE.with_name(f"{OUTPUT_FILE.stem}.journal.jsonl")
+
+
 # ---------------------------------------------------------------------------
 # Hauptprogramm
 # ---------------------------------------------------------------------------
 
+def _display(name: str, extra: dict) -> str:
+    """Anzeigename einer Index-Zeile (Werke mit Komponist)."""
+    if extra.get("komponist"):
+        return f"{name} ({extra['komponist']})"
+    return name
+
+
+def _snapshot(results: dict, slots: list, partial: bool = False) -> dict:
+    """Ausgabe aus Grundstock (``results``) und allen belegten Slots."""
+    out = {key: (dict(value) if key == "meta" else list(value))
+           for key, value in results.items()}
+    for slot in slots:
+        if slot is not None:
+            category, entry = slot
+            out[category].append(entry)
+    if partial:
+        out["meta"]["partial"] = True
+    return out
+
+
 def run_reconciliation(entity_types: list, dry_run: bool = False,
                        force: bool = False,
-                       min_confidence: int = FUZZY_LOW_THRESHOLD):
-    """Fuehrt die Reconciliation durch."""
+                       min_confidence: int = FUZZY_LOW_THRESHOLD,
+                       client: WikidataClient | None = None,
+                       index: OfflineIndex | None = None):
+    """Fuehrt die Reconciliation durch.
+
+    ``client``: optionaler WikidataClient (Worker, Rate, Endpunkt); ohne
+    Angabe die Default-Konfiguration aus get_client().
+    ``index``: Offline-Kandidatenindex; dann keine API-Abfragen.
+    """
 
     # Cache laden (ueberspringbare Namen)
     cache = load_previous_results() if not force else {
@@ -430,6 +622,27 @@ def run_reconciliation(entity_types: list, dry_run: bool = False,
             if s["type"] not in entity_types:
                 results["skipped"].append(s)
 
+    # Journal eines abgebrochenen Laufs: dort aufgeloeste Namen nicht neu abfragen
+    journal = None
+    journaled = {}
+    if not dry_run:
+        journal = Journal(journal_file(), {"min_confidence": min_confidence})
+        if journal.discarded:
+            print(f"Journal {journal.path.name}: andere Parameter, verworfen")
+        for record in journal.records:
+            entry = record["entry"]
+            journaled[(entry["type"], entry["name"])] = (record["category"], entry)
+        if journaled:
+            print(f"Journal {journal.path.name}: {len(journaled)} Namen aus "
+                  f"abgebrochenem Lauf, setze fort")
+    journaled_count = 0
+
+    # Pro Index-Zeile ein Slot (Kategorie, Eintrag); offene Abfragen werden
+    # danach parallel aufgeloest und in ihren Slot geschrieben, damit die
+    # Ausgabe-Reihenfolge unabhaengig von der Parallelitaet bleibt.
+    slots = []
+    pending = []
+
     for cfg in INDEX_CONFIG:
         etype = cfg["type"]
         if etype not in entity_types:
@@ -453,33 +666,40 @@ def run_reconciliation(entity_types: list, dry_run: bool = False,
 
             # Bereits im Google Sheet verknuepft
             if existing_wd and existing_wd != "nan" and existing_wd != "":
-                results["skipped"].append({
+                slots.append(("skipped", {
                     "type": etype, "name": name,
                     "existing_qid": existing_wd
-                })
+                }))
                 print(f"  [SKIP] {name} — bereits {existing_wd}")
                 continue
 
             # Mindestlaenge pruefen (verhindert False Positives bei Kuerzeln)
             if len(name) < MIN_NAME_LENGTH:
-                results["skipped"].append({
+                slots.append(("skipped", {
                     "type": etype, "name": name,
                     "existing_qid": f"zu kurz ({len(name)} Zeichen)"
-                })
+                }))
                 print(f"  [SKIP] {name} — zu kurz ({len(name)} Zeichen)")
                 continue
 
-            # Cache-Hit: bereits abgefragt, Ergebnis wiederverwenden
+            # Im Journal: im abgebrochenen Lauf schon aufgeloest
             cache_key = (etype, name)
+            if cache_key in journaled:
+                slots.append(journaled[cache_key])
+                journaled_count += 1
+                print(f"  [JOURNAL] {name}")
+                continue
+
+            # Cache-Hit: bereits abgefragt, Ergebnis wiederverwenden
             if cache_key in cache["matched_keys"]:
                 prev_match = cache["matched_data"].get(cache_key)
                 if prev_match:
-                    results["matched"].append(prev_match)
+                    slots.append(("matched", prev_match))
                     cached_count += 1
                     print(f"  [CACHE] {name} → {prev_match['qid']}")
                     continue
             if cache_key in cache["unmatched_keys"]:
-                results["unmatched"].append({"type": etype, "name": name})
+                slots.append(("unmatched", {"type": etype, "name": name}))
                 cached_count += 1
                 print(f"  [CACHE] {name} → kein Match")
                 continue
@@ -490,36 +710,98 @@ def run_reconciliation(entity_types: list, dry_run: bool = False,
                 val = str(row.get(field, "")).strip()
                 extra[field] = val if val != "nan" else None
 
-            # Anzeige
-            display = name
-            if extra.get("komponist"):
-                display = f"{name} ({extra['komponist']})"
-            print(f"  [SEARCH] {display}...", end=" ", flush=True)
-
             if dry_run:
-                print("→ [DRY RUN]")
+                print(f"  [SEARCH] {_display(name, extra)} → [DRY RUN]")
                 continue
 
-            match = cfg["reconcile_fn"](name, min_confidence=min_confidence,
-                                          **extra)
-            time.sleep(REQUEST_DELAY)
-
-            if match:
-                entry = {"type": etype, "name": name, **extra, **match}
-                results["matched"].append(entry)
-                print(f"→ {match['qid']} ({match['match']})")
-            else:
-                entry = {"type": etype, "name": name}
-                if extra:
-                    entry.update(extra)
-                results["unmatched"].append(entry)
-                print("→ kein Match")
-
-    # --- Ergebnis speichern (nicht im Dry-Run) ---
+            pending.append((len(slots), cfg, name, extra))
+            slots.append(None)
+
+    if pending:
+        if index is not None:
+            set_index(index)
+            # CPU-gebunden: keine Worker-Threads, kein Client
+            mapper = map
+            print(f"\n=== Offline-Index: {len(pending)} Namen, "
+                  f"{index.entity_count} Entitaeten ({index.path.name}) ===")
+        else:
+            if client is not None:
+                set_client(client)
+            client = get_client()
+            mapper = client.map
+            print(f"\n=== Wikidata-Abfragen: {len(pending)} Namen, "
+                  f"{client.workers} Worker, {client.bucket.rate:g} Anfragen/s ===")
+
+        # Gruppenweise: Suchen parallel, dann die Claims aller Kandidaten der
+        # Gruppe gebuendelt laden (fetch_claims), dann lokal bewerten.
+        def search(job):
+            _, cfg, name, extra = job
+            return cfg["search_fn"](name, **extra)
+
+        done = 0
+        try:
+            for start in range(0, len(pending), CHUNK_ROWS):
+                chunk = pending[start:start + CHUNK_ROWS]
+                searched = list(mapper(search, chunk))
+                names = [cfg.get("names_fn", lambda n: [n])(name) for _, cfg, name, _ in chunk]
+                prime_match_levels((n, r.get("label", ""))
+                                   for variants, result_lists in zip(names, searched)
+                                   for n in variants
+                                   for results in result_lists for r in results)
+                qids = []
+                for variants, result_lists in zip(names, searched):
+                    qids.extend(candidate_qids(variants, result_lists, min_confidence))
+                claims = fetch_claims(qids)
+
+                for (slot, cfg, name, extra), result_lists in zip(chunk, searched):
+                    etype = cfg["type"]
+                    match = cfg["score_fn"](name, result_lists, claims,
+                                            min_confidence=min_confidence, **extra)
+                    if match:
+                        slots[slot] = ("matched", {"type": etype, "name": name, **extra, **match})
+                        print(f"  [SEARCH] {_display(name, extra)} → {match['qid']} ({match['match']})")
+                    else:
+                        entry = {"type": etype, "name": name}
+                        if extra:
+                            entry.update(extra)
+                        slots[slot] = ("unmatched", entry)
+                        print(f"  [SEARCH] {_display(name, extra)} → kein Match")
+                clear_match_levels()
+
+                if journal is not None:
+                    journal.append([{"category": slots[slot][0], "entry": slots[slot][1]}
+                                    for slot, *_ in chunk])
+                    done += 1
+                    if done % JOURNAL_COMPACT_EVERY == 0:
+                        write_json_atomic(OUTPUT_FILE, _snapshot(results, slots, partial=True))
+        except BaseException:
+            # Netzfehler, CacheMiss, Strg+C: Fortschritt sichern, Journal behalten
+            if journal is not None:
+                journal.close()
+                if done:
+                    write_json_atomic(OUTPUT_FILE, _snapshot(results, slots, partial=True))
+                print(f"\nAbgebrochen — Zwischenstand gesichert, {journal.path.name} "
+                      f"bleibt fuer den naechsten Lauf")
+            raise
+        if index is not None:
+            set_index(None)
+            print(f"  Index: {index.stats['searches']} Suchen, "
+                  f"{index.stats['claims']} Claims-Abfragen")
+        else:
+            stats = client.stats
+            print(f"  HTTP: {stats['requests']} Anfragen, {stats['retries']} Retries, "
+                  f"{stats['connections']} Verbindungen, {stats['errors']} Fehler")
+            if client.cache is not None:
+                cstats = client.cache.stats
+                print(f"  Cache: {cstats['hits']} Treffer, {cstats['revalidated']} revalidiert, "
+                      f"{cstats['stored']} neu")
+
+    results = _snapshot(results, slots)
+
+    # --- Ergebnis speichern (nicht im Dry-Run), danach ist das Journal erledigt ---
     if not dry_run:
-        OUTPUT_FILE.parent.mkdir(parents=True, exist_ok=True)
-        with open(OUTPUT_FILE, "w", encoding="utf-8") as f:
-            json.dump(results, f, ensure_ascii=False, indent=2)
+        write_json_atomic(OUTPUT_FILE, results)
+        journal.discard()
 
     # --- Zusammenfassung ---
     print(f"\n{'='*60}")
@@ -529,6 +811,8 @@ def run_reconciliation(entity_types: list, dry_run: bool = False,
     print(f"  Uebersprungen: {len(results['skipped'])}")
     if cached_count > 0:
         print(f"  Aus Cache:    {cached_count}")
+    if journaled_count > 0:
+        print(f"  Aus Journal:  {journaled_count}")
     if not dry_run:
         print(f"\nGespeichert: {OUTPUT_FILE}")
 
@@ -552,12 +836,29 @@ def main():
     )
     parser.add_argument(
         "--force", action="store_true",
-        help="Cache ignorieren, alle Namen neu abfragen"
+        help="Cache ignorieren, alle Namen neu abfragen (HTTP-Cache wird revalidiert)"
+    )
+    parser.add_argument(
+        "--offline", action="store_true",
+        help="Nur aus dem HTTP-Cache antworten, Abbruch bei Fehltreffer"
+    )
+    parser.add_argument(
+        "--index", nargs="?", type=Path, const=INDEX_PATH, default=None,
+        help="Offline-Kandidatenindex statt der API (build-candidate-index.py; "
+             f"default: {INDEX_PATH.name})"
     )
     parser.add_argument(
         "--min-confidence", type=int, default=FUZZY_LOW_THRESHOLD,
         help=f"Minimale Confidence (0-100, default: {FUZZY_LOW_THRESHOLD})"
     )
+    parser.add_argument(
+        "--workers", type=int, default=DEFAULT_WORKERS,
+        help=f"Parallele Abfragen (default: {DEFAULT_WORKERS}; 1 = sequentiell)"
+    )
+    parser.add_argument(
+        "--rate", type=float, default=DEFAULT_RATE,
+        help=f"Max. API-Anfragen pro Sekunde, alle Worker zusammen (default: {DEFAULT_RATE:g})"
+    )
     args = parser.parse_args()
 
     entity_types = [args.type] if args.type else [
@@ -572,8 +873,33 @@ def main():
     if args.force:
         print("[FORCE — Cache wird ignoriert]")
 
-    run_reconciliation(entity_types, dry_run=args.dry_run, force=args.force,
-                       min_confidence=args.min_confidence)
+    if args.offline:
+        print("[OFFLINE — nur HTTP-Cache]")
+
+    if args.index:
+        try:
+            index = OfflineIndex(args.index)
+        except (FileNotFoundError, ValueError) as e:
+            print(f"\nFehler: {e}")
+            sys.exit(1)
+        print(f"[INDEX — {args.index}, Stand {index.meta.get('built', '?')}]")
+        try:
+            run_reconciliation(entity_types, dry_run=args.dry_run, force=args.force,
+                               min_confidence=args.min_confidence, index=index)
+        finally:
+            index.close()
+        return
+
+    cache = ResponseCache.from_env(offline=args.offline, refresh=args.force)
+    client = WikidataClient(WIKIDATA_API, user_agent=USER_AGENT, timeout=10,
+                            rate=args.rate, workers=args.workers, cache=cache)
+    with client:
+        try:
+            run_reconciliation(entity_types, dry_run=args.dry_run, force=args.force,
+                               min_confidence=args.min_confidence, client=client)
+        except CacheMiss as e:
+            print(f"\nFehler: {e}")
+            sys.exit(1)
 
 
 if __name__ == "__main__":
@@ -25,6 +25,9 @@ from pathlib import Path
 
 import pandas as pd
 
+sys.path.insert(0, str(Path(__file__).parent))
+from _graph import ensure_list, load_graph  # noqa: E402
+
 if sys.stdout.encoding != "utf-8":
     sys.stdout.reconfigure(encoding="utf-8")
 
@@ -36,8 +39,7 @@ OUTPUT = BASE / "data" / "reports" / "quality-snapshot.md"
 
 
 def load_jsonld():
-    with open(JSONLD, encoding="utf-8") as f:
-        return json.load(f)
+    return load_graph(JSONLD)
 
 
 def load_recon():
@@ -47,12 +49,6 @@ def load_recon():
         return json.load(f)
 
 
-def ensure_list(v):
-    if v is None:
-        return []
-    return v if isinstance(v, list) else [v]
-
-
 def count_links_on_record(rec):
     """Zaehlt "effektive" Property-Eintraege eines Records."""
     count = 0
@@ -67,10 +63,8 @@ def count_links_on_record(rec):
 
 def main():
     print("Lese m3gim.jsonld ...")
-    data = load_jsonld()
-    graph = data.get("@graph", [])
-    records = [n for n in graph if n.get("@type") == "rico:Record"]
-    records_real = [r for r in records if not r.get("@id", "").endswith("_Folio")]
+    graph = load_jsonld()
+    records_real = [r for r in graph.records if not r.get("@id", "").endswith("_Folio")]
 
     print(f"  {len(records_real)} echte Records (ohne Folio-Platzhalter)")
 
@@ -0,0 +1,354 @@
+#!/usr/bin/env python3
+"""
+M³GIM Pipeline-Runner — alle Schritte in einem Aufruf.
+
+Kennt fuer jeden Schritt Eingaben, Ausgaben und Vorgaenger:
+
+    explore ─┐
+    validate ┴─ reconcile ── enrich-wikidata ── transform ─┬─ build-views
+                                                           └─ report-quality
+
+Ein Schritt laeuft nur, wenn er veraltet ist: Hash ueber seine Eingabedateien
+(inkl. Script und geteilter Helfer) weicht vom letzten erfolgreichen Lauf ab,
+oder eine Ausgabe fehlt. Unabhaengige Schritte laufen parallel (explore neben
+validate, build-views neben report-quality). Beim ersten Fehlschlag startet
+kein weiterer Schritt; laufende werden zu Ende gefuehrt. Der Zustand wird nach
+jedem Schritt gesichert — ein erneuter Aufruf setzt beim ersten veralteten
+Schritt wieder ein.
+
+explore und validate sind Report-Schritte: validate endet bei Datenbefunden
+mit Exitcode 1 (CI-Konvention). Das wird gemeldet, haelt die Pipeline aber
+nur mit --strict an.
+
+Verwendung:
+    python scripts/run-pipeline.py                    # veraltete Schritte
+    python scripts/run-pipeline.py --dry-run          # nur Plan anzeigen
+    python scripts/run-pipeline.py --from transform   # ab transform erzwingen
+    python scripts/run-pipeline.py --skip reconcile --skip enrich-wikidata
+    python scripts/run-pipeline.py --force -j 2
+
+Zustand und Logs: $M3GIM_OUTPUT_DIR/.cache/pipeline-state.json bzw.
+$M3GIM_OUTPUT_DIR/.cache/logs/<schritt>.log (nicht versioniert).
+"""
+
+import argparse
+import ast
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+
+# Windows-Konsole: UTF-8 erzwingen
+if sys.stdout.encoding != "utf-8":
+    sys.stdout.reconfigure(encoding="utf-8")
+
+BASE_DIR = Path(__file__).parent.parent
+SCRIPTS_DIR = BASE_DIR / "scripts"
+SHEETS_DIR = Path(os.environ.get("M3GIM_SHEETS_DIR", BASE_DIR / "data" / "google-spreadsheet"))
+OUTPUT_DIR = Path(os.environ.get("M3GIM_OUTPUT_DIR", BASE_DIR / "data" / "output"))
+REPORTS_DIR = Path(os.environ.get("M3GIM_REPORTS_DIR", BASE_DIR / "data" / "reports"))
+STATE_FILE = OUTPUT_DIR / ".cache" / "pipeline-state.json"
+LOG_DIR = OUTPUT_DIR / ".cache" / "logs"
+
+
+@dataclass
+class Stage:
+    """Ein Pipeline-Schritt: Kommando + deklarierte Dateien + Vorgaenger."""
+    name: str
+    cmd: list[str]
+    inputs: list[Path]
+    outputs: list[Path]
+    after: list[str] = field(default_factory=list)
+    advisory: bool = False  # Exitcode != 0 = Befund, kein Abbruch (ausser --strict)
+
+
+def _script(name: str) -> list[str]:
+    return [sys.executable, str(SCRIPTS_DIR / name)]
+
+
+def _local_imports(path: Path) -> set[str]:
+    """Namen der von ``path`` importierten Module aus scripts/ (auch lokale
+    Importe in Funktionen)."""
+    names = set()
+    for node in ast.walk(ast.parse(path.read_bytes())):
+        if isinstance(node, ast.Import):
+            names.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            names.add(node.module)
+    return {n for n in names if (SCRIPTS_DIR / f"{n}.py").exists()}
+
+
+def _helpers(script: str) -> list[Path]:
+    """Script plus alle (transitiv) importierten Helfer aus scripts/.
+
+    Aus den Importen abgeleitet statt von Hand gepflegt: ein neuer Helfer
+    invalidiert seinen Schritt ohne Aenderung an dieser Datei.
+    """
+    files = [SCRIPTS_DIR / script]
+    seen = set()
+    pending = [files[0]]
+    while pending:
+        for name in _local_imports(pending.pop()):
+            if name not in seen:
+                seen.add(name)
+                pending.append(SCRIPTS_DIR / f"{name}.py")
+    return files + [SCRIPTS_DIR / f"{n}.py" for n in sorted(seen)]
+
+
+def build_stages() -> list[Stage]:
+    """Die Pipeline in dokumentierter Reihenfolge (knowledge/pipeline.md).
+
+    Pfade spiegeln, wo das jeweilige Script tatsaechlich liest und schreibt:
+    reconcile, enrich-wikidata und report-quality arbeiten fest auf
+    data/google-spreadsheet, data/output bzw. data/reports, die uebrigen
+    respektieren die ENV-Overrides.
+    """
+    sheets = sorted(SHEETS_DIR.glob("*.xlsx"))
+    indices = [BASE_DIR / "data" / "google-spreadsheet" / f"M3GIM-{n}.xlsx" for n in (
+        "Personenindex", "Organisationsindex", "Ortsindex", "Werkindex")]
+    fixed_output = BASE_DIR / "data" / "output"
+    recon = fixed_output / "wikidata-reconciliation.json"
+    enrichment = fixed_output / "wikidata-enrichment.json"
+    jsonld = OUTPUT_DIR / "m3gim.jsonld"
+    views = OUTPUT_DIR / "views"
+
+    return [
+        Stage("explore", _script("explore.py"),
+              sheets + _helpers("explore.py"),
+              [REPORTS_DIR / "exploration-report.md"], advisory=True),
+        Stage("validate", _script("validate.py"),
+              sheets + _helpers("validate.py"),
+              [REPORTS_DIR / "validation-report.md"], advisory=True),
+        Stage("reconcile", _script("reconcile.py"),
+              indices + _helpers("reconcile.py"),
+              [recon], after=["explore", "validate"]),
+        Stage("enrich-wikidata", _script("enrich-wikidata.py"),
+              [recon] + _helpers("enrich-wikidata.py"),
+              [enrichment], after=["reconcile"]),
+        Stage("transform", _script("transform.py") + ["--incremental"],
+              sheets + [OUTPUT_DIR / recon.name, OUTPUT_DIR / enrichment.name]
+              + _helpers("transform.py"),
+              [jsonld], after=["enrich-wikidata"]),
+        Stage("build-views", _script("build-views.py"),
+              [jsonld] + _helpers("build-views.py"),
+              [views / f"{n}.json" for n in ("partitur", "matrix", "kosmos", "sankey")],
+              after=["transform"]),
+        Stage("report-quality", _script("report-quality.py"),
+              [fixed_output / "m3gim.jsonld", recon] + _helpers("report-quality.py"),
+              [REPORTS_DIR / "quality-snapshot.md"], after=["transform"]),
+    ]
+
+
+# ---------------------------------------------------------------------------
+# Zustand
+# ---------------------------------------------------------------------------
+
+def input_digest(stage: Stage) -> str:
+    """Hash ueber Kommando + Inhalt aller Eingaben (fehlende Datei = eigener Wert)."""
+    h = hashlib.sha256()
+    # Interpreter-Pfad ausgenommen, Script-Pfade repo-relativ (Checkout-unabhaengig)
+    args = [os.path.relpath(c, BASE_DIR) if c.startswith(str(BASE_DIR)) else c
+            for c in stage.cmd[1:]]
+    h.update(json.dumps(args).encode("utf-8"))
+    for path in sorted(set(stage.inputs)):
+        h.update(str(path).encode("utf-8") + b"\0")
+        if path.exists():
+            h.update(hashlib.sha256(path.read_bytes()).digest())
+        else:
+            h.update(b"<missing>")
+    return h.hexdigest()
+
+
+def load_state(path: Path) -> dict:
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def save_state(path: Path, state: dict) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(state, ensure_ascii=False, indent=2), encoding="utf-8")
+    tmp.replace(path)
+
+
+def stale_reason(stage: Stage, state: dict, forced: set) -> str | None:
+    """Grund, warum der Schritt laufen muss — None, wenn er aktuell ist."""
+    if stage.name in forced:
+        return "erzwungen"
+    entry = state.get(stage.name)
+    if not entry:
+        return "noch nie gelaufen"
+    missing = [p for p in stage.outputs if not p.exists()]
+    if missing:
+        return f"Ausgabe fehlt: {missing[0].name}"
+    if entry.get("inputs") != input_digest(stage):
+        return "Eingaben geaendert"
+    return None
+
+
+def _downstream(stages: list[Stage], roots: set) -> set:
+    result = set(roots)
+    changed = True
+    while changed:
+        changed = False
+        for st in stages:
+            if st.name not in result and result.intersection(st.after):
+                result.add(st.name)
+                changed = True
+    return result
+
+
+# ---------------------------------------------------------------------------
+# Ausfuehrung
+# ---------------------------------------------------------------------------
+
+def _execute(stage: Stage, log_dir: Path) -> tuple[int, float, Path]:
+    """Fuehrt den Schritt als Subprozess aus; Ausgabe ins Schritt-Log."""
+    log_dir.mkdir(parents=True, exist_ok=True)
+    log_path = log_dir / f"{stage.name}.log"
+    start = time.perf_counter()
+    with open(log_path, "w", encoding="utf-8") as log:
+        proc = subprocess.run(stage.cmd, cwd=BASE_DIR, stdout=log,
+                              stderr=subprocess.STDOUT)
+    return proc.returncode, time.perf_counter() - start, log_path
+
+
+def _tail(path: Path, n: int = 15) -> str:
+    try:
+        lines = path.read_text(encoding="utf-8", errors="replace").splitlines()
+    except OSError:
+        return ""
+    return "\n".join("      " + line for line in lines[-n:])
+
+
+def run_pipeline(stages: list[Stage], state_path: Path = STATE_FILE,
+                 log_dir: Path = LOG_DIR, jobs: int = 4, forced: set = frozenset(),
+                 skipped: set = frozenset(), strict: bool = False,
+                 dry_run: bool = False) -> int:
+    """Fuehrt die Schritte in Abhaengigkeitsreihenfolge aus. Exitcode 0/1.
+
+    Ein Schritt wird gestartet, sobald alle Vorgaenger fertig sind; erst dann
+    wird seine Aktualitaet geprueft (die Eingaben koennen gerade erst
+    entstanden sein). ``skipped`` gilt fuer diesen Aufruf als erledigt.
+    """
+    by_name = {st.name: st for st in stages}
+    state = load_state(state_path)
+    done: set = set()
+    planned: set = set()  # nur --dry-run: Schritte, die laufen wuerden
+    pending = [st.name for st in stages]
+    running: dict = {}
+    failed: list = []
+
+    def ready(name: str) -> bool:
+        return all(dep in done or dep not in by_name for dep in by_name[name].after)
+
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+        while pending or running:
+            if not failed:
+                for name in [n for n in pending if ready(n)]:
+                    pending.remove(name)
+                    stage = by_name[name]
+                    if name in skipped:
+                        print(f"[skip] {name:16s} (--skip)")
+                        done.add(name)
+                        continue
+                    reason = stale_reason(stage, state, forced)
+                    if reason is None and planned.intersection(stage.after):
+                        reason = "nach Vorgaenger"
+                    if reason is None:
+                        print(f"[ok]   {name:16s} aktuell (Eingaben unveraendert)")
+                        done.add(name)
+                        continue
+                    if dry_run:
+                        print(f"[plan] {name:16s} {reason}")
+                        planned.add(name)
+                        done.add(name)
+                        continue
+                    print(f"[run]  {name:16s} {reason}")
+                    # Digest VOR dem Lauf: aendert sich eine Eingabe waehrenddessen,
+                    # bleibt der Schritt fuer den naechsten Aufruf veraltet.
+                    digest = input_digest(stage)
+                    running[pool.submit(_execute, stage, log_dir)] = (stage, digest)
+            elif pending and not running:
+                break
+            if not running:
+                if pending and not any(ready(n) for n in pending):
+                    break  # unerfuellbare Abhaengigkeit
+                continue
+
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                stage, digest = running.pop(future)
+                code, seconds, log_path = future.result()
+                if code == 0 or (stage.advisory and not strict):
+                    state[stage.name] = {
+                        "inputs": digest,
+                        "exit_code": code,
+                        "finished": datetime.now().isoformat(timespec="seconds"),
+                        "seconds": round(seconds, 2),
+                    }
+                    save_state(state_path, state)
+                    done.add(stage.name)
+                    note = "" if code == 0 else f" — Befunde (Exitcode {code}), siehe {log_path}"
+                    print(f"[done] {stage.name:16s} {seconds:6.1f}s{note}")
+                else:
+                    state.pop(stage.name, None)
+                    save_state(state_path, state)
+                    failed.append(stage.name)
+                    print(f"[FAIL] {stage.name:16s} Exitcode {code} nach {seconds:.1f}s "
+                          f"— Log: {log_path}")
+                    print(_tail(log_path))
+
+    if failed:
+        print(f"\nAbbruch nach Fehlschlag: {', '.join(failed)}. "
+              f"Nicht gestartet: {', '.join(pending) or '-'}")
+        print("Erneuter Aufruf setzt beim ersten veralteten Schritt wieder ein.")
+        return 1
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    stages = build_stages()
+    names = [st.name for st in stages]
+    parser = argparse.ArgumentParser(description="M³GIM Pipeline-Runner")
+    parser.add_argument("--from", dest="from_stage", choices=names,
+                        help="Diesen Schritt und alle nachgelagerten erzwingen")
+    parser.add_argument("--force", action="store_true",
+                        help="Alle Schritte erzwingen")
+    parser.add_argument("--skip", action="append", choices=names, default=[],
+                        help="Schritt in diesem Lauf auslassen (mehrfach moeglich)")
+    parser.add_argument("-j", "--jobs", type=int, default=4,
+                        help="Maximal parallel laufende Schritte (default: 4)")
+    parser.add_argument("--strict", action="store_true",
+                        help="Auch Befunde der Report-Schritte (validate) brechen ab")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="Nur anzeigen, welche Schritte laufen wuerden")
+    args = parser.parse_args(argv)
+
+    forced: set = set()
+    if args.force:
+        forced = set(names)
+    elif args.from_stage:
+        forced = _downstream(stages, {args.from_stage})
+
+    print("=" * 60)
+    print("M³GIM Pipeline")
+    print("=" * 60)
+    start = time.perf_counter()
+    code = run_pipeline(stages, jobs=args.jobs, forced=forced,
+                        skipped=set(args.skip), strict=args.strict,
+                        dry_run=args.dry_run)
+    print(f"\nGesamt: {time.perf_counter() - start:.1f}s")
+    return code
+
+
+if __name__ == "__main__":
+    exit(main())
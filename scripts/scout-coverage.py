@@ -29,11 +29,13 @@ Verwendung:
 
 from __future__ import annotations
 
-import json
 import sys
 from collections import Counter
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).parent))
+from _graph import RECORD, STE, Graph, ensure_list, load_graph  # noqa: E402
+
 # Windows-Konsole: UTF-8 erzwingen (analog explore.py)
 if sys.stdout.encoding != "utf-8":
     sys.stdout.reconfigure(encoding="utf-8")
@@ -43,18 +45,6 @@ DEFAULT_DATA = ROOT / "docs" / "data" / "m3gim.jsonld"
 DEFAULT_FOCUS = "Bayreuth"
 
 
-def ensure_list(value):
-    """Wert immer als Liste, analog utils/format.js ensureArray."""
-    if value is None:
-        return []
-    return value if isinstance(value, list) else [value]
-
-
-def node_type(node):
-    t = node.get("@type")
-    return ",".join(t) if isinstance(t, list) else t
-
-
 def city_of(name):
     """Stadt-Ebene wie utils/format.js cityOf: Teil vor dem ersten Komma."""
     if not name:
@@ -69,17 +59,10 @@ def is_date_like(name):
     return len(str(name)) >= 4 and str(name)[:4].isdigit()
 
 
-def load_graph(path):
-    data = json.loads(Path(path).read_text(encoding="utf-8"))
-    return data.get("@graph", []), data
-
-
-def build_mobility_events(graph):
+def build_mobility_events(graph: Graph):
     """Spiegelt loader.js indexMobilityEvent (Top-Level SpatiotemporalEvents)."""
     events = {}
-    for node in graph:
-        if node_type(node) != "m3gim:SpatiotemporalEvent":
-            continue
+    for node in graph.of_type(STE):
         place = node.get("m3gim:atPlace") or {}
         qid = place.get("@id")
         events[node["@id"]] = {
@@ -94,11 +77,11 @@ def build_mobility_events(graph):
     return events
 
 
-def build_locations(graph):
+def build_locations(graph: Graph):
     """Spiegelt loader.js indexLocations (rico:hasOrHadLocation an Records)."""
     locations = {}
-    for node in graph:
-        if node_type(node) != "rico:Record":
+    for node in graph.with_predicate("rico:hasOrHadLocation"):
+        if node.get("@type") != RECORD:
             continue
         for loc in ensure_list(node.get("rico:hasOrHadLocation")):
             name = loc.get("name") or loc.get("skos:prefLabel")
@@ -113,25 +96,22 @@ def build_locations(graph):
     return locations
 
 
-def collect_focus_records(records, focus):
+def collect_focus_records(locations, focus):
     """Record-IDs mit einem Ort, dessen Stadt-Ebene dem Fokus entspricht."""
     focus_lower = focus.lower()
     ids = set()
-    for rid, rec in records.items():
-        for loc in ensure_list(rec.get("rico:hasOrHadLocation")):
-            name = loc.get("name") or loc.get("skos:prefLabel")
-            if name and not is_date_like(name) and city_of(name).lower() == focus_lower:
-                ids.add(rid)
-                break
+    for name, entry in locations.items():
+        if city_of(name).lower() == focus_lower:
+            ids |= entry["records"]
     return ids
 
 
-def measure_axes(focus_ids, records, performances, stage_roles):
+def measure_axes(focus_ids, graph: Graph):
     """Netzwerk-, Rollen-, Werk- und Beziehungsachsen ueber die Fokus-Records."""
     actors, subjects, orgs = Counter(), Counter(), Counter()
     works, roles, relations = Counter(), Counter(), Counter()
     for rid in focus_ids:
-        rec = records[rid]
+        rec = graph.get(rid)
         for agent in ensure_list(rec.get("m3gim:hasAssociatedAgent")):
             name = agent.get("name") or agent.get("skos:prefLabel")
             if not name:
@@ -149,12 +129,16 @@ def measure_axes(focus_ids, records, performances, stage_roles):
             elif subj.get("@type") == "m3gim:MusicalWork":
                 works[name] += 1
         for perf_ref in ensure_list(rec.get("m3gim:hasPerformance")):
-            perf = performances.get(perf_ref.get("@id"))
-            if not perf:
+            perf = graph.get(perf_ref.get("@id"))
+            if not perf or perf.get("@type") != "m3gim:Performance":
                 continue
             srid = (perf.get("m3gim:hasStageRole") or {}).get("@id")
             if srid:
-                roles[stage_roles.get(srid, srid)] += 1
+                role = graph.get(srid)
+                if role is None or role.get("@type") != "m3gim:StageRole":
+                    roles[srid] += 1
+                else:
+                    roles[role.get("rico:name") or srid] += 1
         for rel in ensure_list(rec.get("m3gim:agentRelation")):
             relations[rel.get("@type", "?")] += 1
     return {
@@ -177,28 +161,22 @@ def main():
         del args[i:i + 2]
     focus = args[0] if args else DEFAULT_FOCUS
 
-    graph, meta = load_graph(data_path)
-    records = {n["@id"]: n for n in graph if node_type(n) == "rico:Record"}
-    performances = {n["@id"]: n for n in graph if node_type(n) == "m3gim:Performance"}
-    stage_roles = {
-        n["@id"]: (n.get("rico:name") or n["@id"])
-        for n in graph if node_type(n) == "m3gim:StageRole"
-    }
+    graph = load_graph(data_path)
     events = build_mobility_events(graph)
     locations = build_locations(graph)
 
     focus_lower = focus.lower()
-    focus_ids = collect_focus_records(records, focus)
+    focus_ids = collect_focus_records(locations, focus)
     focus_events = {
         eid: ev for eid, ev in events.items()
         if ev["place"] and city_of(ev["place"]).lower() == focus_lower
     }
     focus_locs = {n: v for n, v in locations.items() if city_of(n).lower() == focus_lower}
-    axes = measure_axes(focus_ids, records, performances, stage_roles)
+    axes = measure_axes(focus_ids, graph)
 
     print(f"# M3GIM Coverage-Scout — Fokus '{focus}'")
     print(f"# Quelle: {data_path}")
-    print(f"# Graph: {len(graph)} Top-Level-Knoten, {len(records)} Records, "
+    print(f"# Graph: {len(graph)} Top-Level-Knoten, {len(graph.records)} Records, "
           f"{len(events)} SpatiotemporalEvents, {len(locations)} Orte\n")
 
     print(f"## Ort '{focus}' im Ortsindex ({len(focus_locs)} Namensvariante(n))")
@@ -20,8 +20,29 @@ Normalisierungsschritte:
 
 Verwendung:
     python scripts/transform.py
+    python scripts/transform.py --incremental   # Build-Cache nutzen
+    python scripts/transform.py --compact       # JSON-LD ohne Einrueckung
+
+Inkrementeller Modus: ``--incremental`` haelt die JSON-LD-Fragmente jeder
+Verknuepfungszeile und jedes Records in ``$M3GIM_OUTPUT_DIR/.cache/`` vor und
+baut nur neu, was von geaenderten Zeilen, Index- oder Enrichment-Eintraegen
+abhaengt. Sind alle Eingabedateien unveraendert und ist m3gim.jsonld noch die
+Datei, die der letzte inkrementelle Lauf geschrieben hat, bleibt sie unangetastet.
+Der Output ist identisch zum Volllauf (test_37).
+
+Neben m3gim.jsonld entsteht ``m3gim.graph.bin``, ein per mmap lesbarer
+Schnappschuss von Graph und Indizes fuer ``_graph.load_graph`` (Tests,
+audit/report/scout); er traegt den Hash des JSON-LD und wird ignoriert,
+sobald beide nicht mehr zusammenpassen.
+
+``--changeset`` schreibt zusaetzlich ``m3gim.changeset.json``: die @ids der
+gegenueber dem vorigen m3gim.jsonld hinzugekommenen, entfernten und
+geaenderten Knoten mit Inhalts-Hashes (Format ``m3gim-changeset/1``, siehe
+``_graph_diff.py``), damit nachgelagerte Schritte nur Geaendertes
+nachziehen. Dafuer sind auch Performance-@ids inhaltsbasiert (``_perf_id``).
 """
 
+import argparse
 import os
 import sys
 import re
@@ -31,6 +52,14 @@ import pandas as pd
 from pathlib import Path
 from datetime import datetime
 
+from _build_cache import (
+    BuildCache,
+    RecordingLookup,
+    file_digest,
+    resolve_deps,
+    row_fingerprint,
+    stable_digest,
+)
 from _common import (
     attach_xlsx_source,
     build_xlsx_source,
@@ -40,6 +69,11 @@ from _common import (
     normalize_bearbeitungsstand,
     INDEX_HEADER_SHIFTS,
 )
+from _graph import Graph, load_graph, snapshot_is_current, write_snapshot
+from _graph_diff import diff_graphs
+from _journal import write_json_atomic
+from _trace import Tracer
+from _xlsx_cache import read_sheet, read_workbook
 
 # Windows-Konsole: UTF-8 erzwingen
 if sys.stdout.encoding != "utf-8":
@@ -52,6 +86,10 @@ if sys.stdout.encoding != "utf-8":
 BASE_DIR = Path(__file__).parent.parent
 SHEETS_DIR = Path(os.environ.get("M3GIM_SHEETS_DIR", BASE_DIR / "data" / "google-spreadsheet"))
 OUTPUT_DIR = Path(os.environ.get("M3GIM_OUTPUT_DIR", BASE_DIR / "data" / "output"))
+# Build-Cache fuer --incremental (Laufzeit-Artefakt, nicht versioniert)
+TRANSFORM_CACHE = OUTPUT_DIR / ".cache" / "transform-cache.pickle"
+TRACE_PATH = OUTPUT_DIR / ".cache" / "trace-transform.json"
+CHANGESET_PATH = OUTPUT_DIR / "m3gim.changeset.json"
 
 # ---------------------------------------------------------------------------
 # JSON-LD Context
@@ -493,7 +531,7 @@ def load_index(name: str) -> pd.DataFrame | None:
     if not path.exists():
         return None
 
-    df = pd.read_excel(path)
+    df = read_sheet(path)
     canonical = name.lower()
 
     if canonical in INDEX_HEADER_SHIFTS:
@@ -930,7 +968,40 @@ _VERK_KNOWN_COLS = {
 }
 
 
-def load_verknuepfungen(path: Path) -> pd.DataFrame:
+def _normalize_verknuepfungen_sheet(df: pd.DataFrame,
+                                    sheet: str) -> pd.DataFrame | None:
+    """Normalisiert ein einzelnes Verknuepfungs-Sheet (None bei leerem Sheet)."""
+    if df.empty:
+        return None
+
+    # Spalten lowercasen/strippen; nicht-textuelle Header tolerieren.
+    rename: dict = {}
+    cols = list(df.columns)
+    for pos, col in enumerate(cols):
+        if pos == 0:
+            # Spalte 0 ist immer die Archivsignatur — positionell,
+            # unabhaengig vom (oft leeren/ungesetzten) Header.
+            rename[col] = "archivsignatur"
+        elif isinstance(col, str):
+            rename[col] = col.strip().lower()
+        # nicht-textuelle Header bleiben unveraendert (werden unten ignoriert)
+    df = df.rename(columns=rename)
+
+    # Signatur forward-fillen (viele Folgezeilen lassen sie leer) und die
+    # NIM-Konvolutnummer auf drei Stellen normalisieren, damit zweistellig
+    # erfasste Signaturen (NIM_11) ihren dreistelligen Record treffen.
+    if "archivsignatur" in df.columns:
+        df["archivsignatur"] = df["archivsignatur"].ffill()
+        df["archivsignatur"] = df["archivsignatur"].map(
+            lambda s: normalize_signatur(s) if isinstance(s, str) else s)
+
+    # Provenance: originale XLSX-Zeile (1-basiert inkl. Header) + Sheet.
+    df["_xlsx_sheet"] = sheet
+    df["_xlsx_row"] = [int(i) + 2 for i in range(len(df))]
+    return df
+
+
+def load_verknuepfungen(path: Path, workers: int | None = None) -> pd.DataFrame:
     """Laedt die Verknuepfungstabelle als EINE DataFrame ueber alle Sheets (E-95).
 
     Der Box-Export verteilt die Verknuepfungen auf mehrere, inkonsistent
@@ -948,44 +1019,19 @@ def load_verknuepfungen(path: Path) -> pd.DataFrame:
       Hilfsspalten ``_xlsx_sheet`` / ``_xlsx_row``, damit
       ``process_verknuepfungen`` die Herkunftszeile sheet-genau aufzeichnet.
 
+    Die Sheets kommen ueber ``_xlsx_cache.read_workbook``: aus dem Parse-Cache
+    bzw. aus EINEM geoeffneten Workbook, bei mehreren Sheets und
+    ``workers > 1`` parallel in einem Prozess-Pool (``workers=None`` nimmt
+    ``$M3GIM_WORKERS`` bzw. die CPU-Anzahl). Die Concat-Reihenfolge bleibt die
+    Sheet-Reihenfolge des Workbooks.
+
     Rueckwaerts-kompatibel: beim Single-Sheet-Workbook mit echtem
     "archivsignatur"-Header liefert die Funktion genau die bisherige
     Spaltenstruktur (plus die beiden Provenance-Hilfsspalten).
     """
-    xl = pd.ExcelFile(path)
-    frames: list[pd.DataFrame] = []
-
-    for sheet in xl.sheet_names:
-        df = pd.read_excel(path, sheet_name=sheet)
-        if df.empty:
-            continue
-
-        # Spalten lowercasen/strippen; nicht-textuelle Header tolerieren.
-        rename: dict = {}
-        cols = list(df.columns)
-        for pos, col in enumerate(cols):
-            if pos == 0:
-                # Spalte 0 ist immer die Archivsignatur — positionell,
-                # unabhaengig vom (oft leeren/ungesetzten) Header.
-                rename[col] = "archivsignatur"
-            elif isinstance(col, str):
-                rename[col] = col.strip().lower()
-            # nicht-textuelle Header bleiben unveraendert (werden unten ignoriert)
-        df = df.rename(columns=rename)
-
-        # Signatur forward-fillen (viele Folgezeilen lassen sie leer) und die
-        # NIM-Konvolutnummer auf drei Stellen normalisieren, damit zweistellig
-        # erfasste Signaturen (NIM_11) ihren dreistelligen Record treffen.
-        if "archivsignatur" in df.columns:
-            df["archivsignatur"] = df["archivsignatur"].ffill()
-            df["archivsignatur"] = df["archivsignatur"].map(
-                lambda s: normalize_signatur(s) if isinstance(s, str) else s)
-
-        # Provenance: originale XLSX-Zeile (1-basiert inkl. Header) + Sheet.
-        df["_xlsx_sheet"] = sheet
-        df["_xlsx_row"] = [int(i) + 2 for i in range(len(df))]
-
-        frames.append(df)
+    parsed = [_normalize_verknuepfungen_sheet(df, sheet)
+              for sheet, df in read_workbook(path, workers).items()]
+    frames = [df for df in parsed if df is not None]
 
     if not frames:
         return pd.DataFrame(columns=["archivsignatur", "_xlsx_sheet", "_xlsx_row"])
@@ -995,209 +1041,359 @@ def load_verknuepfungen(path: Path) -> pd.DataFrame:
     return combined
 
 
-def process_verknuepfungen(df: pd.DataFrame, indices: dict) -> dict:
-    """Verarbeitet Verknuepfungen und gruppiert nach Signatur.
+# Verknuepfungstyp -> Index, gegen den der Name aufgeloest wird (Index-Join in
+# _join_verknuepfungen_indices).
+VERK_INDEX_MAP = {
+    'person': 'person',
+    'institution': 'organisation',
+    'ort': 'ort',
+    'werk': 'werk',
+}
 
-    Returns:
-        dict: {signatur_or_objekt_id: [relation_dicts]}
+
+def _str_column(df: pd.DataFrame, col: str) -> pd.Series:
+    """Spaltenweise Vorstufe von normalize_str: ``str()`` + strip, fehlend -> "".
+
+    Fehlt die Spalte, entspricht das ``row.get(col) -> None``. ``astype(object)``
+    vor ``str()`` haelt die Darstellung identisch zum zeilenweisen Zugriff
+    (Timestamps mit Uhrzeit, Floats wie ``str(1.0)``), auch bei den
+    String-Dtypes von pandas >= 3.
     """
-    relations = {}
+    if col not in df.columns:
+        return pd.Series([""] * len(df), index=df.index, dtype=object)
+    values = df[col].astype(object)
+    return values.where(values.notna(), "").map(str).str.strip()
 
-    for idx, row in df.iterrows():
-        sig = row.get('archivsignatur')
-        if pd.isna(sig) or str(sig).strip() == "":
-            continue
-        sig_str = str(sig).strip()
-        if sig_str.lower() == "beispiel":
-            continue
 
-        # Folio-Feld pruefen (Spalte heisst oft "Folio" in Verknuepfungen).
-        # load_verknuepfungen lowercased die Header -> "folio".
-        folio = None
-        for col in ['folio', 'Folio', 'Unnamed: 1']:
-            if col in df.columns:
-                folio_raw = row.get(col)
-                if pd.notna(folio_raw) and str(folio_raw).strip():
-                    folio_val = str(folio_raw).strip()
-                    # Guard: vereinzelt steht die Kopfzeichenkette "Folio"
-                    # literal in einer Folio-Datenzelle — keine echte Folio.
-                    if folio_val.lower() != "folio":
-                        folio = folio_val
-                break
+def _none_if_empty(series: pd.Series) -> list:
+    """"" -> None, wie normalize_str/normalize_lower fuer leere Zellen."""
+    return [v or None for v in series.tolist()]
 
-        # Objekt-ID: signatur + folio
-        objekt_id = f"{sig_str} {folio}" if folio else sig_str
 
-        typ = normalize_lower(row.get('typ'))
-        name = normalize_str(row.get('name'))
-        rolle = normalize_role(row.get('rolle'))
-        datum = clean_date(row.get('datum') if 'datum' in df.columns else None)
-        anmerkung = normalize_str(row.get('anmerkung'))
+def _clean_date_column(df: pd.DataFrame, col: str) -> list:
+    """clean_date ueber eine ganze Spalte (gleiche Regeln, gleiche Reihenfolge)."""
+    s = _str_column(df, col)
+    s = s.str.replace(r'\s+00:00:00$', '', regex=True)
+    s = s.where(~s.str.match(_NO_DATE_PLACEHOLDER), "")
+    s = s.str.replace(r'^(\d{4})-(\d{4})$', r'\1/\2', regex=True)
+    return _none_if_empty(s)
 
-        if typ is None:
-            continue
 
-        # Provenance: Sheet-Name + originale XLSX-Zeile + datenpunkt_id.
-        # load_verknuepfungen liefert die Herkunft sheet-genau in den
-        # Hilfsspalten _xlsx_sheet/_xlsx_row (Box-Export verteilt Zeilen auf
-        # mehrere Sheets). Fallback auf "Verknuepfungen"/idx+2, falls die
-        # Hilfsspalten fehlen (DataFrame nicht ueber load_verknuepfungen geladen).
-        sheet_name = "Verknuepfungen"
-        if "_xlsx_sheet" in df.columns and pd.notna(row.get("_xlsx_sheet")):
-            sheet_name = str(row.get("_xlsx_sheet"))
-        if "_xlsx_row" in df.columns and pd.notna(row.get("_xlsx_row")):
-            xlsx_row = int(row.get("_xlsx_row"))
-        else:
-            xlsx_row = int(idx) + 2  # pandas idx 0-basiert, XLSX-Header in Zeile 1
-        dp_raw = row.get('datenpunkt_id') if 'datenpunkt_id' in df.columns else None
-        datenpunkt_id = None
-        if pd.notna(dp_raw):
-            try:
-                datenpunkt_id = int(float(dp_raw))
-            except (ValueError, TypeError):
-                datenpunkt_id = str(dp_raw).strip() or None
-        source_info = build_xlsx_source(sheet_name, xlsx_row, datenpunkt_id)
-
-        # Komposit-Typen decomponieren
-        typen = decompose_komposit_typ(typ) if "," in typ else [typ]
-        # Komposit-Werte decomponieren (z.B. "München, 1952-12-17" → Ort + Datum)
-        decomposed = decompose_komposit_value(name, typen) if len(typen) > 1 else {}
-
-        # Komposit ort,datum: zusaetzlich eine SpatiotemporalEvent-Relation emittieren
-        # (data.md § 4, § 10, Phase 4.4). Die Event-Instanz wird in add_relations
-        # als Top-Level-Entity gebaut.
-        ortdatum_ste_emitted = False
-        if 'ort' in typen and 'datum' in typen:
-            ort_val = decomposed.get('ort')
-            datum_val = decomposed.get('datum')
-            if ort_val and datum_val and is_iso_date(datum_val):
-                ortdatum_ste_emitted = True
-                ste_rel = {
-                    "typ": "spatiotemporal",
-                    "name": ort_val,  # name wird als Event-Ort verwendet
-                    "ort": ort_val,
-                    "datum": datum_val,
-                    "rolle": rolle,
-                    "anmerkung": anmerkung,
-                    "_source": source_info,
-                }
-                # Ortsindex-Lookup, damit der STE-Zweig in add_relations_to_records
-                # Wikidata-Enrichment (Koordinaten, Land) auf das atPlace-Subobjekt
-                # anwenden kann (Mobilitaets-Atlas-Vorarbeit).
-                ort_lookup = indices.get("ort", {}).get(ort_val.strip().lower())
-                if ort_lookup and 'wikidata_id' in ort_lookup:
-                    ste_rel["wikidata_id"] = ort_lookup["wikidata_id"]
-                relations.setdefault(objekt_id, []).append(ste_rel)
-
-        # Reine ort-Zeile mit Mobilitaets-Rolle -> datumslose SpatiotemporalEvent
-        # (E-97). Additiv zur flachen rico:hasOrHadLocation (kein Index-Regress):
-        # der ort-Zweig in add_relations_to_records emittiert den Ort weiterhin
-        # als Location, dieser Block ergaenzt das Mobilitaetsereignis. Greift nur
-        # ohne Datum — mit Datum traegt bereits der Komposit-ort,datum-STE oben.
-        if typen == ['ort'] and (rolle or '').strip().lower() in MOBILITY_PLACE_ROLES:
-            mob_ort = name.strip() if name else ''
-            if mob_ort:
-                mob_rel = {
-                    "typ": "spatiotemporal",
-                    "name": mob_ort,
-                    "ort": mob_ort,
-                    "rolle": rolle,
-                    "anmerkung": anmerkung,
-                    "_source": source_info,
-                }
-                mob_lookup = indices.get("ort", {}).get(mob_ort.lower())
-                if mob_lookup and 'wikidata_id' in mob_lookup:
-                    mob_rel["wikidata_id"] = mob_lookup["wikidata_id"]
-                relations.setdefault(objekt_id, []).append(mob_rel)
-
-        # Komposit rolle,person -> m3gim:Performance (Bühnenrolle + Interpret:in),
-        # E-96. Die Performance wird in add_relations als Top-Level-Entity gebaut.
-        is_roleperson = 'rolle' in typen and 'person' in typen
-        if is_roleperson:
-            rolle_val = decomposed.get('rolle')
-            person_val = decomposed.get('person')
-            if rolle_val and person_val:
-                perf_rel = {
-                    "typ": "performance",
-                    "name": person_val,
-                    "stageRole": rolle_val,
-                    "performer": person_val,
-                    "anmerkung": anmerkung,
-                    "_source": source_info,
-                }
-                p_lookup = indices.get("person", {}).get(person_val.strip().lower())
-                if p_lookup and 'wikidata_id' in p_lookup:
-                    perf_rel["performer_wikidata_id"] = p_lookup["wikidata_id"]
-                relations.setdefault(objekt_id, []).append(perf_rel)
-
-        # Komposit datum,werk -> m3gim:Performance (Aufführung eines Werks), E-98.
-        # Werk nur über den Index, nie literale Q-ID/Rohstring. Komponist-statt-
-        # Werk-Zeilen (kein führendes Jahr) fallen am is_iso_date-Gate raus.
-        is_datumwerk = 'datum' in typen and 'werk' in typen
-        if is_datumwerk:
-            datum_val = decomposed.get('datum')
-            werk_val = decomposed.get('werk')
-            if datum_val and werk_val and is_iso_date(datum_val):
-                perf_rel = {
-                    "typ": "performance",
-                    "name": werk_val,
-                    "performanceOf": werk_val,
-                    "auffuehrungsdatum": datum_val,
-                    "anmerkung": anmerkung,
-                    "_source": source_info,
-                }
-                w_lookup = indices.get("werk", {}).get(werk_val.strip().lower())
-                if w_lookup and 'wikidata_id' in w_lookup:
-                    perf_rel["work_wikidata_id"] = w_lookup["wikidata_id"]
-                relations.setdefault(objekt_id, []).append(perf_rel)
-
-        for t in typen:
-            # Einzelteile der Performance-Komposite nicht zusätzlich emittieren —
-            # die n-äre Performance trägt sie (E-96/E-98).
-            if is_roleperson and t in ('rolle', 'person'):
-                continue
-            if is_datumwerk and t in ('datum', 'werk'):
-                continue
-            # ort,datum: der Datums-Teil ist bereits im SpatiotemporalEvent
-            # (atDate) repraesentiert — nicht zusaetzlich als DatedEvent
-            # emittieren (data.md § 4: eine Repraesentation). Der Orts-Teil
-            # bleibt als rico:hasOrHadLocation erhalten.
-            if ortdatum_ste_emitted and t == 'datum':
-                continue
-            rel_name = decomposed.get(t, name) if decomposed else name
-            rel = {
-                "typ": t,
-                "name": rel_name,
+def _datenpunkt_id(value) -> int | str | None:
+    """datenpunkt_id als int (Excel liefert Floats), sonst getrimmter String."""
+    if pd.isna(value):
+        return None
+    try:
+        return int(float(value))
+    except (ValueError, TypeError):
+        return str(value).strip() or None
+
+
+def _join_keys(typen: list[str]) -> tuple[str, ...]:
+    """Indizes, gegen die der Name einer Zeile mit diesen Typen aufgeloest wird.
+
+    Die Einzelteile der Performance-Komposite (rolle,person / datum,werk)
+    werden nicht als flache Relation emittiert und brauchen daher keinen Join.
+    """
+    skip = set()
+    if 'rolle' in typen and 'person' in typen:
+        skip |= {'rolle', 'person'}
+    if 'datum' in typen and 'werk' in typen:
+        skip |= {'datum', 'werk'}
+    keys = [VERK_INDEX_MAP[t] for t in typen
+            if t in VERK_INDEX_MAP and t not in skip]
+    return tuple(dict.fromkeys(keys))
+
+
+def _prepare_verknuepfungen(df: pd.DataFrame) -> dict:
+    """Normalisiert die Verknuepfungstabelle spaltenweise.
+
+    Liefert positionsgleiche Listen (Position = ``df.iloc``) fuer Objekt-ID,
+    Typ, Name, Rolle, Datum, Anmerkung, Provenance sowie die zerlegten
+    Komposit-Typen/-Werte, dazu unter ``"rows"`` die Positionen der Zeilen, die
+    Relationen erzeugen (Signatur gesetzt, kein "beispiel", Typ gesetzt).
+    Komposit-Zerlegung laeuft einmal je distinktem Typ bzw. (Name, Typ).
+    """
+    n = len(df)
+
+    sig = _str_column(df, 'archivsignatur')
+    keep = (sig != "") & (sig.str.lower() != "beispiel")
+
+    # Folio-Feld (Spalte heisst oft "Folio" in Verknuepfungen; load_verknuepfungen
+    # lowercased die Header -> "folio"). Guard: vereinzelt steht die
+    # Kopfzeichenkette "Folio" literal in einer Folio-Datenzelle — keine echte Folio.
+    folio = pd.Series([""] * n, index=df.index, dtype=object)
+    for col in ['folio', 'Folio', 'Unnamed: 1']:
+        if col in df.columns:
+            folio = _str_column(df, col)
+            folio = folio.where(folio.str.lower() != "folio", "")
+            break
+    # Objekt-ID: signatur + folio
+    objekt_id = sig.where(folio == "", sig + " " + folio)
+
+    typ = _str_column(df, 'typ').str.lower()
+    keep &= typ != ""
+
+    # normalize_role: lower + Gender-Suffix (:innen/:in) einmal entfernen.
+    # Eine Rolle, die nur aus dem Suffix besteht, bleibt "" (nicht None).
+    rolle_raw = _str_column(df, 'rolle').str.lower()
+    rolle_stripped = rolle_raw.str.replace(r':in(?:nen)?$', '', regex=True)
+    rolle = [r if raw else None
+             for raw, r in zip(rolle_raw.tolist(), rolle_stripped.tolist())]
+
+    name = _str_column(df, 'name')
+
+    # Provenance: Sheet-Name + originale XLSX-Zeile + datenpunkt_id.
+    # load_verknuepfungen liefert die Herkunft sheet-genau in den
+    # Hilfsspalten _xlsx_sheet/_xlsx_row (Box-Export verteilt Zeilen auf
+    # mehrere Sheets). Fallback auf "Verknuepfungen"/idx+2, falls die
+    # Hilfsspalten fehlen (DataFrame nicht ueber load_verknuepfungen geladen).
+    if "_xlsx_sheet" in df.columns:
+        sheets = df["_xlsx_sheet"].astype(object)
+        sheet = sheets.where(sheets.notna(), "Verknuepfungen").map(str).tolist()
+    else:
+        sheet = ["Verknuepfungen"] * n
+    xlsx_rows = (df["_xlsx_row"].astype(object) if "_xlsx_row" in df.columns
+                 else pd.Series([None] * n, index=df.index, dtype=object))
+    xlsx_row = [int(v) if pd.notna(v) else int(idx) + 2  # pandas idx 0-basiert
+                for v, idx in zip(xlsx_rows.tolist(), df.index)]
+    if 'datenpunkt_id' in df.columns:
+        datenpunkt_id = [_datenpunkt_id(v)
+                         for v in df['datenpunkt_id'].astype(object).tolist()]
+    else:
+        datenpunkt_id = [None] * n
+
+    rows = [pos for pos, k in enumerate(keep.tolist()) if k]
+    typ = _none_if_empty(typ)
+    name = _none_if_empty(name)
+
+    # Komposit-Typen decomponieren (je distinktem Typwert einmal)
+    typen_of = {t: decompose_komposit_typ(t) if "," in t else [t]
+                for t in {typ[pos] for pos in rows}}
+    typen = [typen_of.get(t) for t in typ]
+    # Komposit-Werte decomponieren (z.B. "München, 1952-12-17" → Ort + Datum)
+    decomposed_of: dict = {}
+    decomposed = [{}] * n
+    for pos in rows:
+        if len(typen[pos]) > 1:
+            key = (name[pos], typ[pos])
+            if key not in decomposed_of:
+                decomposed_of[key] = decompose_komposit_value(name[pos], typen[pos])
+            decomposed[pos] = decomposed_of[key]
+
+    return {
+        "rows": rows,
+        "objekt_id": objekt_id.tolist(),
+        "typ": typ,
+        "typen": typen,
+        "name": name,
+        "name_key": [v.lower() if v else None for v in name],
+        "rolle": rolle,
+        "datum": _clean_date_column(df, 'datum'),
+        "anmerkung": _none_if_empty(_str_column(df, 'anmerkung')),
+        "decomposed": decomposed,
+        "sheet": sheet,
+        "xlsx_row": xlsx_row,
+        "datenpunkt_id": datenpunkt_id,
+    }
+
+
+def _join_verknuepfungen_indices(prep: dict, indices: dict,
+                                 positions: list[int] | None = None) -> dict:
+    """Index-Join: loest die Namen aller Zeilen gegen ihre Indizes auf.
+
+    Ein Durchlauf je Index ueber alle Zeilen, die ihn brauchen (_join_keys).
+    Die Treffer sind die Index-Eintraege selbst (kein Kopieren), Zugriff
+    ausschliesslich ueber ``lookup.get`` — damit zeichnet der inkrementelle
+    Lauf die gelesenen Eintraege auf (RecordingLookup).
+
+    Returns:
+        dict: {position: {index_key: match_or_None}}
+    """
+    if positions is None:
+        positions = prep["rows"]
+    keys_of = {tuple(t): _join_keys(t) for t in
+               {tuple(prep["typen"][pos]) for pos in positions}}
+    by_index: dict = {}
+    for pos in positions:
+        if not prep["name"][pos]:
+            continue
+        for index_key in keys_of[tuple(prep["typen"][pos])]:
+            by_index.setdefault(index_key, []).append(pos)
+
+    joins: dict = {}
+    name_key = prep["name_key"]
+    for index_key, pos_list in by_index.items():
+        lookup = indices.get(index_key, {})
+        for pos, match in zip(pos_list, map(lookup.get,
+                                            (name_key[p] for p in pos_list))):
+            joins.setdefault(pos, {})[index_key] = match
+    return joins
+
+
+def _emit_verknuepfung(relations: dict, prep: dict, pos: int, matches: dict,
+                       indices: dict) -> None:
+    """Erzeugt die Relationen einer vorbereiteten Verknuepfungszeile.
+
+    Zeilenspezifisch bleiben nur die STE-/Performance-Komposite (deren
+    Teilwerte werden hier gegen die Indizes aufgeloest) und der Zusammenbau
+    der Relation-Dicts; ``matches`` ist der Index-Join dieser Zeile.
+    """
+    objekt_id = prep["objekt_id"][pos]
+    typen = prep["typen"][pos]
+    name = prep["name"][pos]
+    rolle = prep["rolle"][pos]
+    datum = prep["datum"][pos]
+    anmerkung = prep["anmerkung"][pos]
+    decomposed = prep["decomposed"][pos]
+    source_info = build_xlsx_source(prep["sheet"][pos], prep["xlsx_row"][pos],
+                                    prep["datenpunkt_id"][pos])
+
+    # Komposit ort,datum: zusaetzlich eine SpatiotemporalEvent-Relation emittieren
+    # (data.md § 4, § 10, Phase 4.4). Die Event-Instanz wird in add_relations
+    # als Top-Level-Entity gebaut.
+    ortdatum_ste_emitted = False
+    if 'ort' in typen and 'datum' in typen:
+        ort_val = decomposed.get('ort')
+        datum_val = decomposed.get('datum')
+        if ort_val and datum_val and is_iso_date(datum_val):
+            ortdatum_ste_emitted = True
+            ste_rel = {
+                "typ": "spatiotemporal",
+                "name": ort_val,  # name wird als Event-Ort verwendet
+                "ort": ort_val,
+                "datum": datum_val,
                 "rolle": rolle,
-                "datum": decomposed.get('datum', datum) if t == 'datum' else datum,
                 "anmerkung": anmerkung,
                 "_source": source_info,
             }
-
-            # Wikidata-URI aus Index anreichern
-            index_map = {
-                'person': 'person',
-                'institution': 'organisation',
-                'ort': 'ort',
-                'werk': 'werk'
+            # Ortsindex-Lookup, damit der STE-Zweig in add_relations_to_records
+            # Wikidata-Enrichment (Koordinaten, Land) auf das atPlace-Subobjekt
+            # anwenden kann (Mobilitaets-Atlas-Vorarbeit).
+            ort_lookup = indices.get("ort", {}).get(ort_val.strip().lower())
+            if ort_lookup and 'wikidata_id' in ort_lookup:
+                ste_rel["wikidata_id"] = ort_lookup["wikidata_id"]
+            relations.setdefault(objekt_id, []).append(ste_rel)
+
+    # Reine ort-Zeile mit Mobilitaets-Rolle -> datumslose SpatiotemporalEvent
+    # (E-97). Additiv zur flachen rico:hasOrHadLocation (kein Index-Regress):
+    # der ort-Zweig in add_relations_to_records emittiert den Ort weiterhin
+    # als Location, dieser Block ergaenzt das Mobilitaetsereignis. Greift nur
+    # ohne Datum — mit Datum traegt bereits der Komposit-ort,datum-STE oben.
+    if typen == ['ort'] and (rolle or '').strip().lower() in MOBILITY_PLACE_ROLES:
+        mob_ort = name.strip() if name else ''
+        if mob_ort:
+            mob_rel = {
+                "typ": "spatiotemporal",
+                "name": mob_ort,
+                "ort": mob_ort,
+                "rolle": rolle,
+                "anmerkung": anmerkung,
+                "_source": source_info,
+            }
+            mob_lookup = indices.get("ort", {}).get(mob_ort.lower())
+            if mob_lookup and 'wikidata_id' in mob_lookup:
+                mob_rel["wikidata_id"] = mob_lookup["wikidata_id"]
+            relations.setdefault(objekt_id, []).append(mob_rel)
+
+    # Komposit rolle,person -> m3gim:Performance (Bühnenrolle + Interpret:in),
+    # E-96. Die Performance wird in add_relations als Top-Level-Entity gebaut.
+    is_roleperson = 'rolle' in typen and 'person' in typen
+    if is_roleperson:
+        rolle_val = decomposed.get('rolle')
+        person_val = decomposed.get('person')
+        if rolle_val and person_val:
+            perf_rel = {
+                "typ": "performance",
+                "name": person_val,
+                "stageRole": rolle_val,
+                "performer": person_val,
+                "anmerkung": anmerkung,
+                "_source": source_info,
             }
-            if t in index_map and name:
-                lookup = indices.get(index_map[t], {})
-                match = lookup.get(name.strip().lower())
-                if match and 'wikidata_id' in match:
-                    rel["wikidata_id"] = match["wikidata_id"]
-                if match and 'komponist' in match:
-                    rel["komponist"] = match["komponist"]
-                if match:
-                    # Kuratierte Indexfelder fuer add_relations_to_records,
-                    # getrennt vom Verknuepfungs-anmerkung in rel["anmerkung"]
-                    # (M1: ALLE Index-Daten ins JSON-LD).
-                    rel["_index"] = match
-
-            if objekt_id not in relations:
-                relations[objekt_id] = []
-            relations[objekt_id].append(rel)
+            p_lookup = indices.get("person", {}).get(person_val.strip().lower())
+            if p_lookup and 'wikidata_id' in p_lookup:
+                perf_rel["performer_wikidata_id"] = p_lookup["wikidata_id"]
+            relations.setdefault(objekt_id, []).append(perf_rel)
+
+    # Komposit datum,werk -> m3gim:Performance (Aufführung eines Werks), E-98.
+    # Werk nur über den Index, nie literale Q-ID/Rohstring. Komponist-statt-
+    # Werk-Zeilen (kein führendes Jahr) fallen am is_iso_date-Gate raus.
+    is_datumwerk = 'datum' in typen and 'werk' in typen
+    if is_datumwerk:
+        datum_val = decomposed.get('datum')
+        werk_val = decomposed.get('werk')
+        if datum_val and werk_val and is_iso_date(datum_val):
+            perf_rel = {
+                "typ": "performance",
+                "name": werk_val,
+                "performanceOf": werk_val,
+                "auffuehrungsdatum": datum_val,
+                "anmerkung": anmerkung,
+                "_source": source_info,
+            }
+            w_lookup = indices.get("werk", {}).get(werk_val.strip().lower())
+            if w_lookup and 'wikidata_id' in w_lookup:
+                perf_rel["work_wikidata_id"] = w_lookup["wikidata_id"]
+            relations.setdefault(objekt_id, []).append(perf_rel)
+
+    for t in typen:
+        # Einzelteile der Performance-Komposite nicht zusätzlich emittieren —
+        # die n-äre Performance trägt sie (E-96/E-98).
+        if is_roleperson and t in ('rolle', 'person'):
+            continue
+        if is_datumwerk and t in ('datum', 'werk'):
+            continue
+        # ort,datum: der Datums-Teil ist bereits im SpatiotemporalEvent
+        # (atDate) repraesentiert — nicht zusaetzlich als DatedEvent
+        # emittieren (data.md § 4: eine Repraesentation). Der Orts-Teil
+        # bleibt als rico:hasOrHadLocation erhalten.
+        if ortdatum_ste_emitted and t == 'datum':
+            continue
+        rel_name = decomposed.get(t, name) if decomposed else name
+        rel = {
+            "typ": t,
+            "name": rel_name,
+            "rolle": rolle,
+            "datum": decomposed.get('datum', datum) if t == 'datum' else datum,
+            "anmerkung": anmerkung,
+            "_source": source_info,
+        }
+
+        # Wikidata-URI aus Index anreichern (Join-Ergebnis der Zeile)
+        if t in VERK_INDEX_MAP and name:
+            match = matches.get(VERK_INDEX_MAP[t])
+            if match and 'wikidata_id' in match:
+                rel["wikidata_id"] = match["wikidata_id"]
+            if match and 'komponist' in match:
+                rel["komponist"] = match["komponist"]
+            if match:
+                # Kuratierte Indexfelder fuer add_relations_to_records,
+                # getrennt vom Verknuepfungs-anmerkung in rel["anmerkung"]
+                # (M1: ALLE Index-Daten ins JSON-LD).
+                rel["_index"] = match
 
+        if objekt_id not in relations:
+            relations[objekt_id] = []
+        relations[objekt_id].append(rel)
+
+
+def process_verknuepfungen(df: pd.DataFrame, indices: dict) -> dict:
+    """Verarbeitet Verknuepfungen und gruppiert nach Signatur.
+
+    Spaltenweise: Normalisierung und Komposit-Zerlegung
+    (_prepare_verknuepfungen) sowie der Index-Join
+    (_join_verknuepfungen_indices) laufen ueber den ganzen Frame; nur die
+    Emission der Relationen (_emit_verknuepfung) bleibt pro Zeile.
+
+    Returns:
+        dict: {signatur_or_objekt_id: [relation_dicts]}
+    """
+    prep = _prepare_verknuepfungen(df)
+    joins = _join_verknuepfungen_indices(prep, indices)
+    relations = {}
+    for pos in prep["rows"]:
+        _emit_verknuepfung(relations, prep, pos, joins.get(pos, {}), indices)
     return relations
 
 
@@ -1247,6 +1443,21 @@ def _ste_id(rec_local_id: str, ort: str, rolle: str, datum: str, seen: dict) ->
     return base if n == 1 else f"{base}-{n}"
 
 
+def _perf_id(rec_local_id: str, stage_role: str, performer: str, work: str,
+             datum: str, seen: dict) -> str:
+    """Stabile, inhaltsbasierte Performance-@id nach dem Muster von ``_ste_id``:
+    Hash ueber (StageRole-@id, Interpret:in, Werk, Auffuehrungsdatum) je
+    Record. Loest den aufrufweiten ``perf_counter`` ab, der bei jeder
+    eingefuegten Performance alle nachfolgenden @ids verschob und damit
+    jedes Changeset (``--changeset``) mit Scheinaenderungen fuellte."""
+    raw = "\x1f".join((stage_role or "", performer or "", work or "", datum or ""))
+    h = hashlib.sha1(raw.encode("utf-8")).hexdigest()[:8]
+    base = f"m3gim:perf_{rec_local_id}_{h}"
+    n = seen.get(base, 0) + 1
+    seen[base] = n
+    return base if n == 1 else f"{base}-{n}"
+
+
 def _attach_index_fields(entry: dict, rel: dict, typ: str):
     """Haengt kuratierte Indexfelder (rel['_index']) als m3gim:-Properties an
     die Entitaet. Eigener Namespace, additiv zum Loader; getrennt vom
@@ -1296,7 +1507,7 @@ def add_relations_to_records(records: list, relations: dict,
     spatiotemporal_events = []
     performances = []
     ste_seen = {}  # full-@id -> Auftrittszahl, fuer inhaltsbasierte STE-@ids
-    perf_counter = 0  # Performance-@ids bleiben (Scope: nur STE stabilisiert)
+    perf_seen = {}  # dito fuer Performance-@ids
     for record in records:
         identifier = record.get("rico:identifier")
         if not identifier or identifier not in relations:
@@ -1387,13 +1598,13 @@ def add_relations_to_records(records: list, relations: dict,
                 # Standalone-Bühnenrolle (ohne Interpret:in) -> m3gim:Performance
                 # mit nur hasStageRole; löst das alte Attribut hasPerformanceRole
                 # ab (E-96).
-                perf_counter += 1
                 rec_local_id = record["@id"].split(":", 1)[-1]
-                perf_id = f"m3gim:perf_{rec_local_id}_{perf_counter}"
+                role_id = _make_stage_role(stage_roles, name)
+                perf_id = _perf_id(rec_local_id, role_id, None, None, None, perf_seen)
                 perf = {
                     "@id": perf_id,
                     "@type": "m3gim:Performance",
-                    "m3gim:hasStageRole": {"@id": _make_stage_role(stage_roles, name)},
+                    "m3gim:hasStageRole": {"@id": role_id},
                 }
                 if rel.get("anmerkung"):
                     perf["rico:generalDescription"] = rel["anmerkung"]
@@ -1494,14 +1705,15 @@ def add_relations_to_records(records: list, relations: dict,
             elif t == "performance":
                 # n-äre m3gim:Performance aus rolle,person (E-96) bzw. datum,werk
                 # (E-98) als Top-Level-Entity mit Rückverweis am Record.
-                perf_counter += 1
                 rec_local_id = record["@id"].split(":", 1)[-1]
-                perf_id = f"m3gim:perf_{rec_local_id}_{perf_counter}"
+                role_id = (_make_stage_role(stage_roles, rel["stageRole"])
+                           if rel.get("stageRole") else None)
+                perf_id = _perf_id(rec_local_id, role_id, rel.get("performer"),
+                                   rel.get("performanceOf"),
+                                   rel.get("auffuehrungsdatum"), perf_seen)
                 perf = {"@id": perf_id, "@type": "m3gim:Performance"}
-                if rel.get("stageRole"):
-                    perf["m3gim:hasStageRole"] = {
-                        "@id": _make_stage_role(stage_roles, rel["stageRole"])
-                    }
+                if role_id:
+                    perf["m3gim:hasStageRole"] = {"@id": role_id}
                 if rel.get("performer"):
                     performer = {"name": rel["performer"], "@type": "rico:Person"}
                     pwid = rel.get("performer_wikidata_id", "")
@@ -1594,6 +1806,116 @@ def add_relations_to_records(records: list, relations: dict,
     return spatiotemporal_events, performances
 
 
+# ---------------------------------------------------------------------------
+# Inkrementeller Lauf (--incremental, Build-Cache in _build_cache.py)
+# ---------------------------------------------------------------------------
+
+# Index-Namen, die process_verknuepfungen nachschlaegt. Fehlende Indizes werden
+# als leere Lookups mitgefuehrt, damit ihr spaeteres Auftauchen als Aenderung
+# der aufgezeichneten (Fehl-)Zugriffe erkannt wird.
+_INDEX_KEYS = ("person", "organisation", "ort", "werk")
+
+
+def process_verknuepfungen_incremental(df: pd.DataFrame, indices: dict,
+                                       cache: BuildCache) -> dict:
+    """Wie process_verknuepfungen, aber mit Zeilen-Cache.
+
+    Jede Zeile wird ueber ``row_fingerprint`` (Sheet, ``_xlsx_row``,
+    Zellwerte) identifiziert. Ein Treffer wird nur uebernommen, wenn auch die
+    beim letzten Lauf gelesenen Index-Eintraege unveraendert sind; sonst wird
+    die Zeile einzeln gejoint und emittiert (die spaltenweise Normalisierung
+    laeuft einmal fuer den ganzen Frame). Die Zeilen sind voneinander
+    unabhaengig, die Reihenfolge der Relationen pro Objekt bleibt die
+    Frame-Reihenfolge — das Ergebnis ist identisch zum Volllauf.
+    """
+    log: list = []
+    sources = {k: indices.get(k, {}) for k in _INDEX_KEYS}
+    recording = {k: RecordingLookup(v, k, log) for k, v in sources.items()}
+    prep = _prepare_verknuepfungen(df)
+    emitting = set(prep["rows"])
+
+    columns = list(df.columns)
+    has_sheet = "_xlsx_sheet" in df.columns
+    has_row = "_xlsx_row" in df.columns
+    relations: dict = {}
+    for pos, values in enumerate(df.itertuples(index=False, name=None)):
+        rowmap = dict(zip(columns, values))
+        sheet = str(rowmap["_xlsx_sheet"]) if has_sheet else "Verknuepfungen"
+        xlsx_row = int(rowmap["_xlsx_row"]) if has_row else pos + 2
+        fp = row_fingerprint(sheet, xlsx_row, values)
+
+        fragment = cache.get_row(fp, sources)
+        if fragment is None:
+            log.clear()
+            rels: dict = {}
+            if pos in emitting:
+                joins = _join_verknuepfungen_indices(prep, recording, [pos])
+                _emit_verknuepfung(rels, prep, pos, joins.get(pos, {}),
+                                   recording)
+            fragment = list(rels.items())
+            cache.put_row(fp, resolve_deps(log, sources), fragment)
+
+        for objekt_id, rels in fragment:
+            relations.setdefault(objekt_id, []).extend(rels)
+    return relations
+
+
+def add_relations_incremental(records: list, relations: dict,
+                              enrichment_data: dict, stage_roles: dict,
+                              cache: BuildCache) -> tuple[list, list]:
+    """Wie add_relations_to_records, aber mit Record-Cache.
+
+    Schluessel ist der Inhalt des Basis-Records (aus der Objekte-Zeile, inkl.
+    finaler @id) plus seiner Relationen; als Abhaengigkeiten werden die
+    gelesenen Enrichment-Eintraege aufgezeichnet. Jeder Record wird einzeln
+    gebaut und danach in die aufrufweiten Zustaende eingehaengt: StageRoles
+    werden in Erstnennungs-Reihenfolge ins geteilte Registry uebernommen.
+    STE- und Performance-@ids sind pro Record inhaltsbasiert und brauchen
+    keine Korrektur.
+
+    Bei doppelten Record-@ids (geteiltes STE-Dedup) faellt die Funktion auf
+    add_relations_to_records zurueck.
+    """
+    ids = [r.get("@id") for r in records]
+    if len(ids) != len(set(ids)):
+        return add_relations_to_records(records, relations, enrichment_data,
+                                        stage_roles)
+
+    log: list = []
+    sources = {"enrichment": enrichment_data}
+    recording = RecordingLookup(enrichment_data, "enrichment", log)
+
+    spatiotemporal_events = []
+    performances = []
+    for i, record in enumerate(records):
+        identifier = record.get("rico:identifier")
+        if not identifier or identifier not in relations:
+            continue
+        rels = relations[identifier]
+        key = stable_digest([record, rels])
+
+        fragment = cache.get_record(key, sources)
+        if fragment is None:
+            log.clear()
+            local_roles: dict = {}
+            stes, perfs = add_relations_to_records(
+                [record], {identifier: rels}, recording, local_roles)
+            fragment = {
+                "record": record,
+                "stes": stes,
+                "perfs": perfs,
+                "roles": list(local_roles.values()),
+            }
+            cache.put_record(key, resolve_deps(log, sources), fragment)
+
+        records[i] = fragment["record"]
+        for node in fragment["roles"]:
+            stage_roles.setdefault(node["@id"], node)
+        spatiotemporal_events.extend(fragment["stes"])
+        performances.extend(fragment["perfs"])
+    return spatiotemporal_events, performances
+
+
 # ---------------------------------------------------------------------------
 # Enrichment-Injection
 # ---------------------------------------------------------------------------
@@ -1665,23 +1987,107 @@ def _inject_enrichment(entry: dict, props: dict):
 # Hauptfunktion
 # ---------------------------------------------------------------------------
 
-def main():
+def _input_digests() -> dict:
+    """SHA-256 aller Eingabedateien des Transforms (Cache-Gate)."""
+    paths = [SHEETS_DIR / f"M3GIM-{name}.xlsx" for name in (
+        "Personenindex", "Organisationsindex", "Ortsindex", "Werkindex",
+        "Objekte", "Verknüpfungen")]
+    paths += [OUTPUT_DIR / "wikidata-reconciliation.json",
+              OUTPUT_DIR / "wikidata-enrichment.json"]
+    return {p.name: file_digest(p) for p in paths}
+
+
+def _code_digest() -> str:
+    """Hash ueber den Code, der die Fragmente erzeugt (verwirft den Cache)."""
+    here = Path(__file__).parent
+    return stable_digest([file_digest(here / name) for name in
+                          ("transform.py", "_common.py", "_build_cache.py",
+                           "_xlsx_cache.py", "_graph.py",
+                           "_graph_diff.py", "_journal.py", "_trace.py")])
+
+
+def write_changeset(previous: Graph | None, current: Graph) -> dict:
+    """Changeset ``previous`` -> ``current`` nach CHANGESET_PATH (ohne
+    Property-Pfade, nur @ids und Hashes). Ohne vorigen Stand gilt alles
+    als hinzugekommen."""
+    changeset = diff_graphs(previous or Graph({"@graph": []}), current, paths=False)
+    write_json_atomic(CHANGESET_PATH, changeset)
+    return changeset
+
+
+def main(argv: list[str] | None = None):
     """Hauptfunktion"""
+    parser = argparse.ArgumentParser(description="M³GIM Transform (RiC-O JSON-LD)")
+    parser.add_argument(
+        "--incremental", action="store_true",
+        help="Build-Cache nutzen: nur geaenderte Zeilen/Records neu bauen")
+    parser.add_argument(
+        "--compact", action="store_true",
+        help="m3gim.jsonld ohne Einrueckung/Whitespace schreiben")
+    parser.add_argument(
+        "--changeset", action="store_true",
+        help="m3gim.changeset.json schreiben: hinzugekommene/entfernte/geaenderte "
+             "Knoten-@ids gegenueber dem vorigen m3gim.jsonld")
+    parser.add_argument(
+        "--trace", nargs="?", const=TRACE_PATH, type=Path, metavar="PATH",
+        help="Wall-/CPU-Zeit und Peak-Allokation je Stage messen und als "
+             "Chrome-Trace-JSON schreiben (Default: .cache/trace-transform.json)")
+    parser.add_argument(
+        "--no-trace-memory", action="store_true",
+        help="mit --trace nur Zeiten messen (ohne tracemalloc, das den Lauf "
+             "deutlich verlangsamt)")
+    args = parser.parse_args(argv)
+    tracer = Tracer(enabled=args.trace is not None, process_name="transform",
+                    memory=not args.no_trace_memory)
+    try:
+        return _run(args, tracer)
+    finally:
+        if tracer.enabled:
+            tracer.stop()
+            if tracer.stages:
+                tracer.print_summary()
+                print(f"  Trace: {tracer.write(args.trace)}")
+
+
+def _run(args: argparse.Namespace, tracer: Tracer):
+
     print("=" * 60)
     print("M³GIM Transform (RiC-O JSON-LD)")
     print("=" * 60)
 
+    cache = None
+    if args.incremental:
+        inputs = _input_digests()
+        inputs["--compact"] = args.compact
+        cache = BuildCache.load(TRANSFORM_CACHE, _code_digest())
+        # Ausgabe-Digest: ein Volllauf (z.B. mit anderen Optionen) kann
+        # m3gim.jsonld seit dem letzten inkrementellen Lauf ueberschrieben haben
+        if (cache.inputs == inputs and cache.output is not None
+                and cache.output == file_digest(OUTPUT_DIR / "m3gim.jsonld")):
+            print("\nInkrementell: Eingaben und Code unveraendert — "
+                  "m3gim.jsonld bleibt bestehen.")
+            # fehlend, veraltet oder altes Format (SNAPSHOT_MAGIC): neu schreiben
+            if not snapshot_is_current(OUTPUT_DIR / "m3gim.jsonld"):
+                write_snapshot(OUTPUT_DIR / "m3gim.jsonld")
+            if args.changeset:
+                unchanged = load_graph(OUTPUT_DIR / "m3gim.jsonld")
+                write_changeset(unchanged, unchanged)
+            return 0
+        print(f"\nInkrementell: Build-Cache {TRANSFORM_CACHE.name} "
+              f"({len(cache.rows)} Zeilen, {len(cache.records)} Records)")
+
     # Indizes laden
     print("\nLade Indizes...")
     indices = {}
-    for name, key in [("Personenindex", "person"), ("Organisationsindex", "organisation"),
-                       ("Ortsindex", "ort"), ("Werkindex", "werk")]:
-        df = load_index(name)
-        if df is not None:
-            indices[key] = build_index_lookup(df)
-            print(f"  {name}: {len(indices[key])} Eintraege")
-        else:
-            print(f"  WARNUNG: {name} nicht gefunden")
+    with tracer.stage("load_index"):
+        for name, key in [("Personenindex", "person"), ("Organisationsindex", "organisation"),
+                           ("Ortsindex", "ort"), ("Werkindex", "werk")]:
+            df = load_index(name)
+            if df is not None:
+                indices[key] = build_index_lookup(df)
+                print(f"  {name}: {len(indices[key])} Eintraege")
+            else:
+                print(f"  WARNUNG: {name} nicht gefunden")
 
     # Reconciliation-Ergebnisse als Fallback laden.
     # Konservative Policy: fuzzy_low nur uebernehmen, wenn manuell approved.
@@ -1729,7 +2135,8 @@ def main():
         return 1
 
     print(f"\nLade {objekte_path.name}...")
-    df_objekte = pd.read_excel(objekte_path)
+    with tracer.stage("load_objekte"):
+        df_objekte = read_sheet(objekte_path)
     # Spaltennamen normalisieren (Excel hat gemischte Gross-/Kleinschreibung)
     df_objekte.columns = [c.lower().strip() if isinstance(c, str) else c
                           for c in df_objekte.columns]
@@ -1753,7 +2160,8 @@ def main():
         print(f"  Folio-Spalte erkannt: '{folio_col}'")
 
     # Konvolut-Hierarchie bauen
-    records, konvolute = build_konvolut_hierarchy(df_objekte, folio_col)
+    with tracer.stage("build_konvolut_hierarchy", rows=len(df_objekte)):
+        records, konvolute = build_konvolut_hierarchy(df_objekte, folio_col)
     print(f"  {len(records)} Records, {len(konvolute)} Konvolute")
 
     # Verknuepfungen laden
@@ -1765,22 +2173,35 @@ def main():
         )
 
     print(f"\nLade {verk_path.name}...")
-    df_verk = load_verknuepfungen(verk_path)
+    with tracer.stage("load_verknuepfungen"):
+        df_verk = load_verknuepfungen(verk_path)
     sheet_names = sorted(df_verk["_xlsx_sheet"].dropna().unique().tolist()) \
         if "_xlsx_sheet" in df_verk.columns else []
     print(f"  {len(df_verk)} Zeilen aus {len(sheet_names)} Sheet(s): {sheet_names}")
-    relations = process_verknuepfungen(df_verk, indices)
+    with tracer.stage("process_verknuepfungen", rows=len(df_verk)):
+        if cache is not None:
+            relations = process_verknuepfungen_incremental(df_verk, indices, cache)
+        else:
+            relations = process_verknuepfungen(df_verk, indices)
     total_rels = sum(len(v) for v in relations.values())
     print(f"  {total_rels} Verknuepfungen fuer {len(relations)} Objekte")
 
     # Relations zu Records hinzufuegen (mit Enrichment-Daten). stage_roles ist
     # ein über beide Aufrufe geteiltes Dedup-Registry für StageRole-Entitäten (E-96).
     stage_roles = {}
-    ste_events, performances = add_relations_to_records(
-        records, relations, enrichment_data, stage_roles)
-    # Relations auch zu Konvolut-Records (falls Verknuepfungen am Konvolut haengen)
-    ste_events_k, performances_k = add_relations_to_records(
-        konvolute, relations, enrichment_data, stage_roles)
+    with tracer.stage("add_relations_to_records",
+                      records=len(records) + len(konvolute)):
+        if cache is not None:
+            ste_events, performances = add_relations_incremental(
+                records, relations, enrichment_data, stage_roles, cache)
+            ste_events_k, performances_k = add_relations_incremental(
+                konvolute, relations, enrichment_data, stage_roles, cache)
+        else:
+            ste_events, performances = add_relations_to_records(
+                records, relations, enrichment_data, stage_roles)
+            # Relations auch zu Konvolut-Records (falls Verknuepfungen am Konvolut haengen)
+            ste_events_k, performances_k = add_relations_to_records(
+                konvolute, relations, enrichment_data, stage_roles)
     ste_events = list(ste_events) + list(ste_events_k)
     performances = list(performances) + list(performances_k)
     stage_role_nodes = list(stage_roles.values())
@@ -1830,8 +2251,34 @@ def main():
     # Speichern
     OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
     output_path = OUTPUT_DIR / "m3gim.jsonld"
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(jsonld, f, ensure_ascii=False, indent=2)
+    previous = None
+    if args.changeset and output_path.exists():
+        # Merkle-Baum des alten Stands sichern, bevor er ueberschrieben wird
+        previous = load_graph(output_path)
+        previous.merkle()
+    with tracer.stage("serialize", compact=args.compact):
+        # --compact: ohne Einrueckung/Whitespace (ca. ein Drittel kleiner)
+        dump_kwargs = ({"separators": (",", ":")} if args.compact
+                       else {"indent": 2})
+        with open(output_path, 'w', encoding='utf-8') as f:
+            json.dump(jsonld, f, ensure_ascii=False, **dump_kwargs)
+    with tracer.stage("snapshot"):
+        write_snapshot(output_path)
+    if args.changeset:
+        with tracer.stage("changeset"):
+            changeset = write_changeset(previous, load_graph(output_path))
+        counts = {k: len(changeset[k]) for k in ("added", "removed", "modified")}
+        print(f"\n  Changeset: +{counts['added']} -{counts['removed']} "
+              f"~{counts['modified']} Knoten -> {CHANGESET_PATH.name}")
+
+    if cache is not None:
+        cache.inputs = inputs
+        cache.output = file_digest(output_path)
+        cache.save()
+        st = cache.stats
+        print(f"\n  Build-Cache: Zeilen {st['row_hits']} wiederverwendet / "
+              f"{st['row_misses']} neu, Records {st['record_hits']} wiederverwendet"
+              f" / {st['record_misses']} neu")
 
     print()
     print("=" * 60)
@@ -18,6 +18,7 @@ from datetime import datetime
 from dataclasses import dataclass
 
 from _common import INDEX_HEADER_SHIFTS
+from _xlsx_cache import read_sheet
 
 # Windows-Konsole: UTF-8 erzwingen
 if sys.stdout.encoding != "utf-8":
@@ -202,7 +203,7 @@ def load_index(name: str) -> pd.DataFrame | None:
         else:
             return None
 
-    df = pd.read_excel(path)
+    df = read_sheet(path)
 
     # Header-Shift-Korrektur: wenn ein bekannter Datenwert als Header steht
     canonical = name.lower().replace("m3gim-", "")
@@ -554,7 +555,7 @@ def main():
     objekte_path = SHEETS_DIR / "M3GIM-Objekte.xlsx"
     if objekte_path.exists():
         print(f"\nValidiere {objekte_path.name}...")
-        df_objekte = pd.read_excel(objekte_path)
+        df_objekte = read_sheet(objekte_path)
         # Spaltennamen normalisieren (Excel hat gemischte Gross-/Kleinschreibung)
         df_objekte.columns = [c.lower().strip() if isinstance(c, str) else c
                               for c in df_objekte.columns]
@@ -578,7 +579,7 @@ def main():
     verk_path = verk_candidates[0] if verk_candidates else SHEETS_DIR / "M3GIM-Verknuepfungen.xlsx"
     if verk_path.exists():
         print(f"Validiere {verk_path.name}...")
-        df_verk = pd.read_excel(verk_path)
+        df_verk = read_sheet(verk_path)
         stats['verknuepfungen'] = len(df_verk)
         all_issues.extend(validate_verknuepfungen(df_verk, valid_signaturen, indices))
         print(f"  {len(df_verk)} Verknuepfungen geladen")
@@ -25,16 +25,24 @@ Netzwerk-Abhaengigkeit: eine REST-Anfrage pro Batch (50 Q-IDs). Laeuft
 typischerweise unter einer Sekunde. Fuer Offline-Runs::
 
     SKIP_VERIFY_MANUAL=1 python scripts/verify-manual-approvals.py
+
+Die Abfragen gehen durch den gemeinsamen HTTP-Cache (_http_cache.py);
+``M3GIM_HTTP_CACHE=offline`` prueft gegen die zuletzt gecachten Antworten.
+Geprueft wird immer gegen die Antwort der API; deren de/en-Labels landen
+zusaetzlich im Label-Cache (_label_store.py), den enrich-wikidata.py fuer
+Geburtsorte, Standorte usw. nutzt.
 """
 
 import json
 import os
 import sys
-import time
-import urllib.parse
-import urllib.request
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).parent))
+from _http_cache import CacheMiss, ResponseCache  # noqa: E402
+from _label_store import LabelStore  # noqa: E402
+from _wikidata_client import WIKIDATA_API, WikidataClient  # noqa: E402
+
 if sys.stdout.encoding != "utf-8":
     sys.stdout.reconfigure(encoding="utf-8")
 
@@ -42,6 +50,19 @@ BASE = Path(__file__).parent.parent
 RECONCILIATION = BASE / "data" / "output" / "wikidata-reconciliation.json"
 USER_AGENT = "M3GIM-Pipeline/1.0 (office@dhcraft.org)"
 BATCH = 50
+REQUEST_RATE = 5.0  # Anfragen pro Sekunde
+
+_client = None
+_label_store = None
+
+
+def get_client() -> WikidataClient:
+    global _client
+    if _client is None:
+        _client = WikidataClient(WIKIDATA_API, user_agent=USER_AGENT,
+                                 rate=REQUEST_RATE, workers=1,
+                                 cache=ResponseCache.from_env())
+    return _client
 
 # Heuristische Typ-Signale im Description-Text.
 TYPE_SIGNALS = {
@@ -71,13 +92,16 @@ def _tokens(s: str) -> set:
 
 def fetch_entities(qids: list) -> dict:
     """Holt Labels, Aliases und Beschreibungen in DE+EN fuer eine QID-Liste."""
-    url = ("https://www.wikidata.org/w/api.php?action=wbgetentities"
-           f"&ids={'|'.join(qids)}"
-           "&props=labels|aliases|descriptions"
-           "&languages=de|en&format=json")
-    req = urllib.request.Request(url, headers={"User-Agent": USER_AGENT})
-    with urllib.request.urlopen(req, timeout=30) as r:
-        return json.loads(r.read().decode("utf-8")).get("entities", {})
+    params = {
+        "action": "wbgetentities",
+        "ids": "|".join(qids),
+        "props": "labels|aliases|descriptions",
+        "languages": "de|en",
+    }
+    entities = get_client().get(params).get("entities", {})
+    if _label_store is not None:
+        _label_store.store_entities(entities)
+    return entities
 
 
 def verify_entry(entry: dict, wd: dict) -> tuple[str, str]:
@@ -157,14 +181,23 @@ def main() -> int:
     print(f"Pruefe {len(manual)} manual-approved Eintraege gegen Wikidata...\n")
     qids = [m["qid"] for m in manual if m.get("qid")]
 
+    global _label_store
+    _label_store = LabelStore.from_env()
     wd = {}
-    for i in range(0, len(qids), BATCH):
-        batch = qids[i:i + BATCH]
-        try:
-            wd.update(fetch_entities(batch))
-        except Exception as exc:  # noqa: BLE001
-            print(f"  Batch {i // BATCH + 1} Fehler: {exc}")
-        time.sleep(0.2)
+    try:
+        for i in range(0, len(qids), BATCH):
+            batch = qids[i:i + BATCH]
+            try:
+                wd.update(fetch_entities(batch))
+            except CacheMiss as exc:
+                print(f"Fehler: {exc}")
+                return 1
+            except Exception as exc:  # noqa: BLE001
+                print(f"  Batch {i // BATCH + 1} Fehler: {exc}")
+    finally:
+        if _label_store is not None:
+            _label_store.close()
+            _label_store = None
 
     statuses = {}
     for m in manual:
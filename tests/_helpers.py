@@ -1,12 +1,20 @@
 """Hilfsfunktionen fuer Tests. Importierbar aus Testmodulen."""
 
+import importlib.util
+from pathlib import Path
 
-def ensure_list(v):
-    if v is None:
-        return []
-    if isinstance(v, list):
-        return v
-    return [v]
+from _graph import ensure_list  # noqa: F401  (scripts/_graph.py, via conftest im Pfad)
+
+SCRIPTS = Path(__file__).parent.parent / "scripts"
+
+
+def load_script(name: str, filename: str):
+    """CLI-Script mit Bindestrich im Dateinamen (``build-views.py``) als Modul
+    ``name`` laden; normale ``import``-Anweisungen koennen das nicht."""
+    spec = importlib.util.spec_from_file_location(name, SCRIPTS / filename)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
 
 
 def iter_strings(obj):
@@ -11,6 +11,7 @@ Paths are overridable via ENV for v2 pipeline runs:
 
 import json
 import os
+import sys
 from pathlib import Path
 
 import pandas as pd
@@ -18,6 +19,13 @@ import pytest
 
 REPO_ROOT = Path(__file__).parent.parent
 
+# Pipeline-Helfer importierbar machen; XLSX-Fixtures lesen ueber den geteilten
+# Parse-Cache (scripts/_xlsx_cache.py) statt jedes Mal neu zu parsen.
+if str(REPO_ROOT / "scripts") not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT / "scripts"))
+from _graph import Graph, load_graph  # noqa: E402
+from _xlsx_cache import read_sheet  # noqa: E402
+
 
 def _path(env_var: str, default_rel: str) -> Path:
     return Path(os.environ.get(env_var, REPO_ROOT / default_rel))
@@ -49,42 +57,43 @@ def reconciliation_path() -> Path:
 
 
 @pytest.fixture(scope="session")
-def jsonld(jsonld_path: Path) -> dict:
-    with open(jsonld_path, encoding="utf-8") as f:
-        return json.load(f)
+def jsonld_graph(jsonld_path: Path) -> Graph:
+    """Indiziertes Modell (scripts/_graph.py): Lookups nach @type, @id,
+    rico:identifier, Praedikat und Referenz statt Scans ueber ``graph``.
+
+    Liegt ein aktueller ``m3gim.graph.bin`` daneben (transform.py), wird
+    er abgebildet statt geparst; Knoten werden dann erst beim Zugriff
+    dekodiert (``records`` dekodiert nur die Records)."""
+    return load_graph(jsonld_path)
+
+
+@pytest.fixture(scope="session")
+def jsonld(jsonld_graph: Graph) -> dict:
+    return jsonld_graph.data
 
 
 @pytest.fixture(scope="session")
-def graph(jsonld: dict) -> list:
-    return jsonld["@graph"]
+def graph(jsonld_graph: Graph) -> list:
+    return jsonld_graph.data["@graph"]
 
 
 @pytest.fixture(scope="session")
-def records(graph: list) -> list:
-    return [n for n in graph if n.get("@type") == "rico:Record"]
+def records(jsonld_graph: Graph) -> list:
+    return list(jsonld_graph.records)
 
 
 @pytest.fixture(scope="session")
-def konvolute(graph: list) -> list:
+def konvolute(jsonld_graph: Graph) -> list:
     """Record-Sets außer dem Fonds."""
-    result = []
-    for n in graph:
-        if n.get("@type") != "rico:RecordSet":
-            continue
-        set_type = n.get("rico:hasRecordSetType", {})
-        if isinstance(set_type, dict) and set_type.get("@id") == "ric-rst:Fonds":
-            continue
-        result.append(n)
-    return result
+    return jsonld_graph.konvolute
 
 
 @pytest.fixture(scope="session")
-def fonds(graph: list) -> dict:
-    for n in graph:
-        st = n.get("rico:hasRecordSetType", {})
-        if isinstance(st, dict) and st.get("@id") == "ric-rst:Fonds":
-            return n
-    raise RuntimeError("Kein Fonds im Graph")
+def fonds(jsonld_graph: Graph) -> dict:
+    node = jsonld_graph.fonds
+    if node is None:
+        raise RuntimeError("Kein Fonds im Graph")
+    return node
 
 
 @pytest.fixture(scope="session")
@@ -95,7 +104,7 @@ def partitur(partitur_path: Path) -> dict:
 
 @pytest.fixture(scope="session")
 def xlsx_objekte(sheets_dir: Path) -> pd.DataFrame:
-    df = pd.read_excel(sheets_dir / "M3GIM-Objekte.xlsx")
+    df = read_sheet(sheets_dir / "M3GIM-Objekte.xlsx")
     df.columns = [c.lower().strip() if isinstance(c, str) else c for c in df.columns]
     return df
 
@@ -107,8 +116,6 @@ def xlsx_verknuepfungen(sheets_dir: Path) -> pd.DataFrame:
     # ungesetztem Signatur-Header; daher denselben Multi-Sheet-Loader wie
     # die Pipeline verwenden (E-95). Backward-kompatibel mit dem
     # Single-Sheet-Produktions-Workbook.
-    import sys
-    sys.path.insert(0, str(REPO_ROOT / "scripts"))
     from transform import load_verknuepfungen  # noqa: WPS433
 
     for name in ["M3GIM-Verknüpfungen.xlsx", "M3GIM-Verknuepfungen.xlsx"]:
@@ -120,7 +127,7 @@ def xlsx_verknuepfungen(sheets_dir: Path) -> pd.DataFrame:
 
 @pytest.fixture(scope="session")
 def xlsx_personen(sheets_dir: Path) -> pd.DataFrame:
-    df = pd.read_excel(sheets_dir / "M3GIM-Personenindex.xlsx")
+    df = read_sheet(sheets_dir / "M3GIM-Personenindex.xlsx")
     df.columns = [c.lower().strip() if isinstance(c, str) else c for c in df.columns]
     return df
 
@@ -162,3 +169,15 @@ def helpers():
         iter_strings = staticmethod(iter_strings)
         iter_entities_with_id = staticmethod(iter_entities_with_id)
     return H()
+
+
+# ---------------------------------------------------------------------------
+# Lokaler Wikidata-Stand-in (scripts/_wikidata_standin.py)
+# ---------------------------------------------------------------------------
+
+@pytest.fixture
+def wikidata_standin():
+    """Laufender Stand-in-Server; ``.url`` ist der API-Endpunkt."""
+    from _wikidata_standin import serve
+    with serve() as state:
+        yield state
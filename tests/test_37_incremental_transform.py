@@ -0,0 +1,153 @@
+"""Inkrementeller Transform: ``--incremental`` liefert denselben Output wie der
+Volllauf — kalt, warm ohne Aenderung und nach einer punktuellen Aenderung an
+den Enrichment-Daten bzw. an einzelnen XLSX-Zeilen (nur abhaengige Zeilen und
+Records werden neu gebaut).
+
+Marker: slow — fuehrt transform.py mehrfach in temporaeren Output-Dirs aus.
+"""
+
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import openpyxl
+import pytest
+
+REPO_ROOT = Path(__file__).parent.parent
+if str(REPO_ROOT / "scripts") not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT / "scripts"))
+
+from _graph import snapshot_is_current  # noqa: E402
+
+OUTPUT = REPO_ROOT / "data" / "output"
+SHEETS_DIR = REPO_ROOT / "data" / "google-spreadsheet"
+SIDE_INPUTS = ("wikidata-reconciliation.json", "wikidata-enrichment.json")
+
+
+def _run(out_dir: Path, *args: str, **env_vars: str) -> str:
+    env = dict(os.environ, M3GIM_OUTPUT_DIR=str(out_dir), **env_vars)
+    proc = subprocess.run(
+        [sys.executable, "scripts/transform.py", *args],
+        cwd=REPO_ROOT, env=env, check=True, capture_output=True, text=True,
+    )
+    return proc.stdout
+
+
+def _graph(out_dir: Path) -> dict:
+    data = json.loads((out_dir / "m3gim.jsonld").read_text(encoding="utf-8"))
+    data.pop("m3gim:exportDate", None)
+    return data
+
+
+def _touch_enrichment(out_dir: Path) -> None:
+    """Aendert genau eine Entitaet (Koordinaten) in wikidata-enrichment.json."""
+    path = out_dir / "wikidata-enrichment.json"
+    data = json.loads(path.read_text(encoding="utf-8"))
+    for entity in data.get("entities", {}).values():
+        props = entity.get("properties", {})
+        if "coordinates" in props:
+            props["coordinates"] = {"lat": 0.0, "lon": 0.0}
+            break
+    path.write_text(json.dumps(data, ensure_ascii=False, indent=2),
+                    encoding="utf-8")
+
+
+def _edit_cell(path: Path, row: int, column: str, update):
+    """Zelle (Spalte per Header-Name) im ersten Sheet einer XLSX-Kopie durch
+    ``update(alter_wert)`` ersetzen; liefert den neuen Wert."""
+    wb = openpyxl.load_workbook(path)
+    ws = wb.worksheets[0]
+    header = [c.value for c in ws[1]]
+    cell = ws.cell(row=row, column=header.index(column) + 1)
+    cell.value = update(cell.value)
+    wb.save(path)
+    return cell.value
+
+
+def _build_stats(stdout: str) -> tuple[int, int, int, int]:
+    match = re.search(r"Zeilen (\d+) wiederverwendet / (\d+) neu, "
+                      r"Records (\d+) wiederverwendet / (\d+) neu", stdout)
+    assert match, stdout
+    return tuple(map(int, match.groups()))
+
+
+@pytest.fixture
+def out_dirs(tmp_path):
+    if not (OUTPUT / "m3gim.jsonld").exists():
+        pytest.skip("m3gim.jsonld nicht vorhanden — Pipeline nicht gelaufen")
+    dirs = []
+    for name in ("full", "inc"):
+        d = tmp_path / name
+        d.mkdir()
+        for fname in SIDE_INPUTS:
+            if (OUTPUT / fname).exists():
+                shutil.copy2(OUTPUT / fname, d / fname)
+        dirs.append(d)
+    return dirs
+
+
+@pytest.mark.slow
+def test_incremental_matches_full_run(out_dirs):
+    full, inc = out_dirs
+
+    _run(full)
+    _run(inc, "--incremental")
+    assert (inc / ".cache" / "transform-cache.pickle").exists()
+    assert _graph(inc) == _graph(full), "kalter inkrementeller Lauf weicht ab"
+
+    stdout = _run(inc, "--incremental")
+    assert "unveraendert" in stdout, "warmer Lauf ohne Aenderung baut neu"
+
+    # Schnappschuss im alten Format: der unveraenderte Lauf ersetzt ihn
+    snapshot = inc / "m3gim.graph.bin"
+    snapshot.write_bytes(b"M3GIMGS\x01" + snapshot.read_bytes()[8:])
+    assert not snapshot_is_current(inc / "m3gim.jsonld")
+    assert "unveraendert" in _run(inc, "--incremental")
+    assert snapshot_is_current(inc / "m3gim.jsonld")
+
+    # Ein Volllauf mit anderen Optionen ueberschreibt den Output: der naechste
+    # inkrementelle Lauf darf ihn nicht als unveraendert stehen lassen
+    _run(inc, "--compact")
+    compact = (inc / "m3gim.jsonld").read_text(encoding="utf-8")
+    assert "\n" not in compact and _graph(inc) == _graph(full)
+    assert "unveraendert" not in _run(inc, "--incremental")
+    assert _graph(inc) == _graph(full)
+    assert "\n  " in (inc / "m3gim.jsonld").read_text(encoding="utf-8")
+
+    if not (full / "wikidata-enrichment.json").exists():
+        pytest.skip("wikidata-enrichment.json fehlt — keine Abhaengigkeit testbar")
+    _touch_enrichment(full)
+    _touch_enrichment(inc)
+    _run(full)
+    stdout = _run(inc, "--incremental")
+    assert _graph(inc) == _graph(full), "warmer inkrementeller Lauf weicht ab"
+    _, _, hits, misses = _build_stats(stdout)
+    assert hits > misses > 0, f"Cache wirkt nicht selektiv: {hits}/{misses}"
+
+
+@pytest.mark.slow
+def test_incremental_after_xlsx_row_edit(out_dirs, tmp_path):
+    # Kopie der Sheets: je eine Zeile in Verknuepfungen und Objekte aendern
+    full, inc = out_dirs
+    sheets = tmp_path / "sheets"
+    shutil.copytree(SHEETS_DIR, sheets)
+    env = {"M3GIM_SHEETS_DIR": str(sheets),
+           "M3GIM_CACHE_DIR": str(tmp_path / "cache")}
+    _run(inc, "--incremental", **env)
+
+    _edit_cell(sheets / "M3GIM-Verknüpfungen.xlsx", 2, "rolle",
+               lambda old: "dirigent:in" if old == "regisseur:in" else "regisseur:in")
+    title = _edit_cell(sheets / "M3GIM-Objekte.xlsx", 2, "titel",
+                       lambda old: f"{old} (korrigiert)")
+
+    _run(full, **env)
+    stdout = _run(inc, "--incremental", **env)
+    assert _graph(inc) == _graph(full), "inkrementeller Lauf nach XLSX-Aenderung weicht ab"
+    row_hits, row_misses, hits, misses = _build_stats(stdout)
+    assert row_misses == 1 and row_hits > 0, f"Zeilen: {row_hits}/{row_misses}"
+    assert 0 < misses <= 2 < hits, f"Records: {hits}/{misses}"
+    assert any(n.get("rico:title") == title.strip() for n in _graph(inc)["@graph"])
@@ -0,0 +1,76 @@
+"""Spaltenweise Verknuepfungs-Normalisierung (_prepare_verknuepfungen) muss
+zellgenau dieselben Werte liefern wie die zeilenweisen Helfer
+(normalize_str/normalize_lower/normalize_role/clean_date).
+
+Schnelle Unit-Tests ohne Pipeline-Run, mit synthetischen Grenzfaellen
+(NaN, Leerstrings, Timestamps, Gender-Suffix ohne Stamm, "o. D.", Folio-
+Kopfzeile in Datenzelle, fehlende Provenance-Spalten).
+"""
+
+import math
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+SCRIPTS = Path(__file__).parent.parent / "scripts"
+if str(SCRIPTS) not in sys.path:
+    sys.path.insert(0, str(SCRIPTS))
+
+from transform import (  # noqa: E402
+    _prepare_verknuepfungen,
+    clean_date,
+    normalize_lower,
+    normalize_role,
+    normalize_str,
+    process_verknuepfungen,
+)
+
+NAN = float("nan")
+
+
+@pytest.fixture
+def frame():
+    return pd.DataFrame({
+        "archivsignatur": ["NIM_001", " NIM_002 ", NAN, "Beispiel", "NIM_003", "NIM_004"],
+        "folio": ["1_2", "Folio", NAN, "x", "  ", NAN],
+        "datenpunkt_id": [3.0, NAN, 1.0, 2.0, NAN, 7.0],
+        "typ": ["Person", "ort, datum", "person", "person", " ", "rolle,person"],
+        "name": [" Adam, Theo ", "Wien, 1956-1957", "X", "Y", "Z", "Wotan, Hans Hotter"],
+        "rolle": ["Saenger:in", ":innen", NAN, "", "dirigent", "interpret:in:in"],
+        "datum": [pd.Timestamp("1958-04-18"), "o. D.", "1950-1951", " ", NAN, 1958],
+        "anmerkung": [NAN, "  ", 12, "ok", NAN, "Rolle unsicher"],
+    })
+
+
+def _scalar(value):
+    return None if isinstance(value, float) and math.isnan(value) else value
+
+
+def test_columns_match_scalar_helpers(frame):
+    prep = _prepare_verknuepfungen(frame)
+    for pos, row in enumerate(frame.to_dict("records")):
+        row = {k: _scalar(v) for k, v in row.items()}
+        assert prep["name"][pos] == normalize_str(row["name"])
+        assert prep["typ"][pos] == normalize_lower(row["typ"])
+        assert prep["rolle"][pos] == normalize_role(row["rolle"])
+        assert prep["datum"][pos] == clean_date(row["datum"])
+        assert prep["anmerkung"][pos] == normalize_str(row["anmerkung"])
+
+
+def test_row_filter_and_objekt_id(frame):
+    prep = _prepare_verknuepfungen(frame)
+    # NaN-Signatur, "Beispiel" und leerer Typ erzeugen keine Relationen
+    assert prep["rows"] == [0, 1, 5]
+    assert prep["objekt_id"][0] == "NIM_001 1_2"
+    # literale "Folio"-Kopfzeile ist keine Folio
+    assert prep["objekt_id"][1] == "NIM_002"
+
+
+def test_provenance_fallback_without_helper_columns(frame):
+    rels = process_verknuepfungen(frame, {})
+    source = rels["NIM_001 1_2"][0]["_source"]
+    assert source == {"m3gim:xlsxSheet": "Verknuepfungen", "m3gim:xlsxRow": 2,
+                      "m3gim:datenpunktId": 3}
+    assert "m3gim:datenpunktId" not in rels["NIM_002"][0]["_source"]
@@ -0,0 +1,138 @@
+"""load_verknuepfungen: paralleles Sheet-Parsing liefert denselben Frame wie
+der sequentielle Lauf — Concat-Reihenfolge = Sheet-Reihenfolge, Provenance
+(_xlsx_sheet/_xlsx_row) sheet-genau, leere Sheets uebersprungen.
+
+Dazu der geteilte Parse-Cache (scripts/_xlsx_cache.py): Treffer sind
+identisch zu ``pd.read_excel``, eine geaenderte Datei wird neu geparst.
+"""
+
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+SCRIPTS = Path(__file__).parent.parent / "scripts"
+if str(SCRIPTS) not in sys.path:
+    sys.path.insert(0, str(SCRIPTS))
+
+import _xlsx_cache  # noqa: E402
+from transform import load_verknuepfungen  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache(tmp_path, monkeypatch):
+    """Parse-Cache ins tmp-Verzeichnis, prozesslokale Memos leeren."""
+    cache_dir = tmp_path / "xlsx-cache"
+    monkeypatch.setattr(_xlsx_cache, "CACHE_DIR", cache_dir)
+    monkeypatch.setattr(_xlsx_cache, "_blobs", {})
+    monkeypatch.setattr(_xlsx_cache, "_claimed", set())
+    return cache_dir
+
+
+@pytest.fixture
+def box_workbook(tmp_path):
+    """Box-Export-artiges Workbook: Spalte 0 ohne Header, Signatur nur in der
+    ersten Zeile, ein leeres Sheet, ein Sheet ohne datenpunkt_id."""
+    path = tmp_path / "M3GIM-Verknüpfungen.xlsx"
+    sheets = {
+        "Box_02": pd.DataFrame({" ": ["NIM_12", None], "Folio": ["1", "2"],
+                                "datenpunkt_id": [1, 2], "Typ": ["person", "ort"],
+                                "Name": ["A", "Wien"]}),
+        "Box 5": pd.DataFrame({" ": ["NIM_005", None, None], "Folio": [None] * 3,
+                               "Typ": ["werk"] * 3, "Name": ["X", "Y", "Z"]}),
+        "leer": pd.DataFrame(),
+        "Box_01": pd.DataFrame({" ": ["NIM_001"], "Folio": ["3"],
+                                "datenpunkt_id": [9], "Typ": ["person"],
+                                "Name": ["B"]}),
+    }
+    with pd.ExcelWriter(path) as writer:
+        for name, df in sheets.items():
+            df.to_excel(writer, sheet_name=name, index=False)
+    return path
+
+
+def test_parallel_equals_sequential(box_workbook, monkeypatch):
+    monkeypatch.setenv("M3GIM_XLSX_CACHE", "0")
+    sequential = load_verknuepfungen(box_workbook, workers=1)
+    parallel = load_verknuepfungen(box_workbook, workers=3)
+    pd.testing.assert_frame_equal(parallel, sequential)
+
+
+def test_order_and_provenance(box_workbook):
+    df = load_verknuepfungen(box_workbook, workers=2)
+    assert df["_xlsx_sheet"].tolist() == ["Box_02"] * 2 + ["Box 5"] * 3 + ["Box_01"]
+    assert df["_xlsx_row"].tolist() == [2, 3, 2, 3, 4, 2]
+    # Signatur forward-gefuellt und dreistellig normalisiert
+    assert df["archivsignatur"].tolist()[:2] == ["NIM_012", "NIM_012"]
+
+
+def test_cache_hit_equals_fresh_parse(box_workbook, isolated_cache, monkeypatch):
+    cold = load_verknuepfungen(box_workbook, workers=1)
+    assert list(isolated_cache.rglob("sheet-*.pickle"))
+    # Zweiter Lauf: nur Platte, kein Memo — und kein Parsen mehr
+    monkeypatch.setattr(_xlsx_cache, "_blobs", {})
+    with monkeypatch.context() as m:
+        m.setattr(pd, "ExcelFile", None)
+        warm = load_verknuepfungen(box_workbook, workers=1)
+    pd.testing.assert_frame_equal(warm, cold)
+
+    for sheet in ("Box 5", 0):
+        pd.testing.assert_frame_equal(
+            _xlsx_cache.read_sheet(box_workbook, sheet),
+            pd.read_excel(box_workbook, sheet_name=sheet))
+
+
+def test_cache_invalidated_by_content(box_workbook):
+    before = _xlsx_cache.read_sheet(box_workbook, "Box_01")
+    with pd.ExcelWriter(box_workbook, mode="a", if_sheet_exists="replace") as writer:
+        pd.DataFrame({" ": ["NIM_002"], "Name": ["neu"]}).to_excel(
+            writer, sheet_name="Box_01", index=False)
+    after = _xlsx_cache.read_sheet(box_workbook, "Box_01")
+    assert before["Name"].tolist() == ["B"]
+    assert after["Name"].tolist() == ["neu"]
+
+
+def _rewrite(path, name):
+    with pd.ExcelWriter(path, mode="a", if_sheet_exists="replace") as writer:
+        pd.DataFrame({" ": ["NIM_002"], "Name": [name]}).to_excel(
+            writer, sheet_name="Box_01", index=False)
+
+
+def test_edits_evict_previous_entries(box_workbook, isolated_cache, tmp_path):
+    other = tmp_path / "M3GIM-Personenindex.xlsx"
+    pd.DataFrame({"Name": ["A"]}).to_excel(other, index=False)
+    _xlsx_cache.read_sheet(other)
+    for name in ("eins", "zwei", "drei"):
+        _rewrite(box_workbook, name)
+        load_verknuepfungen(box_workbook, workers=1)
+        _xlsx_cache.read_sheet(box_workbook, "Box_01")
+    # ein Eintrag pro Workbook; der des anderen Workbooks bleibt
+    assert len([d for d in isolated_cache.iterdir() if d.is_dir()]) == 2
+    assert _xlsx_cache.read_sheet(box_workbook, "Box_01")["Name"].tolist() == ["drei"]
+    assert _xlsx_cache.read_sheet(other)["Name"].tolist() == ["A"]
+
+
+def test_entries_of_deleted_workbooks_are_evicted(isolated_cache, tmp_path):
+    gone = tmp_path / "tmp-kopie.xlsx"
+    pd.DataFrame({"Name": ["A"]}).to_excel(gone, index=False)
+    _xlsx_cache.read_sheet(gone)
+    gone.unlink()
+    legacy = isolated_cache / "alt-ohne-sources"    # Cache-Stand vor dem Vermerk
+    legacy.mkdir()
+    (legacy / "sheet-0.pickle").write_bytes(b"")
+    other = tmp_path / "M3GIM-Personenindex.xlsx"
+    pd.DataFrame({"Name": ["B"]}).to_excel(other, index=False)
+    _xlsx_cache.read_sheet(other)
+    entries = [d for d in isolated_cache.iterdir() if d.is_dir()]
+    assert len(entries) == 1
+    assert _xlsx_cache._sources(entries[0]) == [str(other.resolve())]
+
+
+def test_blob_memo_is_bounded(box_workbook, monkeypatch):
+    load_verknuepfungen(box_workbook, workers=1)
+    assert not _xlsx_cache._blobs                  # read_workbook memoisiert nicht
+    monkeypatch.setattr(_xlsx_cache, "_BLOB_BUDGET", 1)
+    for sheet in ("Box_02", "Box 5", "Box_01"):
+        _xlsx_cache.read_sheet(box_workbook, sheet)
+    assert len(_xlsx_cache._blobs) == 1
@@ -0,0 +1,106 @@
+"""Pipeline-Runner (scripts/run-pipeline.py) mit synthetischen Schritten:
+Ueberspringen bei unveraenderten Eingaben, Abbruch beim ersten Fehlschlag,
+Wiederaufnahme ab dem ersten veralteten Schritt, parallele Nachbarn.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+from _helpers import load_script
+
+run_pipeline_mod = load_script("run_pipeline", "run-pipeline.py")
+Stage = run_pipeline_mod.Stage
+
+
+def _stage(tmp: Path, name: str, src: str, dst: str, after=(), extra: str = ""):
+    """Schritt: kopiert src -> dst und protokolliert seinen Lauf in runs.txt."""
+    code = (
+        "import pathlib, sys\n"
+        f"tmp = pathlib.Path({str(tmp)!r})\n"
+        f"(tmp / 'runs.txt').open('a').write({name!r} + '\\n')\n"
+        f"{extra}\n"
+        f"(tmp / {dst!r}).write_text((tmp / {src!r}).read_text() + {name!r})\n"
+    )
+    return Stage(name, [sys.executable, "-c", code], [tmp / src], [tmp / dst],
+                 after=list(after))
+
+
+@pytest.fixture
+def chain(tmp_path):
+    (tmp_path / "quelle.txt").write_text("v1")
+    stages = [
+        _stage(tmp_path, "a", "quelle.txt", "a.txt"),
+        _stage(tmp_path, "b", "a.txt", "b.txt", after=["a"],
+               extra="sys.exit(1) if (tmp / 'kaputt').exists() else None"),
+        _stage(tmp_path, "c", "b.txt", "c.txt", after=["b"]),
+    ]
+    return tmp_path, stages
+
+
+def _run(tmp: Path, stages, **kwargs) -> tuple[int, list[str]]:
+    runs = tmp / "runs.txt"
+    runs.write_text("")
+    code = run_pipeline_mod.run_pipeline(
+        stages, state_path=tmp / "state.json", log_dir=tmp / "logs", **kwargs)
+    return code, runs.read_text().split()
+
+
+def test_skips_unchanged_and_reruns_downstream(chain):
+    tmp, stages = chain
+    assert _run(tmp, stages) == (0, ["a", "b", "c"])
+    assert _run(tmp, stages) == (0, [])
+    (tmp / "quelle.txt").write_text("v2")
+    assert _run(tmp, stages) == (0, ["a", "b", "c"])
+    assert (tmp / "c.txt").read_text() == "v2abc"
+
+
+def test_stop_on_failure_and_resume(chain):
+    tmp, stages = chain
+    (tmp / "kaputt").touch()
+    code, runs = _run(tmp, stages)
+    assert code == 1 and runs == ["a", "b"], "c darf nach Fehlschlag nicht starten"
+
+    (tmp / "kaputt").unlink()
+    assert _run(tmp, stages) == (0, ["b", "c"]), "Wiederaufnahme ab b"
+
+
+def test_forced_downstream(chain):
+    tmp, stages = chain
+    _run(tmp, stages)
+    forced = run_pipeline_mod._downstream(stages, {"b"})
+    assert _run(tmp, stages, forced=forced) == (0, ["b", "c"])
+
+
+def test_independent_stages_run_concurrently(tmp_path):
+    """x wartet auf eine Datei, die erst y schreibt — klappt nur parallel."""
+    (tmp_path / "quelle.txt").write_text("v1")
+    wait_for_y = (
+        "import time\n"
+        "for _ in range(100):\n"
+        "    if (tmp / 'y.txt').exists(): break\n"
+        "    time.sleep(0.05)\n"
+        "else: sys.exit(1)"
+    )
+    stages = [
+        _stage(tmp_path, "x", "quelle.txt", "x.txt", extra=wait_for_y),
+        _stage(tmp_path, "y", "quelle.txt", "y.txt"),
+    ]
+    code, runs = _run(tmp_path, stages, jobs=2)
+    assert code == 0 and sorted(runs) == ["x", "y"]
+
+
+def test_stage_inputs_follow_imports():
+    """Helfer ergeben sich transitiv aus den Importen der Scripts."""
+    inputs = {stage.name: {p.name for p in stage.inputs if p.suffix == ".py"}
+              for stage in run_pipeline_mod.build_stages()}
+    assert {"_graph.py", "_graph_diff.py", "_trace.py", "_xlsx_cache.py"} <= inputs["transform"]
+    assert {"_title_matcher.py", "_graph.py", "_graph_diff.py", "_build_cache.py",
+            "_trace.py"} <= inputs["build-views"]
+    assert "_graph.py" in inputs["report-quality"]
+    # _candidate_index -> _fuzzy_match, _wikidata_client -> _http_cache
+    assert {"_wikidata_client.py", "_http_cache.py", "_fuzzy_match.py",
+            "_candidate_index.py", "_journal.py"} <= inputs["reconcile"]
+    assert {"_wikidata_client.py", "_http_cache.py", "_label_store.py"} <= inputs["enrich-wikidata"]
+    assert "_wikidata_standin.py" not in set().union(*inputs.values())
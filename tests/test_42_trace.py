@@ -0,0 +1,72 @@
+"""Stage-Tracing (scripts/_trace.py): Chrome-Trace-Format, geschachtelte
+Peaks, No-op ohne --trace."""
+
+import json
+import sys
+import tracemalloc
+from pathlib import Path
+
+SCRIPTS = Path(__file__).parent.parent / "scripts"
+if str(SCRIPTS) not in sys.path:
+    sys.path.insert(0, str(SCRIPTS))
+
+from _trace import Tracer  # noqa: E402
+
+MB = 2**20
+
+
+def test_disabled_is_noop():
+    was_tracing = tracemalloc.is_tracing()
+    tracer = Tracer(enabled=False)
+    with tracer.stage("load_index"):
+        pass
+    assert tracer.stages == []
+    assert tracemalloc.is_tracing() == was_tracing
+
+
+def test_nested_peaks_and_chrome_trace(tmp_path):
+    tracer = Tracer(enabled=True, process_name="transform")
+    with tracer.stage("outer"):
+        with tracer.stage("gross"):
+            buf = bytearray(8 * MB)
+            del buf
+        with tracer.stage("klein", rows=3):
+            buf = bytearray(1 * MB)
+            del buf
+    tracer.stop()
+
+    by_name = {st["name"]: st for st in tracer.stages}
+    # Der Reset fuer "klein" darf den Peak von "gross" in "outer" nicht loeschen
+    assert by_name["gross"]["peak_bytes"] >= 8 * MB
+    assert by_name["outer"]["peak_bytes"] >= by_name["gross"]["peak_bytes"]
+    assert 1 * MB <= by_name["klein"]["peak_bytes"] < 8 * MB
+    assert [by_name[n]["depth"] for n in ("outer", "gross", "klein")] == [0, 1, 1]
+
+    path = tracer.write(tmp_path / "trace.json")
+    events = json.loads(path.read_text(encoding="utf-8"))["traceEvents"]
+    complete = [e for e in events if e["ph"] == "X"]
+    assert [e["name"] for e in complete] == ["outer", "gross", "klein"]
+    for e in complete:
+        assert e["dur"] >= 0 and e["ts"] >= 0
+        assert {"cpu_ms", "peak_kb"} <= set(e["args"])
+    assert complete[2]["args"]["rows"] == 3
+    # Kind liegt zeitlich innerhalb der Eltern-Stage (Perfetto-Verschachtelung)
+    outer = complete[0]
+    assert outer["ts"] <= complete[1]["ts"]
+    assert complete[2]["ts"] + complete[2]["dur"] <= outer["ts"] + outer["dur"] + 1
+
+    lines = tracer.summary_lines()
+    assert len(lines) == 4 and lines[2].lstrip().startswith("gross")
+
+
+def test_timing_only_without_tracemalloc():
+    was_tracing = tracemalloc.is_tracing()
+    tracer = Tracer(enabled=True, memory=False)
+    with tracer.stage("serialize"):
+        pass
+    assert tracemalloc.is_tracing() == was_tracing
+    assert tracer.stages[0]["peak_bytes"] is None
+    events = tracer.chrome_trace()["traceEvents"]
+    assert [e["ph"] for e in events] == ["M", "X"]
+    assert "peak_kb" not in events[1]["args"]
+    assert tracer.summary_lines()[1].rstrip().endswith("-")
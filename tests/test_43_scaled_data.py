@@ -0,0 +1,123 @@
+"""Skalierte Testdaten (scripts/generate-scaled-data.py) und Regressions-
+Vergleich des Benchmarks (scripts/benchmark.py).
+
+Der Generator muss Joins erhalten: verschobene Signaturen treffen ihre
+Records, Index-Kopien ihre Verknuepfungen; jede Kopie bekommt eigene
+Sheets und Signaturen.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+SCRIPTS = Path(__file__).parent.parent / "scripts"
+if str(SCRIPTS) not in sys.path:
+    sys.path.insert(0, str(SCRIPTS))
+
+import _xlsx_cache  # noqa: E402
+from _xlsx_cache import read_sheet  # noqa: E402
+from transform import SHEETS_DIR, load_verknuepfungen  # noqa: E402
+from _helpers import load_script  # noqa: E402
+
+gen = load_script("generate_scaled_data", "generate-scaled-data.py")
+bench = load_script("benchmark", "benchmark.py")
+
+VERK = "M3GIM-Verknüpfungen.xlsx"
+
+
+@pytest.fixture(scope="module", autouse=True)
+def xlsx_cache(tmp_path_factory):
+    """Parse-Cache fuer die temporaeren Workbooks nicht im Repo ablegen."""
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(_xlsx_cache, "CACHE_DIR", tmp_path_factory.mktemp("xlsx-cache"))
+        mp.setattr(_xlsx_cache, "_blobs", {})
+        mp.setattr(_xlsx_cache, "_claimed", set())
+        yield
+
+
+@pytest.fixture(scope="module")
+def scaled(tmp_path_factory):
+    out = tmp_path_factory.mktemp("x2")
+    manifest = gen.generate(out, 2, SHEETS_DIR)
+    return out, manifest
+
+
+def test_shift_signatur():
+    assert gen.shift_signatur("UAKUG/NIM_135", 0) == "UAKUG/NIM_135"
+    assert gen.shift_signatur("UAKUG/NIM_11", 2) == "UAKUG/NIM_2011"
+    assert gen.shift_signatur("UAKUG/NIM_011", 2) == "UAKUG/NIM_2011"
+    assert gen.shift_signatur("UAKUG/NIM/PL_03", 1) == "UAKUG/NIM/PL_1003"
+    assert gen.shift_signatur(None, 1) is None
+
+
+def test_rows_scale(scaled):
+    out, manifest = scaled
+    objekte = read_sheet(SHEETS_DIR / "M3GIM-Objekte.xlsx")
+    scaled_objekte = read_sheet(out / "M3GIM-Objekte.xlsx")
+    # Leerzeilen mitten im Sheet werden mitkopiert (XLSX-Provenance)
+    assert len(scaled_objekte) == 2 * len(objekte)
+    sigs = scaled_objekte["archivsignatur"].dropna()
+    assert sigs.str.contains(r"NIM_1\d{3}\b").any()
+
+    original = load_verknuepfungen(SHEETS_DIR / VERK, workers=1)
+    grown = load_verknuepfungen(out / VERK, workers=1)
+    assert manifest["sheets"] == 2 * original["_xlsx_sheet"].nunique()
+    assert len(grown) == manifest["rows"][VERK] == 2 * len(original)
+    # Jede Kopie hat eigene Konvolut-Signaturen, keine Ueberschneidung
+    per_copy = grown.groupby(grown["_xlsx_sheet"].str.contains("~"))
+    a, b = (set(g["archivsignatur"].dropna()) for _, g in per_copy)
+    assert a and b and not a & b
+
+
+def test_copies_link_to_own_index_entries(scaled):
+    out, _ = scaled
+    persons = read_sheet(out / "M3GIM-Personenindex.xlsx")
+    names = {n.lower() for n in persons.iloc[:, 1].dropna()}
+    grown = load_verknuepfungen(out / VERK, workers=1)
+    copy1 = grown[grown["_xlsx_sheet"].str.endswith("~1")
+                  & (grown["typ"] == "person")]
+    suffixed = copy1["name"].dropna()
+    suffixed = suffixed[suffixed.str.endswith(" [1]")]
+    assert len(suffixed) > 0
+    assert {n.lower() for n in suffixed} <= names
+
+
+def test_reuse_detects_current_set(scaled, tmp_path):
+    out, _ = scaled
+    assert gen.is_current(out, 2, SHEETS_DIR)
+    assert not gen.is_current(out, 3, SHEETS_DIR)
+    assert not gen.is_current(out, 2, SHEETS_DIR, shared_index=True)
+    assert not gen.is_current(tmp_path, 3, SHEETS_DIR)
+
+
+def _result(transform_wall, stage_wall, status="ok"):
+    return {"scale": 10, "status": status,
+            "transform": {"wall": transform_wall,
+                          "stages": {"load_index": {"wall": stage_wall, "cpu": 0}}},
+            "build_views": {"wall": 1.0, "stages": {}}}
+
+
+def test_compare_flags_regressions():
+    before = _result(10.0, 2.0)
+    assert bench.compare(None, before) == []
+    assert bench.compare(before, _result(11.0, 2.1)) == []
+    findings = bench.compare(before, _result(13.0, 2.0))
+    assert len(findings) == 1 and "transform:" in findings[0]
+    assert "load_index" in bench.compare(before, _result(10.0, 3.0))[0]
+    assert "timeout" in bench.compare(before, _result(0, 0, "timeout"))[0]
+    # Winzige Stages (Rauschen) werden nicht gemeldet
+    assert bench.compare(_result(10.0, 0.01), _result(10.0, 0.03)) == []
+
+
+def test_previous_result_matches_options():
+    options = {"repeat": 1, "warm": False, "shared_index": False, "memory": False}
+    warm = dict(options, warm=True)
+    history = {"runs": [
+        {"options": options, "results": [_result(5.0, 1.0)]},
+        {"options": warm, "results": [_result(1.0, 0.5)]},
+        {"options": options, "results": [_result(0, 0, "failed")]},
+    ]}
+    assert bench.previous_result(history, 10, options)["transform"]["wall"] == 5.0
+    assert bench.previous_result(history, 10, warm)["transform"]["wall"] == 1.0
+    assert bench.previous_result(history, 1, options) is None
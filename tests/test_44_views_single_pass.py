@@ -0,0 +1,82 @@
+"""build-views.py: alle Views in einem Graph-Durchlauf (build_views).
+
+Der fusionierte Lauf muss dieselben Dokumente liefern wie die einzelnen
+build_*-Funktionen, jede View sieht jeden Knoten genau einmal, und die
+gemeinsamen Felder (extract_year, get_dokumenttyp, ...) werden pro Knoten nur
+einmal berechnet.
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+SCRIPTS = Path(__file__).parent.parent / "scripts"
+if str(SCRIPTS) not in sys.path:
+    sys.path.insert(0, str(SCRIPTS))
+
+from _helpers import load_script  # noqa: E402
+
+bv = load_script("build_views", "build-views.py")
+
+JSONLD = Path(__file__).parent.parent / "data" / "output" / "m3gim.jsonld"
+
+
+@pytest.fixture(scope="module")
+def graph():
+    with open(JSONLD, encoding="utf-8") as f:
+        return json.load(f)["@graph"]
+
+
+def _strip(doc):
+    doc = dict(doc)
+    doc["_meta"] = {k: v for k, v in doc["_meta"].items() if k != "generated"}
+    return doc
+
+
+def test_fused_equals_single_builders(graph, capsys):
+    fused = bv.build_views(graph)
+    assert list(fused) == ["partitur", "matrix", "kosmos", "sankey"]
+    singles = {
+        "partitur": bv.build_partitur(graph),
+        "matrix": bv.build_matrix(graph),
+        "kosmos": bv.build_kosmos(graph),
+        "sankey": bv.build_sankey(graph),
+    }
+    for name, doc in singles.items():
+        assert _strip(fused[name]) == _strip(doc), name
+    assert fused["partitur"]["auftritte"]
+
+
+def test_one_visit_per_node_and_shared_fields_once(graph, monkeypatch, capsys):
+    calls = {"extract_year": 0, "get_dokumenttyp": 0}
+    for name in calls:
+        original = getattr(bv, name)
+
+        def counted(*args, _name=name, _orig=original):
+            calls[_name] += 1
+            return _orig(*args)
+        monkeypatch.setattr(bv, name, counted)
+
+    class CountingView(bv.ViewAccumulator):
+        name = "zaehler"
+
+        def __init__(self):
+            self.ids = []
+
+        def visit(self, ctx):
+            self.ids.append(id(ctx.node))
+
+        def finish(self, source_records):
+            return {"knoten": len(self.ids), "_meta": {"source_records": source_records}}
+
+    views = [cls() for cls in bv.VIEWS] + [CountingView()]
+    result = bv.build_views(graph, views)
+
+    assert result["zaehler"]["knoten"] == len(graph)
+    assert views[-1].ids == [id(n) for n in graph]
+    # Einmal pro Knoten im NodeContext; extract_year zusaetzlich nur fuer
+    # Auftritts-Datumsangaben aus DatedEvents/STEs.
+    assert calls["get_dokumenttyp"] == len(graph)
+    assert len(graph) <= calls["extract_year"] < 2 * len(graph)
@@ -0,0 +1,70 @@
+"""Mehrfach-Mustersuche fuer Titel (scripts/_title_matcher.py).
+
+Der Matcher muss exakt dieselben Treffer liefern wie die bisherigen
+Einzeltests ``keyword in title`` (auch ueberlappende und Praefix-Schluessel),
+und die Tabellen muessen die alte Auswertungsreihenfolge beibehalten.
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+SCRIPTS = Path(__file__).parent.parent / "scripts"
+if str(SCRIPTS) not in sys.path:
+    sys.path.insert(0, str(SCRIPTS))
+
+from _title_matcher import MultiPatternMatcher, PatternTable  # noqa: E402
+from _helpers import load_script  # noqa: E402
+
+bv = load_script("build_views", "build-views.py")
+
+JSONLD = Path(__file__).parent.parent / "data" / "output" / "m3gim.jsonld"
+
+
+def _naive(keys, text):
+    return {k for k in keys if k in text}
+
+
+def test_overlapping_and_prefix_keys():
+    keys = ["wag", "wagner", "agne", "ner", "r. strauss", "strauss", "a+b", "(x)"]
+    matcher = MultiPatternMatcher(keys)
+    for text in ["wagner", "wagnerwag", "richard wagner, r. strauss",
+                 "a+b (x)", "ab x", "", "wa", "strausswagne"]:
+        assert matcher.findall(text) == _naive(keys, text), text
+
+
+def test_empty_matcher():
+    assert MultiPatternMatcher([]).findall("wagner") == frozenset()
+    assert MultiPatternMatcher([""]).findall("wagner") == frozenset()
+
+
+def test_table_order_first_and_all():
+    table = PatternTable({"ring": "Ring", "walküre": "Walküre", "erda": "Erda"})
+    hits = {"erda", "walküre", "fremd"}
+    assert table.first(hits) == "Walküre"
+    assert table.all(hits) == [("walküre", "Walküre"), ("erda", "Erda")]
+    assert table.first({"fremd"}) is None
+    assert table.all(set()) == []
+
+
+def test_views_tables_equal_naive_scan_on_real_titles():
+    with open(JSONLD, encoding="utf-8") as f:
+        graph = json.load(f)["@graph"]
+    keys = bv.TITLE_MATCHER.patterns
+    for node in graph:
+        title = (node.get("rico:title") or "").lower()
+        assert bv.TITLE_MATCHER.findall(title) == _naive(keys, title), title
+        expected = next((v for k, v in bv.KOMPONISTEN_MAPPING.items() if k in title), None)
+        assert bv.NodeContext(node).komponist == expected
+
+
+@pytest.mark.parametrize("name, kategorie", [
+    ("Karajan, Herbert von", "Dirigent"),
+    ("Böhm, Karl", "Dirigent"),
+    ("", "Andere"),
+    ("Niemand Bekannt", "Andere"),
+])
+def test_person_kategorie(name, kategorie):
+    assert bv.get_person_kategorie(name) == kategorie
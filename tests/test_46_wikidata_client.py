@@ -0,0 +1,182 @@
+"""Wikidata-Client (scripts/_wikidata_client.py) gegen einen lokalen Stand-in.
+
+Der Stand-in-Server (scripts/_wikidata_standin.py) beantwortet
+``wbsearchentities``/``wbgetentities`` aus einem kleinen Korpus und kann
+Fehler (429 mit Retry-After, maxlag, 503) injizieren. Geprueft werden
+Rate-Limit, Keep-Alive, Retry-Verhalten und die parallele Reconciliation in
+reconcile.py.
+"""
+
+import json
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+SCRIPTS = Path(__file__).parent.parent / "scripts"
+if str(SCRIPTS) not in sys.path:
+    sys.path.insert(0, str(SCRIPTS))
+
+import reconcile  # noqa: E402
+from _wikidata_client import TokenBucket, WikidataClient, WikidataError  # noqa: E402
+
+
+@pytest.fixture
+def standin(wikidata_standin):
+    return wikidata_standin
+
+
+def _client(standin, **kw):
+    kw.setdefault("rate", 1000)
+    kw.setdefault("backoff", 0.01)
+    return WikidataClient(standin.url, **kw)
+
+
+def test_token_bucket_limits_rate():
+    now = [0.0]
+    sleeps = []
+
+    def sleep(seconds):
+        sleeps.append(seconds)
+        now[0] += seconds
+
+    bucket = TokenBucket(rate=5, burst=2, clock=lambda: now[0], sleep=sleep)
+    for _ in range(12):
+        bucket.acquire()
+    # 2 aus dem Vorrat, 10 weitere mit 5/s
+    assert now[0] == pytest.approx(2.0)
+    bucket.pause(3.0)
+    start = now[0]
+    bucket.acquire()
+    assert now[0] - start >= 3.0
+
+
+def test_keep_alive_and_maxlag_param(standin):
+    with _client(standin) as client:
+        for _ in range(10):
+            assert client.get({"action": "wbsearchentities", "search": "Wien"})["search"]
+        assert client.stats["connections"] == 1
+    assert len(standin.ports) == 1
+    assert all(r["maxlag"] == "5" and r["format"] == "json" for r in standin.requests)
+
+
+def test_retry_after_and_maxlag_are_honoured(standin):
+    standin.failures = [
+        (429, {"error": "too many"}, [("Retry-After", "0.3")]),
+        (200, {"error": {"code": "maxlag", "info": "lagged", "lag": 0.2}}, [("Retry-After", "0.2")]),
+        (503, {}, ()),
+    ]
+    with _client(standin) as client:
+        start = time.monotonic()
+        data = client.get({"action": "wbsearchentities", "search": "Wien"})
+        elapsed = time.monotonic() - start
+    assert data["search"][0]["id"] == "Q1741"
+    assert client.stats["retries"] == 3
+    assert elapsed >= 0.5
+
+
+def test_give_up_and_non_retryable_errors(standin):
+    with _client(standin, max_retries=1) as client:
+        standin.failures = [(503, {}, ())] * 2
+        with pytest.raises(WikidataError, match="2 Versuche"):
+            client.get({"action": "wbsearchentities", "search": "Wien"})
+        with pytest.raises(WikidataError, match="badvalue"):
+            client.get({"action": "nonsense"})
+        assert client.stats["retries"] == 1
+
+
+def test_map_is_parallel_and_ordered(standin):
+    standin.latency = 0.1
+    names = ["Wien", "Ira Malaniuk"] * 4
+
+    def search(name):
+        return client.get({"action": "wbsearchentities", "search": name})["search"][0]["id"]
+
+    client = _client(standin, workers=4)
+    with client:
+        start = time.monotonic()
+        ids = list(client.map(search, names))
+        elapsed = time.monotonic() - start
+    assert ids == ["Q1741", "Q94208"] * 4
+    assert elapsed < 0.1 * len(names) * 0.75
+    assert client.stats["connections"] <= 4
+
+
+def test_map_reuses_pool_connections(standin):
+    # reconcile ruft map() zweimal pro Chunk: Keep-Alive ueber alle Aufrufe
+    standin.latency = 0.02
+    names = ["Wien", "Ira Malaniuk"] * 4
+
+    def search(name):
+        return client.get({"action": "wbsearchentities", "search": name})["search"][0]["id"]
+
+    client = _client(standin, workers=4)
+    with client:
+        for _ in range(10):
+            assert list(client.map(search, names)) == ["Q1741", "Q94208"] * 4
+        assert client.stats["connections"] <= 4
+        assert len(client._connections) <= 4
+
+
+def test_reconcile_uses_client(standin):
+    with _client(standin) as client:
+        reconcile.set_client(client)
+        try:
+            match = reconcile.reconcile_person("Malaniuk, Ira")
+            location = reconcile.reconcile_simple("Wien", reconcile.Q_GEOGRAPHIC)
+            standin.failures = [(503, {}, ())] * (client.max_retries + 1)
+            assert reconcile.search_wikidata("Wien") == []
+        finally:
+            reconcile.set_client(None)
+    assert match["qid"] == "Q94208" and match["confidence"] == 100
+    assert location["qid"] == "Q1741"
+
+
+def test_run_reconciliation_keeps_index_order(standin, tmp_path, monkeypatch, capsys):
+    names = ["Ira Malaniuk", "Wien", "xy", "Unbekannt", "Ira Malaniuk"]
+    index = pd.DataFrame({"id": range(len(names)), "name": names,
+                          "wikidata_id": [None, None, None, None, "Q94208"]})
+
+    def slow_search(name, **kw):
+        # Spaetere Zeilen werden frueher fertig
+        time.sleep(0.05 * (len(names) - names.index(name)))
+        return reconcile.search_simple(name, **kw)
+
+    def score(*args, **kw):
+        return reconcile.score_simple(*args, expected_types={"Q5", "Q515"}, **kw)
+
+    cfg = dict(reconcile.INDEX_CONFIG[0], search_fn=slow_search, score_fn=score)
+    monkeypatch.setattr(reconcile, "INDEX_CONFIG", [cfg])
+    monkeypatch.setattr(reconcile, "load_index", lambda *a, **kw: index)
+    monkeypatch.setattr(reconcile, "OUTPUT_FILE", tmp_path / "recon.json")
+
+    with _client(standin, workers=3) as client:
+        reconcile.run_reconciliation(["person"], client=client)
+    reconcile.set_client(None)
+
+    result = json.loads((tmp_path / "recon.json").read_text(encoding="utf-8"))
+    assert [m["qid"] for m in result["matched"]] == ["Q94208", "Q1741"]
+    assert [u["name"] for u in result["unmatched"]] == ["Unbekannt"]
+    assert [s["name"] for s in result["skipped"]] == ["xy", "Ira Malaniuk"]
+    # Zwei Suchen, die Claims beider Kandidaten in einem gebuendelten Aufruf
+    claim_calls = [r for r in standin.requests if r["action"] == "wbgetentities"]
+    assert len(claim_calls) == 1
+    assert set(claim_calls[0]["ids"].split("|")) == {"Q94208", "Q1741"}
+
+
+def test_fetch_claims_batches_of_50(standin):
+    qids = [f"Q{i}" for i in range(1, 121)] + ["Q94208", "Q1"]
+    with _client(standin, workers=2) as client:
+        reconcile.set_client(client)
+        try:
+            claims = reconcile.fetch_claims(qids)
+        finally:
+            reconcile.set_client(None)
+    calls = [r["ids"].split("|") for r in standin.calls("wbgetentities")]
+    assert sorted(len(c) for c in calls) == [21, 50, 50]
+    # Unbekannte QIDs ("missing") fehlen im Ergebnis
+    assert set(claims) == {"Q94208"}
+    assert reconcile.check_type("Q94208", reconcile.Q_HUMAN, claims["Q94208"])
+    assert not reconcile.check_type("Q1", reconcile.Q_HUMAN, claims.get("Q1", {}))
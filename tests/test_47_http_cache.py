@@ -0,0 +1,159 @@
+"""HTTP-Antwort-Cache (scripts/_http_cache.py) fuer die Wikidata-Skripte.
+
+Frische Eintraege kommen ohne Netz, abgelaufene werden bedingt revalidiert
+(ETag -> 304), der Offline-Modus spielt nur aus dem Cache ab und bricht bei
+Fehltreffern ab. Zum Schluss laeuft reconcile/enrich/verify einmal online
+und danach komplett offline mit identischem Ergebnis.
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+SCRIPTS = Path(__file__).parent.parent / "scripts"
+if str(SCRIPTS) not in sys.path:
+    sys.path.insert(0, str(SCRIPTS))
+
+import reconcile  # noqa: E402
+from _http_cache import CacheMiss, ResponseCache, cache_key, cache_mode  # noqa: E402
+from _wikidata_client import WikidataClient  # noqa: E402
+from _helpers import load_script  # noqa: E402
+
+
+
+enrich = load_script("enrich_wikidata", "enrich-wikidata.py")
+verify = load_script("verify_manual_approvals", "verify-manual-approvals.py")
+
+SEARCH_WIEN = {"action": "wbsearchentities", "search": "Wien", "language": "de"}
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _client(url, cache):
+    return WikidataClient(url, rate=1000, backoff=0.01, cache=cache)
+
+
+def test_cache_key_normalizes():
+    a = cache_key("https://www.wikidata.org/w/api.php",
+                  {"search": "Wien", "action": "wbsearchentities", "maxlag": "5"})
+    b = cache_key("https://www.wikidata.org/w/api.php",
+                  {"action": "wbsearchentities", "search": "Wien"})
+    assert a == b
+    assert a != cache_key("https://www.wikidata.org/w/api.php",
+                          {"action": "wbsearchentities", "search": "Graz"})
+
+
+def test_cache_mode_from_env(monkeypatch):
+    monkeypatch.delenv("M3GIM_HTTP_CACHE", raising=False)
+    assert cache_mode() == "on"
+    monkeypatch.setenv("M3GIM_HTTP_CACHE", "0")
+    assert cache_mode() == "off"
+    assert ResponseCache.from_env() is None
+    monkeypatch.setenv("M3GIM_HTTP_CACHE", "offline")
+    assert cache_mode() == "offline"
+    monkeypatch.setenv("M3GIM_HTTP_CACHE", "kaputt")
+    with pytest.raises(ValueError):
+        cache_mode()
+
+
+def test_fresh_hit_then_conditional_revalidation(wikidata_standin, tmp_path):
+    clock = Clock()
+    cache = ResponseCache(tmp_path / "c.sqlite", clock=clock)
+    with _client(wikidata_standin.url, cache) as client:
+        first = client.get(SEARCH_WIEN)
+        assert client.get(SEARCH_WIEN) == first
+        assert len(wikidata_standin.requests) == 1
+        assert cache.stats["hits"] == 1
+
+        # TTL der Suche abgelaufen -> If-None-Match -> 304, Body aus dem Cache
+        clock.now += cache.ttl("wbsearchentities") + 1
+        assert client.get(SEARCH_WIEN) == first
+        assert wikidata_standin.not_modified == 1
+        assert cache.stats["revalidated"] == 1
+        assert client.get(SEARCH_WIEN) == first
+        assert len(wikidata_standin.requests) == 2
+
+
+def test_errors_are_not_cached(wikidata_standin, tmp_path):
+    cache = ResponseCache(tmp_path / "c.sqlite")
+    wikidata_standin.failures = [(503, {}, ())]
+    with _client(wikidata_standin.url, cache) as client:
+        client.get(SEARCH_WIEN)
+        assert len(cache) == 1
+        assert client.stats["retries"] == 1
+
+
+def test_offline_replay_and_miss(wikidata_standin, tmp_path):
+    path = tmp_path / "c.sqlite"
+    clock = Clock()
+    with _client(wikidata_standin.url, ResponseCache(path, clock=clock)) as client:
+        online = client.get(SEARCH_WIEN)
+
+    clock.now += 365 * 86400  # auch abgelaufene Eintraege werden abgespielt
+    offline = ResponseCache(path, mode="offline", clock=clock)
+    with _client(wikidata_standin.url, offline) as client:
+        assert client.get(SEARCH_WIEN) == online
+        with pytest.raises(CacheMiss):
+            client.get({"action": "wbsearchentities", "search": "Graz", "language": "de"})
+        assert client.stats["requests"] == 0
+    assert len(wikidata_standin.requests) == 1
+
+
+def test_refresh_revalidates_old_entries_once(wikidata_standin, tmp_path):
+    path = tmp_path / "c.sqlite"
+    clock = Clock()
+    with _client(wikidata_standin.url, ResponseCache(path, clock=clock)) as client:
+        client.get(SEARCH_WIEN)
+    clock.now += 10
+    refresh = ResponseCache(path, mode="refresh", clock=clock)
+    with _client(wikidata_standin.url, refresh) as client:
+        client.get(SEARCH_WIEN)
+        client.get(SEARCH_WIEN)
+    assert len(wikidata_standin.requests) == 2
+    assert wikidata_standin.not_modified == 1
+
+
+def test_scripts_replay_offline(wikidata_standin, tmp_path, monkeypatch, capsys):
+    index = pd.DataFrame({"id": [1, 2, 3], "name": ["Ira Malaniuk", "Wien", "Unbekannt"]})
+    cfg = dict(reconcile.INDEX_CONFIG[0],
+               score_fn=lambda *a, **kw: reconcile.score_simple(
+                   *a, expected_types={"Q5", "Q515"}, **kw))
+    monkeypatch.setattr(reconcile, "INDEX_CONFIG", [cfg])
+    monkeypatch.setattr(reconcile, "load_index", lambda *a, **kw: index)
+    path = tmp_path / "c.sqlite"
+
+    def run(url, mode, out):
+        monkeypatch.setattr(reconcile, "OUTPUT_FILE", out)
+        client = _client(url, ResponseCache(path, mode=mode))
+        enrich.set_client(client)
+        verify._client = client
+        try:
+            with client:
+                reconcile.run_reconciliation(["person"], client=client)
+                entities = enrich.fetch_entities_batch(["Q94208", "Q1741"])
+                labels = enrich.resolve_labels(["Q1741"])
+                verified = verify.fetch_entities(["Q94208"])
+        finally:
+            reconcile.set_client(None)
+            enrich.set_client(None)
+            verify._client = None
+        result = json.loads(out.read_text(encoding="utf-8"))
+        return result["matched"], result["unmatched"], entities, labels, verified
+
+    online = run(wikidata_standin.url, "on", tmp_path / "online.json")
+    requests = len(wikidata_standin.requests)
+    offline = run(wikidata_standin.url, "offline", tmp_path / "offline.json")
+
+    assert offline == online
+    assert [m["qid"] for m in online[0]] == ["Q94208", "Q1741"]
+    assert online[3] == {"Q1741": "Wien"}
+    assert len(wikidata_standin.requests) == requests
@@ -0,0 +1,77 @@
+"""Wikidata-Stand-in (scripts/_wikidata_standin.py) und benchmark-wikidata.py.
+
+Der Korpus aus den Pipeline-Ausgaben muss jeden Match unter den Suchformen
+von reconcile.py finden, der Server die API-Grenzen (50 IDs, Rate-Limit)
+nachbilden; der Benchmark laeuft einmal klein gegen ihn durch.
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+SCRIPTS = Path(__file__).parent.parent / "scripts"
+if str(SCRIPTS) not in sys.path:
+    sys.path.insert(0, str(SCRIPTS))
+
+import reconcile  # noqa: E402
+from _wikidata_client import WikidataClient, WikidataError  # noqa: E402
+from _wikidata_standin import Corpus, StandIn, serve  # noqa: E402
+from _helpers import load_script  # noqa: E402
+
+OUTPUT = Path(__file__).parent.parent / "data" / "output"
+RECONCILIATION = OUTPUT / "wikidata-reconciliation.json"
+
+benchmark = load_script("benchmark_wikidata", "benchmark-wikidata.py")
+
+needs_outputs = pytest.mark.skipif(not RECONCILIATION.exists(),
+                                   reason="wikidata-reconciliation.json fehlt")
+
+
+@needs_outputs
+def test_corpus_from_outputs_reproduces_matches():
+    corpus = Corpus.from_outputs(decoys=1)
+    recon = json.loads(RECONCILIATION.read_text(encoding="utf-8"))
+    state = StandIn(corpus)
+    for entry in recon["matched"]:
+        for query in reconcile.name_variants(entry["name"]):
+            hits = state.respond({"action": "wbsearchentities", "search": query})[1]["search"]
+            if hits:
+                break
+        assert hits[0]["id"] == entry["qid"], entry["name"]
+        assert len(hits) == 2
+        assert "P31" in corpus.entities[entry["qid"]]["claims"]
+
+
+def test_wbgetentities_limit_and_props():
+    state = StandIn()
+    status, data = state.respond({"action": "wbgetentities",
+                                  "ids": "|".join(f"Q{i}" for i in range(51))})
+    assert data["error"]["code"] == "toomanyvalues"
+    data = state.respond({"action": "wbgetentities", "ids": "Q1741|Q2", "props": "labels"})[1]
+    assert set(data["entities"]["Q1741"]) == {"id", "labels"}
+    assert "missing" in data["entities"]["Q2"]
+
+
+def test_server_rate_limit_answers_429():
+    state = StandIn(rate_limit=3, retry_after=0.1)
+    with serve(state):
+        with WikidataClient(state.url, rate=1000, max_retries=0) as client:
+            for _ in range(3):
+                client.get({"action": "wbsearchentities", "search": "Wien"})
+            with pytest.raises(WikidataError):
+                client.get({"action": "wbsearchentities", "search": "Wien"})
+    assert state.status_counts == {200: 3, 429: 1}
+
+
+@needs_outputs
+def test_benchmark_smoke(tmp_path, capsys):
+    out = tmp_path / "bench.json"
+    assert benchmark.main(["--limit", "2", "--workers", "2", "--rate", "1000",
+                           "--latency", "0", "--workdir", str(tmp_path),
+                           "--json", str(out)]) == 0
+    results = json.loads(out.read_text(encoding="utf-8"))["results"]
+    assert set(results) == {"reconcile (workers=2)", "enrich (workers=2)", "verify"}
+    assert all(r["requests"] > 0 and r["errors"] == 0 for r in results.values())
+    assert (tmp_path / "wikidata-enrichment.json").exists()
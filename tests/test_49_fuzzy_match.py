@@ -0,0 +1,97 @@
+"""Gebuendeltes Fuzzy-Matching (scripts/_fuzzy_match.py).
+
+Der Blocking-Index darf kein Paar verlieren, das der Einzelvergleich
+(reconcile.compute_match_level, thefuzz token_set_ratio) als exact/
+fuzzy_high/fuzzy_low einstuft — geprueft gegen den Brute-Force-Vergleich
+ueber echte Namen mit zufaelligen Tippfehlern.
+"""
+
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+SCRIPTS = Path(__file__).parent.parent / "scripts"
+if str(SCRIPTS) not in sys.path:
+    sys.path.insert(0, str(SCRIPTS))
+
+import reconcile  # noqa: E402
+from _fuzzy_match import CandidateIndex, match_pairs  # noqa: E402
+
+NAMES = [
+    "Malaniuk, Ira", "Ira Malaniuk", "Wien", "Wiener Staatsoper", "Bayreuther Festspiele",
+    "Wagner, Richard", "Der Ring des Nibelungen", "Die Walküre", "Götterdämmerung",
+    "Salzburger Festspiele", "Karajan, Herbert von", "Lemberg", "Lviv", "Graz",
+    "Orfeo ed Euridice", "Gluck, Christoph Willibald", "Teatro alla Scala", "Mailand",
+    "Verdi, Giuseppe", "Aida", "Carmen", "München", "Bayerische Staatsoper",
+    "Das Rheingold", "Tristan und Isolde", "Le nozze di Figaro", "Zürich", "Ö1",
+]
+
+
+def _perturb(rng, text):
+    chars = list(text)
+    for _ in range(rng.randint(1, 3)):
+        i = rng.randrange(len(chars) + 1)
+        op = rng.random()
+        if op < 0.4 and chars:
+            chars.pop(min(i, len(chars) - 1))
+        elif op < 0.8:
+            chars.insert(i, rng.choice("abcdefghiklmnorstuvwzä "))
+        elif chars:
+            chars[min(i, len(chars) - 1)] = rng.choice("aeiou")
+    return "".join(chars)
+
+
+@pytest.fixture(scope="module")
+def labels():
+    rng = random.Random(7)
+    out = list(NAMES)
+    for name in NAMES:
+        out += [_perturb(rng, name) for _ in range(6)]
+    return out
+
+
+@pytest.mark.parametrize("min_confidence", [68, 80, 90])
+def test_index_matches_pairwise_classification(labels, min_confidence):
+    index = CandidateIndex(labels, min_confidence=min_confidence)
+    assert index.blocking
+    queries = NAMES + labels[::5]
+    for name, hits in zip(queries, index.match(queries)):
+        expected = {}
+        for i, label in enumerate(labels):
+            level, score = reconcile.compute_match_level(name, label, min_confidence)
+            if level:
+                expected[i] = (level, score)
+        assert {i: (level, score) for i, level, score in hits} == expected, name
+    # Blocking spart tatsaechlich Vergleiche
+    assert sum(len(index.block(q)) for q in queries) < len(queries) * len(labels) / 2
+
+
+def test_low_threshold_compares_everything(labels):
+    index = CandidateIndex(labels, min_confidence=50)
+    assert not index.blocking
+    assert len(index.block("Wien")) == len(labels)
+    with pytest.raises(ValueError):
+        CandidateIndex(labels).match(["Wien"], min_confidence=70)
+
+
+def test_match_order_and_limit():
+    index = CandidateIndex(["Wiener", "wien", "Wien (Stadt)", "Graz"])
+    hits = index.match(["Wien"], limit=2)[0]
+    # exakt zuerst, dann nach Score ("wien" ist Teilmenge von "wien stadt" -> 100)
+    assert hits == [(1, "exact", 100), (2, "fuzzy_high", 100)]
+    assert index.match(["Unbekannt"]) == [[]]
+
+
+def test_match_pairs_and_primed_scores():
+    pairs = [("Malaniuk, Ira", "Ira Malaniuk"), ("Wien", " wien "), ("Wien", "Graz")]
+    expected = [reconcile.compute_match_level(a, b) for a, b in pairs]
+    assert match_pairs(pairs) == expected
+    reconcile.prime_match_levels(pairs)
+    try:
+        assert [reconcile.compute_match_level(a, b) for a, b in pairs] == expected
+        assert ("Malaniuk, Ira", "Ira Malaniuk") in reconcile._pair_scores
+        assert ("Wien", " wien ") not in reconcile._pair_scores  # exakt, kein Score noetig
+    finally:
+        reconcile.clear_match_levels()
@@ -0,0 +1,117 @@
+"""Offline-Kandidatenindex (scripts/_candidate_index.py, build-candidate-index.py).
+
+Aus einem kleinen Dump im Wikidata-Format wird der JSONL-Auszug und der
+SQLite-Index gebaut; reconcile.py laeuft damit ohne Client. Das Blocking aus
+SQLite muss dieselben Treffer liefern wie der Index im Speicher.
+"""
+
+import gzip
+import json
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+SCRIPTS = Path(__file__).parent.parent / "scripts"
+if str(SCRIPTS) not in sys.path:
+    sys.path.insert(0, str(SCRIPTS))
+
+import reconcile  # noqa: E402
+from _candidate_index import OfflineIndex, iter_dump  # noqa: E402
+from _fuzzy_match import CandidateIndex  # noqa: E402
+from _helpers import load_script  # noqa: E402
+
+builder = load_script("build_candidate_index", "build-candidate-index.py")
+
+
+def _entity(qid, label, p31, aliases=(), p86=None, lang="de"):
+    def claim(value):
+        return {"mainsnak": {"snaktype": "value", "datavalue": {
+            "type": "wikibase-entityid", "value": {"entity-type": "item", "id": value}}}}
+    claims = {"P31": [claim(p31)]}
+    if p86:
+        claims["P86"] = [claim(p86)]
+    return {"id": qid, "type": "item",
+            "labels": {lang: {"language": lang, "value": label}},
+            "aliases": {lang: [{"language": lang, "value": a} for a in aliases]},
+            "descriptions": {}, "claims": claims}
+
+
+ENTITIES = [
+    _entity("Q94208", "Ira Malaniuk", "Q5", aliases=["Irene Malaniuk"]),
+    _entity("Q1741", "Wien", "Q515", aliases=["Vienna"]),
+    _entity("Q36036", "Lviv", "Q515", aliases=["Lemberg"], lang="en"),
+    _entity("Q154", "Der Ring des Nibelungen", "Q1344", p86="Q1511"),
+    _entity("Q3", "Wiener Staatsoper", "Q57660343"),
+    _entity("Q11", "Wien (Begriffsklärung)", "Q4167410"),   # falscher Typ
+    _entity("Q12", "Weber", "Q101352"),                     # Familienname
+]
+
+
+@pytest.fixture(scope="module")
+def index_path(tmp_path_factory):
+    tmp = tmp_path_factory.mktemp("candidates")
+    dump = tmp / "dump.json.gz"
+    with gzip.open(dump, "wt", encoding="utf-8") as f:
+        f.write("[\n" + ",\n".join(json.dumps(e) for e in ENTITIES) + "\n]\n")
+    path = tmp / "candidates.sqlite"
+    assert builder.main([str(dump), "--extract", str(tmp / "c.jsonl"),
+                         "--index", str(path)]) == 0
+    return path
+
+
+def test_extract_keeps_reconcile_types(index_path):
+    records = list(iter_dump(index_path.parent / "c.jsonl"))
+    assert [r["id"] for r in records] == ["Q94208", "Q1741", "Q36036", "Q154", "Q3"]
+    assert records[0]["aliases"] == ["Irene Malaniuk"]
+    assert records[3]["claims"] == {"P31": ["Q1344"], "P86": ["Q1511"]}
+    assert records[4]["kinds"] == ["org"]
+
+
+def test_lookup_search_and_claims(index_path):
+    index = OfflineIndex(index_path)
+    assert index.entity_count == 5 and len(index) == 8
+    assert index.lookup("lemberg") == ["Q36036"]
+    assert index.lookup("Unbekannt") == []
+
+    hits = index.search("Wien")
+    assert hits[0] == {"id": "Q1741", "label": "Wien", "description": "",
+                       "match": {"type": "label", "text": "Wien"}}
+    assert [h["id"] for h in index.search("Lemberg")] == ["Q36036"]
+    assert index.search("Lemberg")[0]["match"]["type"] == "alias"
+
+    claims = index.claims(["Q154", "Q999"])
+    assert set(claims) == {"Q154"}
+    assert reconcile.check_type("Q154", reconcile.Q_MUSICAL_WORK, claims["Q154"])
+    index.close()
+
+
+def test_sqlite_blocking_equals_memory(index_path):
+    index = OfflineIndex(index_path)
+    memory = CandidateIndex([t for _, t in index._query("SELECT id, text FROM name ORDER BY id")])
+    queries = ["Wien", "Malaniuk, Ira", "Irene Malaniuk", "Ring des Nibelungen", "Wiener Oper",
+               "Lemberg", "Lwiw", "xyz"]
+    for got, expected in zip(index.match(queries), memory.match(queries)):
+        assert got == [(i + 1, level, score) for i, level, score in expected]
+
+
+def test_reconcile_runs_on_index(index_path, tmp_path, monkeypatch, capsys):
+    index = pd.DataFrame({"id": [1, 2, 3], "name": ["Malaniuk, Ira", "Lemberg", "Unbekannt"]})
+    cfg = dict(reconcile.INDEX_CONFIG[0],
+               score_fn=lambda *a, **kw: reconcile.score_simple(
+                   *a, expected_types={"Q5", "Q515"}, **kw))
+    monkeypatch.setattr(reconcile, "INDEX_CONFIG", [cfg])
+    monkeypatch.setattr(reconcile, "load_index", lambda *a, **kw: index)
+    monkeypatch.setattr(reconcile, "OUTPUT_FILE", tmp_path / "recon.json")
+    # Kein Netz: ein Zugriff auf den Client waere ein Fehler
+    monkeypatch.setattr(reconcile, "get_client", lambda: pytest.fail("API benutzt"))
+
+    offline = OfflineIndex(index_path)
+    reconcile.run_reconciliation(["person"], index=offline)
+    result = json.loads((tmp_path / "recon.json").read_text(encoding="utf-8"))
+    # "Lemberg" findet Lviv ueber den Alias, bewertet wird wie online das Label
+    assert [m["qid"] for m in result["matched"]] == ["Q94208"]
+    assert [u["name"] for u in result["unmatched"]] == ["Lemberg", "Unbekannt"]
+    assert reconcile._index is None
+    assert "Offline-Index" in capsys.readouterr().out
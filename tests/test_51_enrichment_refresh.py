@@ -0,0 +1,152 @@
+"""Revisionsgesteuerter Enrichment-Refresh (enrich-wikidata.py --refresh).
+
+Gespeichert werden ``lastrevid``/``modified`` pro Entitaet; der Refresh
+prueft die Revisionen gebuendelt (props=info, am HTTP-Cache vorbei) und holt
+Claims und Labels nur fuer geaenderte Entitaeten neu.
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+SCRIPTS = Path(__file__).parent.parent / "scripts"
+if str(SCRIPTS) not in sys.path:
+    sys.path.insert(0, str(SCRIPTS))
+
+from _http_cache import ResponseCache  # noqa: E402
+from _wikidata_client import WikidataClient  # noqa: E402
+from _helpers import load_script  # noqa: E402
+
+enrich = load_script("enrich_wikidata", "enrich-wikidata.py")
+
+COORDS = {"mainsnak": {"snaktype": "value", "datavalue": {
+    "type": "globecoordinate", "value": {"latitude": 48.2, "longitude": 16.37}}},
+    "rank": "normal"}
+
+
+MATCHED = [
+    {"type": "person", "name": "Malaniuk, Ira", "qid": "Q94208", "match": "exact"},
+    {"type": "location", "name": "Wien", "qid": "Q1741", "match": "exact"},
+]
+
+
+@pytest.fixture
+def matched():
+    return list(MATCHED)
+
+
+@pytest.fixture
+def setup(wikidata_standin, matched, tmp_path, monkeypatch, capsys):
+    recon = {"matched": matched}
+    (tmp_path / "recon.json").write_text(json.dumps(recon), encoding="utf-8")
+    monkeypatch.setattr(enrich, "RECONCILIATION_FILE", tmp_path / "recon.json")
+    monkeypatch.setattr(enrich, "ENRICHMENT_FILE", tmp_path / "enrichment.json")
+
+    def run(**kw):
+        cache = ResponseCache(tmp_path / "http.sqlite")
+        client = WikidataClient(wikidata_standin.url, rate=1000, cache=cache)
+        enrich.set_client(client)
+        before = len(wikidata_standin.requests)
+        try:
+            with client:
+                enrich.run_enrichment(["person", "location"], **kw)
+        finally:
+            enrich.set_client(None)
+        data = json.loads((tmp_path / "enrichment.json").read_text(encoding="utf-8"))
+        return data["entities"], wikidata_standin.requests[before:]
+
+    return wikidata_standin, run
+
+
+def _claim_calls(requests):
+    return [r["ids"] for r in requests
+            if r["action"] == "wbgetentities" and "claims" in r.get("props", "")]
+
+
+def test_revisions_are_stored(setup):
+    _, run = setup
+    entities, _ = run()
+    assert entities["Q1741"]["lastrevid"] == 1
+    assert entities["Q94208"]["modified"]
+
+
+def test_refresh_refetches_only_changed(setup):
+    standin, run = setup
+    run()
+    standin.edit("Q1741", claims=dict(standin.entities["Q1741"]["claims"], P625=[COORDS]))
+
+    # Ohne --refresh bleibt der Cache massgeblich
+    entities, requests = run()
+    assert "coordinates" not in entities["Q1741"]["properties"]
+    assert _claim_calls(requests) == []
+
+    entities, requests = run(refresh=True)
+    assert entities["Q1741"]["properties"]["coordinates"] == {"lat": 48.2, "lon": 16.37}
+    assert entities["Q1741"]["lastrevid"] == 2
+    assert entities["Q94208"]["lastrevid"] == 1
+    info = [r for r in requests if r.get("props") == "info"]
+    assert len(info) == 1 and set(info[0]["ids"].split("|")) == {"Q94208", "Q1741"}
+    assert _claim_calls(requests) == ["Q1741"]
+
+    # Nichts geaendert: nur die Revisionsabfrage (trotz frischem HTTP-Cache)
+    _, requests = run(refresh=True)
+    assert [r.get("props") for r in requests] == ["info"]
+
+
+def test_entries_without_revision_are_refetched(setup, tmp_path):
+    _, run = setup
+    run()
+    path = tmp_path / "enrichment.json"
+    data = json.loads(path.read_text(encoding="utf-8"))
+    del data["entities"]["Q94208"]["lastrevid"]
+    path.write_text(json.dumps(data), encoding="utf-8")
+
+    entities, requests = run(refresh=True)
+    assert _claim_calls(requests) == ["Q94208"]
+    assert entities["Q94208"]["lastrevid"] == 1
+
+
+@pytest.mark.parametrize("matched", [MATCHED[1:]])
+def test_refresh_bypasses_cached_batch_of_same_ids(setup):
+    # Erstabruf und Refresh holen dieselbe Batch (nur Q1741): gleiche URL,
+    # der frische HTTP-Cache-Eintrag darf die neue Revision nicht verdecken
+    standin, run = setup
+    run()
+    standin.edit("Q1741", claims=dict(standin.entities["Q1741"]["claims"], P625=[COORDS]))
+
+    entities, requests = run(refresh=True)
+    assert _claim_calls(requests) == ["Q1741"]
+    assert entities["Q1741"]["lastrevid"] == 2
+    assert entities["Q1741"]["properties"]["coordinates"] == {"lat": 48.2, "lon": 16.37}
+
+    _, requests = run(refresh=True)
+    assert _claim_calls(requests) == []
+
+
+def test_failed_refetch_keeps_cached_entry(setup, monkeypatch):
+    # Die Claims-Batch des Refreshs scheitert mit einem API-Fehler: der
+    # gecachte Stand von Q1741 bleibt erhalten, kein leeres properties-Dict
+    standin, run = setup
+    before, _ = run()
+    standin.edit("Q1741", claims=dict(standin.entities["Q1741"]["claims"], P625=[COORDS]))
+
+    fetch = enrich.fetch_entities_batch
+
+    def failing(qids, revalidate=False):
+        standin.failures.append((200, {"error": {"code": "internal_api_error",
+                                                 "info": "boom"}}, ()))
+        return fetch(qids, revalidate=revalidate)
+
+    monkeypatch.setattr(enrich, "fetch_entities_batch", failing)
+    entities, requests = run(refresh=True)
+    assert _claim_calls(requests) == ["Q1741"]
+    assert entities["Q1741"] == before["Q1741"]
+    assert entities["Q1741"]["lastrevid"] == 1
+
+    # Der naechste Refresh erkennt die Aenderung weiterhin
+    monkeypatch.setattr(enrich, "fetch_entities_batch", fetch)
+    entities, _ = run(refresh=True)
+    assert entities["Q1741"]["lastrevid"] == 2
+    assert entities["Q1741"]["properties"]["coordinates"] == {"lat": 48.2, "lon": 16.37}
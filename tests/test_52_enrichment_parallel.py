@@ -0,0 +1,112 @@
+"""Paralleler Enrichment-Fetch mit Label-Warteschlange (enrich-wikidata.py).
+
+Entity-Batches laufen ueber den Pool des Clients; referenzierte QIDs gehen
+dedupliziert in die ``LabelQueue``, deren volle Batches schon starten,
+solange noch Entity-Batches offen sind. Die Ausgabe muss der sequentiellen
+entsprechen.
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+SCRIPTS = Path(__file__).parent.parent / "scripts"
+if str(SCRIPTS) not in sys.path:
+    sys.path.insert(0, str(SCRIPTS))
+
+from _wikidata_client import WikidataClient  # noqa: E402
+from _wikidata_standin import Corpus, StandIn, serve  # noqa: E402
+from _helpers import load_script  # noqa: E402
+
+enrich = load_script("enrich_wikidata", "enrich-wikidata.py")
+
+PERSONS = 300   # 6 Entity-Batches
+PLACES = 20     # gemeinsame Geburtsorte (Duplikate in der Warteschlange)
+
+
+def _ref(qid):
+    return [{"mainsnak": {"snaktype": "value", "datavalue": {
+        "type": "wikibase-entityid", "value": {"entity-type": "item", "id": qid}}},
+        "rank": "normal"}]
+
+
+def _entity(qid, label, claims=None):
+    return {"id": qid, "labels": {"de": {"language": "de", "value": label}},
+            "aliases": {}, "claims": claims or {}}
+
+
+def _corpus():
+    entities = {}
+    for i in range(PERSONS):
+        qid, job, place = f"Q{1000 + i}", f"Q{5000 + i}", f"Q{9000 + i % PLACES}"
+        entities[qid] = _entity(qid, f"Person {i}", {"P106": _ref(job), "P19": _ref(place)})
+        entities[job] = _entity(job, f"Beruf {i}")
+        entities[place] = _entity(place, f"Ort {i % PLACES}")
+    return Corpus(entities=entities)
+
+
+@pytest.fixture
+def setup(tmp_path, monkeypatch, capsys):
+    recon = {"matched": [{"type": "person", "name": f"Person {i}", "qid": f"Q{1000 + i}",
+                          "match": "exact"} for i in range(PERSONS)]}
+    (tmp_path / "recon.json").write_text(json.dumps(recon), encoding="utf-8")
+    monkeypatch.setattr(enrich, "RECONCILIATION_FILE", tmp_path / "recon.json")
+    monkeypatch.setattr(enrich, "ENRICHMENT_FILE", tmp_path / "enrichment.json")
+
+    with serve(StandIn(_corpus(), latency=0.02)) as standin:
+        def run(workers):
+            client = WikidataClient(standin.url, rate=1000, workers=workers)
+            enrich.set_client(client)
+            before = len(standin.requests)
+            try:
+                with client:
+                    enrich.run_enrichment(["person"], force=True)
+            finally:
+                enrich.set_client(None)
+            data = json.loads((tmp_path / "enrichment.json").read_text(encoding="utf-8"))
+            return data["entities"], standin.requests[before:]
+
+        yield run
+
+
+def _label_ids(requests):
+    return [q for r in requests if r.get("props") == "labels" for q in r["ids"].split("|")]
+
+
+def test_parallel_equals_sequential(setup):
+    sequential, _ = setup(1)
+    parallel, requests = setup(4)
+    assert list(parallel) == list(sequential)
+    assert parallel == sequential
+    assert parallel["Q1007"]["properties"]["occupation"] == [{"qid": "Q5007", "label": "Beruf 7"}]
+    assert parallel["Q1027"]["properties"]["birthPlace"] == {"qid": "Q9007", "label": "Ort 7"}
+
+    # Jede referenzierte QID genau einmal, in vollen Batches
+    labels = _label_ids(requests)
+    assert len(labels) == len(set(labels)) == PERSONS + PLACES
+    assert len([r for r in requests if r.get("props") == "labels"]) == 7
+
+
+def test_labels_stream_while_entities_in_flight(setup):
+    _, requests = setup(2)
+    kinds = [r.get("props") for r in requests]
+    assert kinds.count("info|claims|labels") == PERSONS // enrich.BATCH_SIZE
+    # Die erste Label-Batch startet vor der letzten Entity-Batch
+    assert kinds.index("labels") < len(kinds) - 1 - kinds[::-1].index("info|claims|labels")
+
+
+def test_label_queue_dedupes_and_flushes(monkeypatch):
+    batches = []
+    monkeypatch.setattr(enrich, "fetch_labels_batch",
+                        lambda qids: batches.append(list(qids)) or {q: q.lower() for q in qids})
+    monkeypatch.setattr(enrich, "BATCH_SIZE", 3)
+    client = WikidataClient("http://127.0.0.1:9/w/api.php", workers=1)
+    queue = enrich.LabelQueue(client)
+    for qid in ["Q1", "Q2", "Q1", "Q3", "Q4", "Q2"]:
+        queue.add(qid)
+    assert batches == [["Q1", "Q2", "Q3"]]          # volle Batch sofort
+    assert queue.result() == {"Q1": "q1", "Q2": "q2", "Q3": "q3", "Q4": "q4"}
+    assert batches == [["Q1", "Q2", "Q3"], ["Q4"]]  # Rest beim Einsammeln
+    assert len(queue) == 4
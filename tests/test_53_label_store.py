@@ -0,0 +1,162 @@
+"""Persistenter Label-Cache (scripts/_label_store.py).
+
+Labels werden pro QID mit Abrufzeit gespeichert; frische Eintraege ersparen
+enrich-wikidata.py beim naechsten Lauf die Label-Anfragen komplett,
+verify-manual-approvals.py traegt die Labels der geprueften Entitaeten ein.
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+SCRIPTS = Path(__file__).parent.parent / "scripts"
+if str(SCRIPTS) not in sys.path:
+    sys.path.insert(0, str(SCRIPTS))
+
+import _http_cache  # noqa: E402
+import _label_store  # noqa: E402
+from _http_cache import ResponseCache  # noqa: E402
+from _label_store import LABEL_TTL, LabelStore  # noqa: E402
+from _wikidata_client import WikidataClient  # noqa: E402
+from _wikidata_standin import Corpus, StandIn, serve  # noqa: E402
+from _helpers import load_script  # noqa: E402
+
+
+
+enrich = load_script("enrich_wikidata", "enrich-wikidata.py")
+verify = load_script("verify_manual_approvals", "verify-manual-approvals.py")
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_lookup_fresh_and_stale(tmp_path):
+    clock = Clock()
+    store = LabelStore(tmp_path / "labels.sqlite", clock=clock)
+    store.store_entities({
+        "Q40": {"id": "Q40", "labels": {"de": {"value": "Österreich"}, "en": {"value": "Austria"}}},
+        "Q2": {"id": "Q2", "labels": {"en": {"value": "Earth"}}},
+        "Q9": {"id": "Q9", "missing": ""},
+    })
+    assert store.lookup(["Q40", "Q1"]) == {"Q40": ("Österreich", "Austria")}
+    assert store.labels(["Q40", "Q2", "Q9"]) == {"Q40": "Österreich", "Q2": "Earth", "Q9": "Q9"}
+
+    clock.now += LABEL_TTL + 1
+    assert store.labels(["Q40"]) == {}
+    store.close()
+
+    # Offline gelten auch abgelaufene Eintraege
+    offline = LabelStore(tmp_path / "labels.sqlite", mode="offline", clock=clock)
+    assert offline.labels(["Q40"]) == {"Q40": "Österreich"}
+    offline.close()
+
+
+def test_refresh_mode_ignores_earlier_runs(tmp_path):
+    clock = Clock()
+    LabelStore(tmp_path / "l.sqlite", clock=clock).store({"Q1": ("Eins", None)})
+    clock.now += 10
+    store = LabelStore(tmp_path / "l.sqlite", mode="refresh", clock=clock)
+    assert store.lookup(["Q1"]) == {}
+    store.store({"Q1": ("Eins", None)})
+    assert store.lookup(["Q1"]) == {"Q1": ("Eins", None)}
+
+
+@pytest.mark.parametrize("env,offline,refresh,expected", [
+    ("on", False, False, "on"), ("off", False, False, None), ("off", True, False, "offline"),
+    ("on", False, True, "refresh"), ("offline", False, False, "offline"),
+])
+def test_modes_shared_with_http_cache(tmp_path, monkeypatch, env, offline, refresh, expected):
+    """Label- und HTTP-Cache loesen M3GIM_HTTP_CACHE identisch auf (SqliteCache)."""
+    monkeypatch.setenv("M3GIM_HTTP_CACHE", env)
+    monkeypatch.setattr(_label_store, "LABEL_PATH", tmp_path / "labels.sqlite")
+    monkeypatch.setattr(_http_cache, "CACHE_PATH", tmp_path / "http.sqlite")
+    for cls in (LabelStore, ResponseCache):
+        cache = cls.from_env(offline=offline, refresh=refresh)
+        assert (None if cache is None else cache.mode) == expected, cls.__name__
+        if cache is not None:
+            cache.close()
+    with pytest.raises(ValueError):
+        LabelStore(tmp_path / "x.sqlite", mode="off")
+
+
+def test_bulk_lookup_beyond_parameter_limit():
+    store = LabelStore(":memory:")
+    store.store({f"Q{i}": (f"L{i}", None) for i in range(1200)})
+    assert len(store.labels(f"Q{i}" for i in range(0, 2400, 2))) == 600
+    assert store.stats == {"hits": 600, "misses": 600, "stored": 1200}
+
+
+# -- Skripte -----------------------------------------------------------------
+
+def _ref(qid):
+    return [{"mainsnak": {"snaktype": "value", "datavalue": {
+        "type": "wikibase-entityid", "value": {"entity-type": "item", "id": qid}}},
+        "rank": "normal"}]
+
+
+def _entity(qid, label, claims=None):
+    return {"id": qid, "labels": {"de": {"language": "de", "value": label}},
+            "aliases": {}, "claims": claims or {}}
+
+
+@pytest.fixture
+def standin():
+    entities = {"Q2865819": _entity("Q2865819", "Opernsänger"),
+                "Q40": _entity("Q40", "Österreich"),
+                "Q1741": _entity("Q1741", "Wien", {"P17": _ref("Q40")})}
+    for i in range(3):
+        qid = f"Q{100 + i}"
+        entities[qid] = _entity(qid, f"Person {i}", {"P106": _ref("Q2865819"), "P19": _ref("Q1741")})
+    with serve(StandIn(Corpus(entities=entities))) as state:
+        yield state
+
+
+def test_enrich_rerun_costs_no_label_requests(standin, tmp_path, monkeypatch, capsys):
+    matched = [{"type": "person", "name": f"Person {i}", "qid": f"Q{100 + i}", "match": "exact"}
+               for i in range(3)] + [{"type": "location", "name": "Wien", "qid": "Q1741",
+                                      "match": "exact"}]
+    (tmp_path / "recon.json").write_text(json.dumps({"matched": matched}), encoding="utf-8")
+    monkeypatch.setattr(enrich, "RECONCILIATION_FILE", tmp_path / "recon.json")
+    monkeypatch.setattr(enrich, "ENRICHMENT_FILE", tmp_path / "enrichment.json")
+
+    def run():
+        store = LabelStore(tmp_path / "labels.sqlite")
+        client = WikidataClient(standin.url, rate=1000)
+        enrich.set_client(client)
+        enrich.set_label_store(store)
+        before = len(standin.requests)
+        try:
+            with client:
+                enrich.run_enrichment(["person", "location"], force=True)
+        finally:
+            enrich.set_client(None)
+            enrich.set_label_store(None)
+            store.close()
+        data = json.loads((tmp_path / "enrichment.json").read_text(encoding="utf-8"))
+        return data["entities"], [r.get("props") for r in standin.requests[before:]]
+
+    first, props = run()
+    assert props.count("labels") == 1
+    assert first["Q100"]["properties"]["occupation"] == [{"qid": "Q2865819", "label": "Opernsänger"}]
+    assert first["Q1741"]["properties"]["country"] == {"qid": "Q40", "label": "Österreich"}
+
+    second, props = run()
+    assert props == ["info|claims|labels"]
+    assert second == first
+    assert "3 aus dem Label-Cache" in capsys.readouterr().out
+
+
+def test_verify_fills_label_store(standin, monkeypatch):
+    store = LabelStore(":memory:")
+    monkeypatch.setattr(verify, "_label_store", store)
+    with WikidataClient(standin.url, rate=1000) as client:
+        monkeypatch.setattr(verify, "_client", client)
+        assert set(verify.fetch_entities(["Q1741", "Q40"])) == {"Q1741", "Q40"}
+    assert store.labels(["Q1741", "Q40"]) == {"Q1741": "Wien", "Q40": "Österreich"}
@@ -0,0 +1,125 @@
+"""Absturzsicheres Journal fuer reconcile.py (scripts/_journal.py).
+
+Ein Lauf, der mitten im Index abbricht, hinterlaesst ein JSONL-Journal mit
+allen fertigen Gruppen und einen atomar geschriebenen Zwischenstand; der
+naechste Lauf fragt nur die restlichen Namen ab. Geprueft wird mit --force,
+damit nicht der Reconciliation-Cache, sondern das Journal die Arbeit spart.
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+SCRIPTS = Path(__file__).parent.parent / "scripts"
+if str(SCRIPTS) not in sys.path:
+    sys.path.insert(0, str(SCRIPTS))
+
+import reconcile  # noqa: E402
+from _journal import Journal  # noqa: E402
+from _wikidata_client import WikidataClient  # noqa: E402
+
+NAMES = [f"Person {i:03d}" for i in range(120)]   # 3 Gruppen a CHUNK_ROWS
+
+
+class Interrupted(Exception):
+    pass
+
+
+@pytest.fixture
+def run(tmp_path, monkeypatch, capsys):
+    searched = []
+    state = {"fail_at": None}
+
+    def search(name, **_):
+        if name == state["fail_at"]:
+            raise Interrupted(name)
+        searched.append(name)
+        return [[{"id": f"Q{name[-3:]}", "label": name}]] if int(name[-3:]) % 2 else []
+
+    def score(name, result_lists, claims, **_):
+        if not result_lists:
+            return None
+        return {"qid": result_lists[0][0]["id"], "label": name, "match": "exact", "score": 100}
+
+    cfg = dict(reconcile.INDEX_CONFIG[0], search_fn=search, score_fn=score)
+    monkeypatch.setattr(reconcile, "INDEX_CONFIG", [cfg])
+    monkeypatch.setattr(reconcile, "load_index",
+                        lambda *a, **kw: pd.DataFrame({"id": range(len(NAMES)), "name": NAMES}))
+    monkeypatch.setattr(reconcile, "fetch_claims", lambda qids: {})
+    monkeypatch.setattr(reconcile, "OUTPUT_FILE", tmp_path / "recon.json")
+    monkeypatch.setattr(reconcile, "JOURNAL_COMPACT_EVERY", 1)
+
+    def go(fail_at=None, **kw):
+        state["fail_at"] = fail_at
+        searched.clear()
+        client = WikidataClient("http://127.0.0.1:9/w/api.php", workers=1)
+        try:
+            reconcile.run_reconciliation(["person"], force=True, client=client, **kw)
+        finally:
+            reconcile.set_client(None)
+        return list(searched)
+
+    return go
+
+
+def _output(tmp_path):
+    return json.loads((tmp_path / "recon.json").read_text(encoding="utf-8"))
+
+
+def test_interrupted_run_resumes_from_journal(run, tmp_path):
+    with pytest.raises(Interrupted):
+        run(fail_at="Person 075")
+    journal = tmp_path / "recon.journal.jsonl"
+    assert len(journal.read_text(encoding="utf-8").splitlines()) == 1 + 50
+
+    partial = _output(tmp_path)
+    assert partial["meta"]["partial"] is True
+    assert len(partial["matched"]) + len(partial["unmatched"]) == 50
+
+    # Zweiter Lauf: nur die zweite und dritte Gruppe werden abgefragt
+    assert run() == NAMES[50:]
+    result = _output(tmp_path)
+    assert "partial" not in result["meta"]
+    assert [m["name"] for m in result["matched"]] == NAMES[1::2]
+    assert [u["name"] for u in result["unmatched"]] == NAMES[0::2]
+    assert not journal.exists()
+
+
+def test_torn_last_line_is_dropped(run, tmp_path):
+    with pytest.raises(Interrupted):
+        run(fail_at="Person 075")
+    journal = tmp_path / "recon.journal.jsonl"
+    with open(journal, "a", encoding="utf-8") as f:
+        f.write('{"category": "matched", "entry": {"type": "per')
+    assert run() == NAMES[50:]
+    assert len(_output(tmp_path)["matched"]) == 60
+
+
+def test_journal_with_other_parameters_is_discarded(run, tmp_path, capsys):
+    with pytest.raises(Interrupted):
+        run(fail_at="Person 075")
+    assert run(min_confidence=85) == NAMES
+    assert "andere Parameter, verworfen" in capsys.readouterr().out
+
+
+def test_dry_run_leaves_journal_alone(run, tmp_path):
+    with pytest.raises(Interrupted):
+        run(fail_at="Person 075")
+    journal = tmp_path / "recon.journal.jsonl"
+    before = journal.read_text(encoding="utf-8")
+    run(dry_run=True)
+    assert journal.read_text(encoding="utf-8") == before
+
+
+def test_journal_reopen_keeps_records(tmp_path):
+    path = tmp_path / "j.jsonl"
+    journal = Journal(path, {"v": 1})
+    journal.append([{"a": 1}, {"a": 2}])
+    journal.close()
+    again = Journal(path, {"v": 1})
+    assert again.records == [{"a": 1}, {"a": 2}] and not again.discarded
+    again.discard()
+    assert not path.exists()
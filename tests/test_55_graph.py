@@ -0,0 +1,152 @@
+"""Indiziertes Graph-Modell (scripts/_graph.py).
+
+Die Indizes muessen dasselbe liefern wie die Scans ueber ``@graph``, die
+audit, report, scout und die Fixtures vorher selbst gemacht haben; ein
+Graph aus dem mmap-Schnappschuss (``m3gim.graph.bin``) dasselbe wie ein
+frisch geparster.
+"""
+
+import json
+import os
+import sys
+from pathlib import Path
+
+SCRIPTS = Path(__file__).parent.parent / "scripts"
+if str(SCRIPTS) not in sys.path:
+    sys.path.insert(0, str(SCRIPTS))
+
+from _graph import (  # noqa: E402
+    PERFORMANCE, RECORD, STE, Graph, ensure_list, load_graph, snapshot_is_current,
+    snapshot_path, write_snapshot,
+)
+
+
+def _doc():
+    return {"@graph": [
+        {"@id": "fonds", "@type": "rico:RecordSet",
+         "rico:hasRecordSetType": {"@id": "ric-rst:Fonds"}},
+        {"@id": "k1", "@type": "rico:RecordSet", "rico:identifier": "NIM_001",
+         "rico:isOrWasIncludedIn": {"@id": "fonds"}},
+        {"@id": "r1", "@type": RECORD, "rico:identifier": "NIM_001_01",
+         "rico:isOrWasIncludedIn": {"@id": "k1"},
+         "m3gim:hasPerformance": [{"@id": "p1"}, {"@id": "p2"}],
+         "rico:hasOrHadSubject": [{"@type": "m3gim:Mention", "rico:hasOrHadAgent": {"@id": "a1"}}],
+         "rico:title": ""},
+        {"@id": "p1", "@type": PERFORMANCE, "m3gim:performedBy": {"@id": "a1"}},
+        {"@id": "p2", "@type": [PERFORMANCE, "schema:Event"]},
+        {"@id": "ste1", "@type": STE, "agrelon:metadataProvenance": {"@id": "r1"},
+         "m3gim:concernsRecord": {"@id": "r1"}},
+    ]}
+
+
+def test_lookups():
+    g = Graph(_doc())
+    assert len(g) == 6
+    assert [n["@id"] for n in g.of_type(PERFORMANCE)] == ["p1", "p2"]
+    assert [n["@id"] for n in g.of_type("schema:Event")] == ["p2"]
+    assert g.of_type("rico:Agent") == []
+    assert g.get("r1") is g.records[0] and "r1" in g and "a1" not in g
+    assert g.by_identifier("NIM_001_01")["@id"] == "r1"
+    assert set(g.identifiers) == {"NIM_001", "NIM_001_01"}
+    # Leere Werte zaehlen nicht als "traegt das Praedikat"
+    assert g.with_predicate("rico:title") == []
+    assert [n["@id"] for n in g.with_predicate("rico:isOrWasIncludedIn")] == ["k1", "r1"]
+
+
+def test_referrers_and_targets():
+    g = Graph(_doc())
+    assert [n["@id"] for n in g.referrers("p1", "m3gim:hasPerformance")] == ["r1"]
+    # verschachtelte Referenz (Mention -> Agent) und Performance -> Agent
+    assert [n["@id"] for n in g.referrers("a1")] == ["r1", "p1"]
+    # ste1 referenziert r1 ueber zwei Praedikate, erscheint aber nur einmal
+    assert [n["@id"] for n in g.referrers("r1")] == ["ste1"]
+    assert [n["@id"] for n in g.referrers("r1", "agrelon:metadataProvenance")] == ["ste1"]
+    assert g.targets("r1", "m3gim:hasPerformance") == ["p1", "p2"]
+    assert g.targets("p2") == []
+
+
+def test_lookups_return_lists_callers_may_change():
+    g = Graph({"@graph": [{"@id": "r1", "@type": RECORD}]})
+    # Records ohne RecordSets: Verkettung wie in audit-data.py
+    assert [n["@id"] for n in g.of_type(RECORD) + g.of_type("rico:RecordSet")] == ["r1"]
+    g.of_type(RECORD).clear()
+    g.records.append({"@id": "x"})
+    assert [n["@id"] for n in g.of_type(RECORD)] == ["r1"]
+    assert g.with_predicate("rico:title") + [1] == [1]
+
+
+def test_konvolute_and_fonds():
+    g = Graph(_doc())
+    assert g.fonds["@id"] == "fonds"
+    assert [n["@id"] for n in g.konvolute] == ["k1"]
+    assert Graph({"@graph": []}).fonds is None
+
+
+def _bump_mtime(path):
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+
+def test_load_graph_is_memoized(tmp_path):
+    path = tmp_path / "m.jsonld"
+    path.write_text(json.dumps(_doc()), encoding="utf-8")
+    first = load_graph(path)
+    assert load_graph(str(path)) is first
+    path.write_text(json.dumps({"@graph": _doc()["@graph"][:2]}), encoding="utf-8")
+    _bump_mtime(path)
+    assert len(load_graph(path)) == 2
+
+
+def test_indexes_match_scans(jsonld_graph, graph):
+    records = [n for n in graph if n.get("@type") == RECORD]
+    assert jsonld_graph.records == records
+    by_id = {n["@id"]: n for n in graph if "@id" in n}
+    assert all(jsonld_graph.get(k) is v for k, v in by_id.items())
+    for ste in jsonld_graph.of_type(STE):
+        for ref in ensure_list(ste.get("agrelon:metadataProvenance")):
+            assert ste in jsonld_graph.referrers(ref["@id"], "agrelon:metadataProvenance")
+
+
+def test_snapshot_matches_parsed_graph(tmp_path):
+    path = tmp_path / "m3gim.jsonld"
+    doc = dict(_doc(), **{"m3gim:recordCount": 1})
+    path.write_text(json.dumps(doc, indent=2), encoding="utf-8")
+    assert write_snapshot(path) == tmp_path / "m3gim.graph.bin"
+
+    g = load_graph(path)
+    assert type(g.nodes).__name__ == "_LazyNodes"
+    assert g.get("p2")["@type"] == [PERFORMANCE, "schema:Event"]
+    assert g.nodes._decoded.count(None) == 5          # nur p2 dekodiert
+    assert g.get("p2") is g.of_type("schema:Event")[0]
+
+    parsed = Graph(doc)
+    assert g.data == doc and list(g.data) == list(doc)
+    assert [n["@id"] for n in g.referrers("a1")] == ["r1", "p1"]
+    assert g.targets("r1", "m3gim:hasPerformance") == parsed.targets("r1", "m3gim:hasPerformance")
+    assert g.fonds["@id"] == "fonds" and g.by_identifier("NIM_001")["@id"] == "k1"
+    assert g.nodes[-1] is g.get("ste1") and g.nodes[1:3] == parsed.nodes[1:3]
+
+
+def test_stale_snapshot_is_ignored(tmp_path):
+    path = tmp_path / "m3gim.jsonld"
+    path.write_text(json.dumps(_doc()), encoding="utf-8")
+    write_snapshot(path)
+    path.write_text(json.dumps({"@graph": _doc()["@graph"][:3]}), encoding="utf-8")
+    _bump_mtime(path)
+    g = load_graph(path)
+    assert isinstance(g.nodes, list) and len(g) == 3
+
+    snapshot_path(path).write_bytes(b"kaputt")
+    _bump_mtime(path)
+    assert len(load_graph(path)) == 3
+
+
+def test_snapshot_is_current(tmp_path):
+    path = tmp_path / "m3gim.jsonld"
+    path.write_text(json.dumps(_doc()), encoding="utf-8")
+    assert not snapshot_is_current(path)
+    snap = write_snapshot(path)
+    assert snapshot_is_current(path)
+    # Formatwechsel (SNAPSHOT_MAGIC) macht einen sonst passenden Schnappschuss ungueltig
+    snap.write_bytes(b"M3GIMGS\x01" + snap.read_bytes()[8:])
+    assert not snapshot_is_current(path)
@@ -0,0 +1,113 @@
+"""@id-basierter Diff mit Merkle-Baum (scripts/_graph_diff.py, tests/tools/snapshot_diff.py).
+
+Der Diff meldet exakt hinzugekommene, entfernte und geaenderte Knoten mit
+Property-Pfaden; unveraenderte Typen und Buckets werden ueber ihre Wurzel
+uebersprungen, aus Schnappschuessen wird nur Geaendertes dekodiert.
+"""
+
+import copy
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+SCRIPTS = Path(__file__).parent.parent / "scripts"
+if str(SCRIPTS) not in sys.path:
+    sys.path.insert(0, str(SCRIPTS))
+
+from _graph import Graph, load_graph, merkle_tree, node_hash, tree_root, write_snapshot  # noqa: E402
+from _graph_diff import diff_graphs, is_empty, property_changes  # noqa: E402
+
+TOOL = Path(__file__).parent / "tools" / "snapshot_diff.py"
+
+
+def _doc():
+    nodes = [{"@id": "fonds", "@type": "rico:RecordSet",
+              "rico:hasRecordSetType": {"@id": "ric-rst:Fonds"}}]
+    for i in range(40):
+        nodes.append({"@id": f"r{i}", "@type": "rico:Record", "rico:title": f"Titel {i}",
+                      "rico:hasOrHadSubject": [{"@type": "rico:Person", "name": f"P{i}"}]})
+    for i in range(20):
+        nodes.append({"@id": f"p{i}", "@type": "m3gim:Performance", "m3gim:date": "1950"})
+    return {"@context": {}, "@graph": nodes}
+
+
+def _edited():
+    doc = copy.deepcopy(_doc())
+    graph = doc["@graph"]
+    graph[3]["rico:title"] = "Neu"                          # r2
+    graph[4]["rico:hasOrHadSubject"][0]["name"] = "Q"       # r3
+    del graph[5]["rico:title"]                              # r4
+    graph[6]["rico:date"] = "1951"                          # r5
+    graph.remove(graph[10])                                 # r9
+    graph.append({"@id": "r99", "@type": "rico:Record"})
+    return doc
+
+
+def test_node_hash_ignores_key_order():
+    assert node_hash({"a": 1, "b": [1, 2]}) == node_hash({"b": [1, 2], "a": 1})
+    assert node_hash({"a": [1, 2]}) != node_hash({"a": [2, 1]})
+
+
+def test_exact_changes_and_paths():
+    cs = diff_graphs(Graph(_doc()), Graph(_edited()))
+    assert [n["@id"] for n in cs["added"]] == ["r99"]
+    assert [n["@id"] for n in cs["removed"]] == ["r9"]
+    paths = {m["@id"]: m["paths"] for m in cs["modified"]}
+    assert paths == {
+        "r2": [{"path": "/rico:title", "old": "Titel 2", "new": "Neu"}],
+        "r3": [{"path": "/rico:hasOrHadSubject/0/name", "old": "P3", "new": "Q"}],
+        "r4": [{"path": "/rico:title", "old": "Titel 4"}],
+        "r5": [{"path": "/rico:date", "new": "1951"}],
+    }
+    assert cs["types"] == {"rico:Record": {"added": 1, "removed": 1, "modified": 4}}
+    # Performances und RecordSets: Wurzel gleich, nicht betreten
+    assert cs["stats"]["types_skipped"] == 2
+    assert cs["stats"]["buckets_skipped"] > 0
+    assert cs["old_root"] != cs["new_root"]
+
+
+def test_identical_graphs_and_type_change():
+    same = diff_graphs(Graph(_doc()), Graph(_doc()))
+    assert is_empty(same) and same["stats"]["types_skipped"] == same["stats"]["types"]
+    assert same["old_root"] == same["new_root"] == tree_root(merkle_tree(_doc()["@graph"]))
+
+    doc = _doc()
+    doc["@graph"][45]["@type"] = "schema:Event"
+    cs = diff_graphs(Graph(_doc()), Graph(doc), paths=False)
+    assert not cs["added"] and not cs["removed"]
+    assert cs["modified"] == [{"@id": doc["@graph"][45]["@id"], "@type": "schema:Event",
+                               "old_hash": node_hash(_doc()["@graph"][45]),
+                               "hash": node_hash(doc["@graph"][45]),
+                               "old_type": "m3gim:Performance"}]
+
+
+def test_list_length_change_reported_whole():
+    assert property_changes({"l": [1]}, {"l": [1, 2]}) == [{"path": "/l", "old": [1], "new": [1, 2]}]
+    assert property_changes({"a/b": 1}, {"a/b": 2}) == [{"path": "/a~1b", "old": 1, "new": 2}]
+
+
+def test_snapshot_diff_decodes_only_changes(tmp_path):
+    old, new = tmp_path / "old" / "m3gim.jsonld", tmp_path / "new" / "m3gim.jsonld"
+    for path, doc in ((old, _doc()), (new, _edited())):
+        path.parent.mkdir()
+        path.write_text(json.dumps(doc), encoding="utf-8")
+        write_snapshot(path)
+    a, b = load_graph(old), load_graph(new)
+    cs = diff_graphs(a, b)
+    assert cs == diff_graphs(Graph(_doc()), Graph(_edited()))
+    decoded = sum(n is not None for n in b.nodes._decoded)
+    assert decoded == 4                 # nur r2..r5
+
+
+def test_cli_writes_changeset(tmp_path):
+    old, new = tmp_path / "old.jsonld", tmp_path / "new.jsonld"
+    old.write_text(json.dumps(_doc()), encoding="utf-8")
+    new.write_text(json.dumps(_edited()), encoding="utf-8")
+    out = subprocess.run([sys.executable, str(TOOL), str(old), str(new),
+                          "--changeset", str(tmp_path / "cs.json")],
+                         check=True, capture_output=True, text=True, encoding="utf-8").stdout
+    assert "=== Geänderte Knoten: 4 ===" in out
+    assert "/rico:title: Titel 2 → Neu" in out
+    cs = json.loads((tmp_path / "cs.json").read_text(encoding="utf-8"))
+    assert cs["format"] == "m3gim-changeset/1" and len(cs["modified"]) == 4
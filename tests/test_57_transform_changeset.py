@@ -0,0 +1,108 @@
+"""Changeset-Ausgabe von transform.py (``--changeset``) und inhaltsbasierte
+Performance-@ids (``_perf_id``).
+
+Eine eingefuegte Performance darf keine anderen @ids verschieben, sonst
+meldet das Changeset Scheinaenderungen an allen nachfolgenden Records.
+
+Marker: slow (nur der Pipeline-Test) — fuehrt transform.py in temporaeren
+Output-Dirs aus.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+SCRIPTS = Path(__file__).parent.parent / "scripts"
+if str(SCRIPTS) not in sys.path:
+    sys.path.insert(0, str(SCRIPTS))
+
+from _helpers import ensure_list  # noqa: E402
+from transform import add_relations_to_records  # noqa: E402
+
+REPO_ROOT = Path(__file__).parent.parent
+OUTPUT = REPO_ROOT / "data" / "output"
+
+
+def _expected_base(perf: dict, record_id: str) -> str:
+    """Spiegelt transform._perf_id aus dem Inhalt des Performance-Knotens."""
+    role = (perf.get("m3gim:hasStageRole") or {}).get("@id", "")
+    performer = (perf.get("m3gim:hasPerformer") or {}).get("name", "")
+    work = (perf.get("m3gim:performanceOf") or {}).get("name", "")
+    raw = "\x1f".join((role, performer, work, perf.get("m3gim:auffuehrungsdatum", "")))
+    h = hashlib.sha1(raw.encode("utf-8")).hexdigest()[:8]
+    return f"m3gim:perf_{record_id.split(':', 1)[-1]}_{h}"
+
+
+def test_perf_ids_are_content_derived(jsonld_graph):
+    bad = []
+    for perf in jsonld_graph.of_type("m3gim:Performance"):
+        for record in jsonld_graph.referrers(perf["@id"], "m3gim:hasPerformance"):
+            base = _expected_base(perf, record["@id"])
+            if not (perf["@id"] == base or perf["@id"].startswith(base + "-")):
+                bad.append((perf["@id"], base))
+    assert not bad, f"Performance-@id nicht inhaltsabgeleitet: {bad[:5]}"
+
+
+def _perf_ids(relations: dict) -> dict:
+    records = [{"@id": f"m3gim:{sig}", "rico:identifier": sig} for sig in relations]
+    add_relations_to_records(records, relations, {}, {})
+    return {r["@id"]: [p["@id"] for p in ensure_list(r.get("m3gim:hasPerformance"))]
+            for r in records}
+
+
+def test_inserted_performance_moves_no_other_id():
+    relations = {
+        "A": [{"typ": "performance", "name": "x", "stageRole": "Carmen", "performer": "P"}],
+        "B": [{"typ": "rolle", "name": "Amneris"}, {"typ": "rolle", "name": "Amneris"}],
+    }
+    before = _perf_ids(relations)
+    assert before["m3gim:B"][1] == before["m3gim:B"][0] + "-2"     # Inhaltsdublette
+
+    relations["A"].insert(0, {"typ": "rolle", "name": "Eboli"})
+    after = _perf_ids(relations)
+    assert after["m3gim:B"] == before["m3gim:B"]
+    assert after["m3gim:A"][1:] == before["m3gim:A"]
+
+
+def _run(out_dir: Path) -> dict:
+    env = dict(os.environ, M3GIM_OUTPUT_DIR=str(out_dir))
+    subprocess.run([sys.executable, "scripts/transform.py", "--changeset"],
+                   cwd=REPO_ROOT, env=env, check=True, capture_output=True)
+    return json.loads((out_dir / "m3gim.changeset.json").read_text(encoding="utf-8"))
+
+
+@pytest.mark.slow
+def test_changeset_against_previous_output(tmp_path):
+    if not (OUTPUT / "m3gim.jsonld").exists():
+        pytest.skip("m3gim.jsonld nicht vorhanden — Pipeline nicht gelaufen")
+    for name in ("wikidata-reconciliation.json", "wikidata-enrichment.json"):
+        if (OUTPUT / name).exists():
+            shutil.copy2(OUTPUT / name, tmp_path / name)
+
+    first = _run(tmp_path)
+    assert not first["removed"] and not first["modified"]
+    assert len(first["added"]) > 100
+
+    assert not any(_run(tmp_path)[k] for k in ("added", "removed", "modified"))
+
+    # Vorigen Stand manipulieren: ein Record fehlt, eine Performance weicht ab
+    path = tmp_path / "m3gim.jsonld"
+    doc = json.loads(path.read_text(encoding="utf-8"))
+    graph = doc["@graph"]
+    record = next(n for n in graph if n.get("@type") == "rico:Record")
+    perf = next(n for n in graph if n.get("@type") == "m3gim:Performance")
+    graph.remove(record)
+    perf["rico:generalDescription"] = "alt"
+    path.write_text(json.dumps(doc, ensure_ascii=False), encoding="utf-8")
+
+    changeset = _run(tmp_path)
+    assert [n["@id"] for n in changeset["added"]] == [record["@id"]]
+    assert [n["@id"] for n in changeset["modified"]] == [perf["@id"]]
+    assert not changeset["removed"]
+    assert changeset["types"]["rico:Record"] == {"added": 1, "removed": 0, "modified": 0}
@@ -0,0 +1,131 @@
+"""build-views.py --incremental: Views aus Graph-Deltas (build_views_incremental).
+
+Nach Aenderung, Entfernen oder Hinzufuegen einzelner Knoten muss der
+inkrementelle Lauf dieselben Dokumente liefern wie ein Vollbau; eine
+NodeContext bekommen nur die geaenderten Knoten und die, die auf sie
+verweisen (Record -> STE). Unveraenderte Views werden nicht neu geschrieben.
+"""
+
+import copy
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+SCRIPTS = Path(__file__).parent.parent / "scripts"
+if str(SCRIPTS) not in sys.path:
+    sys.path.insert(0, str(SCRIPTS))
+
+from _graph import Graph, ensure_list  # noqa: E402
+from _helpers import load_script  # noqa: E402
+
+bv = load_script("build_views", "build-views.py")
+
+JSONLD = Path(__file__).parent.parent / "data" / "output" / "m3gim.jsonld"
+
+
+@pytest.fixture(scope="module")
+def doc():
+    with open(JSONLD, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _strip(views):
+    return {name: bv._without_timestamp(view) for name, view in views.items()}
+
+
+def _full(doc):
+    return _strip(bv.build_views(copy.deepcopy(doc["@graph"])))
+
+
+def _edited(doc):
+    """Record-Titel geaendert, ein Record entfernt, STE-Datum verschoben."""
+    doc = copy.deepcopy(doc)
+    graph = doc["@graph"]
+    records = [n for n in graph if n.get("@type") == "rico:Record"]
+    records[10]["rico:title"] = "Programmheft Carmen Salzburg Wagner"
+    graph.remove(records[20])
+    ste = next(n for n in graph
+               if n.get("@type") == bv.STE_TYPE and "m3gim:atDate" in n)
+    ste["m3gim:atDate"] = "1962-07-01"
+    graph.append({"@id": "m3gim:NIM_999", "@type": "rico:Record",
+                  "rico:identifier": "NIM_999", "rico:title": "Brief Tristan",
+                  "rico:date": "1958"})
+    return doc, {records[10]["@id"], ste["@id"], "m3gim:NIM_999"}
+
+
+def test_incremental_equals_full_build(doc, tmp_path, capsys):
+    state = bv.ViewState(tmp_path / "state.pickle", "code")
+    views, stats = bv.build_views_incremental(Graph(doc), state)
+    assert stats["full"] and _strip(views) == _full(doc)
+
+    edited, touched = _edited(doc)
+    views, stats = bv.build_views_incremental(Graph(edited), state)
+    assert not stats["full"]
+    assert _strip(views) == _full(edited)
+    assert json.dumps(_strip(views)) == json.dumps(_full(edited))   # auch Reihenfolge
+
+
+def test_only_changed_nodes_get_a_context(doc, tmp_path, monkeypatch, capsys):
+    state = bv.ViewState(tmp_path / "state.pickle", "code")
+    bv.build_views_incremental(Graph(doc), state)
+
+    seen = []
+    original = bv.NodeContext
+
+    def counted(node, stes=None):
+        seen.append(node.get("@id"))
+        return original(node, stes)
+
+    monkeypatch.setattr(bv, "NodeContext", counted)
+    edited, touched = _edited(doc)
+    graph = Graph(edited)
+    removed = set(Graph(doc).node_ids()) - set(graph.node_ids())
+    bv.build_views_incremental(graph, state)
+    # Records mit Verweis auf die geaenderte STE werden neu ausgewertet
+    ste_id = next(k for k in touched if "ste_" in k)
+    assert any(ste_id in {r.get("@id") for r in ensure_list(n.get("m3gim:hasSpatiotemporalEvent"))}
+               for n in graph.referrers(ste_id))
+    referrers = {n["@id"] for k in touched | removed for n in graph.referrers(k)}
+    assert set(seen) == touched | referrers
+    assert len(seen) < 10
+
+    seen.clear()
+    bv.build_views_incremental(graph, state)
+    assert seen == []
+
+
+def test_state_invalidated_by_code_change(tmp_path, capsys):
+    state = bv.ViewState(tmp_path / "state.pickle", "code")
+    state.tree = {"x": 1}
+    state.save()
+    assert bv.ViewState.load(tmp_path / "state.pickle", "code").tree == {"x": 1}
+    assert bv.ViewState.load(tmp_path / "state.pickle", "anders").tree is None
+
+
+def test_cli_skips_unchanged_views(doc, tmp_path, monkeypatch, capsys):
+    source = tmp_path / "m3gim.jsonld"
+    source.write_text(json.dumps(doc, ensure_ascii=False), encoding="utf-8")
+    monkeypatch.setattr(bv, "_OUTPUT_BASE", tmp_path)
+    monkeypatch.setattr(bv, "INPUT_FILE", source)
+    monkeypatch.setattr(bv, "OUTPUT_DIR", tmp_path / "views")
+    monkeypatch.setattr(bv, "STATE_PATH", tmp_path / ".cache" / "views-state.pickle")
+
+    bv.main(["--incremental"])
+    written = {p.name: p.stat().st_mtime_ns for p in (tmp_path / "views").iterdir()}
+    assert sorted(written) == ["kosmos.json", "matrix.json", "partitur.json", "sankey.json"]
+
+    capsys.readouterr()
+    bv.main(["--incremental"])
+    assert "(0 of " in capsys.readouterr().out
+    assert {p.name: p.stat().st_mtime_ns for p in (tmp_path / "views").iterdir()} == written
+
+    edited = copy.deepcopy(doc)
+    record = next(n for n in edited["@graph"]
+                  if n.get("@type") == "rico:Record" and n.get("rico:date"))
+    record["rico:title"] = record.get("rico:title", "") + " Carmen"
+    source.write_text(json.dumps(edited, ensure_ascii=False), encoding="utf-8")
+    bv.main(["--incremental"])
+    out = json.loads((tmp_path / "views" / "kosmos.json").read_text(encoding="utf-8"))
+    assert bv._without_timestamp(out) == _full(edited)["kosmos"]
@@ -4,16 +4,26 @@
 Druckt strukturierten Report zwischen zwei m3gim.jsonld-Versionen.
 Failed nie — reines Review-Werkzeug für Datenupdates.
 
+Die Änderungen kommen aus dem @id-basierten Diff (scripts/_graph_diff.py):
+exakt hinzugekommene, entfernte und geänderte Knoten aller Typen mit den
+geänderten Property-Pfaden. Unveränderte Typen werden über ihre Merkle-
+Wurzel übersprungen; die Aggregat-Zähler (Personen, Orte, ...) werden nur
+neu gerechnet, wenn sich Records oder Konvolute überhaupt geändert haben.
+
 Verwendung:
     python tests/tools/snapshot_diff.py old.jsonld new.jsonld
+    python tests/tools/snapshot_diff.py old.jsonld new.jsonld --changeset diff.json
 """
 
 import argparse
 import json
 import sys
-from collections import Counter
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "scripts"))
+from _graph import RECORD, RECORD_SET, Graph, ensure_list, load_graph  # noqa: E402
+from _graph_diff import diff_graphs  # noqa: E402
+
 # Windows-Konsolen (cp1252) können den U+2192-Pfeil nicht rendern.
 if sys.stdout.encoding and sys.stdout.encoding.lower() != "utf-8":
     try:
@@ -22,23 +32,8 @@ if sys.stdout.encoding and sys.stdout.encoding.lower() != "utf-8":
         pass
 
 
-def load_graph(path: Path) -> dict:
-    with open(path, encoding="utf-8") as f:
-        data = json.load(f)
-    return data.get("@graph", [])
-
-
-def classify(graph):
-    records = [n for n in graph if n.get("@type") == "rico:Record"]
-    konvolute = [n for n in graph if n.get("@type") == "rico:RecordSet"
-                 and n.get("rico:hasRecordSetType", {}).get("@id") != "ric-rst:Fonds"]
-    return records, konvolute
-
-
-def ensure_list(v):
-    if v is None:
-        return []
-    return v if isinstance(v, list) else [v]
+def classify(graph: Graph):
+    return graph.records, graph.konvolute
 
 
 def collect_entities(records):
@@ -81,11 +76,49 @@ def fmt_delta(old, new):
     return f"{old:>6} → {new:>6}  ({sign}{diff})"
 
 
+def _label(node) -> str:
+    if node is None:
+        return ""
+    label = node.get("rico:title") or node.get("name") or node.get("skos:prefLabel") or ""
+    return str(label)[:60]
+
+
+def _short(value) -> str:
+    text = value if isinstance(value, str) else json.dumps(value, ensure_ascii=False)
+    return text if len(text) <= 70 else text[:67] + "..."
+
+
+def print_nodes(title: str, sign: str, items: list, graph: Graph, limit: int | None):
+    print()
+    print(f"=== {title}: {len(items)} ===")
+    for item in items[:limit]:
+        print(f"  {sign} {item['@id']}  [{item['@type']}]  {_label(graph.get(item['@id']))}")
+    if limit is not None and len(items) > limit:
+        print(f"  ... ({len(items) - limit} weitere — -v für alle)")
+
+
+def print_modified(items: list, limit: int | None):
+    print()
+    print(f"=== Geänderte Knoten: {len(items)} ===")
+    for item in items[:limit]:
+        retyped = f" (vorher {item['old_type']})" if "old_type" in item else ""
+        print(f"  ~ {item['@id']}  [{item['@type']}]{retyped}")
+        for change in item.get("paths", []):
+            old = _short(change["old"]) if "old" in change else "—"
+            new = _short(change["new"]) if "new" in change else "—"
+            print(f"    {change['path']}: {old} → {new}")
+    if limit is not None and len(items) > limit:
+        print(f"  ... ({len(items) - limit} weitere — -v für alle)")
+
+
 def main():
     ap = argparse.ArgumentParser(description="M3GIM JSON-LD Snapshot-Diff")
     ap.add_argument("old", type=Path, help="Alte m3gim.jsonld")
     ap.add_argument("new", type=Path, help="Neue m3gim.jsonld")
     ap.add_argument("--verbose", "-v", action="store_true", help="Zeige alle geänderten IDs")
+    ap.add_argument("--changeset", type=Path, metavar="JSON",
+                    help="Changeset (added/removed/modified mit Pfaden) als JSON schreiben "
+                         "('-' = stdout, dann ohne Report)")
     args = ap.parse_args()
 
     if not args.old.exists():
@@ -97,14 +130,14 @@ def main():
 
     old_graph = load_graph(args.old)
     new_graph = load_graph(args.new)
+    changeset = diff_graphs(old_graph, new_graph)
 
-    old_records, old_konv = classify(old_graph)
-    new_records, new_konv = classify(new_graph)
-
-    old_stats = collect_entities(old_records)
-    old_stats["konvolute"] = len(old_konv)
-    new_stats = collect_entities(new_records)
-    new_stats["konvolute"] = len(new_konv)
+    if args.changeset is not None:
+        text = json.dumps(changeset, ensure_ascii=False, indent=2)
+        if str(args.changeset) == "-":
+            print(text)
+            return 0
+        args.changeset.write_text(text + "\n", encoding="utf-8")
 
     print("=" * 60)
     print(f"M3GIM Snapshot-Diff")
@@ -113,68 +146,44 @@ def main():
     print("=" * 60)
     print()
     print("=== Structural Diff ===")
-    labels = [
-        ("Records",       "records"),
-        ("Konvolute",     "konvolute"),
-        ("Persons",       "persons"),
-        ("Organizations", "organizations"),
-        ("Locations",     "locations"),
-        ("Works",         "works"),
-        ("Verknüpfungen", "relations"),
-        ("WD-Matches",    "wd_matches"),
-    ]
-    for label, key in labels:
-        print(f"  {label:18s} {fmt_delta(old_stats[key], new_stats[key])}")
-
-    # ID-Diff
-    old_ids = {r["@id"]: r for r in old_records}
-    new_ids = {r["@id"]: r for r in new_records}
-
-    added = sorted(set(new_ids) - set(old_ids))
-    removed = sorted(set(old_ids) - set(new_ids))
-    common = set(old_ids) & set(new_ids)
-
-    print()
-    print(f"=== Neue Records: {len(added)} ===")
-    for aid in added[:20]:
-        title = new_ids[aid].get("rico:title", "")[:60]
-        print(f"  + {aid}  {title}")
-    if len(added) > 20:
-        print(f"  ... ({len(added) - 20} weitere)")
-
-    print()
-    print(f"=== Entfernte Records: {len(removed)} ===")
-    for aid in removed[:20]:
-        title = old_ids[aid].get("rico:title", "")[:60]
-        print(f"  - {aid}  {title}")
-    if len(removed) > 20:
-        print(f"  ... ({len(removed) - 20} weitere)")
-
-    # Inhaltlicher Diff in gemeinsamen Records
-    changed_titles = []
-    changed_dates = []
-    for aid in common:
-        old_r = old_ids[aid]
-        new_r = new_ids[aid]
-        if old_r.get("rico:title") != new_r.get("rico:title"):
-            changed_titles.append(aid)
-        if old_r.get("rico:date") != new_r.get("rico:date"):
-            changed_dates.append(aid)
+    if not ({RECORD, RECORD_SET} & changeset["types"].keys()):
+        print("  Records und Konvolute unverändert")
+    else:
+        old_records, old_konv = classify(old_graph)
+        new_records, new_konv = classify(new_graph)
+        old_stats = collect_entities(old_records)
+        old_stats["konvolute"] = len(old_konv)
+        new_stats = collect_entities(new_records)
+        new_stats["konvolute"] = len(new_konv)
+        labels = [
+            ("Records",       "records"),
+            ("Konvolute",     "konvolute"),
+            ("Persons",       "persons"),
+            ("Organizations", "organizations"),
+            ("Locations",     "locations"),
+            ("Works",         "works"),
+            ("Verknüpfungen", "relations"),
+            ("WD-Matches",    "wd_matches"),
+        ]
+        for label, key in labels:
+            print(f"  {label:18s} {fmt_delta(old_stats[key], new_stats[key])}")
 
     print()
-    print(f"=== Geänderte Titel: {len(changed_titles)} ===")
-    for aid in changed_titles[:10]:
-        print(f"  ~ {aid}")
-        print(f"    alt: {old_ids[aid].get('rico:title', '')[:70]}")
-        print(f"    neu: {new_ids[aid].get('rico:title', '')[:70]}")
-    if len(changed_titles) > 10 and not args.verbose:
-        print(f"  ... ({len(changed_titles) - 10} weitere — -v für alle)")
-
-    print()
-    print(f"=== Geänderte Datümer: {len(changed_dates)} ===")
-    for aid in changed_dates[:10]:
-        print(f"  ~ {aid}: {old_ids[aid].get('rico:date')} → {new_ids[aid].get('rico:date')}")
-
+    print("=== Änderungen nach Typ ===")
+    if not changeset["types"]:
+        print("  keine")
+    for node_type, counts in changeset["types"].items():
+        print(f"  {node_type:28s} +{counts['added']:<5} -{counts['removed']:<5} "
+              f"~{counts['modified']}")
+
+    limit = None if args.verbose else 20
+    print_nodes("Neue Knoten", "+", changeset["added"], new_graph, limit)
+    print_nodes("Entfernte Knoten", "-", changeset["removed"], old_graph, limit)
+    print_modified(changeset["modified"], None if args.verbose else 10)
+
+    if args.changeset is not None:
+        print()
+        print(f"Changeset: {args.changeset}")
     print()
     print("=" * 60)
     print("Diff abgeschlossen.")